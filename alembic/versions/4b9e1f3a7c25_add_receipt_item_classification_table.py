@@ -0,0 +1,56 @@
+"""Add receipt_item_classification table
+
+Revision ID: 4b9e1f3a7c25
+Revises: d73a9c5e2b18
+Create Date: 2026-10-18 14:05:12.418306
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4b9e1f3a7c25"
+down_revision: Union[str, None] = "d73a9c5e2b18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "receipt_item_classification",
+        sa.Column("normalized_name", sa.String(), nullable=False),
+        sa.Column("item_name", sa.String(), nullable=False),
+        sa.Column("subcategory", sa.String(), nullable=True),
+        sa.Column("quantity", sa.Float(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("normalized_name"),
+    )
+    op.create_index(
+        op.f("ix_receipt_item_classification_id"),
+        "receipt_item_classification",
+        ["id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_receipt_item_classification_id"),
+        table_name="receipt_item_classification",
+    )
+    op.drop_table("receipt_item_classification")
@@ -0,0 +1,37 @@
+"""Add token_count to chat_history
+
+Revision ID: 5c1e7d9b3a42
+Revises: a2f3a0024fb0
+Create Date: 2026-10-18 09:12:40.518233
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1e7d9b3a42"
+down_revision: Union[str, None] = "a2f3a0024fb0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "chat_history",
+        sa.Column("token_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    # Same estimate as TokenUtil.estimate_tokens: one token per 4 characters
+    op.execute(
+        "UPDATE chat_history SET token_count = (length(content) + 3) / 4 "
+        "WHERE content IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("chat_history", "token_count")
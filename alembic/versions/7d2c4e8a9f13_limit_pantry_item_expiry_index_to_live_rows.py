@@ -0,0 +1,43 @@
+"""Limit pantry_item (user_id, expiry_date) index to rows not soft-deleted
+
+Revision ID: 7d2c4e8a9f13
+Revises: 4b9e1f3a7c25
+Create Date: 2026-10-18 16:40:27.518204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2c4e8a9f13"
+down_revision: Union[str, None] = "4b9e1f3a7c25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index("ix_pantry_item_user_id_expiry_date", table_name="pantry_item")
+    op.create_index(
+        "ix_pantry_item_user_id_expiry_date",
+        "pantry_item",
+        ["user_id", "expiry_date"],
+        unique=False,
+        sqlite_where=sa.text("deleted_at IS NULL"),
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_pantry_item_user_id_expiry_date", table_name="pantry_item")
+    op.create_index(
+        "ix_pantry_item_user_id_expiry_date",
+        "pantry_item",
+        ["user_id", "expiry_date"],
+        unique=False,
+    )
@@ -0,0 +1,74 @@
+"""Add receipt_job table
+
+Revision ID: 8e4b2f6c1d07
+Revises: 5c1e7d9b3a42
+Create Date: 2026-10-18 11:02:17.305114
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4b2f6c1d07"
+down_revision: Union[str, None] = "5c1e7d9b3a42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "receipt_job",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("receipt_id", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "pending",
+                "running",
+                "done",
+                "failed",
+                name="receiptjobstatus",
+                native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("receipt_id"),
+    )
+    op.create_index(op.f("ix_receipt_job_id"), "receipt_job", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_receipt_job_user_id"), "receipt_job", ["user_id"], unique=False
+    )
+    op.create_index(
+        "ix_receipt_job_status_available_at",
+        "receipt_job",
+        ["status", "available_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_receipt_job_status_available_at", table_name="receipt_job")
+    op.drop_index(op.f("ix_receipt_job_user_id"), table_name="receipt_job")
+    op.drop_index(op.f("ix_receipt_job_id"), table_name="receipt_job")
+    op.drop_table("receipt_job")
@@ -0,0 +1,58 @@
+"""Add ordered partial indexes for live chat_history messages
+
+Revision ID: 9a6c3e1f5b28
+Revises: 7d2c4e8a9f13
+Create Date: 2026-10-18 18:05:12.304417
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a6c3e1f5b28"
+down_revision: Union[str, None] = "7d2c4e8a9f13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE_MESSAGE_INDEXES = {
+    "ix_chat_history_user_id_created_at": ["user_id", "created_at", "id"],
+    "ix_chat_history_user_id_session_id_created_at": [
+        "user_id",
+        "session_id",
+        "created_at",
+        "id",
+    ],
+    "ix_chat_history_session_id_created_at": ["session_id", "created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, columns in LIVE_MESSAGE_INDEXES.items():
+        op.create_index(
+            name,
+            "chat_history",
+            columns,
+            unique=False,
+            sqlite_where=sa.text("deleted_at IS NULL"),
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        )
+    # Superseded: every history query filters on deleted_at IS NULL
+    op.drop_index(op.f("ix_chat_history_user_id"), table_name="chat_history")
+    op.drop_index(op.f("ix_chat_history_session_id"), table_name="chat_history")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        op.f("ix_chat_history_session_id"), "chat_history", ["session_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_chat_history_user_id"), "chat_history", ["user_id"], unique=False
+    )
+    for name in LIVE_MESSAGE_INDEXES:
+        op.drop_index(name, table_name="chat_history")
@@ -0,0 +1,32 @@
+"""Add (user_id, expiry_date) index to pantry_item
+
+Revision ID: a2f3a0024fb0
+Revises: b492db656a5f
+Create Date: 2026-10-18 01:52:14.306512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a2f3a0024fb0"
+down_revision: Union[str, None] = "b492db656a5f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_pantry_item_user_id_expiry_date",
+        "pantry_item",
+        ["user_id", "expiry_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_pantry_item_user_id_expiry_date", table_name="pantry_item")
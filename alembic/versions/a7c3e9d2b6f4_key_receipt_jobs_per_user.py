@@ -0,0 +1,50 @@
+"""Key receipt jobs by user and receipt id
+
+Revision ID: a7c3e9d2b6f4
+Revises: f2c6a8e1b4d9
+Create Date: 2026-10-19 09:41:27.208164
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9d2b6f4"
+down_revision: Union[str, None] = "f2c6a8e1b4d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# SQLite reflects the original unnamed unique constraint without a name; batch
+# mode names it after this convention so that it can be dropped
+NAMING_CONVENTION = {"uq": "uq_%(table_name)s_%(column_0_name)s"}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Receipt ids come from the webhook body, so two users' receipts can share
+    # one; each user gets their own job
+    name = next(
+        constraint["name"]
+        for constraint in sa.inspect(op.get_bind()).get_unique_constraints(
+            "receipt_job"
+        )
+        if constraint["column_names"] == ["receipt_id"]
+    )
+    with op.batch_alter_table(
+        "receipt_job", naming_convention=NAMING_CONVENTION
+    ) as batch_op:
+        batch_op.drop_constraint(name or "uq_receipt_job_receipt_id", type_="unique")
+        batch_op.create_unique_constraint(
+            "uq_receipt_job_receipt_id_user_id", ["receipt_id", "user_id"]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("receipt_job") as batch_op:
+        batch_op.drop_constraint("uq_receipt_job_receipt_id_user_id", type_="unique")
+        batch_op.create_unique_constraint("uq_receipt_job_receipt_id", ["receipt_id"])
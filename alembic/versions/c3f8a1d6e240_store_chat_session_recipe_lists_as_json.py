@@ -0,0 +1,145 @@
+"""Store chat_session recipe lists as JSON and index ingredient terms
+
+Revision ID: c3f8a1d6e240
+Revises: 9a6c3e1f5b28
+Create Date: 2026-10-18 19:02:51.731904
+
+"""
+
+import json
+import re
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f8a1d6e240"
+down_revision: Union[str, None] = "9a6c3e1f5b28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RECIPE_LIST_COLUMNS = ("instructions", "ingredients")
+# Same terms as ChatSessionDomain.ingredient_terms at the time of writing
+INGREDIENT_TERM_PATTERN = re.compile(r"[^\W\d_]{3,}")
+
+
+def recipe_list_type():
+    return sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), "postgresql")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "chat_session_ingredient",
+        sa.Column("session_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("term", sa.String(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("session_id", "term"),
+    )
+    op.create_index(
+        op.f("ix_chat_session_ingredient_id"),
+        "chat_session_ingredient",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_chat_session_ingredient_user_id_term",
+        "chat_session_ingredient",
+        ["user_id", "term", "session_id"],
+        unique=False,
+    )
+
+    # Rewrite the "|"-joined text as JSON text and index the ingredient terms
+    conn = op.get_bind()
+    sessions = conn.execute(
+        sa.text("SELECT id, user_id, instructions, ingredients FROM chat_session")
+    ).all()
+    for session_id, user_id, instructions, ingredients in sessions:
+        lists = {
+            "id": session_id,
+            "instructions": json.dumps(instructions.split("|") if instructions else []),
+            "ingredients": json.dumps(ingredients.split("|") if ingredients else []),
+        }
+        conn.execute(
+            sa.text(
+                "UPDATE chat_session SET instructions = :instructions, "
+                "ingredients = :ingredients WHERE id = :id"
+            ),
+            lists,
+        )
+        terms = dict.fromkeys(
+            INGREDIENT_TERM_PATTERN.findall((ingredients or "").casefold())
+        )
+        if terms:
+            conn.execute(
+                sa.text(
+                    "INSERT INTO chat_session_ingredient (session_id, user_id, term) "
+                    "VALUES (:session_id, :user_id, :term)"
+                ),
+                [
+                    {"session_id": session_id, "user_id": user_id, "term": term}
+                    for term in terms
+                ],
+            )
+
+    with op.batch_alter_table("chat_session") as batch_op:
+        for column in RECIPE_LIST_COLUMNS:
+            batch_op.alter_column(
+                column,
+                existing_type=sa.Text(),
+                type_=recipe_list_type(),
+                existing_nullable=True,
+                postgresql_using=f"{column}::jsonb",
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("chat_session") as batch_op:
+        for column in RECIPE_LIST_COLUMNS:
+            batch_op.alter_column(
+                column,
+                existing_type=recipe_list_type(),
+                type_=sa.Text(),
+                existing_nullable=True,
+                postgresql_using=f"{column}::text",
+            )
+
+    conn = op.get_bind()
+    sessions = conn.execute(
+        sa.text("SELECT id, instructions, ingredients FROM chat_session")
+    ).all()
+    for session_id, instructions, ingredients in sessions:
+        conn.execute(
+            sa.text(
+                "UPDATE chat_session SET instructions = :instructions, "
+                "ingredients = :ingredients WHERE id = :id"
+            ),
+            {
+                "id": session_id,
+                "instructions": "|".join(json.loads(instructions or "[]")),
+                "ingredients": "|".join(json.loads(ingredients or "[]")),
+            },
+        )
+
+    op.drop_index(
+        "ix_chat_session_ingredient_user_id_term",
+        table_name="chat_session_ingredient",
+    )
+    op.drop_index(
+        op.f("ix_chat_session_ingredient_id"), table_name="chat_session_ingredient"
+    )
+    op.drop_table("chat_session_ingredient")
@@ -0,0 +1,56 @@
+"""Add receipt_upload table
+
+Revision ID: d73a9c5e2b18
+Revises: 8e4b2f6c1d07
+Create Date: 2026-10-18 12:20:45.871093
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d73a9c5e2b18"
+down_revision: Union[str, None] = "8e4b2f6c1d07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "receipt_upload",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("receipt_id", sa.String(), nullable=False),
+        sa.Column("image_hash", sa.String(length=64), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("receipt_id"),
+    )
+    op.create_index(
+        op.f("ix_receipt_upload_id"), "receipt_upload", ["id"], unique=False
+    )
+    op.create_index(
+        "ix_receipt_upload_user_id_image_hash",
+        "receipt_upload",
+        ["user_id", "image_hash"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_receipt_upload_user_id_image_hash", table_name="receipt_upload")
+    op.drop_index(op.f("ix_receipt_upload_id"), table_name="receipt_upload")
+    op.drop_table("receipt_upload")
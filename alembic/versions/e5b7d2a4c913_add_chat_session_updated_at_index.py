@@ -0,0 +1,63 @@
+"""Order live chat sessions by updated_at for keyset pages
+
+Revision ID: e5b7d2a4c913
+Revises: c3f8a1d6e240
+Create Date: 2026-10-18 20:14:37.518206
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b7d2a4c913"
+down_revision: Union[str, None] = "c3f8a1d6e240"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Sessions never updated have no updated_at; start them at created_at. Go
+    # through typed columns so the values are written in the format the app
+    # writes and keyset comparisons see (SQLite stores datetimes as text)
+    chat_session = sa.table(
+        "chat_session",
+        sa.column("id", sa.Integer()),
+        sa.column("created_at", sa.DateTime(timezone=True)),
+        sa.column("updated_at", sa.DateTime(timezone=True)),
+    )
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(chat_session.c.id, chat_session.c.created_at).where(
+            chat_session.c.updated_at.is_(None)
+        )
+    ).all()
+    for session_id, created_at in rows:
+        conn.execute(
+            chat_session.update()
+            .where(chat_session.c.id == session_id)
+            .values(updated_at=created_at)
+        )
+
+    op.create_index(
+        "ix_chat_session_user_id_updated_at",
+        "chat_session",
+        ["user_id", "updated_at", "id"],
+        unique=False,
+        sqlite_where=sa.text("deleted_at IS NULL"),
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+    # Superseded: session lists filter on deleted_at IS NULL
+    op.drop_index(op.f("ix_chat_session_user_id"), table_name="chat_session")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        op.f("ix_chat_session_user_id"), "chat_session", ["user_id"], unique=False
+    )
+    op.drop_index("ix_chat_session_user_id_updated_at", table_name="chat_session")
@@ -0,0 +1,47 @@
+"""Rewrite chat history created_at in the format history cursors use
+
+Revision ID: f2c6a8e1b4d9
+Revises: e5b7d2a4c913
+Create Date: 2026-10-18 23:02:11.604317
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c6a8e1b4d9"
+down_revision: Union[str, None] = "e5b7d2a4c913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite stores datetimes as text, and the CURRENT_TIMESTAMP server default
+    # writes them without the fractional seconds the app writes. Go through
+    # typed columns so existing rows match the keyset cursors compared with them
+    conn = op.get_bind()
+    if conn.dialect.name != "sqlite":
+        return
+    chat_history = sa.table(
+        "chat_history",
+        sa.column("id", sa.Integer()),
+        sa.column("created_at", sa.DateTime(timezone=True)),
+    )
+    rows = conn.execute(sa.select(chat_history.c.id, chat_history.c.created_at)).all()
+    if rows:
+        conn.execute(
+            chat_history.update()
+            .where(chat_history.c.id == sa.bindparam("row_id"))
+            .values(created_at=sa.bindparam("stamp")),
+            [{"row_id": row_id, "stamp": created_at} for row_id, created_at in rows],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The rewritten values are the same instants; nothing to undo
@@ -0,0 +1,143 @@
+# flake8: noqa: E402
+"""
+Microbenchmark the admin redirect middleware on non-admin routes.
+
+Builds two copies of the app: one with the previous ``BaseHTTPMiddleware``
+implementation (reproduced here as ``BaseHTTPAdminRedirectMiddleware``) and one
+with the pure ASGI ``AdminRedirectMiddleware``, then measures requests per
+second on ``GET /`` and an authenticated ``GET /pantry/list`` (warm auth cache).
+
+Usage:
+    python scripts/benchmarks/bench_admin_middleware.py [--requests 5000]
+        [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import (
+    configure_environment,
+    prepare_database,
+    print_table,
+    register_and_login,
+    run_concurrent,
+)
+
+
+def build_base_http_middleware():
+    """The pre-ASGI middleware: every request goes through BaseHTTPMiddleware."""
+    from fastapi.security.utils import get_authorization_scheme_param
+    from starlette.middleware.base import BaseHTTPMiddleware
+    from starlette.responses import RedirectResponse
+
+    from src.pantrypal_api.account.dependencies import get_admin_user
+
+    class BaseHTTPAdminRedirectMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            path = request.url.path
+            if path == "/docs" or (
+                path.startswith("/admin") and not path.startswith("/admin/login")
+            ):
+                token = request.headers.get("Authorization") or request.cookies.get(
+                    "Authorization"
+                )
+                if token:
+                    scheme, param = get_authorization_scheme_param(str(token))
+                    if scheme.lower() != "bearer":
+                        param = str(token)
+                    try:
+                        if param and await get_admin_user(param):
+                            return await call_next(request)
+                    except Exception:
+                        pass
+                return RedirectResponse(url="/admin/login")
+            return await call_next(request)
+
+    return BaseHTTPAdminRedirectMiddleware
+
+
+def build_app(use_base_http: bool):
+    from starlette.middleware import Middleware
+
+    from src.app.main import create_app
+    from src.app.middleware import AdminRedirectMiddleware
+
+    app = create_app()
+    if use_base_http:
+        legacy = build_base_http_middleware()
+        app.user_middleware = [
+            Middleware(legacy) if m.cls is AdminRedirectMiddleware else m
+            for m in app.user_middleware
+        ]
+    return app
+
+
+async def run(args) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    await prepare_database()
+
+    results = []
+    for label, use_base_http in (
+        ("BaseHTTPMiddleware", True),
+        ("pure ASGI", False),
+    ):
+        app = build_app(use_base_http)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            token = await register_and_login(client, f"{use_base_http}@example.com")
+            await client.post(
+                "/pantry/add",
+                json=[
+                    {
+                        "item_name": f"Item {i}",
+                        "quantity": 1,
+                        "unit": "pieces",
+                        "category": "Fruits",
+                        "purchase_date": "2025-06-01T10:00:00Z",
+                        "expiry_date": "2025-06-10T10:00:00Z",
+                    }
+                    for i in range(20)
+                ],
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+            for path, headers in (
+                ("/", {}),
+                ("/pantry/list", {"Authorization": f"Bearer {token}"}),
+            ):
+
+                async def request(index: int) -> None:
+                    response = await client.get(path, headers=headers)
+                    response.raise_for_status()
+
+                await run_concurrent("warmup", request, args.concurrency, 200)
+                results.append(
+                    await run_concurrent(
+                        f"{label} GET {path}",
+                        request,
+                        args.concurrency,
+                        args.requests,
+                    )
+                )
+
+    print(f"\n{args.requests} requests per scenario\n")
+    print_table(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# flake8: noqa: E402
+"""
+Load test the auth cache on authenticated requests.
+
+Sends concurrent ``GET /chatbot/title-suggestions`` calls (a route whose handler
+does no database work when the LLM is faked) from a pool of users and counts
+the SQL statements executed per request. The baseline run disables the cache by
+setting its TTL to zero; the warm run primes it with one request per user first.
+
+Usage:
+    python scripts/benchmarks/bench_auth_cache.py [--users 20] [--requests 2000]
+        [--concurrency 100]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import (
+    configure_environment,
+    prepare_database,
+    print_table,
+    register_and_login,
+    run_concurrent,
+)
+
+
+async def run(args) -> None:
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import event
+
+    from src.app.main import app
+    from src.core.account.services.auth_cache_service import AuthCacheService
+    from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+    from src.core.common.ports.cache_provider import ICacheProvider
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.modules import injector
+
+    class FakeChatbotProvider(IChatbotProvider):
+        async def handle_single_turn(self, message):
+            return '["One", "Two", "Three", "Four"]'
+
+        async def handle_multi_turn(self, messages):
+            return "ok"
+
+    await prepare_database()
+    injector.binder.bind(IChatbotProvider, to=FakeChatbotProvider())
+    auth_cache = injector.get(AuthCacheService)
+    cache_provider = injector.get(ICacheProvider)
+
+    statements = []
+    engine = injector.get(IDatabaseProvider).engine.sync_engine
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *a: statements.append(statement),
+    )
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        tokens = [
+            await register_and_login(client, f"user{i}@example.com")
+            for i in range(args.users)
+        ]
+
+        async def request(index: int) -> None:
+            token = tokens[index % len(tokens)]
+            response = await client.get(
+                "/chatbot/title-suggestions",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            response.raise_for_status()
+
+        results, query_counts = [], []
+        for label, ttl in (("cache disabled (ttl=0)", 0), ("warm cache", 60)):
+            auth_cache.ttl_seconds = ttl
+            await cache_provider.clear()
+            if ttl:
+                await run_concurrent("prime", request, args.users, args.users)
+            before = auth_cache.stats()
+            statements.clear()
+            results.append(
+                await run_concurrent(label, request, args.concurrency, args.requests)
+            )
+            after = auth_cache.stats()
+            query_counts.append(
+                (
+                    label,
+                    len(statements) / args.requests,
+                    {k: after[k] - before[k] for k in after},
+                )
+            )
+
+    print(f"\n{args.requests} requests from {args.users} users\n")
+    print_table(results)
+    print("\n| scenario | SQL statements / request | cache counters |")
+    print("| --- | --- | --- |")
+    for label, per_request, counters in query_counts:
+        print(f"| {label} | {per_request:.2f} | {counters} |")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
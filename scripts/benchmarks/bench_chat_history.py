@@ -0,0 +1,191 @@
+# flake8: noqa: E402
+"""
+Benchmark chat history reads at 1M and 10M ``chat_history`` rows.
+
+For each ``--rows`` value, seeds a fresh SQLite database with users who each
+have ``--sessions-per-user`` sessions of ``--messages-per-session`` messages,
+interleaved in time across users as a busy server writes them, with 10% of
+sessions soft-deleted. Then times the ``ChatbotHistoryAccessor`` reads for
+random live sessions:
+
+* with the previous single-column ``user_id`` and ``session_id`` indexes;
+* with the ordered partial indexes on ``(user_id, created_at, id)``,
+  ``(user_id, session_id, created_at, id)`` and ``(session_id, created_at, id)``.
+
+No ``ANALYZE`` is run, as the app never runs one either. Reports p50/p99
+latency per read over ``--repeats`` calls.
+
+Usage:
+    python scripts/benchmarks/bench_chat_history.py [--rows 1000000 10000000]
+        [--sessions-per-user 20] [--messages-per-session 50] [--repeats 200]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, percentile, prepare_database
+
+PREVIOUS_INDEXES = (
+    "CREATE INDEX ix_chat_history_user_id ON chat_history (user_id)",
+    "CREATE INDEX ix_chat_history_session_id ON chat_history (session_id)",
+)
+LIVE_MESSAGE_INDEXES = (
+    "CREATE INDEX ix_chat_history_user_id_created_at "
+    "ON chat_history (user_id, created_at, id) WHERE deleted_at IS NULL",
+    "CREATE INDEX ix_chat_history_user_id_session_id_created_at "
+    "ON chat_history (user_id, session_id, created_at, id) "
+    "WHERE deleted_at IS NULL",
+    "CREATE INDEX ix_chat_history_session_id_created_at "
+    "ON chat_history (session_id, created_at, id) WHERE deleted_at IS NULL",
+)
+
+
+def seed(path: str, rows: int, args) -> int:
+    """Bulk-load ``rows`` messages with the stdlib driver; returns the user count."""
+    per_user = args.sessions_per_user * args.messages_per_session
+    users = max(rows // per_user, 1)
+    start = datetime(2025, 1, 1)
+    stamp = "%Y-%m-%d %H:%M:%S.%f"
+
+    def messages():
+        for k in range(rows):
+            user, position = k % users, k // users
+            session = position // args.messages_per_session
+            created = (start + timedelta(seconds=k)).strftime(stamp)
+            yield (
+                user + 1,
+                user * args.sessions_per_user + session + 1,
+                "user" if position % 2 == 0 else "assistant",
+                f"Message {position} about what to cook with what is left",
+                14,
+                created,
+                created,
+                created if session % 10 == 0 else None,
+            )
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA synchronous=OFF")
+    for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' "
+        "AND tbl_name = 'chat_history' AND sql IS NOT NULL"
+    ).fetchall():
+        conn.execute(f"DROP INDEX {name}")
+    conn.executemany(
+        "INSERT INTO chat_history (user_id, session_id, role, content, "
+        "token_count, timestamp, created_at, deleted_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        messages(),
+    )
+    conn.commit()
+    conn.close()
+    return users
+
+
+def use_indexes(path: str, statements) -> None:
+    conn = sqlite3.connect(path)
+    for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' "
+        "AND tbl_name = 'chat_history' AND sql IS NOT NULL"
+    ).fetchall():
+        conn.execute(f"DROP INDEX {name}")
+    for statement in statements:
+        conn.execute(statement)
+    conn.commit()
+    conn.close()
+
+
+async def time_reads(accessor, targets, repeats: int):
+    reads = {
+        "recent messages (session)": lambda u, s: accessor.get_recent_messages(u, s),
+        "recent messages (all sessions)": lambda u, s: accessor.get_recent_messages(u),
+        "prompt window (session)": lambda u, s: accessor.get_prompt_window(
+            u, s, token_budget=2000
+        ),
+        "prompt window (all sessions)": lambda u, s: accessor.get_prompt_window(
+            u, token_budget=2000
+        ),
+        "session transcript": lambda u, s: accessor.get_messages_by_session(s),
+    }
+    timings = {}
+    for label, read in reads.items():
+        await read(*targets[0])  # warm-up
+        samples = []
+        for user_id, session_id in targets[:repeats]:
+            start = time.perf_counter()
+            await read(user_id, session_id)
+            samples.append(time.perf_counter() - start)
+        timings[label] = samples
+    return timings
+
+
+async def run(args) -> None:
+    from src.core.chatbot.accessors.chatbot_history_accessor import (
+        IChatbotHistoryAccessor,
+    )
+    from src.pantrypal_api.modules import injector
+
+    accessor = injector.get(IChatbotHistoryAccessor)
+    results = []
+    for rows in args.rows:
+        path = str(Path(tempfile.mkdtemp(prefix="pantrypal-bench-")) / "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+        await prepare_database()
+
+        started = time.perf_counter()
+        users = seed(path, rows, args)
+        print(f"seeded {rows} rows in {time.perf_counter() - started:.0f} s")
+        rng = random.Random(11)
+        targets = []
+        while len(targets) < args.repeats:
+            user = rng.randrange(users)
+            session = rng.randrange(args.sessions_per_user)
+            if session % 10:  # live sessions only
+                targets.append((user + 1, user * args.sessions_per_user + session + 1))
+
+        for label, statements in (
+            ("user_id, session_id indexes", PREVIOUS_INDEXES),
+            ("ordered partial indexes", LIVE_MESSAGE_INDEXES),
+        ):
+            use_indexes(path, statements)
+            timings = await time_reads(accessor, targets, args.repeats)
+            results.append((rows, label, timings))
+
+    print(
+        f"\n{args.sessions_per_user} sessions x {args.messages_per_session} "
+        f"messages per user, {args.repeats} random live sessions per read\n"
+    )
+    print("| rows | indexes | read | p50 ms | p99 ms |")
+    print("| --- | --- | --- | --- | --- |")
+    for rows, label, timings in results:
+        for read, samples in timings.items():
+            print(
+                f"| {rows:,} | {label} | {read} "
+                f"| {percentile(samples, 50) * 1000:.2f} "
+                f"| {percentile(samples, 99) * 1000:.2f} |"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--sessions-per-user", type=int, default=20)
+    parser.add_argument("--messages-per-session", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
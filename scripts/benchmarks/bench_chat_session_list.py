@@ -0,0 +1,195 @@
+# flake8: noqa: E402
+"""
+Benchmark ``GET /chatbot/sessions`` for users with 10 to 10k chat sessions.
+
+For each ``--sizes`` value a fresh user gets that many sessions, each with a
+recipe of 5-10 ingredients and 4-8 steps, then these are timed:
+
+* the previous implementation (reproduced here and mounted on the app as
+  ``/bench/legacy-sessions``): load every session with its recipe, hydrate
+  ``ChatSessionDomain`` and ``ChatSessionResponse`` objects, and let FastAPI
+  validate and serialise them against ``response_model``;
+* the new endpoint without parameters (every session's id, title and
+  updated_at);
+* the first keyset page with ``limit=--page-size``;
+* ``GET /chatbot/sessions/{id}/recipe`` for one session, which the client now
+  calls when a session is opened.
+
+Reports the response body size and the median time of ``--repeats`` requests
+through the ASGI app.
+
+Usage:
+    python scripts/benchmarks/bench_chat_session_list.py
+        [--sizes 10 100 1000 10000] [--page-size 50] [--repeats 20]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, prepare_database, register_and_login
+
+INGREDIENTS = (
+    "chicken thighs", "beef mince", "salmon fillet", "firm tofu", "eggs",
+    "basmati rice", "spaghetti", "onion", "garlic cloves", "fresh ginger",
+    "soy sauce", "olive oil", "butter", "tinned tomatoes", "coconut milk",
+    "spinach", "carrots", "potatoes", "broccoli", "lemon",
+)  # fmt: skip
+
+
+def mount_legacy_route(app) -> None:
+    """The previous handler: every full session -> response models."""
+    from fastapi import Depends
+    from sqlalchemy.future import select
+
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.account.dependencies import get_current_user
+    from src.pantrypal_api.chatbot.models import ChatSession
+    from src.pantrypal_api.chatbot.schemas.chat_session_schemas import (
+        ChatSessionResponse,
+    )
+    from src.pantrypal_api.modules import injector
+
+    async def legacy_sessions(current_user_id: int = Depends(get_current_user)):
+        async with injector.get(IDatabaseProvider).get_db() as db:
+            result = await db.execute(
+                select(ChatSession)
+                .where(ChatSession.user_id == current_user_id)
+                .where(ChatSession.deleted_at.is_(None))
+            )
+            sessions = [r.to_domain() for r in result.scalars().all()]
+        return [s.to_schema() for s in sessions]
+
+    app.add_api_route(
+        "/bench/legacy-sessions",
+        legacy_sessions,
+        methods=["GET"],
+        response_model=List[ChatSessionResponse],
+    )
+
+
+async def seed(user_id: int, sessions: int) -> int:
+    """Bulk-load the user's sessions; returns the id of the last one."""
+    from sqlalchemy import func, insert, select
+
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.chatbot.models import ChatSession
+    from src.pantrypal_api.modules import injector
+
+    rng = random.Random(sessions)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(sessions):
+        ingredients = [
+            f"{rng.randint(1, 500)}g {word}"
+            for word in rng.sample(INGREDIENTS, rng.randint(5, 10))
+        ]
+        rows.append(
+            {
+                "user_id": user_id,
+                "title": f"Recipe {i}",
+                "summary": "A quick weeknight dinner from what is in the pantry.",
+                "prep_time": rng.randint(10, 60),
+                "instructions": [
+                    f"Step {step}: prepare and cook the ingredients until done."
+                    for step in range(rng.randint(4, 8))
+                ],
+                "ingredients": ingredients,
+                "available_count": rng.randint(0, len(ingredients)),
+                "total_count": len(ingredients),
+                "updated_at": start + timedelta(minutes=i),
+            }
+        )
+    async with injector.get(IDatabaseProvider).get_db() as db:
+        for offset in range(0, len(rows), 5000):
+            await db.execute(insert(ChatSession), rows[offset : offset + 5000])
+        await db.commit()
+        result = await db.execute(
+            select(func.max(ChatSession.id)).where(ChatSession.user_id == user_id)
+        )
+        return result.scalar_one()
+
+
+async def measure(client, headers, session_id: int, page_size: int, repeats: int):
+    requests = {
+        "previous (full recipes)": ("/bench/legacy-sessions", {}),
+        "summaries, all": ("/chatbot/sessions", {}),
+        f"summaries, limit={page_size}": ("/chatbot/sessions", {"limit": page_size}),
+        "one recipe": (f"/chatbot/sessions/{session_id}/recipe", {}),
+    }
+    results = {}
+    for label, (path, params) in requests.items():
+        timings = []
+        for _ in range(repeats + 1):
+            start = time.perf_counter()
+            response = await client.get(path, params=params, headers=headers)
+            response.raise_for_status()
+            timings.append(time.perf_counter() - start)
+        results[label] = (len(response.content), statistics.median(timings[1:]))
+    return results
+
+
+async def run(args) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from src.app.main import app
+    from src.core.account.accessors.user_account_accessor import (
+        IUserAccountAccessor,
+    )
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    mount_legacy_route(app)
+
+    rows = []
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        for size in args.sizes:
+            email = f"sessions{size}@example.com"
+            token = await register_and_login(client, email)
+            user = await injector.get(IUserAccountAccessor).get_by_email(email)
+            session_id = await seed(user.id, size)
+            results = await measure(
+                client,
+                {"Authorization": f"Bearer {token}"},
+                session_id,
+                args.page_size,
+                args.repeats,
+            )
+            for label, (size_bytes, median) in results.items():
+                rows.append((size, label, size_bytes, median))
+
+    print(f"\nmedian of {args.repeats} requests per scenario\n")
+    print("| sessions | request | body KiB | HTTP p50 ms |")
+    print("| --- | --- | --- | --- |")
+    for size, label, size_bytes, median in rows:
+        print(f"| {size} | {label} | {size_bytes / 1024:.1f} | {median * 1000:.1f} |")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
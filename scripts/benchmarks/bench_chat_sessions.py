@@ -0,0 +1,250 @@
+# flake8: noqa: E402
+"""
+Benchmark ``list_sessions`` for users with ``--sessions`` chat sessions each.
+
+Seeds ``--users`` users with the same recipes twice: in ``chat_session``, whose
+instructions and ingredients are JSON lists, and in a copy of the previous
+table that stored them as ``"|"``-joined text (reproduced here, with its
+``to_domain`` splitting them on every read). Then times, for one user:
+
+* listing every session;
+* listing the sessions that use chicken: previously by loading every session
+  and filtering in Python, or with ``LIKE '%chicken%'`` on the text column;
+  now with the ``chat_session_ingredient`` term index.
+
+Reports the median time per call over ``--repeats`` calls.
+
+Usage:
+    python scripts/benchmarks/bench_chat_sessions.py [--sessions 5000]
+        [--users 20] [--repeats 20]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, prepare_database
+
+PANTRY_WORDS = (
+    "chicken thighs", "beef mince", "pork belly", "salmon fillet", "prawns",
+    "firm tofu", "eggs", "basmati rice", "jasmine rice", "spaghetti", "udon noodles",
+    "rolled oats", "plain flour", "bread", "onion", "spring onions", "garlic cloves",
+    "fresh ginger", "red chilli", "soy sauce", "fish sauce", "oyster sauce",
+    "sesame oil", "olive oil", "butter", "tinned tomatoes", "tomato paste",
+    "coconut milk", "whole milk", "cheddar cheese", "parmesan", "yoghurt",
+    "spinach", "kale", "red pepper", "carrots", "potatoes", "sweet potato",
+    "broccoli", "mushrooms", "courgette", "aubergine", "chickpeas", "lentils",
+    "black beans", "lemon", "lime", "coriander", "basil", "cumin",
+)  # fmt: skip
+
+
+def legacy_model():
+    """The previous chat_session table, with recipe lists stored as text."""
+    from sqlalchemy import Column, Integer, String, Text
+
+    from src.pantrypal_api.base.models import PantryPalBaseModel
+
+    class LegacyChatSession(PantryPalBaseModel):
+        __tablename__ = "chat_session_legacy"
+
+        user_id = Column(Integer, index=True)
+        title = Column(String, nullable=False)
+        summary = Column(Text, nullable=True)
+        prep_time = Column(Integer, nullable=True)
+        instructions = Column(Text, nullable=True)
+        ingredients = Column(Text, nullable=True)
+        available_count = Column(Integer, nullable=True)
+        total_count = Column(Integer, nullable=True)
+
+        def to_domain(self):
+            from src.core.chatbot.models import ChatSessionDomain
+
+            return ChatSessionDomain(
+                id=self.id,
+                created_at=self.created_at,
+                deleted_at=self.deleted_at,
+                user_id=self.user_id,
+                title=self.title,
+                summary=self.summary,
+                prep_time=self.prep_time,
+                instructions=(
+                    self.instructions.split("|") if self.instructions else []
+                ),
+                ingredients=self.ingredients.split("|") if self.ingredients else [],
+                available_ingredients=self.available_count or 0,
+                total_ingredients=self.total_count or 0,
+                updated_at=self.updated_at,
+            )
+
+    return LegacyChatSession
+
+
+def recipes(users: int, sessions: int):
+    rng = random.Random(3)
+    for user_id in range(1, users + 1):
+        for i in range(sessions):
+            ingredients = [
+                f"{rng.randint(1, 500)}g {word}"
+                for word in rng.sample(PANTRY_WORDS, rng.randint(5, 10))
+            ]
+            yield {
+                "user_id": user_id,
+                "title": f"Recipe {i}",
+                "summary": "A quick weeknight dinner from what is in the pantry.",
+                "prep_time": rng.randint(10, 60),
+                "instructions": [
+                    f"Step {step}: prepare and cook the ingredients until done."
+                    for step in range(rng.randint(4, 8))
+                ],
+                "ingredients": ingredients,
+                "available_ingredients": rng.randint(0, len(ingredients)),
+                "total_ingredients": len(ingredients),
+            }
+
+
+async def seed(legacy, users: int, sessions: int) -> None:
+    """Bulk-load both tables, indexing ingredient terms as create_session does."""
+    from sqlalchemy import insert
+
+    from src.core.chatbot.models import ChatSessionDomain
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.chatbot.models import ChatSession, ChatSessionIngredient
+    from src.pantrypal_api.modules import injector
+
+    sessions_rows, legacy_rows, term_rows = [], [], []
+    for session_id, recipe in enumerate(recipes(users, sessions), start=1):
+        row = {
+            "id": session_id,
+            "user_id": recipe["user_id"],
+            "title": recipe["title"],
+            "summary": recipe["summary"],
+            "prep_time": recipe["prep_time"],
+            "available_count": recipe["available_ingredients"],
+            "total_count": recipe["total_ingredients"],
+        }
+        sessions_rows.append(
+            {
+                **row,
+                "instructions": recipe["instructions"],
+                "ingredients": recipe["ingredients"],
+            }
+        )
+        legacy_rows.append(
+            {
+                **row,
+                "instructions": "|".join(recipe["instructions"]),
+                "ingredients": "|".join(recipe["ingredients"]),
+            }
+        )
+        terms = ChatSessionDomain.ingredient_terms(" ".join(recipe["ingredients"]))
+        term_rows.extend(
+            {"session_id": session_id, "user_id": recipe["user_id"], "term": term}
+            for term in terms
+        )
+    async with injector.get(IDatabaseProvider).get_db() as db:
+        for model, rows in (
+            (ChatSession, sessions_rows),
+            (legacy, legacy_rows),
+            (ChatSessionIngredient, term_rows),
+        ):
+            for start in range(0, len(rows), 5000):
+                await db.execute(insert(model), rows[start : start + 5000])
+        await db.commit()
+
+
+async def run(args) -> None:
+    from sqlalchemy.future import select
+
+    from src.core.chatbot.accessors.chat_session_accessor import (
+        IChatSessionAccessor,
+    )
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.modules import injector
+
+    legacy = legacy_model()
+    await prepare_database()
+    started = time.perf_counter()
+    await seed(legacy, args.users, args.sessions)
+    print(
+        f"seeded {args.users * args.sessions} sessions in "
+        f"{time.perf_counter() - started:.0f} s"
+    )
+    db_provider = injector.get(IDatabaseProvider)
+    accessor = injector.get(IChatSessionAccessor)
+    user_id = 1
+
+    async def legacy_list(*criteria):
+        async with db_provider.get_db() as db:
+            result = await db.execute(
+                select(legacy)
+                .where(legacy.user_id == user_id)
+                .where(legacy.deleted_at.is_(None))
+                .where(*criteria)
+            )
+            return [r.to_domain() for r in result.scalars().all()]
+
+    async def legacy_filter_in_python():
+        return [
+            s
+            for s in await legacy_list()
+            if any("chicken" in i.lower() for i in s.ingredients)
+        ]
+
+    scenarios = (
+        ("all sessions", "text + split (previous)", legacy_list),
+        ("all sessions", "JSON lists", lambda: accessor.list_sessions(user_id)),
+        ("uses chicken", "load all + filter in Python", legacy_filter_in_python),
+        (
+            "uses chicken",
+            "LIKE '%chicken%' on text",
+            lambda: legacy_list(legacy.ingredients.like("%chicken%")),
+        ),
+        (
+            "uses chicken",
+            "ingredient term index",
+            lambda: accessor.list_sessions(user_id, ingredient="chicken"),
+        ),
+    )
+    rows = []
+    for case, label, call in scenarios:
+        result = await call()  # warm-up
+        timings = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            await call()
+            timings.append(time.perf_counter() - start)
+        rows.append((case, label, len(result), statistics.median(timings)))
+
+    print(
+        f"\n{args.sessions} sessions per user, {args.users} users, "
+        f"median of {args.repeats} calls\n"
+    )
+    print("| query | implementation | sessions returned | ms per call |")
+    print("| --- | --- | --- | --- |")
+    for case, label, count, median in rows:
+        print(f"| {case} | {label} | {count} | {median * 1000:.1f} |")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# flake8: noqa: E402
+"""
+Benchmark how chat turns are persisted under concurrent ``POST /chatbot/chat``.
+
+One user per concurrent client gets a session through ``/chatbot/recommend``,
+then sends contextual messages to it. The stub LLM replies with a recipe, so every
+turn updates the session and stores the user and assistant messages:
+
+* the previous sequence (reproduced here by patching
+  ``ChatSessionService.save_turn``): the session update and each message
+  opened their own session and committed;
+* ``save_turn``: the session update and both messages in one transaction;
+* ``save_turn`` with the chat history writer enabled (``--flush-ms``): the
+  session update commits on its own and the messages of concurrent turns are
+  inserted together by the writer.
+
+Reports database commits per turn (counted on the engine, for the whole
+request) and p50/p99 latency at each ``--concurrency`` level.
+
+Usage:
+    python scripts/benchmarks/bench_chat_turns.py [--concurrency 10 50 200]
+        [--turns-per-user 5] [--flush-ms 10] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import (
+    StubLLMServer,
+    configure_environment,
+    prepare_database,
+    register_and_login,
+    run_concurrent,
+)
+
+RECIPE_REPLY = json.dumps(
+    {
+        "title": "Egg fried rice",
+        "summary": "Leftover rice fried with egg and greens.",
+        "prep_time": "15 mins",
+        "ingredients": ["2 cups cooked rice", "2 eggs", "1 spring onion"],
+        "instructions": ["Scramble the eggs", "Fry the rice", "Mix and season"],
+        "available_ingredients": ["rice", "eggs"],
+        "total_ingredients": 3,
+        "assistant_comment": "A quick way to use up rice.",
+    }
+)
+
+
+async def previous_save_turn(self, session_id, recipe, messages):
+    """The previous ChatbotService sequence: one commit per write."""
+    if recipe is not None and session_id is None:
+        session_id = (await self.chat_session_accessor.create_session(recipe)).id
+    elif recipe is not None:
+        await self.chat_session_accessor.update_session_recipe(session_id, recipe)
+    for message in messages:
+        await self.chatbot_history_accessor.save_message(
+            message.model_copy(update={"session_id": session_id})
+        )
+    return session_id
+
+
+async def run(args) -> None:
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import event
+
+    from src.app.main import app
+    from src.core.chatbot.services.chat_history_writer import ChatHistoryWriter
+    from src.core.chatbot.services.chat_session_service import ChatSessionService
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    commits = [0]
+
+    def count_commit(conn):
+        commits[0] += 1
+
+    event.listen(
+        injector.get(IDatabaseProvider).engine.sync_engine, "commit", count_commit
+    )
+    writer = injector.get(ChatHistoryWriter)
+    save_turn = ChatSessionService.save_turn
+
+    rows = []
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        users = []
+        for i in range(max(args.concurrency)):
+            token = await register_and_login(client, f"turns{i}@example.com")
+            headers = {"Authorization": f"Bearer {token}"}
+            response = await client.post(
+                "/chatbot/recommend",
+                json={"role": "user", "content": "What can I cook tonight?"},
+                headers=headers,
+            )
+            response.raise_for_status()
+            users.append((headers, response.json()["session_id"]))
+
+        for label in ("previous (commit per write)", "save_turn", "save_turn + writer"):
+            ChatSessionService.save_turn = (
+                previous_save_turn if label.startswith("previous") else save_turn
+            )
+            if label.endswith("writer"):
+                writer.flush_ms = args.flush_ms
+                writer.start()
+            for concurrency in args.concurrency:
+
+                async def chat(index: int) -> None:
+                    headers, session_id = users[index % concurrency]
+                    response = await client.post(
+                        "/chatbot/chat",
+                        json={
+                            "role": "user",
+                            "content": f"Something else? #{index}",
+                            "session_id": session_id,
+                        },
+                        headers=headers,
+                    )
+                    response.raise_for_status()
+
+                turns = concurrency * args.turns_per_user
+                await run_concurrent(label, chat, concurrency)  # warm-up
+                commits[0] = 0
+                result = await run_concurrent(label, chat, concurrency, turns)
+                rows.append((label, result, commits[0] / turns))
+            await writer.stop()
+            writer.flush_ms = 0
+    ChatSessionService.save_turn = save_turn
+
+    print(
+        f"\n/chatbot/chat turns that update the session recipe, stub LLM latency "
+        f"{args.latency * 1000:.0f} ms, writer flush {args.flush_ms} ms\n"
+    )
+    print(
+        "| persistence | concurrency | turns | errors | commits/turn | p50 ms | p99 ms |"
+    )
+    print("| --- | --- | --- | --- | --- | --- | --- |")
+    for label, result, per_turn in rows:
+        summary = result.summary()
+        print(
+            f"| {label} | {result.concurrency} | {len(result.latencies)} "
+            f"| {result.errors} | {per_turn:.2f} | {summary['p50_ms']:.1f} "
+            f"| {summary['p99_ms']:.1f} |"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--turns-per-user", type=int, default=5)
+    parser.add_argument("--flush-ms", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with StubLLMServer(latency=args.latency, reply=RECIPE_REPLY) as server:
+        configure_environment(
+            GROQ_BASE_URL=server.base_url,
+            CHATBOT_MAX_CONNECTIONS="200",
+            CHATBOT_MAX_CONCURRENT_REQUESTS="1000",
+        )
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
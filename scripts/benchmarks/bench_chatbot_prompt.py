@@ -0,0 +1,238 @@
+# flake8: noqa: E402
+"""
+Measure CPU time and memory allocated while building chatbot prompts.
+
+Seeds one user with ``--items`` pantry items and ``--history`` chat messages of
+about ``--message-chars`` characters each, then builds the provider messages
+for a recommendation and for a contextual chat turn, up to the point where they
+are handed to the LLM client:
+
+* the previous implementation (reproduced here): every recommendation loads and
+  sorts all pantry items and builds a fresh system ``ChatMessageSpec``; every
+  chat turn hydrates ``ChatHistoryDomain`` rows and round-trips them through
+  ``model_dump``/``model_validate``; the provider then formats the specs;
+* ``ChatbotService`` with the cached pantry context, both on a cache hit and
+  when the pantry version is bumped before every request (cache miss);
+* history read straight into provider message dicts.
+
+CPU is ``time.process_time`` per request; "peak KiB" is the tracemalloc peak
+during one request, measured in a separate pass.
+
+Usage:
+    python scripts/benchmarks/bench_chatbot_prompt.py [--items 200]
+        [--history 20] [--message-chars 800] [--repeats 300]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, prepare_database
+
+USER_ID = 1
+SESSION_ID = 1
+
+
+def to_provider_messages(specs):
+    """What the provider's message formatter did with each spec."""
+    return [{"role": m.role.value.lower(), "content": m.content} for m in specs]
+
+
+async def previous_recommendation_messages(pantry_service, json_instruction, message):
+    from src.core.chatbot.constants import ChatbotMessageRole
+    from src.core.chatbot.specs import ChatMessageSpec
+    from src.core.common.utils import DateTimeUtils
+
+    items = await pantry_service.get_items_sorted_by_expiry(message.user_id)
+    ingredient_list = ", ".join(
+        f"{i.item_name} {i.quantity} {i.unit} exp {i.expiry_date.date() if i.expiry_date else 'N/A'}"
+        for i in items
+    )
+    enriched = message.model_copy(
+        update={
+            "content": f"Prioritize ingredients nearing expiry: {ingredient_list}. "
+            + message.content
+        }
+    )
+    system_msg = ChatMessageSpec(
+        user_id=message.user_id,
+        role=ChatbotMessageRole.SYSTEM,
+        content=json_instruction,
+        timestamp=DateTimeUtils.get_utc_now(),
+        session_id=message.session_id,
+    )
+    return to_provider_messages([system_msg, enriched])
+
+
+async def previous_context_messages(history_accessor, message):
+    from src.core.chatbot.specs import ChatMessageSpec
+
+    recent = await history_accessor.get_recent_messages(
+        message.user_id, session_id=message.session_id
+    )
+    specs = [ChatMessageSpec.model_validate(m.model_dump()) for m in recent]
+    specs.append(message)
+    return to_provider_messages(specs)
+
+
+async def seed(items: int, history: int, message_chars: int) -> None:
+    from src.core.chatbot.accessors.chatbot_history_accessor import (
+        IChatbotHistoryAccessor,
+    )
+    from src.core.chatbot.constants import ChatbotMessageRole
+    from src.core.chatbot.specs import ChatMessageSpec
+    from src.core.pantry.accessors.pantry_item_accessor import IPantryItemAccessor
+    from src.core.pantry.constants import Category, Unit
+    from src.core.pantry.models import PantryItemDomain
+    from src.pantrypal_api.modules import injector
+
+    rng = random.Random(9)
+    now = datetime.now(timezone.utc)
+    await injector.get(IPantryItemAccessor).add_items(
+        [
+            PantryItemDomain.create(
+                user_id=USER_ID,
+                item_name=f"Ingredient {i}",
+                quantity=rng.randint(1, 5),
+                unit=rng.choice(list(Unit)),
+                category=rng.choice(list(Category)),
+                expiry_date=(
+                    None
+                    if rng.random() < 0.1
+                    else now + timedelta(days=rng.randint(-5, 30))
+                ),
+            )
+            for i in range(items)
+        ]
+    )
+    history_accessor = injector.get(IChatbotHistoryAccessor)
+    for i in range(history):
+        await history_accessor.save_message(
+            ChatMessageSpec(
+                user_id=USER_ID,
+                role=ChatbotMessageRole.USER if i % 2 else ChatbotMessageRole.ASSISTANT,
+                content=("lorem ipsum " * message_chars)[:message_chars],
+                timestamp=now,
+                session_id=SESSION_ID,
+            )
+        )
+
+
+async def measure(call, repeats: int):
+    await call()  # warm-up (fills caches on the new path)
+    cpu = []
+    for _ in range(repeats):
+        start = time.process_time()
+        await call()
+        cpu.append(time.process_time() - start)
+
+    peaks = []
+    tracemalloc.start()
+    for _ in range(min(repeats, 50)):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        await call()
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return statistics.median(cpu), statistics.median(peaks)
+
+
+async def run(args) -> None:
+    from src.core.chatbot.accessors.chatbot_history_accessor import (
+        IChatbotHistoryAccessor,
+    )
+    from src.core.chatbot.constants import ChatbotMessageRole
+    from src.core.chatbot.services.chatbot_service import (
+        RECIPE_JSON_INSTRUCTION,
+        ChatbotService,
+    )
+    from src.core.chatbot.specs import ChatMessageSpec
+    from src.core.pantry.services.pantry_context_service import PantryContextService
+    from src.core.pantry.services.pantry_service import PantryService
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    await seed(args.items, args.history, args.message_chars)
+
+    pantry_service = injector.get(PantryService)
+    context_service = injector.get(PantryContextService)
+    history_accessor = injector.get(IChatbotHistoryAccessor)
+    service = injector.get(ChatbotService)
+    build_recommendation = service._ChatbotService__build_recommendation_messages
+    build_context = service._ChatbotService__build_context_messages
+
+    message = ChatMessageSpec(
+        user_id=USER_ID,
+        role=ChatbotMessageRole.USER,
+        content="Something quick for dinner",
+        timestamp=datetime.now(timezone.utc),
+        session_id=SESSION_ID,
+    )
+
+    # The new prompts must match the old ones apart from the item formatting
+    old = await previous_context_messages(history_accessor, message)
+    assert old == await build_context(message), "history prompts disagree"
+
+    async def recommendation_cache_miss():
+        await context_service.bump_version(USER_ID)
+        return await build_recommendation(message)
+
+    scenarios = (
+        (
+            "recommendation",
+            "previous (sort all items, new system spec)",
+            lambda: previous_recommendation_messages(
+                pantry_service, RECIPE_JSON_INSTRUCTION, message
+            ),
+        ),
+        ("recommendation", "cached context, miss", recommendation_cache_miss),
+        (
+            "recommendation",
+            "cached context, hit",
+            lambda: build_recommendation(message),
+        ),
+        (
+            "chat turn",
+            "previous (domain + dump/validate)",
+            lambda: previous_context_messages(history_accessor, message),
+        ),
+        ("chat turn", "rows to message dicts", lambda: build_context(message)),
+    )
+    rows = []
+    for request, label, call in scenarios:
+        cpu, peak = await measure(call, args.repeats)
+        rows.append((request, label, cpu, peak))
+
+    print(
+        f"\n{args.items} pantry items, {args.history} messages of "
+        f"{args.message_chars} chars (CHATBOT_MAX_CHAT_HISTORY=10), "
+        f"median of {args.repeats} requests\n"
+    )
+    print("| request | implementation | CPU ms | peak KiB |")
+    print("| --- | --- | --- | --- |")
+    for request, label, cpu, peak in rows:
+        print(f"| {request} | {label} | {cpu * 1000:.2f} | {peak / 1024:.1f} |")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--history", type=int, default=20)
+    parser.add_argument("--message-chars", type=int, default=800)
+    parser.add_argument("--repeats", type=int, default=300)
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
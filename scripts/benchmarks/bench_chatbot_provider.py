@@ -0,0 +1,134 @@
+# flake8: noqa: E402
+"""
+Benchmark concurrent ``POST /chatbot/chat`` calls against a local stub LLM server.
+
+Compares the per-call ``Groq`` client run through ``asyncio.to_thread`` (the
+previous ``GroqChatbotProvider`` behaviour, reproduced here as
+``ThreadedGroqChatbotProvider``) with the pooled ``AsyncGroq`` client, and
+reports p50/p99 latency and throughput at each concurrency level.
+
+Usage:
+    python scripts/benchmarks/bench_chatbot_provider.py [--latency 0.05]
+        [--concurrency 50 200 1000]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import (
+    StubLLMServer,
+    configure_environment,
+    prepare_database,
+    print_table,
+    register_and_login,
+    run_concurrent,
+)
+
+
+def build_threaded_provider():
+    """The pre-pooling provider: a new sync Groq client per call on a worker thread."""
+    from groq import Groq
+
+    from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+    from src.core.common.constants import SecretKey
+    from src.core.common.ports.secretkey_provider import ISecretProvider
+    from src.pantrypal_api.modules import injector
+
+    secrets = injector.get(ISecretProvider)
+
+    class ThreadedGroqChatbotProvider(IChatbotProvider):
+        async def handle_single_turn(self, message):
+            return await self.handle_multi_turn([message.to_prompt_message()])
+
+        async def handle_multi_turn(self, messages):
+            return await asyncio.to_thread(self._call, messages)
+
+        def _call(self, formatted: List[Dict[str, str]]) -> str:
+            client = Groq(
+                api_key=secrets.get_secret(SecretKey.GROQ_API_KEY),
+                base_url=secrets.get_secret(SecretKey.GROQ_BASE_URL),
+            )
+            response = client.chat.completions.create(
+                model=secrets.get_secret(SecretKey.CHATBOT_MODEL),
+                messages=formatted,
+                max_tokens=int(secrets.get_secret(SecretKey.CHATBOT_MAX_TOKENS)),
+            )
+            return response.choices[0].message.content
+
+    return ThreadedGroqChatbotProvider()
+
+
+def build_pooled_provider():
+    from src.pantrypal_api.chatbot.adapters.chatbot_provider import (
+        GroqChatbotProvider,
+    )
+    from src.pantrypal_api.modules import injector
+
+    return injector.create_object(GroqChatbotProvider)
+
+
+async def run(args) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from src.app.main import app
+    from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        token = await register_and_login(client, "bench@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def chat(index: int) -> None:
+            response = await client.post(
+                "/chatbot/chat",
+                json={"role": "user", "content": f"What can I cook tonight? #{index}"},
+                headers=headers,
+            )
+            response.raise_for_status()
+
+        results = []
+        for label, factory in (
+            ("threaded per-call client", build_threaded_provider),
+            ("pooled async client", build_pooled_provider),
+        ):
+            for concurrency in args.concurrency:
+                provider = factory()
+                injector.binder.bind(IChatbotProvider, to=provider)
+                # Warm up connections / thread pool before measuring
+                await run_concurrent(label, chat, min(concurrency, 20))
+                results.append(await run_concurrent(label, chat, concurrency))
+                await provider.close()
+
+    print(
+        f"\n/chatbot/chat with stub LLM latency {args.latency * 1000:.0f} ms "
+        f"(each level sends as many requests as its concurrency)\n"
+    )
+    print_table(results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000])
+    args = parser.parse_args()
+
+    with StubLLMServer(latency=args.latency) as server:
+        configure_environment(
+            GROQ_BASE_URL=server.base_url,
+            CHATBOT_MAX_CONNECTIONS="200",
+            CHATBOT_MAX_CONCURRENT_REQUESTS="1000",
+        )
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# flake8: noqa: E402
+"""
+Benchmark time to first token of the streaming chatbot routes.
+
+A fake streaming provider emits ``--tokens`` tokens, waiting ``--first-token``
+seconds before the first and ``--token-delay`` seconds between the rest. For
+each concurrency level the script compares ``POST /chatbot/chat`` (whose first
+byte only arrives once the whole reply is generated) with
+``POST /chatbot/chat/stream`` (first SSE token event), reporting time to first
+token and time to the complete response. The app is served over a real socket
+so that streamed bytes reach the client as they are written.
+
+Usage:
+    python scripts/benchmarks/bench_chatbot_streaming.py [--concurrency 1 50]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import (
+    configure_environment,
+    percentile,
+    prepare_database,
+    register_and_login,
+    serve_in_process,
+)
+
+
+def build_fake_provider(first_token: float, token_delay: float, tokens: int):
+    from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+
+    words = [f"word{i} " for i in range(tokens)]
+
+    class FakeStreamingChatbotProvider(IChatbotProvider):
+        async def handle_single_turn(self, message):
+            return await self.handle_multi_turn([message.to_prompt_message()])
+
+        async def handle_multi_turn(self, messages):
+            await asyncio.sleep(first_token + token_delay * (tokens - 1))
+            return "".join(words)
+
+        async def stream_multi_turn(self, messages):
+            await asyncio.sleep(first_token)
+            for index, word in enumerate(words):
+                if index:
+                    await asyncio.sleep(token_delay)
+                yield word
+
+    return FakeStreamingChatbotProvider()
+
+
+async def run(args) -> None:
+    from httpx import AsyncClient, Limits
+
+    from src.app.main import app
+    from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    injector.binder.bind(
+        IChatbotProvider,
+        to=build_fake_provider(args.first_token, args.token_delay, args.tokens),
+    )
+
+    async with (
+        serve_in_process(app) as base_url,
+        AsyncClient(
+            base_url=base_url, timeout=None, limits=Limits(max_connections=None)
+        ) as client,
+    ):
+        token = await register_and_login(client, "stream@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+        payload = {"role": "user", "content": "What can I cook tonight?"}
+
+        async def measure(path: str, concurrency: int):
+            first_token, complete = [], []
+
+            async def one() -> None:
+                start = time.perf_counter()
+                async with client.stream(
+                    "POST", path, json=payload, headers=headers
+                ) as response:
+                    seen_first = False
+                    async for chunk in response.aiter_text():
+                        if not seen_first and chunk:
+                            first_token.append(time.perf_counter() - start)
+                            seen_first = True
+                complete.append(time.perf_counter() - start)
+
+            await asyncio.gather(*(one() for _ in range(concurrency)))
+            return first_token, complete
+
+        print(
+            f"\nFake provider: first token after {args.first_token * 1000:.0f} ms, "
+            f"{args.tokens} tokens {args.token_delay * 1000:.0f} ms apart\n"
+        )
+        print(
+            "| route | concurrency | TTFT p50 ms | TTFT p99 ms | complete p50 ms "
+            "| complete p99 ms |"
+        )
+        print("| --- | --- | --- | --- | --- | --- |")
+        for concurrency in args.concurrency:
+            for path in ("/chatbot/chat", "/chatbot/chat/stream"):
+                ttft, complete = await measure(path, concurrency)
+                print(
+                    f"| {path} | {concurrency} "
+                    f"| {percentile(ttft, 50) * 1000:.1f} "
+                    f"| {percentile(ttft, 99) * 1000:.1f} "
+                    f"| {percentile(complete, 50) * 1000:.1f} "
+                    f"| {percentile(complete, 99) * 1000:.1f} |"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--first-token", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 50])
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# flake8: noqa: E402
+"""
+Benchmark expiry resolution for synthetic receipts.
+
+Builds receipts of ``--lines`` line items with random pantry categories;
+``--supermarket-share`` of the lines carry one of a few FairPrice or Giant
+barcodes, and each supermarket lookup waits ``--provider-latency``
+seconds to model a network call. Compares the previous per-line loop over
+``ExpiryPredictionService.get_expiry_date`` with one
+``get_expiry_dates`` call, using the real static provider and logger.
+
+Usage:
+    python scripts/benchmarks/bench_expiry_batch.py [--lines 10 100 1000]
+        [--provider-latency 0.02] [--repeats 5]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment
+
+BARCODES = {
+    "FairPrice": ["FPD001", "FPD002", "FPS001", "FPX404"],
+    "Giant": ["GNTM01", "GNTV01", "GNTV02", "GNTX404"],
+}
+
+
+def build_latency_provider(inner, latency: float):
+    from src.core.expiry.ports.supermarket_expiry_provider import (
+        ISupermarketExpiryProvider,
+    )
+
+    class LatencySupermarketProvider(ISupermarketExpiryProvider):
+        async def fetch_expiry_date(self, **kwargs):
+            await asyncio.sleep(latency)
+            return await inner.fetch_expiry_date(**kwargs)
+
+    return LatencySupermarketProvider()
+
+
+def build_receipt(lines: int, supermarket_share: float, seed: int):
+    from src.core.expiry.constants import SupermarketType
+    from src.core.expiry.specs import ExpiryQuerySpec
+    from src.core.pantry.constants import Category
+
+    rng = random.Random(seed)
+    categories = list(Category)
+    purchase_date = date(2025, 6, 1)
+    queries = []
+    for _ in range(lines):
+        query = ExpiryQuerySpec(
+            category=rng.choice(categories), purchase_date=purchase_date
+        )
+        if rng.random() < supermarket_share:
+            supermarket_type = rng.choice(list(SupermarketType))
+            query.supermarket_type = supermarket_type
+            query.lookup = {"barcode": rng.choice(BARCODES[supermarket_type.value])}
+        queries.append(query)
+    return queries
+
+
+async def resolve_per_line(service, queries):
+    """The previous behaviour: one awaited lookup (and log line) per line item."""
+    return [
+        await service.get_expiry_date(
+            category=query.category,
+            purchase_date=query.purchase_date,
+            supermarket_type=query.supermarket_type,
+            **query.lookup,
+        )
+        for query in queries
+    ]
+
+
+async def run(args) -> None:
+    from src.core.expiry.constants import SupermarketType
+    from src.core.expiry.services.expiry_prediction_service import (
+        ExpiryPredictionService,
+    )
+    from src.pantrypal_api.expiry.adapters.fairprice_expiry_provider import (
+        FairPriceExpiryProvider,
+    )
+    from src.pantrypal_api.expiry.adapters.giant_expiry_provider import (
+        GiantExpiryProvider,
+    )
+    from src.pantrypal_api.modules import injector
+
+    service = injector.get(ExpiryPredictionService)
+    service.supermarket_expiry_provider = {
+        SupermarketType.FAIRPRICE: build_latency_provider(
+            FairPriceExpiryProvider(), args.provider_latency
+        ),
+        SupermarketType.GIANT: build_latency_provider(
+            GiantExpiryProvider(), args.provider_latency
+        ),
+    }
+
+    print(
+        f"\n{args.supermarket_share:.0%} of lines hit a supermarket provider "
+        f"({args.provider_latency * 1000:.0f} ms per lookup, at most "
+        f"{service.provider_max_concurrency} concurrent per provider); "
+        f"median of {args.repeats} runs\n"
+    )
+    print("| lines | per-line loop ms | get_expiry_dates ms | speed-up |")
+    print("| --- | --- | --- | --- |")
+    for lines in args.lines:
+        queries = build_receipt(lines, args.supermarket_share, seed=lines)
+        timings = {"loop": [], "bulk": []}
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            expected = await resolve_per_line(service, queries)
+            timings["loop"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            actual = await service.get_expiry_dates(queries)
+            timings["bulk"].append(time.perf_counter() - start)
+            assert actual == expected, "bulk lookup disagrees with per-line lookup"
+
+        loop_ms = statistics.median(timings["loop"]) * 1000
+        bulk_ms = statistics.median(timings["bulk"]) * 1000
+        print(f"| {lines} | {loop_ms:.2f} | {bulk_ms:.2f} | {loop_ms / bulk_ms:.0f}x |")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--supermarket-share", type=float, default=0.3)
+    parser.add_argument("--provider-latency", type=float, default=0.02)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
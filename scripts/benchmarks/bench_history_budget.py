@@ -0,0 +1,186 @@
+# flake8: noqa: E402
+"""
+Measure prompt tokens per contextual chat request as a session grows.
+
+Replays one session of ``--turns`` user/assistant exchanges where users send
+short questions and the assistant answers with long recipe replies of about
+``--reply-chars`` characters. Before every user turn the history part of the
+prompt is built with:
+
+* the previous implementation (reproduced here): the last
+  CHATBOT_MAX_CHAT_HISTORY messages, whatever their size;
+* ``ChatContextService`` with CHATBOT_HISTORY_TOKEN_BUDGET;
+* the same budget with a rolling summary (CHATBOT_HISTORY_SUMMARY_TOKENS); the
+  summariser is a stub returning a fixed-size summary, so only the number of
+  summary calls is reported, not their latency.
+
+Tokens are estimated like the service does (about four characters per token).
+
+Usage:
+    python scripts/benchmarks/bench_history_budget.py [--turns 100]
+        [--reply-chars 2400] [--budget 3000] [--summary-tokens 300]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, prepare_database
+
+USER_ID = 1
+SESSION_ID = 1
+
+
+class BenchSecretProvider:
+    def __init__(self, values):
+        self.values = values
+
+    def get_secret(self, key, default=None):
+        return self.values.get(key.value, default)
+
+
+class StubSummariser:
+    def __init__(self, summary_chars: int):
+        self.summary = ("the user asked for quick vegetarian dinners " * 100)[
+            :summary_chars
+        ]
+        self.calls = 0
+
+    async def handle_multi_turn(self, messages):
+        self.calls += 1
+        return self.summary
+
+
+def prompt_tokens(messages) -> int:
+    from src.core.common.utils import TokenUtil
+
+    return sum(TokenUtil.estimate_tokens(m["content"]) for m in messages)
+
+
+async def previous_context_messages(history_accessor, message):
+    recent = await history_accessor.get_recent_messages(
+        message.user_id, session_id=message.session_id
+    )
+    messages = [{"role": m.role.value, "content": m.content} for m in recent]
+    messages.append(message.to_prompt_message())
+    return messages
+
+
+async def run(args) -> None:
+    from src.core.chatbot.accessors.chatbot_history_accessor import (
+        IChatbotHistoryAccessor,
+    )
+    from src.core.chatbot.constants import ChatbotMessageRole
+    from src.core.chatbot.services.chat_context_service import ChatContextService
+    from src.core.chatbot.specs import ChatMessageSpec
+    from src.core.common.ports.cache_provider import ICacheProvider
+    from src.core.logging.ports.logging_provider import ILoggingProvider
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    history_accessor = injector.get(IChatbotHistoryAccessor)
+    summariser = StubSummariser(args.summary_tokens * 4)
+
+    def context_service(summary_tokens: int) -> ChatContextService:
+        return ChatContextService(
+            history_accessor,
+            summariser,
+            injector.get(ICacheProvider),
+            BenchSecretProvider(
+                {
+                    "CHATBOT_HISTORY_TOKEN_BUDGET": str(args.budget),
+                    "CHATBOT_HISTORY_SUMMARY_TOKENS": str(summary_tokens),
+                }
+            ),
+            injector.get(ILoggingProvider),
+        )
+
+    budgeted = context_service(0)
+    summarised = context_service(args.summary_tokens)
+    scenarios = (
+        (
+            "previous (last 10 messages)",
+            lambda m: previous_context_messages(history_accessor, m),
+        ),
+        (f"token budget {args.budget}", budgeted.build_messages),
+        (
+            f"budget + {args.summary_tokens}-token summary",
+            summarised.build_messages,
+        ),
+    )
+    tokens = {label: [] for label, _ in scenarios}
+    messages_sent = {label: [] for label, _ in scenarios}
+    cpu = {label: [] for label, _ in scenarios}
+
+    rng = random.Random(10)
+
+    def spec(role, content):
+        return ChatMessageSpec(
+            user_id=USER_ID,
+            role=role,
+            content=content,
+            timestamp=datetime.now(timezone.utc),
+            session_id=SESSION_ID,
+        )
+
+    for turn in range(args.turns):
+        question = spec(
+            ChatbotMessageRole.USER,
+            f"Turn {turn}: what can I cook with " + "rice, " * rng.randint(5, 15),
+        )
+        for label, build in scenarios:
+            start = time.process_time()
+            messages = await build(question)
+            cpu[label].append(time.process_time() - start)
+            tokens[label].append(prompt_tokens(messages))
+            messages_sent[label].append(len(messages))
+
+        reply_chars = int(args.reply_chars * rng.uniform(0.5, 1.5))
+        await history_accessor.save_message(question)
+        await history_accessor.save_message(
+            spec(
+                ChatbotMessageRole.ASSISTANT,
+                ("Step: chop, stir and simmer. " * 200)[:reply_chars],
+            )
+        )
+
+    print(
+        f"\n{args.turns} turns, assistant replies of ~{args.reply_chars} chars, "
+        f"CHATBOT_MAX_CHAT_HISTORY=10, {summariser.calls} summary calls\n"
+    )
+    print(
+        "| history | mean prompt tokens | p95 prompt tokens | max prompt tokens "
+        "| mean messages | CPU ms |"
+    )
+    print("| --- | --- | --- | --- | --- | --- |")
+    for label, _ in scenarios:
+        values = sorted(tokens[label])
+        p95 = values[int(len(values) * 0.95) - 1]
+        print(
+            f"| {label} | {statistics.mean(values):.0f} | {p95} | {values[-1]} "
+            f"| {statistics.mean(messages_sent[label]):.1f} "
+            f"| {statistics.median(cpu[label]) * 1000:.2f} |"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--reply-chars", type=int, default=2400)
+    parser.add_argument("--budget", type=int, default=3000)
+    parser.add_argument("--summary-tokens", type=int, default=300)
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# flake8: noqa: E402
+"""
+Benchmark receipt classification with and without the item classification cache.
+
+Replays a corpus of receipt webhook payloads through
+``ReceiptService.process_receipt_webhook`` twice: once with every line sent to
+the LLM (the previous behaviour) and once with the item cache, which only sends
+lines it has not classified before. The corpus is either a directory of receipt
+JSON files (``--corpus``) or a synthetic one: ``--receipts`` receipts of 8-25
+lines drawn from a catalogue of ``--catalogue`` Singapore supermarket products
+with Zipf-like popularity.
+
+The LLM is an in-process stub that answers after ``--latency`` seconds plus
+``--ms-per-item`` per classified line. Reports LLM prompt and completion tokens
+(estimated at four characters per token), processing latency and LLM cost per
+receipt at the given per-million-token prices.
+
+Usage:
+    python scripts/benchmarks/bench_item_cache.py [--receipts 200]
+        [--catalogue 400] [--corpus DIR] [--latency 0.3] [--ms-per-item 20]
+        [--input-price 0.59] [--output-price 0.79]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, percentile, prepare_database
+
+BRANDS = ["MARIGOLD", "MEIJI", "FAIRPRICE", "GARDENIA", "AYAM BRAND", "PRIMA", "F&N"]
+PRODUCTS = [
+    ("HL MILK 1L", "Fresh Milk"),
+    ("LOW FAT MILK 2L", "Fresh Milk"),
+    ("GREEK YOGHURT 500G", "Yoghurt"),
+    ("CHEDDAR SLICES 250G", "Cheese"),
+    ("WHITE BREAD 600G", "Breads"),
+    ("WHOLEMEAL LOAF 400G", "Breads"),
+    ("SARDINES 155G", "Canned Food"),
+    ("TUNA CHUNKS 150G", "Canned Food"),
+    ("JASMINE RICE 5KG", "Rice"),
+    ("INSTANT NOODLES 5S", "Noodles"),
+    ("FRESH EGGS 10S", "Eggs"),
+    ("CHICKEN BREAST 500G", "Chicken"),
+    ("PORK COLLAR 300G", "Pork"),
+    ("BANANAS 1KG", "Fruits"),
+    ("XIAO BAI CAI 200G", "Vegetables"),
+    ("ORANGE JUICE 1L", "Juices"),
+    ("MINERAL WATER 1.5L", "Water"),
+    ("KAYA SPREAD 250G", "Jams, Spreads & Honey"),
+    ("DISHWASHING LIQUID 800ML", None),
+    ("TISSUE BOX 4S", None),
+]
+
+
+def synthetic_corpus(receipts: int, catalogue: int, seed: int = 7):
+    rng = random.Random(seed)
+    skus = [
+        (f"{brand} {product}", subcategory)
+        for brand in BRANDS
+        for product, subcategory in PRODUCTS
+    ]
+    while len(skus) < catalogue:
+        skus.append((f"HOUSE BRAND ITEM {len(skus):04d}", "Snacks"))
+    skus = skus[:catalogue]
+    rng.shuffle(skus)
+    weights = [1 / (rank + 1) for rank in range(len(skus))]
+    corpus = []
+    for _ in range(receipts):
+        lines = rng.choices(skus, weights=weights, k=rng.randint(8, 25))
+        corpus.append(
+            {
+                "Date": "01/06/2025",
+                "Items": [{"ITEM": name, "QUANTITY": 1} for name, _ in lines],
+            }
+        )
+    return corpus, dict(skus)
+
+
+def load_corpus(directory: Path):
+    return [json.loads(path.read_text()) for path in sorted(directory.glob("*.json"))]
+
+
+class StubClassifier:
+    """Classifies the numbered lines of a receipt prompt after a simulated delay."""
+
+    def __init__(self, subcategories, latency: float, seconds_per_item: float):
+        self.subcategories = subcategories
+        self.latency = latency
+        self.seconds_per_item = seconds_per_item
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    async def handle_single_turn(self, message):
+        from src.core.common.utils import TokenUtil
+
+        names = re.findall(r"^\d+\. (.*)$", message.content, re.MULTILINE)
+        reply = json.dumps(
+            [
+                {
+                    "ITEM": name.title(),
+                    "CATEGORY": "Food" if self.subcategories.get(name) else "Non-Food",
+                    "SUBCATEGORY": self.subcategories.get(name),
+                    "QUANTITY": 1,
+                }
+                for name in names
+            ]
+        )
+        self.calls += 1
+        self.prompt_tokens += TokenUtil.estimate_tokens(message.content)
+        self.completion_tokens += TokenUtil.estimate_tokens(reply)
+        await asyncio.sleep(self.latency + self.seconds_per_item * len(names))
+        return reply
+
+
+async def run(args, corpus, subcategories) -> None:
+    from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+    from src.core.receipt.services.receipt_item_cache_service import (
+        ReceiptItemCacheService,
+    )
+    from src.core.receipt.services.receipt_service import ReceiptService
+    from src.pantrypal_api.modules import injector
+
+    class NoItemCache(ReceiptItemCacheService):
+        """The previous behaviour: every line goes to the LLM."""
+
+        async def get_many(self, normalized_names):
+            return {}
+
+        async def add_many(self, classifications):
+            pass
+
+    await prepare_database()
+    stub = StubClassifier(subcategories, args.latency, args.ms_per_item / 1000)
+    injector.binder.bind(IChatbotProvider, to=stub)
+
+    rows = []
+    for label, cache_service in (
+        ("every line to LLM", injector.create_object(NoItemCache)),
+        ("item cache", injector.get(ReceiptItemCacheService)),
+    ):
+        service = injector.create_object(
+            ReceiptService, additional_kwargs={"item_cache_service": cache_service}
+        )
+        stub.reset()
+        latencies = []
+        for user_id, receipt in enumerate(corpus, start=1):
+            start = time.perf_counter()
+            await service.process_receipt_webhook(user_id, receipt)
+            latencies.append(time.perf_counter() - start)
+        cost = (
+            stub.prompt_tokens * args.input_price
+            + stub.completion_tokens * args.output_price
+        ) / 1e6
+        usage = (stub.calls, stub.prompt_tokens, stub.completion_tokens)
+        rows.append((label, usage, latencies, cost, cache_service.stats()))
+
+    lines = sum(len(receipt["Items"]) for receipt in corpus)
+    print(
+        f"\n{len(corpus)} receipts, {lines} lines, LLM stub "
+        f"{args.latency * 1000:.0f} ms + {args.ms_per_item:.0f} ms/line\n"
+    )
+    print(
+        "| classification | LLM calls | prompt tok/receipt | completion tok/receipt "
+        "| p50 ms | p99 ms | mean ms | USD per 1k receipts | line hit rate |"
+    )
+    print("| --- | --- | --- | --- | --- | --- | --- | --- | --- |")
+    for label, usage, latencies, cost, stats in rows:
+        calls, prompt_tokens, completion_tokens = usage
+        print(
+            f"| {label} | {calls} | {prompt_tokens / len(corpus):.0f} "
+            f"| {completion_tokens / len(corpus):.0f} "
+            f"| {percentile(latencies, 50) * 1000:.1f} "
+            f"| {percentile(latencies, 99) * 1000:.1f} "
+            f"| {statistics.fmean(latencies) * 1000:.1f} "
+            f"| {cost / len(corpus) * 1000:.3f} | {stats['hit_rate']:.2f} |"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--receipts", type=int, default=200)
+    parser.add_argument("--catalogue", type=int, default=400)
+    parser.add_argument("--corpus", type=Path)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--ms-per-item", type=float, default=20)
+    parser.add_argument("--input-price", type=float, default=0.59)
+    parser.add_argument("--output-price", type=float, default=0.79)
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus, subcategories = load_corpus(args.corpus), {}
+    else:
+        corpus, subcategories = synthetic_corpus(args.receipts, args.catalogue)
+
+    configure_environment()
+    asyncio.run(run(args, corpus, subcategories))
+
+
+if __name__ == "__main__":
+    main()
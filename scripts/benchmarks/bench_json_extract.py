@@ -0,0 +1,166 @@
+# flake8: noqa: E402
+"""
+Benchmark JSON extraction from LLM replies: previous receipt parser vs JsonExtractUtil.
+
+Builds a seeded, fuzz-style corpus of receipt classification replies for each
+size in ``--items``:
+
+* clean: the bare JSON array;
+* fenced: the array in a ```json block between prose;
+* python: single quotes and ``None`` (read with ``ast.literal_eval``);
+* truncated: cut off at a random point, so only finished objects are usable;
+* noisy: prose full of brackets (``[1]``, ``{note}``) around the array;
+* garbage: random printable noise with brackets and quotes and no JSON.
+
+Each reply is parsed ``--repeats`` times with the previous
+``ReceiptService._extract_json`` + ``json.loads`` (reproduced here) and with
+``ReceiptService._extract_classification``. Reports replies per second, MB/s
+and how many replies gave a list.
+
+Usage:
+    python scripts/benchmarks/bench_json_extract.py [--items 20 200 2000]
+        [--replies 50] [--repeats 5]
+"""
+
+import argparse
+import json
+import random
+import re
+import string
+import sys
+import time
+from ast import literal_eval
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+import harness  # noqa: F401  (puts the repository root on the path)
+
+
+def previous_safe_load_json(candidate):
+    for parser in (json.loads, literal_eval):
+        try:
+            return parser(candidate)
+        except Exception:
+            continue
+    return None
+
+
+def previous_extract(text):
+    """The previous ``_extract_json`` followed by the caller's ``json.loads``."""
+    blocks = re.findall(r"```(?:json)?\s*([\s\S]+?)\s*```", text)
+    if not blocks:
+        blocks = [text]
+    for block in blocks:
+        block = block.strip()
+        if not block:
+            continue
+        match = re.search(r"\[\s*{.*?}\s*\]", block, re.DOTALL)
+        if match:
+            parsed = previous_safe_load_json(match.group(0))
+            if isinstance(parsed, list):
+                return json.loads(json.dumps(parsed))
+        parsed = previous_safe_load_json(block)
+        if isinstance(parsed, (list, dict)):
+            return json.loads(json.dumps(parsed))
+        item_strs = re.findall(r"\{[^{}]*\}", block)
+        parsed_items = [previous_safe_load_json(s) for s in item_strs]
+        parsed_items = [p for p in parsed_items if isinstance(p, dict)]
+        if parsed_items:
+            return json.loads(json.dumps(parsed_items))
+    raise ValueError("No valid JSON list found in response")
+
+
+def build_corpus(items: int, replies: int, rng: random.Random):
+    def answers():
+        return [
+            {
+                "ITEM": f"{rng.choice(['MARIGOLD', 'MEIJI', 'PRIMA'])} ITEM {i} 1L",
+                "CATEGORY": rng.choice(["Food", "Non-Food"]),
+                "SUBCATEGORY": rng.choice(["Fresh Milk", "Snacks", None]),
+                "QUANTITY": rng.randint(1, 3),
+            }
+            for i in range(items)
+        ]
+
+    def noise(length):
+        alphabet = string.ascii_letters + " .,:;[]{}'\"\n"
+        return "".join(rng.choice(alphabet) for _ in range(length))
+
+    corpus = {
+        "clean": [],
+        "fenced": [],
+        "python": [],
+        "truncated": [],
+        "noisy": [],
+        "garbage": [],
+    }
+    for _ in range(replies):
+        data = json.dumps(answers())
+        corpus["clean"].append(data)
+        corpus["fenced"].append(f"Here you go:\n```json\n{data}\n```\nEnjoy!")
+        corpus["python"].append(repr(answers()))
+        corpus["truncated"].append(data[: rng.randint(len(data) // 2, len(data) - 2)])
+        corpus["noisy"].append("See [1] and {note} (ref [2]): " + data + " [end] {fin}")
+        corpus["garbage"].append(noise(len(data)))
+    return corpus
+
+
+def measure(parse, replies, repeats):
+    parsed = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for reply in replies:
+            try:
+                value = parse(reply)
+            except ValueError:
+                continue
+            parsed += isinstance(value, list)
+    elapsed = time.perf_counter() - start
+    return elapsed, parsed // repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, nargs="+", default=[20, 200, 2000])
+    parser.add_argument("--replies", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    from unittest.mock import MagicMock
+
+    from src.core.receipt.services.receipt_service import ReceiptService
+
+    service = ReceiptService(
+        pantry_service=MagicMock(),
+        chatbot_provider=MagicMock(),
+        logging_provider=MagicMock(),
+        expiry_service=MagicMock(),
+        item_cache_service=MagicMock(),
+        secret_provider=MagicMock(get_secret=lambda key, default=None: default),
+    )
+    parsers = [
+        ("previous", previous_extract),
+        ("JsonExtractUtil", service._extract_classification),
+    ]
+
+    rng = random.Random(3)
+    print("\n| items | reply | parser | avg KB | replies/s | MB/s | parsed as list |")
+    print("| --- | --- | --- | --- | --- | --- | --- |")
+    for items in args.items:
+        corpus = build_corpus(items, args.replies, rng)
+        for kind, replies in corpus.items():
+            size = sum(len(r) for r in replies)
+            for label, parse in parsers:
+                elapsed, parsed = measure(parse, replies, args.repeats)
+                count = len(replies) * args.repeats
+                print(
+                    f"| {items} | {kind} | {label} | {size / len(replies) / 1024:.1f} "
+                    f"| {count / elapsed:,.0f} "
+                    f"| {size * args.repeats / elapsed / 1e6:.1f} "
+                    f"| {parsed}/{len(replies)} |"
+                )
+
+
+if __name__ == "__main__":
+    main()
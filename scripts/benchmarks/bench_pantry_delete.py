@@ -0,0 +1,152 @@
+# flake8: noqa: E402
+"""
+Benchmark deleting ``--ids`` pantry items at once.
+
+Compares the previous ``PantryService.delete_items`` (load every targeted item
+with ``get_items_by_ids`` to check ownership, then DELETE in a second session,
+reproduced here) with the single-statement ``PantryItemAccessor.delete_items``,
+as a hard delete and as a soft delete (``deleted_at``). Each call deletes a
+fresh set of items; a second table times calls that are rejected because one
+id belongs to another user.
+
+Reports the median time per call over ``--repeats`` calls and the SQL
+statements and sessions each call used.
+
+Usage:
+    python scripts/benchmarks/bench_pantry_delete.py [--ids 1000] [--repeats 10]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, prepare_database
+
+
+async def previous_delete_items(db_provider, accessor, item_ids, user_id) -> bool:
+    from sqlalchemy import delete
+
+    from src.pantrypal_api.pantry.models import PantryItem
+
+    existing_items = await accessor.get_items_by_ids(item_ids, user_id)
+    if len(existing_items) != len(item_ids):
+        return False
+    async with db_provider.get_db() as db:
+        await db.execute(
+            delete(PantryItem).where(
+                PantryItem.id.in_(item_ids), PantryItem.user_id == user_id
+            )
+        )
+        await db.commit()
+    return True
+
+
+async def run(args) -> None:
+    from sqlalchemy import event
+
+    from src.core.pantry.accessors.pantry_item_accessor import IPantryItemAccessor
+    from src.core.pantry.constants import Category, Unit
+    from src.core.pantry.models import PantryItemDomain
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    db_provider = injector.get(IDatabaseProvider)
+    accessor = injector.get(IPantryItemAccessor)
+    counts = {"statements": 0, "sessions": 0}
+    engine = db_provider.engine.sync_engine
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda *_: counts.__setitem__("statements", counts["statements"] + 1),
+    )
+    event.listen(
+        engine,
+        "checkout",
+        lambda *_: counts.__setitem__("sessions", counts["sessions"] + 1),
+    )
+
+    async def seed(user_id: int, count: int):
+        added = await accessor.add_items(
+            [
+                PantryItemDomain.create(
+                    user_id=user_id,
+                    item_name=f"Item {i}",
+                    quantity=1,
+                    unit=Unit.PIECES,
+                    category=Category.OTHER,
+                )
+                for i in range(count)
+            ]
+        )
+        return [item.id for item in added]
+
+    implementations = (
+        (
+            "select, then delete",
+            lambda ids, user_id: previous_delete_items(
+                db_provider, accessor, ids, user_id
+            ),
+        ),
+        (
+            "DELETE ... RETURNING",
+            lambda ids, user_id: accessor.delete_items(ids, user_id),
+        ),
+        (
+            "soft delete (UPDATE ... RETURNING)",
+            lambda ids, user_id: accessor.delete_items(ids, user_id, soft=True),
+        ),
+    )
+    [foreign_id] = await seed(user_id=2, count=1)
+
+    results = {}
+    for case in ("deleted", "rejected"):
+        for label, delete_items in implementations:
+            timings, statements, sessions = [], [], []
+            for round_ in range(args.repeats + 1):
+                item_ids = await seed(user_id=1, count=args.ids)
+                if case == "rejected":
+                    item_ids[-1] = foreign_id
+                counts.update(statements=0, sessions=0)
+                start = time.perf_counter()
+                await delete_items(item_ids, 1)
+                if round_:  # the first round warms up
+                    timings.append(time.perf_counter() - start)
+                    statements.append(counts["statements"])
+                    sessions.append(counts["sessions"])
+            results.setdefault(case, []).append(
+                (
+                    label,
+                    statistics.median(timings),
+                    statistics.median(statements),
+                    statistics.median(sessions),
+                )
+            )
+
+    for case, rows in results.items():
+        print(f"\n{args.ids} ids per call, {case}, median of {args.repeats} calls\n")
+        print("| implementation | ms per call | SQL statements | sessions |")
+        print("| --- | --- | --- | --- |")
+        for label, median, statements, sessions in rows:
+            print(f"| {label} | {median * 1000:.1f} | {statements:g} | {sessions:g} |")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ids", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+# flake8: noqa: E402
+"""
+Benchmark ``GET /pantry/list`` as a user's pantry grows.
+
+For each ``--sizes`` value a fresh user gets that many pantry items (10% without
+an expiry date), then four ways of listing them are timed:
+
+* the previous implementation (reproduced here and mounted on the app as
+  ``/bench/legacy-list``): load every ORM row, hydrate ``PantryItemDomain`` and
+  ``PantryItemResponse`` objects, and let FastAPI validate and serialise them
+  against ``response_model``;
+* the new endpoint without parameters (every item, plain rows);
+* the new endpoint with ``fields=item_name,quantity,expiry_date``;
+* the first keyset page with ``limit=--page-size``.
+
+"DB ms" is the accessor call, "serialise ms" turns its result into the response
+body, and "HTTP p50 ms" is the full request through the ASGI app.
+
+Usage:
+    python scripts/benchmarks/bench_pantry_list.py [--sizes 100 1000 10000 100000]
+        [--page-size 50] [--repeats 5]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, prepare_database, register_and_login
+
+PROJECTED_FIELDS = "item_name,quantity,expiry_date"
+
+
+def mount_legacy_route(app) -> None:
+    """The pre-pagination handler: domains -> response models -> response_model."""
+    from fastapi import Depends
+
+    from src.core.pantry.services.pantry_service import PantryService
+    from src.pantrypal_api.account.dependencies import get_current_user
+    from src.pantrypal_api.modules import injector
+    from src.pantrypal_api.pantry.schemas.pantry_schemas import PantryItemResponse
+
+    async def legacy_list(current_user_id: int = Depends(get_current_user)):
+        items = await injector.get(PantryService).get_items(current_user_id)
+        return [item.to_schema() for item in items]
+
+    app.add_api_route(
+        "/bench/legacy-list",
+        legacy_list,
+        methods=["GET"],
+        response_model=List[PantryItemResponse],
+    )
+
+
+async def seed(user_id: int, items: int) -> None:
+    from src.core.pantry.accessors.pantry_item_accessor import IPantryItemAccessor
+    from src.core.pantry.constants import Category, Unit
+    from src.core.pantry.models import PantryItemDomain
+    from src.pantrypal_api.modules import injector
+
+    accessor = injector.get(IPantryItemAccessor)
+    rng = random.Random(items)
+    now = datetime.now(timezone.utc)
+    for start in range(0, items, 1000):
+        await accessor.add_items(
+            [
+                PantryItemDomain.create(
+                    user_id=user_id,
+                    item_name=f"Item {i}",
+                    quantity=rng.randint(1, 5),
+                    unit=Unit.PIECES,
+                    category=rng.choice(list(Category)),
+                    purchase_date=now,
+                    expiry_date=(
+                        None
+                        if rng.random() < 0.1
+                        else now + timedelta(minutes=rng.randint(-30 * 1440, 60 * 1440))
+                    ),
+                )
+                for i in range(start, min(start + 1000, items))
+            ]
+        )
+
+
+def legacy_serialise(items) -> bytes:
+    """What FastAPI's response_model path does with the old handler's result."""
+    from pydantic import TypeAdapter
+
+    from src.pantrypal_api.pantry.schemas.pantry_schemas import PantryItemResponse
+
+    adapter = TypeAdapter(List[PantryItemResponse])
+    validated = adapter.validate_python(
+        [item.to_schema() for item in items], from_attributes=True
+    )
+    return json.dumps(
+        adapter.dump_python(validated, mode="json"), separators=(",", ":")
+    ).encode()
+
+
+async def measure_layers(user_id: int, page_size: int, repeats: int):
+    """DB and serialisation time for each scenario, outside of HTTP."""
+    from src.core.pantry.accessors.pantry_item_accessor import IPantryItemAccessor
+    from src.core.pantry.models import PantryItemPageDomain
+    from src.core.pantry.specs import ListPantryItemsSpec
+    from src.pantrypal_api.modules import injector
+
+    accessor = injector.get(IPantryItemAccessor)
+
+    async def legacy():
+        start = time.perf_counter()
+        items = await accessor.get_items_by_user(user_id)
+        db_done = time.perf_counter()
+        body = legacy_serialise(items)
+        return db_done - start, time.perf_counter() - db_done, body
+
+    def paged(spec: ListPantryItemsSpec):
+        async def call():
+            start = time.perf_counter()
+            rows = await accessor.get_items_page(user_id, spec)
+            db_done = time.perf_counter()
+            page = PantryItemPageDomain.model_construct(items=rows, next_cursor=None)
+            body = page.to_schema().items_json()
+            return db_done - start, time.perf_counter() - db_done, body
+
+        return call
+
+    scenarios = {
+        "previous (ORM + response_model)": legacy,
+        "rows, all fields": paged(ListPantryItemsSpec()),
+        f"rows, fields={PROJECTED_FIELDS}": paged(
+            ListPantryItemsSpec(fields=PROJECTED_FIELDS.split(","))
+        ),
+        f"rows, limit={page_size}": paged(ListPantryItemsSpec(limit=page_size + 1)),
+    }
+    results = {}
+    for label, call in scenarios.items():
+        await call()  # warm-up
+        db_times, serialise_times = [], []
+        for _ in range(repeats):
+            db_time, serialise_time, body = await call()
+            db_times.append(db_time)
+            serialise_times.append(serialise_time)
+        results[label] = (
+            statistics.median(db_times),
+            statistics.median(serialise_times),
+            len(body),
+        )
+    return results
+
+
+async def measure_http(client, headers, page_size: int, repeats: int):
+    requests = {
+        "previous (ORM + response_model)": ("/bench/legacy-list", {}),
+        "rows, all fields": ("/pantry/list", {}),
+        f"rows, fields={PROJECTED_FIELDS}": (
+            "/pantry/list",
+            {"fields": PROJECTED_FIELDS},
+        ),
+        f"rows, limit={page_size}": ("/pantry/list", {"limit": page_size}),
+    }
+    results, bodies = {}, {}
+    for label, (path, params) in requests.items():
+        timings = []
+        for _ in range(repeats + 1):
+            start = time.perf_counter()
+            response = await client.get(path, params=params, headers=headers)
+            response.raise_for_status()
+            timings.append(time.perf_counter() - start)
+        results[label] = statistics.median(timings[1:])
+        bodies[label] = response.json()
+    return results, bodies
+
+
+async def run(args) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from src.app.main import app
+    from src.core.account.accessors.user_account_accessor import (
+        IUserAccountAccessor,
+    )
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    mount_legacy_route(app)
+
+    rows = []
+    transport = ASGITransport(app=app)
+    async with AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        for size in args.sizes:
+            email = f"list{size}@example.com"
+            token = await register_and_login(client, email)
+            user = await injector.get(IUserAccountAccessor).get_by_email(email)
+            await seed(user.id, size)
+
+            layers = await measure_layers(user.id, args.page_size, args.repeats)
+            http, bodies = await measure_http(
+                client,
+                {"Authorization": f"Bearer {token}"},
+                args.page_size,
+                args.repeats,
+            )
+            legacy = bodies["previous (ORM + response_model)"]
+            full = bodies["rows, all fields"]
+            assert len(full) == len(legacy) == size
+            assert sorted(full, key=lambda item: item["id"]) == sorted(
+                legacy, key=lambda item: item["id"]
+            ), "new rows disagree with the previous response"
+            for label, (db_time, serialise_time, size_bytes) in layers.items():
+                rows.append(
+                    (size, label, size_bytes, db_time, serialise_time, http[label])
+                )
+
+    print(f"\nmedian of {args.repeats} calls per scenario\n")
+    print("| items | scenario | body KiB | DB ms | serialise ms | HTTP p50 ms |")
+    print("| --- | --- | --- | --- | --- | --- |")
+    for size, label, size_bytes, db_time, serialise_time, http_time in rows:
+        print(
+            f"| {size} | {label} | {size_bytes / 1024:.1f} | {db_time * 1000:.1f} "
+            f"| {serialise_time * 1000:.1f} | {http_time * 1000:.1f} |"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000]
+    )
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# flake8: noqa: E402
+"""
+Benchmark the pantry dashboard queries at ``--items`` items per user.
+
+Seeds ``--users`` users with ``--items`` pantry items each (expiry dates spread
+from 30 days ago to 60 days ahead, 10% without one), then times
+``PantryService.get_pantry_stats`` and ``get_expiring_items`` for one user:
+
+* the previous implementation (reproduced here), which loads and hydrates every
+  row and counts/sorts in Python;
+* the SQL aggregate / ORDER BY ... LIMIT queries without the composite index;
+* the same queries with the ``(user_id, expiry_date)`` index.
+
+Usage:
+    python scripts/benchmarks/bench_pantry_stats.py [--items 10000] [--users 5]
+        [--repeats 50]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, percentile, prepare_database
+
+
+async def previous_pantry_stats(service, user_id: int):
+    from src.core.pantry.models import PantryStatsDomain
+
+    items = await service.get_items(user_id)
+    today = datetime.now(timezone.utc).date()
+    soon_threshold = today + timedelta(days=7)
+    expired = expiring_today = expiring_soon = 0
+    for item in items:
+        if not item.expiry_date:
+            continue
+        expiry_date = item.expiry_date.date()
+        if expiry_date < today:
+            expired += 1
+        elif expiry_date == today:
+            expiring_today += 1
+        elif today < expiry_date <= soon_threshold:
+            expiring_soon += 1
+    return PantryStatsDomain(
+        total_items=len(items),
+        expiring_soon=expiring_soon,
+        expiring_today=expiring_today,
+        expired=expired,
+    )
+
+
+async def previous_expiring_items(service, user_id: int):
+    items = await service.get_items(user_id)
+    threshold = datetime.now(timezone.utc) + timedelta(days=7)
+    expiring = []
+    for item in items:
+        if not item.expiry_date:
+            continue
+        expiry = (
+            item.expiry_date
+            if item.expiry_date.tzinfo
+            else item.expiry_date.replace(tzinfo=timezone.utc)
+        )
+        if expiry <= threshold:
+            item.expiry_date = expiry
+            expiring.append(item)
+    return sorted(expiring, key=lambda item: item.expiry_date)[:3]
+
+
+async def seed(users: int, items: int) -> None:
+    from src.core.pantry.accessors.pantry_item_accessor import IPantryItemAccessor
+    from src.core.pantry.constants import Category, Unit
+    from src.core.pantry.models import PantryItemDomain
+    from src.pantrypal_api.modules import injector
+
+    accessor = injector.get(IPantryItemAccessor)
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    for user_id in range(1, users + 1):
+        batch = [
+            PantryItemDomain.create(
+                user_id=user_id,
+                item_name=f"Item {i}",
+                quantity=1,
+                unit=Unit.PIECES,
+                category=rng.choice(list(Category)),
+                expiry_date=(
+                    None
+                    if rng.random() < 0.1
+                    else now + timedelta(minutes=rng.randint(-30 * 1440, 60 * 1440))
+                ),
+            )
+            for i in range(items)
+        ]
+        for start in range(0, items, 1000):
+            await accessor.add_items(batch[start : start + 1000])
+
+
+async def time_calls(call, repeats: int):
+    await call()  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = await call()
+        timings.append(time.perf_counter() - start)
+    return result, timings
+
+
+async def run(args) -> None:
+    from src.core.pantry.services.pantry_service import PantryService
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    await seed(args.users, args.items)
+    service = injector.get(PantryService)
+    engine = injector.get(IDatabaseProvider).engine
+    user_id = 1
+
+    rows = []
+    scenarios = (
+        (
+            "load all rows + Python",
+            lambda: previous_pantry_stats(service, user_id),
+            lambda: previous_expiring_items(service, user_id),
+            True,
+        ),
+        (
+            "SQL, ix_pantry_item_user_id only",
+            lambda: service.get_pantry_stats(user_id),
+            lambda: service.get_expiring_items(user_id),
+            False,
+        ),
+        (
+            "SQL, (user_id, expiry_date) index",
+            lambda: service.get_pantry_stats(user_id),
+            lambda: service.get_expiring_items(user_id),
+            True,
+        ),
+    )
+    baseline = {}
+    for label, stats_call, expiring_call, with_index in scenarios:
+        async with engine.begin() as conn:
+            if with_index:
+                await conn.exec_driver_sql(
+                    "CREATE INDEX IF NOT EXISTS ix_pantry_item_user_id_expiry_date "
+                    "ON pantry_item (user_id, expiry_date) WHERE deleted_at IS NULL"
+                )
+            else:
+                await conn.exec_driver_sql(
+                    "DROP INDEX IF EXISTS ix_pantry_item_user_id_expiry_date"
+                )
+            await conn.exec_driver_sql("ANALYZE")
+
+        stats, stats_timings = await time_calls(stats_call, args.repeats)
+        expiring, expiring_timings = await time_calls(expiring_call, args.repeats)
+        result = (stats, [item.id for item in expiring])
+        baseline.setdefault("result", result)
+        assert result == baseline["result"], f"{label} disagrees with the baseline"
+        rows.append((label, stats_timings, expiring_timings))
+
+    print(
+        f"\n{args.items} items per user, {args.users} users, "
+        f"{args.repeats} calls per query\n"
+    )
+    print(
+        "| implementation | stats p50 ms | stats p99 ms "
+        "| expiring p50 ms | expiring p99 ms |"
+    )
+    print("| --- | --- | --- | --- | --- |")
+    for label, stats_timings, expiring_timings in rows:
+        print(
+            f"| {label} | {statistics.median(stats_timings) * 1000:.2f} "
+            f"| {percentile(stats_timings, 99) * 1000:.2f} "
+            f"| {statistics.median(expiring_timings) * 1000:.2f} "
+            f"| {percentile(expiring_timings, 99) * 1000:.2f} |"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
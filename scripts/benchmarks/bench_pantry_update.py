@@ -0,0 +1,125 @@
+# flake8: noqa: E402
+"""
+Benchmark per-item cost of ``PATCH /pantry/update`` vs ``/pantry/update-batch``.
+
+For each ``--batch-sizes`` value N, updates the quantity of N pantry items:
+
+* one ``PATCH /pantry/update`` per item, as clients do today (e.g. 10 to 20
+  calls when a recipe is cooked);
+* a single ``PATCH /pantry/update-batch`` carrying all N updates.
+
+Requests go through the whole app in-process, so the numbers include auth,
+validation and serialisation. Reports the median time per item over
+``--repeats`` rounds and the SQL statements sent per item.
+
+Usage:
+    python scripts/benchmarks/bench_pantry_update.py
+        [--batch-sizes 1 10 20 100 500] [--repeats 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, prepare_database, register_and_login
+
+
+async def run(args) -> None:
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import event
+
+    from src.app.main import app
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    statements = [0]
+    event.listen(
+        injector.get(IDatabaseProvider).engine.sync_engine,
+        "before_cursor_execute",
+        lambda *_: statements.__setitem__(0, statements[0] + 1),
+    )
+
+    rows = []
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        token = await register_and_login(client, "cook@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+        response = await client.post(
+            "/pantry/add",
+            json=[
+                {
+                    "item_name": f"Item {i}",
+                    "quantity": 100,
+                    "unit": "grams",
+                    "category": "Staples",
+                }
+                for i in range(max(args.batch_sizes))
+            ],
+            headers=headers,
+        )
+        response.raise_for_status()
+        item_ids = [item["id"] for item in response.json()]
+
+        async def one_by_one(updates):
+            for update in updates:
+                response = await client.patch(
+                    "/pantry/update", json=update, headers=headers
+                )
+                response.raise_for_status()
+
+        async def batched(updates):
+            response = await client.patch(
+                "/pantry/update-batch", json=updates, headers=headers
+            )
+            response.raise_for_status()
+
+        for size in args.batch_sizes:
+            for label, apply in (
+                ("one PATCH per item", one_by_one),
+                ("update-batch", batched),
+            ):
+                timings, sql = [], []
+                for round_ in range(args.repeats + 1):
+                    updates = [
+                        {"item_id": item_id, "quantity": 100 - round_}
+                        for item_id in item_ids[:size]
+                    ]
+                    statements[0] = 0
+                    start = time.perf_counter()
+                    await apply(updates)
+                    if round_:  # the first round warms up
+                        timings.append(time.perf_counter() - start)
+                        sql.append(statements[0])
+                per_item = statistics.median(timings) / size
+                rows.append((size, label, per_item, statistics.median(sql) / size))
+
+    print(f"\nmedian of {args.repeats} rounds\n")
+    print("| items | implementation | ms per item | SQL statements per item |")
+    print("| --- | --- | --- | --- |")
+    for size, label, per_item, sql in rows:
+        print(f"| {size} | {label} | {per_item * 1000:.2f} | {sql:.3f} |")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[1, 10, 20, 100, 500]
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    configure_environment()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
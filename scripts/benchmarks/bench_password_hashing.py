@@ -0,0 +1,178 @@
+# flake8: noqa: E402
+"""
+Measure event-loop latency while bcrypt logins are in flight.
+
+Fires ``--logins`` concurrent ``POST /account/login`` calls and, for as long as
+they run, keeps ``--readers`` clients looping on an authenticated
+``GET /pantry/list`` while a probe task records how late a 10 ms
+``asyncio.sleep`` wakes up (event-loop lag). The baseline reproduces the
+previous behaviour (``InlineAuthProvider``: bcrypt runs on the event loop); the
+second run uses the bounded bcrypt worker pool.
+
+Usage:
+    python scripts/benchmarks/bench_password_hashing.py [--logins 100]
+        [--readers 10] [--rounds 12]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import (
+    configure_environment,
+    percentile,
+    prepare_database,
+    register_and_login,
+)
+
+PASSWORD = "bench-pass"
+
+
+def build_inline_provider():
+    """The pre-pool behaviour: the async methods hash on the calling thread."""
+    from src.pantrypal_api.account.adapters.auth_provider import AuthProvider
+    from src.pantrypal_api.modules import injector
+
+    class InlineAuthProvider(AuthProvider):
+        async def get_hashed_password_async(self, raw_password):
+            return self.get_hashed_password(raw_password)
+
+        async def verify_password_async(self, raw_password, hashed_password):
+            return self.verify_password(raw_password, hashed_password)
+
+    return injector.create_object(InlineAuthProvider)
+
+
+async def create_login_users(count: int) -> None:
+    from src.core.account.accessors.user_account_accessor import (
+        IUserAccountAccessor,
+    )
+    from src.core.account.models import UserAccountDomain
+    from src.core.account.ports.auth_provider import IAuthProvider
+    from src.pantrypal_api.modules import injector
+
+    # One hash shared by every login user keeps setup fast
+    password_hash = injector.get(IAuthProvider).get_hashed_password(PASSWORD)
+    accessor = injector.get(IUserAccountAccessor)
+    for i in range(count):
+        await accessor.create_user(
+            UserAccountDomain.create(
+                username=f"login{i}",
+                email=f"login{i}@example.com",
+                password_hash=password_hash,
+            )
+        )
+
+
+async def run(args) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from src.app.main import app
+    from src.core.account.ports.auth_provider import IAuthProvider
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    pooled_provider = injector.get(IAuthProvider)
+    inline_provider = build_inline_provider()
+    await create_login_users(args.logins)
+
+    rows = []
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        token = await register_and_login(client, "reader@example.com", PASSWORD)
+        headers = {"Authorization": f"Bearer {token}"}
+        await client.post(
+            "/pantry/add",
+            json=[
+                {
+                    "item_name": f"Item {i}",
+                    "quantity": 1,
+                    "unit": "pieces",
+                    "category": "Fruits",
+                    "purchase_date": "2025-06-01T10:00:00Z",
+                    "expiry_date": "2025-06-10T10:00:00Z",
+                }
+                for i in range(20)
+            ],
+            headers=headers,
+        )
+
+        for label, provider in (
+            ("bcrypt on event loop", inline_provider),
+            ("bcrypt worker pool", pooled_provider),
+        ):
+            injector.binder.bind(IAuthProvider, to=provider)
+            logins_done = asyncio.Event()
+            login_latencies, list_latencies, loop_lag = [], [], []
+
+            async def login(index: int) -> None:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/account/login",
+                    json={"email": f"login{index}@example.com", "password": PASSWORD},
+                )
+                response.raise_for_status()
+                login_latencies.append(time.perf_counter() - start)
+
+            async def reader() -> None:
+                while not logins_done.is_set():
+                    start = time.perf_counter()
+                    response = await client.get("/pantry/list", headers=headers)
+                    response.raise_for_status()
+                    list_latencies.append(time.perf_counter() - start)
+
+            async def probe() -> None:
+                while not logins_done.is_set():
+                    start = time.perf_counter()
+                    await asyncio.sleep(0.01)
+                    loop_lag.append(time.perf_counter() - start - 0.01)
+
+            background = [asyncio.create_task(reader()) for _ in range(args.readers)]
+            background.append(asyncio.create_task(probe()))
+            started = time.perf_counter()
+            await asyncio.gather(*(login(i) for i in range(args.logins)))
+            wall_time = time.perf_counter() - started
+            logins_done.set()
+            await asyncio.gather(*background)
+
+            rows.append((label, wall_time, login_latencies, list_latencies, loop_lag))
+
+    await pooled_provider.close()
+    await inline_provider.close()
+
+    print(
+        f"\n{args.logins} concurrent logins at bcrypt cost {args.rounds}, "
+        f"{args.readers} concurrent /pantry/list readers\n"
+    )
+    print(
+        "| scenario | logins wall s | login p99 ms | /pantry/list calls "
+        "| /pantry/list p50 ms | /pantry/list p99 ms | loop lag p99 ms "
+        "| loop lag max ms |"
+    )
+    print("| --- | --- | --- | --- | --- | --- | --- | --- |")
+    for label, wall_time, logins, lists, lag in rows:
+        print(
+            f"| {label} | {wall_time:.2f} | {percentile(logins, 99) * 1000:.0f} "
+            f"| {len(lists)} | {percentile(lists, 50) * 1000:.1f} "
+            f"| {percentile(lists, 99) * 1000:.1f} "
+            f"| {percentile(lag, 99) * 1000:.1f} | {max(lag) * 1000:.1f} |"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--readers", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=12)
+    args = parser.parse_args()
+
+    configure_environment(AUTH_BCRYPT_ROUNDS=str(args.rounds))
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# flake8: noqa: E402
+"""
+Benchmark classification of long receipts in one prompt vs concurrent chunks.
+
+Classifies receipts of ``--lines`` lines (all new to the item cache) with
+``ReceiptService.process_receipt_webhook``:
+
+* one prompt per receipt (RECEIPT_CLASSIFY_CHUNK_TOKENS effectively unlimited),
+  as before, except that lines lost to a truncated reply are now asked for
+  again in halves instead of failing the receipt;
+* token-bounded chunks of RECEIPT_CLASSIFY_CHUNK_TOKENS, classified with
+  ``--concurrency`` chunks in flight.
+
+The LLM is an in-process stub that answers after ``--latency`` seconds plus
+``--ms-per-token`` per reply token, and cuts replies off at ``--max-tokens``
+(CHATBOT_MAX_TOKENS), like the real model. Reports end-to-end latency, LLM
+calls and how many lines were classified.
+
+Usage:
+    python scripts/benchmarks/bench_receipt_chunks.py [--lines 20 100 300]
+        [--latency 0.3] [--ms-per-token 4] [--max-tokens 1024]
+        [--chunk-tokens 512] [--concurrency 1 4 8] [--repeats 3]
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, prepare_database
+
+UNLIMITED_CHUNK_TOKENS = 10**9
+
+
+class StubClassifier:
+    """Answers for each numbered prompt line, truncating long replies."""
+
+    def __init__(self, latency: float, seconds_per_token: float, max_tokens: int):
+        self.latency = latency
+        self.seconds_per_token = seconds_per_token
+        self.max_tokens = max_tokens
+        self.calls = 0
+
+    async def handle_single_turn(self, message):
+        from src.core.common.utils import TokenUtil
+
+        self.calls += 1
+        names = re.findall(r"^\d+\. (.*)$", message.content, re.MULTILINE)
+        reply = json.dumps(
+            [
+                {
+                    "ITEM": name,
+                    "CATEGORY": "Food",
+                    "SUBCATEGORY": "Snacks",
+                    "QUANTITY": 1,
+                }
+                for name in names
+            ]
+        )
+        max_chars = self.max_tokens * TokenUtil.CHARS_PER_TOKEN
+        reply = reply[:max_chars]
+        tokens = TokenUtil.estimate_tokens(reply)
+        await asyncio.sleep(self.latency + self.seconds_per_token * tokens)
+        return reply
+
+
+async def run(args) -> None:
+    from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+    from src.core.common.ports.secretkey_provider import ISecretProvider
+    from src.core.pantry.services.pantry_service import PantryService
+    from src.core.receipt.services.receipt_item_cache_service import (
+        ReceiptItemCacheService,
+    )
+    from src.core.receipt.services.receipt_service import ReceiptService
+    from src.pantrypal_api.modules import injector
+
+    class NoItemCache(ReceiptItemCacheService):
+        async def get_many(self, normalized_names):
+            return {}
+
+        async def add_many(self, classifications):
+            pass
+
+    class Secrets(ISecretProvider):
+        def __init__(self, **values):
+            self.values = values
+
+        def get_secret(self, key, default=None):
+            return self.values.get(key.value, default)
+
+    class CountingPantry:
+        added = 0
+
+        async def add_items(self, user_id, specs):
+            CountingPantry.added = sum(1 for s in specs if s.category.value != "Other")
+
+    await prepare_database()
+    stub = StubClassifier(args.latency, args.ms_per_token / 1000, args.max_tokens)
+    injector.binder.bind(IChatbotProvider, to=stub)
+    injector.binder.bind(PantryService, to=CountingPantry())
+    item_cache = injector.create_object(NoItemCache)
+
+    setups = [("one prompt", UNLIMITED_CHUNK_TOKENS, 1)] + [
+        ("chunked", args.chunk_tokens, concurrency) for concurrency in args.concurrency
+    ]
+    print(
+        f"\nStub LLM {args.latency * 1000:.0f} ms + {args.ms_per_token:.0f} ms/token, "
+        f"replies cut at {args.max_tokens} tokens, chunks of {args.chunk_tokens} "
+        f"tokens, median of {args.repeats}\n"
+    )
+    print("| lines | classification | chunks in flight | LLM calls | classified | ms |")
+    print("| --- | --- | --- | --- | --- | --- |")
+    for lines in args.lines:
+        receipt = {"Items": [{"ITEM": f"ITEM {i:04d} 500G"} for i in range(lines)]}
+        for label, chunk_tokens, concurrency in setups:
+            service = injector.create_object(
+                ReceiptService,
+                additional_kwargs={
+                    "item_cache_service": item_cache,
+                    "secret_provider": Secrets(
+                        RECEIPT_CLASSIFY_CHUNK_TOKENS=str(chunk_tokens),
+                        RECEIPT_CLASSIFY_CONCURRENCY=str(concurrency),
+                    ),
+                },
+            )
+            timings = []
+            for _ in range(args.repeats):
+                stub.calls = 0
+                start = time.perf_counter()
+                await service.process_receipt_webhook(1, receipt)
+                timings.append(time.perf_counter() - start)
+            print(
+                f"| {lines} | {label} | {concurrency} | {stub.calls} "
+                f"| {CountingPantry.added}/{lines} "
+                f"| {statistics.median(timings) * 1000:.0f} |"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, nargs="+", default=[20, 100, 300])
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--ms-per-token", type=float, default=4)
+    parser.add_argument("--max-tokens", type=int, default=1024)
+    parser.add_argument("--chunk-tokens", type=int, default=512)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    configure_environment(CHATBOT_MAX_TOKENS=str(args.max_tokens))
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# flake8: noqa: E402
+"""
+Benchmark receipt upload deduplication.
+
+Part 1 hashes random "images" of ``--sizes`` MiB sent as base64, comparing
+``base64.b64decode`` + ``hashlib.sha256`` on the whole payload with the
+chunked ``ContentHashUtil.sha256_of_base64`` (CPU ms and tracemalloc peak).
+
+Part 2 sends ``--uploads`` uploads through ``ReceiptGatewayService``, where
+``--duplicate-share`` of them re-send an image the user already uploaded. The
+gateway is a stub that waits ``--gateway-latency`` seconds per upload. Reports
+upload latency for new and duplicate images and the dedup counters.
+
+Usage:
+    python scripts/benchmarks/bench_receipt_dedup.py [--sizes 1 5 10]
+        [--uploads 200] [--duplicate-share 0.3] [--gateway-latency 0.3]
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, percentile, prepare_database
+
+USER_ID = 1
+
+
+def measure(call, repeats: int = 5):
+    cpu = []
+    for _ in range(repeats):
+        start = time.process_time()
+        digest = call()
+        cpu.append(time.process_time() - start)
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return digest, statistics.median(cpu), peak
+
+
+def bench_hashing(sizes):
+    from src.core.common.utils import ContentHashUtil
+
+    print("\n| image MiB | hashing | CPU ms | peak MiB |")
+    print("| --- | --- | --- | --- |")
+    for size in sizes:
+        encoded = base64.b64encode(os.urandom(size * 1024 * 1024)).decode()
+        whole, whole_cpu, whole_peak = measure(
+            lambda: hashlib.sha256(base64.b64decode(encoded)).hexdigest()
+        )
+        chunked, chunked_cpu, chunked_peak = measure(
+            lambda: ContentHashUtil.sha256_of_base64(encoded)
+        )
+        assert whole == chunked
+        for label, cpu, peak in (
+            ("decode whole payload", whole_cpu, whole_peak),
+            ("chunked decode", chunked_cpu, chunked_peak),
+        ):
+            print(f"| {size} | {label} | {cpu * 1000:.1f} | {peak / 2**20:.2f} |")
+
+
+async def bench_uploads(args):
+    from src.core.receipt.ports.receipt_gateway_provider import (
+        IReceiptGatewayProvider,
+    )
+    from src.core.receipt.services.receipt_dedup_service import ReceiptDedupService
+    from src.core.receipt.services.receipt_gateway_service import (
+        ReceiptGatewayService,
+    )
+    from src.pantrypal_api.modules import injector
+
+    class StubGateway(IReceiptGatewayProvider):
+        calls = 0
+
+        async def upload_receipt(self, url, payload):
+            StubGateway.calls += 1
+            await asyncio.sleep(args.gateway_latency)
+            return 200
+
+        async def fetch_receipt_result(self, url, params):
+            return 202, None
+
+    await prepare_database()
+    injector.binder.bind(IReceiptGatewayProvider, to=StubGateway())
+    service = injector.get(ReceiptGatewayService)
+
+    rng = random.Random(12)
+    sent = []
+    latencies = {"new image": [], "duplicate": []}
+    for _ in range(args.uploads):
+        if sent and rng.random() < args.duplicate_share:
+            image, kind = rng.choice(sent), "duplicate"
+        else:
+            image, kind = base64.b64encode(os.urandom(512 * 1024)).decode(), "new image"
+            sent.append(image)
+        start = time.perf_counter()
+        await service.upload_receipt(USER_ID, image)
+        latencies[kind].append(time.perf_counter() - start)
+
+    print(
+        f"\n{args.uploads} uploads of 512 KiB images, gateway latency "
+        f"{args.gateway_latency * 1000:.0f} ms\n"
+    )
+    print("| upload | count | p50 ms | p99 ms |")
+    print("| --- | --- | --- | --- |")
+    for kind, values in latencies.items():
+        print(
+            f"| {kind} | {len(values)} | {percentile(values, 50) * 1000:.1f} "
+            f"| {percentile(values, 99) * 1000:.1f} |"
+        )
+    stats = injector.get(ReceiptDedupService).stats()
+    print(
+        f"\ngateway uploads: {StubGateway.calls}, dedup hit rate "
+        f"{stats['hit_rate']:.2f}, gateway calls saved {stats['gateway_calls_saved']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--duplicate-share", type=float, default=0.3)
+    parser.add_argument("--gateway-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    configure_environment(RECEIPT_UPLOAD_ENDPOINT="http://gateway.invalid/upload")
+    bench_hashing(args.sizes)
+    asyncio.run(bench_uploads(args))
+
+
+if __name__ == "__main__":
+    main()
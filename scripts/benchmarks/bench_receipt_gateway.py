@@ -0,0 +1,218 @@
+# flake8: noqa: E402
+"""
+Benchmark the receipt gateway client against a local stub gateway.
+
+Compares a fresh ``httpx.AsyncClient`` per call with the whole payload sent as
+``json=`` (the previous ``HttpReceiptGatewayProvider``, reproduced here as
+``PerCallGatewayProvider``) with the shared, pooled client:
+
+* result polls: ``--polls`` GETs at each ``--concurrency``, reporting latency,
+  throughput and how many TCP connections the gateway saw;
+* uploads: one upload of each ``--image-mb`` image, reporting the tracemalloc
+  peak of the client while sending it;
+* flaky gateway: polls where ``--error-rate`` of responses are 503, reporting
+  how many polls still got a result.
+
+The stub gateway runs in a child process over plain HTTP and answers after
+``--latency`` seconds, so TLS handshakes (and HTTP/2, which needs TLS here)
+are not part of the numbers; against the real gateway reuse also saves those.
+
+Usage:
+    python scripts/benchmarks/bench_receipt_gateway.py [--latency 0.02]
+        [--polls 1000] [--concurrency 1 20 100] [--image-mb 1 5 10]
+        [--error-rate 0.2]
+"""
+
+import argparse
+import asyncio
+import base64
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, print_table, run_concurrent
+
+
+def _serve_gateway(port: int, latency: float, error_rate: float) -> None:
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    connections = set()
+    rng = random.Random(5)
+
+    async def upload(request):
+        connections.add(request.scope["client"])
+        await request.body()
+        await asyncio.sleep(latency)
+        return JSONResponse({"ok": True})
+
+    async def result(request):
+        connections.add(request.scope["client"])
+        await asyncio.sleep(latency)
+        if request.query_params.get("flaky") and rng.random() < error_rate:
+            return JSONResponse({"message": "busy"}, status_code=503)
+        return JSONResponse({"Items": [{"ITEM": "MILK 1L", "QUANTITY": 1}]})
+
+    async def stats(request):
+        count = len(connections)
+        connections.clear()
+        return JSONResponse({"connections": count})
+
+    app = Starlette(
+        routes=[
+            Route("/upload", upload, methods=["POST"]),
+            Route("/result", result),
+            Route("/stats", stats),
+        ]
+    )
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="error", backlog=4096)
+
+
+class StubGateway:
+    def __init__(self, latency: float, error_rate: float):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._process = multiprocessing.Process(
+            target=_serve_gateway, args=(self.port, latency, error_rate), daemon=True
+        )
+
+    def __enter__(self) -> "StubGateway":
+        self._process.start()
+        deadline = time.time() + 15
+        while time.time() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.2):
+                    return self
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError("Stub gateway did not start")
+
+    def __exit__(self, *exc) -> None:
+        self._process.terminate()
+        self._process.join(timeout=5)
+
+    async def connections(self) -> int:
+        import httpx
+
+        async with httpx.AsyncClient() as client:
+            return (await client.get(f"{self.base_url}/stats")).json()["connections"]
+
+
+def build_per_call_provider():
+    """The previous provider: a new client per call and a ``json=`` upload body."""
+    import httpx
+
+    from src.core.receipt.ports.receipt_gateway_provider import (
+        IReceiptGatewayProvider,
+    )
+
+    class PerCallGatewayProvider(IReceiptGatewayProvider):
+        async def upload_receipt(self, url, payload):
+            async with httpx.AsyncClient() as client:
+                return (await client.post(url, json=payload)).status_code
+
+        async def fetch_receipt_result(self, url, params):
+            async with httpx.AsyncClient() as client:
+                resp = await client.get(url, params=params)
+            return resp.status_code, resp.json() if resp.status_code == 200 else None
+
+    return PerCallGatewayProvider()
+
+
+async def run(args, gateway: StubGateway) -> None:
+    from src.pantrypal_api.modules import injector
+    from src.pantrypal_api.receipt.adapters.receipt_gateway_provider import (
+        HttpReceiptGatewayProvider,
+    )
+
+    providers = [
+        ("per-call client", build_per_call_provider()),
+        ("shared client", injector.create_object(HttpReceiptGatewayProvider)),
+    ]
+    result_url = f"{gateway.base_url}/result"
+
+    results, connections = [], []
+    for concurrency in args.concurrency:
+        for label, provider in providers:
+            await gateway.connections()
+
+            async def poll(index: int) -> None:
+                status, _ = await provider.fetch_receipt_result(
+                    result_url, {"receipt_id": f"{index}.jpg"}
+                )
+                if status != 200:
+                    raise RuntimeError(status)
+
+            results.append(
+                await run_concurrent(label, poll, concurrency, total=args.polls)
+            )
+            connections.append((label, concurrency, await gateway.connections()))
+    print(
+        f"\n{args.polls} result polls, gateway latency {args.latency * 1000:.0f} ms\n"
+    )
+    print_table(results)
+    print("\n| client | concurrency | TCP connections opened |")
+    print("| --- | --- | --- |")
+    for label, concurrency, count in connections:
+        print(f"| {label} | {concurrency} | {count} |")
+
+    print("\n| image MiB | client | upload ms | client peak MiB |")
+    print("| --- | --- | --- | --- |")
+    upload_url = f"{gateway.base_url}/upload"
+    for size in args.image_mb:
+        image = base64.b64encode(os.urandom(size * 1024 * 1024)).decode()
+        payload = {"user_id": "1", "receipt_id": "bench.jpg", "image_base64": image}
+        for label, provider in providers:
+            await provider.upload_receipt(upload_url, payload)  # warm up
+            tracemalloc.start()
+            start = time.perf_counter()
+            status = await provider.upload_receipt(upload_url, payload)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            assert status == 200
+            print(f"| {size} | {label} | {elapsed * 1000:.1f} | {peak / 2**20:.2f} |")
+
+    print(
+        f"\n| client | polls | got a result ({args.error_rate:.0%} of responses 503) |"
+    )
+    print("| --- | --- | --- |")
+    for label, provider in providers:
+        ok = 0
+        for index in range(args.polls // 4):
+            status, _ = await provider.fetch_receipt_result(
+                result_url, {"receipt_id": f"{index}.jpg", "flaky": "1"}
+            )
+            ok += status == 200
+        print(f"| {label} | {args.polls // 4} | {ok} |")
+
+    await providers[1][1].close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--polls", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 20, 100])
+    parser.add_argument("--image-mb", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    args = parser.parse_args()
+
+    configure_environment(RECEIPT_GATEWAY_CONNECTIONS="100")
+    with StubGateway(args.latency, args.error_rate) as gateway:
+        asyncio.run(run(args, gateway))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# flake8: noqa: E402
+"""
+Benchmark receipt webhooks handled inline vs through the receipt job queue.
+
+Sends ``--receipts`` webhooks of ``--lines`` items each, ``--concurrency`` at a
+time, to the real app while the stub LLM server answers every classification
+after ``--latency`` seconds:
+
+* the previous implementation (reproduced here as ``/bench/legacy-webhook``):
+  the request classifies the receipt and adds the items before returning;
+* ``POST /receipt/webhook``, which only queues the receipt, with
+  ``--workers`` job workers classifying in the background.
+
+Reports webhook latency and the time until every receipt's items are in the
+pantry.
+
+Usage:
+    python scripts/benchmarks/bench_receipt_queue.py [--receipts 40]
+        [--lines 10] [--latency 1.0] [--concurrency 5] [--workers 1 4 16]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import (
+    StubLLMServer,
+    configure_environment,
+    percentile,
+    prepare_database,
+    run_concurrent,
+)
+
+USER_ID = 1
+
+
+def build_receipt(lines: int):
+    return {
+        "Date": "01/06/2025",
+        "Items": [{"ITEM": f"Item {i}", "QUANTITY": 1} for i in range(lines)],
+    }
+
+
+def classification_reply(lines: int) -> str:
+    return json.dumps(
+        [
+            {"ITEM": f"Item {i}", "CATEGORY": "Food", "SUBCATEGORY": "Cheese"}
+            for i in range(lines)
+        ]
+    )
+
+
+def mount_legacy_route(app) -> None:
+    """The previous handler: classify and store the receipt inside the request."""
+    from fastapi import status
+
+    from src.core.receipt.services.receipt_service import ReceiptService
+    from src.pantrypal_api.modules import injector
+    from src.pantrypal_api.receipt.schemas.receipt_schemas import (
+        ReceiptWebhookRequest,
+    )
+
+    async def legacy_webhook(request: ReceiptWebhookRequest):
+        await injector.get(ReceiptService).process_receipt_webhook(
+            request.user_id, request.receipt
+        )
+
+    app.add_api_route(
+        "/bench/legacy-webhook",
+        legacy_webhook,
+        methods=["POST"],
+        status_code=status.HTTP_204_NO_CONTENT,
+    )
+
+
+async def count_pantry_items() -> int:
+    from sqlalchemy import func, select
+
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.modules import injector
+    from src.pantrypal_api.pantry.models import PantryItem
+
+    async with injector.get(IDatabaseProvider).get_db() as db:
+        return await db.scalar(select(func.count(PantryItem.id)))
+
+
+async def run(args) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from src.app.main import app
+    from src.core.receipt.services.receipt_job_service import ReceiptJobService
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    mount_legacy_route(app)
+    receipt = build_receipt(args.lines)
+    rows = []
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench", timeout=None
+    ) as client:
+
+        async def drive(label, path, workers):
+            baseline = await count_pantry_items()
+            expected = baseline + args.receipts * args.lines
+            run_id = len(rows)
+
+            async def post(index: int) -> None:
+                response = await client.post(
+                    path,
+                    json={
+                        "user_id": USER_ID,
+                        "receipt_id": f"bench-{run_id}-{index}",
+                        "receipt": receipt,
+                    },
+                )
+                response.raise_for_status()
+
+            started = time.perf_counter()
+            result = await run_concurrent(
+                label, post, args.concurrency, total=args.receipts
+            )
+            while await count_pantry_items() < expected:
+                await asyncio.sleep(0.05)
+            drained = time.perf_counter() - started
+            rows.append((label, workers, result, drained))
+
+        await drive("previous (inline)", "/bench/legacy-webhook", "-")
+        for workers in args.workers:
+            service = injector.get(ReceiptJobService)
+            service.workers = workers
+            service.start()
+            await drive("queued", "/receipt/webhook", workers)
+            await service.stop()
+
+    print(
+        f"\n{args.receipts} receipts of {args.lines} lines, {args.concurrency} "
+        f"webhooks in flight, stub LLM latency {args.latency * 1000:.0f} ms\n"
+    )
+    print(
+        "| webhook | workers | errors | webhook p50 ms | webhook p99 ms "
+        "| all items stored s |"
+    )
+    print("| --- | --- | --- | --- | --- | --- |")
+    for label, workers, result, drained in rows:
+        print(
+            f"| {label} | {workers} | {result.errors} "
+            f"| {percentile(result.latencies, 50) * 1000:.1f} "
+            f"| {percentile(result.latencies, 99) * 1000:.1f} | {drained:.2f} |"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--receipts", type=int, default=40)
+    parser.add_argument("--lines", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    with StubLLMServer(
+        latency=args.latency, reply=classification_reply(args.lines)
+    ) as server:
+        configure_environment(GROQ_BASE_URL=server.base_url)
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# flake8: noqa: E402
+"""
+Benchmark clients polling ``GET /receipt/result/{id}`` vs long-polling ``/wait``.
+
+``--clients`` clients each wait on their own uploaded receipt, which the stub
+receipt gateway finishes reading at a random time within ``--spread`` seconds
+(answering 202 until then). Job workers then classify it (stub LLM, no delay).
+
+* polling: every client calls ``GET /receipt/result/{id}`` every
+  ``--client-interval`` seconds until it gets 204, as clients do today;
+* long-poll: every client calls ``GET /receipt/result/{id}/wait`` until it
+  gets 204, while the server polls the gateway once every
+  ``--gateway-poll`` seconds per awaited receipt.
+
+Reports API requests, gateway calls and SQL statements per receipt, the
+delay between the gateway having the result and the client learning that the
+items are in the pantry, and how many clients learnt it before giving up after
+``--give-up`` seconds.
+
+Usage:
+    python scripts/benchmarks/bench_receipt_wait.py [--clients 1000]
+        [--spread 10] [--client-interval 1] [--gateway-poll 1] [--give-up 120]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import (
+    configure_environment,
+    percentile,
+    prepare_database,
+    register_and_login,
+)
+
+RECEIPT = {"Date": "01/06/2025", "Items": [{"ITEM": "MARIGOLD HL MILK 1L"}]}
+
+
+class StubGateway:
+    """Answers 202 for a receipt until its ready time, then returns it."""
+
+    def __init__(self):
+        self.ready_at = {}
+        self.calls = 0
+
+    async def upload_receipt(self, url, payload):
+        return 200
+
+    async def fetch_receipt_result(self, url, params):
+        self.calls += 1
+        if time.perf_counter() < self.ready_at[params["receipt_id"]]:
+            return 202, None
+        return 200, RECEIPT
+
+
+class StubClassifier:
+    async def handle_single_turn(self, message):
+        return (
+            '[{"ITEM": "Marigold HL Milk 1L", "CATEGORY": "Food", '
+            '"SUBCATEGORY": "Fresh Milk", "QUANTITY": 1}]'
+        )
+
+    async def close(self):
+        pass
+
+
+async def run(args) -> None:
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import event
+
+    from src.app.main import app
+    from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+    from src.core.receipt.accessors.receipt_job_accessor import IReceiptJobAccessor
+    from src.core.receipt.constants import ReceiptJobStatus
+    from src.core.receipt.ports.receipt_gateway_provider import (
+        IReceiptGatewayProvider,
+    )
+    from src.core.receipt.services.receipt_job_service import ReceiptJobService
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    gateway = StubGateway()
+    injector.binder.bind(IReceiptGatewayProvider, to=gateway)
+    injector.binder.bind(IChatbotProvider, to=StubClassifier())
+    statements = [0]
+    event.listen(
+        injector.get(IDatabaseProvider).engine.sync_engine,
+        "before_cursor_execute",
+        lambda *_: statements.__setitem__(0, statements[0] + 1),
+    )
+    jobs = injector.get(ReceiptJobService)
+    jobs.start()
+
+    rows = []
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench", timeout=None
+    ) as client:
+        token = await register_and_login(client, "waiter@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for label, path, interval in (
+            ("polling", "/receipt/result/{}", args.client_interval),
+            ("long-poll", "/receipt/result/{}/wait", 0),
+        ):
+            rng = random.Random(17)
+            requests = [0]
+            delays = []
+            started = time.perf_counter()
+            receipt_ids = [f"{label}-{i}.jpg" for i in range(args.clients)]
+            for receipt_id in receipt_ids:
+                gateway.ready_at[receipt_id] = started + rng.uniform(0, args.spread)
+            gateway.calls, statements[0] = 0, 0
+
+            async def wait(receipt_id: str) -> None:
+                while time.perf_counter() - started < args.give_up:
+                    requests[0] += 1
+                    response = await client.get(
+                        path.format(receipt_id), headers=headers
+                    )
+                    if response.status_code == 204:
+                        delays.append(
+                            time.perf_counter() - gateway.ready_at[receipt_id]
+                        )
+                        return
+                    if response.status_code != 202:
+                        raise RuntimeError(response.text)
+                    await asyncio.sleep(interval)
+
+            await asyncio.gather(*(wait(r) for r in receipt_ids))
+            wall = time.perf_counter() - started
+            rows.append(
+                (label, requests[0], gateway.calls, statements[0], delays, wall)
+            )
+
+            # Let jobs left by clients that gave up finish before the next run
+            unfinished = {ReceiptJobStatus.PENDING, ReceiptJobStatus.RUNNING}
+            job_accessor = injector.get(IReceiptJobAccessor)
+            while unfinished & set(
+                (await job_accessor.get_statuses(receipt_ids)).values()
+            ):
+                await asyncio.sleep(0.5)
+
+    await jobs.stop()
+
+    print(
+        f"\n{args.clients} clients, receipts ready within {args.spread:.0f} s, "
+        f"client poll every {args.client_interval:g} s, gateway poll every "
+        f"{args.gateway_poll:g} s\n"
+    )
+    print(
+        "| clients | API requests/receipt | gateway calls/receipt "
+        "| SQL statements/receipt | ready to known p50 ms | p99 ms "
+        "| learnt in time | wall s |"
+    )
+    print("| --- | --- | --- | --- | --- | --- | --- | --- |")
+    for label, requests, calls, sql, delays, wall in rows:
+        n = args.clients
+        print(
+            f"| {label} | {requests / n:.1f} | {calls / n:.1f} | {sql / n:.1f} "
+            f"| {percentile(delays, 50) * 1000:.0f} "
+            f"| {percentile(delays, 99) * 1000:.0f} | {len(delays)}/{n} "
+            f"| {wall:.1f} |"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--spread", type=float, default=10)
+    parser.add_argument("--client-interval", type=float, default=1)
+    parser.add_argument("--gateway-poll", type=float, default=1)
+    parser.add_argument("--give-up", type=float, default=120)
+    args = parser.parse_args()
+
+    configure_environment(
+        RECEIPT_RETRIEVE_ENDPOINT="http://gateway.invalid/result",
+        RECEIPT_RESULT_POLL_SECONDS=str(args.gateway_poll),
+        RECEIPT_RESULT_WAIT_SECONDS="25",
+    )
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
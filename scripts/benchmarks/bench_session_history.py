@@ -0,0 +1,227 @@
+# flake8: noqa: E402
+"""
+Benchmark peak memory of reading a long chat session's history.
+
+Seeds one session with ``--messages`` messages, alternating short user prompts
+and ``--reply-chars``-character assistant replies, then reads it back, each
+scenario in a fresh process serving the app with uvicorn:
+
+* the previous implementation (reproduced here and mounted on the app as
+  ``/bench/legacy-history/{id}``): load every message, build domain objects
+  and ``Message`` schemas for all of them and return one JSON array;
+* ``GET /chatbot/sessions/{id}`` without ``limit`` (the same whole-history
+  response, now restricted to the owner);
+* the newest page with ``limit=--page-size``;
+* every page, walking ``X-Next-Cursor`` back to the first message;
+* ``GET /chatbot/sessions/{id}/stream`` (NDJSON from a server-side cursor).
+
+The client reads each body in chunks and discards them, so the process's peak
+RSS above its warmed-up baseline is what serving the history cost.
+
+Usage:
+    python scripts/benchmarks/bench_session_history.py [--messages 5000]
+        [--reply-chars 3000] [--page-size 200]
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import (
+    configure_environment,
+    prepare_database,
+    register_and_login,
+    serve_in_process,
+)
+
+SESSION_ID = 1
+SCENARIOS = ("previous", "no limit", "newest page", "all pages", "NDJSON stream")
+
+
+def mount_legacy_route(app) -> None:
+    """The previous handler: every message -> domain -> Message, one array."""
+    from typing import List
+
+    from sqlalchemy.future import select
+
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.chatbot.models import ChatHistory
+    from src.pantrypal_api.chatbot.schemas.chatbot_schemas import Message
+    from src.pantrypal_api.modules import injector
+
+    async def legacy_history(session_id: int):
+        async with injector.get(IDatabaseProvider).get_db() as db:
+            result = await db.execute(
+                select(ChatHistory)
+                .where(ChatHistory.session_id == session_id)
+                .where(ChatHistory.deleted_at.is_(None))
+                .order_by(ChatHistory.created_at.asc())
+            )
+            history = [m.to_domain() for m in result.scalars().all()]
+        return [h.to_schema() for h in history]
+
+    app.add_api_route(
+        "/bench/legacy-history/{session_id}",
+        legacy_history,
+        methods=["GET"],
+        response_model=List[Message],
+    )
+
+
+async def seed(args) -> str:
+    """Register the reader, bulk-load their session; returns their token."""
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import insert
+
+    from src.app.main import app
+    from src.core.account.accessors.user_account_accessor import (
+        IUserAccountAccessor,
+    )
+    from src.core.chatbot.constants import ChatbotMessageRole
+    from src.core.common.utils import DateTimeUtils
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.chatbot.models import ChatHistory
+    from src.pantrypal_api.modules import injector
+
+    await prepare_database()
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        token = await register_and_login(client, "history@example.com")
+    user = await injector.get(IUserAccountAccessor).get_by_email("history@example.com")
+
+    reply = ("Simmer the onions slowly until golden, then add the rest. " * 100)[
+        : args.reply_chars
+    ]
+    rows = [
+        {
+            "user_id": user.id,
+            "session_id": SESSION_ID,
+            "role": ChatbotMessageRole.ASSISTANT if i % 2 else ChatbotMessageRole.USER,
+            "content": reply if i % 2 else f"What else could I make? ({i})",
+            "token_count": 0,
+            "timestamp": DateTimeUtils.get_utc_now(),
+        }
+        for i in range(args.messages)
+    ]
+    async with injector.get(IDatabaseProvider).get_db() as db:
+        for start in range(0, len(rows), 1000):
+            await db.execute(insert(ChatHistory), rows[start : start + 1000])
+        await db.commit()
+    return token
+
+
+async def read_all(client, path: str, params=None) -> tuple:
+    """GET path, discarding the body in chunks; returns (bytes, next cursor)."""
+    size = 0
+    async with client.stream("GET", path, params=params) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes():
+            size += len(chunk)
+        return size, response.headers.get("X-Next-Cursor")
+
+
+async def measure(args) -> None:
+    """Child process: serve the app and read the history one way."""
+    from httpx import AsyncClient
+
+    from src.app.main import app
+
+    await prepare_database()
+    mount_legacy_route(app)
+    history = f"/chatbot/sessions/{SESSION_ID}"
+    async with serve_in_process(app) as base_url:
+        async with AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {args.token}"},
+            timeout=None,
+        ) as client:
+            await read_all(client, history, {"limit": 1})  # warm-up
+            baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            started = time.perf_counter()
+            if args.scenario == "previous":
+                size, _ = await read_all(client, f"/bench/legacy-history/{SESSION_ID}")
+            elif args.scenario == "no limit":
+                size, _ = await read_all(client, history)
+            elif args.scenario == "newest page":
+                size, _ = await read_all(client, history, {"limit": args.page_size})
+            elif args.scenario == "all pages":
+                size, cursor, params = 0, None, {"limit": args.page_size}
+                while True:
+                    page_size, cursor = await read_all(client, history, params)
+                    size += page_size
+                    if cursor is None:
+                        break
+                    params = {"limit": args.page_size, "cursor": cursor}
+            else:
+                size, _ = await read_all(client, f"{history}/stream")
+            elapsed = time.perf_counter() - started
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        json.dumps(
+            {"baseline": baseline, "peak": peak, "bytes": size, "seconds": elapsed}
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--reply-chars", type=int, default=3000)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--database-url", help=argparse.SUPPRESS)
+    parser.add_argument("--token", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        configure_environment(DATABASE_URL=args.database_url)
+        asyncio.run(measure(args))
+        return
+
+    database_url = configure_environment()
+    token = asyncio.run(seed(args))
+    rows = []
+    for scenario in SCENARIOS:
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                f"--scenario={scenario}",
+                f"--database-url={database_url}",
+                f"--token={token}",
+                f"--page-size={args.page_size}",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        rows.append((scenario, json.loads(output.strip().splitlines()[-1])))
+
+    print(
+        f"\n{args.messages} messages in one session, assistant replies "
+        f"{args.reply_chars} chars, page size {args.page_size}\n"
+    )
+    print("| read | body MiB | s | baseline RSS MiB | peak RSS MiB | peak - baseline |")
+    print("| --- | --- | --- | --- | --- | --- |")
+    for scenario, r in rows:
+        print(
+            f"| {scenario} | {r['bytes'] / 2**20:.1f} | {r['seconds']:.2f} "
+            f"| {r['baseline'] / 1024:.1f} | {r['peak'] / 1024:.1f} "
+            f"| {(r['peak'] - r['baseline']) / 1024:.1f} |"
+        )
+
+
+if __name__ == "__main__":
+    main()
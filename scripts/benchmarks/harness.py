@@ -0,0 +1,303 @@
+"""
+Shared helpers for the benchmark scripts in ``scripts/benchmarks``.
+
+Each benchmark runs the real FastAPI app in-process (via ``httpx.ASGITransport``)
+against a throwaway SQLite database, so the numbers cover routing, services,
+accessors and adapters. Outbound LLM traffic goes to ``StubLLMServer``, a small
+OpenAI-compatible server started in a child process with a fixed latency.
+
+Environment variables must be configured before any ``src`` module is imported,
+because the injector builds its providers at import time; call
+``configure_environment()`` first and import the app afterwards.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+# Ensure the repository root is on the path so `src` imports work when running
+# the benchmark scripts directly via `python scripts/benchmarks/<script>.py`.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+BENCH_ENVIRONMENT = {
+    "AUTH_SECRET_KEY": "bench-secret",
+    "AUTH_ALGORITHM": "HS256",
+    "AUTH_TOKEN_EXPIRY_MINUTES": "60",
+    "ADMIN_USERNAME": "admin",
+    "ADMIN_EMAIL": "admin@example.com",
+    "ADMIN_PASSWORD": "admin123",
+    "CHATBOT_MAX_TOKENS": "256",
+    "CHATBOT_MAX_CHAT_HISTORY": "10",
+    "CHATBOT_MODEL": "stub-model",
+    "GROQ_API_KEY": "stub-key",
+}
+
+
+def configure_environment(**overrides: str) -> str:
+    """Point the app at a fresh SQLite file and return its async database URL."""
+    db_path = Path(tempfile.mkdtemp(prefix="pantrypal-bench-")) / "bench.db"
+    database_url = f"sqlite+aiosqlite:///{db_path}"
+    os.environ["DATABASE_URL"] = database_url
+    for key, value in {**BENCH_ENVIRONMENT, **overrides}.items():
+        os.environ[key] = value
+    return database_url
+
+
+async def prepare_database() -> None:
+    """Recreate the app engine with generous lock/pool timeouts and create tables."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.base.models import PantryPalBaseModel
+    from src.pantrypal_api.modules import injector
+
+    provider = injector.get(IDatabaseProvider)
+    engine = create_async_engine(
+        os.environ["DATABASE_URL"],
+        connect_args={"timeout": 120},
+        pool_size=20,
+        max_overflow=0,
+        pool_timeout=600,
+    )
+    provider.engine = engine
+    provider.async_session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        await conn.run_sync(PantryPalBaseModel.metadata.create_all)
+
+
+async def register_and_login(client, email: str, password: str = "bench-pass") -> str:
+    """Register a user through the API and return a bearer token."""
+    await client.post(
+        "/account/register",
+        json={"username": email.split("@")[0], "email": email, "password": password},
+    )
+    response = await client.post(
+        "/account/login", json={"email": email, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["token"]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (``pct`` in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+@dataclass
+class RunResult:
+    label: str
+    concurrency: int
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    wall_time: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.wall_time if self.wall_time else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "p50_ms": percentile(self.latencies, 50) * 1000,
+            "p99_ms": percentile(self.latencies, 99) * 1000,
+            "mean_ms": (
+                (statistics.fmean(self.latencies) * 1000) if self.latencies else 0.0
+            ),
+            "throughput_rps": self.throughput,
+        }
+
+
+async def run_concurrent(
+    label: str,
+    operation: Callable[[int], Awaitable[None]],
+    concurrency: int,
+    total: Optional[int] = None,
+) -> RunResult:
+    """Run ``total`` calls of ``operation`` with at most ``concurrency`` in flight."""
+    total = total or concurrency
+    result = RunResult(label=label, concurrency=concurrency)
+    gate = asyncio.Semaphore(concurrency)
+
+    async def timed(index: int) -> None:
+        async with gate:
+            start = time.perf_counter()
+            try:
+                await operation(index)
+            except Exception:
+                result.errors += 1
+                return
+            result.latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(i) for i in range(total)))
+    result.wall_time = time.perf_counter() - started
+    return result
+
+
+def print_table(results: List[RunResult]) -> None:
+    """Print benchmark results as a markdown table."""
+    print(
+        "| scenario | concurrency | ok | errors | p50 ms | p99 ms | mean ms | req/s |"
+    )
+    print("| --- | --- | --- | --- | --- | --- | --- | --- |")
+    for r in results:
+        s = r.summary()
+        print(
+            f"| {r.label} | {r.concurrency} | {len(r.latencies)} | {r.errors} "
+            f"| {s['p50_ms']:.1f} | {s['p99_ms']:.1f} | {s['mean_ms']:.1f} "
+            f"| {s['throughput_rps']:.1f} |"
+        )
+
+
+@asynccontextmanager
+async def serve_in_process(app) -> AsyncIterator[str]:
+    """Serve ``app`` with uvicorn on the current event loop and yield its base URL.
+
+    Needed when a benchmark measures streamed responses: ``httpx.ASGITransport``
+    buffers the whole body before returning it.
+    """
+    import uvicorn
+
+    port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app, host="127.0.0.1", port=port, log_level="error", lifespan="off"
+        )
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+# ===============================
+# STUB LLM SERVER
+# ===============================
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _completion_payload(content: str) -> Dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "stub-model",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def _chunk_payload(content: Optional[str], finish_reason: Optional[str]) -> Dict:
+    delta = {"content": content} if content is not None else {}
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": "stub-model",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def _serve_stub(port: int, latency: float, reply: str, token_delay: float) -> None:
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse, StreamingResponse
+    from starlette.routing import Route
+
+    async def completions(request: Request):
+        body = await request.json()
+        if body.get("stream"):
+
+            async def events():
+                await asyncio.sleep(latency)
+                for word in reply.split(" "):
+                    chunk = _chunk_payload(word + " ", None)
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                    await asyncio.sleep(token_delay)
+                yield f"data: {json.dumps(_chunk_payload(None, 'stop'))}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await asyncio.sleep(latency + token_delay * len(reply.split(" ")))
+        return JSONResponse(_completion_payload(reply))
+
+    app = Starlette(
+        routes=[
+            Route("/openai/v1/chat/completions", completions, methods=["POST"]),
+        ]
+    )
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="error", backlog=4096)
+
+
+class StubLLMServer:
+    """OpenAI/Groq-compatible chat completion server running in a child process.
+
+    Every completion waits ``latency`` seconds before the first token and
+    ``token_delay`` seconds between streamed words, which stands in for model
+    time so that client-side overheads are what the benchmarks compare.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        reply: str = "Here is a quick idea for dinner tonight.",
+        token_delay: float = 0.0,
+    ):
+        self.port = _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self._process = multiprocessing.Process(
+            target=_serve_stub,
+            args=(self.port, latency, reply, token_delay),
+            daemon=True,
+        )
+
+    def __enter__(self) -> "StubLLMServer":
+        self._process.start()
+        deadline = time.time() + 15
+        while time.time() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.2):
+                    return self
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError("Stub LLM server did not start")
+
+    def __exit__(self, *exc) -> None:
+        self._process.terminate()
+        self._process.join(timeout=5)
@@ -0,0 +1,406 @@
+# flake8: noqa: E402
+"""
+Run EXPLAIN on every accessor query against a seeded database and flag scans.
+
+Seeds ``--users`` users with pantry items, chat sessions and
+``--messages-per-user`` chat history messages, then calls every accessor
+method once while recording the SQL it sends, and explains each SELECT, UPDATE
+and DELETE with the parameters it was sent with:
+
+* SQLite (a fresh file by default): ``EXPLAIN QUERY PLAN``; flags a ``SCAN`` of
+  a table and a temp B-tree sort over rows read from a table. No ``ANALYZE`` is
+  run, as the app never runs one either;
+* another database (``--database-url``, e.g. PostgreSQL with asyncpg
+  installed; its tables are dropped and recreated): ``EXPLAIN`` after
+  ``ANALYZE``; flags ``Seq Scan`` and ``Sort`` nodes. Seed enough rows for the
+  planner to prefer indexes over scanning small tables.
+
+Prints every query with its plan, then exits with status 1 if ``--strict`` is
+given and any query was flagged.
+
+Usage:
+    python scripts/benchmarks/index_advisor.py [--users 50]
+        [--messages-per-user 200] [--strict] [--database-url URL]
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from harness import configure_environment, prepare_database
+
+EXPLAINED_VERBS = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+async def use_database(url: str) -> None:
+    """Point the app at ``url`` and recreate every table there."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.base.models import PantryPalBaseModel
+    from src.pantrypal_api.modules import injector
+
+    provider = injector.get(IDatabaseProvider)
+    provider.engine = create_async_engine(url)
+    provider.async_session_factory = sessionmaker(
+        bind=provider.engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with provider.engine.begin() as conn:
+        await conn.run_sync(PantryPalBaseModel.metadata.drop_all)
+        await conn.run_sync(PantryPalBaseModel.metadata.create_all)
+
+
+async def seed(args) -> None:
+    from sqlalchemy import insert
+
+    from src.core.chatbot.constants import ChatbotMessageRole
+    from src.core.common.utils import DateTimeUtils
+    from src.core.pantry.constants import Category, Unit
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.account.models import UserAccount
+    from src.pantrypal_api.chatbot.models import ChatHistory, ChatSession
+    from src.pantrypal_api.modules import injector
+    from src.pantrypal_api.pantry.models import PantryItem
+
+    now = DateTimeUtils.get_utc_now()
+    sessions_per_user = max(args.messages_per_user // 50, 1)
+    users = [
+        {"username": f"user{u}", "email": f"user{u}@example.com", "password_hash": "x"}
+        for u in range(1, args.users + 1)
+    ]
+    sessions = [
+        {"user_id": u, "title": f"Recipe {s}", "created_at": now}
+        for u in range(1, args.users + 1)
+        for s in range(sessions_per_user)
+    ]
+    items = [
+        {
+            "user_id": u,
+            "item_name": f"Item {i}",
+            "quantity": 1,
+            "unit": Unit.PIECES,
+            "category": Category.OTHER,
+            "expiry_date": now + timedelta(days=i % 60 - 20),
+            "created_at": now,
+        }
+        for u in range(1, args.users + 1)
+        for i in range(args.items_per_user)
+    ]
+    messages = [
+        {
+            "user_id": u,
+            "session_id": (u - 1) * sessions_per_user + m % sessions_per_user + 1,
+            "role": (
+                ChatbotMessageRole.USER if m % 2 else ChatbotMessageRole.ASSISTANT
+            ),
+            "content": f"Message {m}",
+            "token_count": 3,
+            "timestamp": now,
+            "created_at": now + timedelta(seconds=m),
+            "deleted_at": now if m % 10 == 0 else None,
+        }
+        for u in range(1, args.users + 1)
+        for m in range(args.messages_per_user)
+    ]
+    async with injector.get(IDatabaseProvider).get_db() as db:
+        for model, rows in (
+            (UserAccount, users),
+            (ChatSession, sessions),
+            (PantryItem, items),
+            (ChatHistory, messages),
+        ):
+            for start in range(0, len(rows), 5000):
+                await db.execute(insert(model), rows[start : start + 5000])
+        await db.commit()
+
+
+async def workload(call) -> None:
+    """Call every accessor method once, as user 1 where there is a user."""
+    from src.core.account.accessors.auth_token_accessor import IAuthTokenAccessor
+    from src.core.account.accessors.user_account_accessor import (
+        IUserAccountAccessor,
+    )
+    from src.core.account.models import AuthTokenDomain, UserAccountDomain
+    from src.core.chatbot.accessors.chat_session_accessor import (
+        IChatSessionAccessor,
+    )
+    from src.core.chatbot.accessors.chatbot_history_accessor import (
+        IChatbotHistoryAccessor,
+    )
+    from src.core.chatbot.constants import ChatbotMessageRole
+    from src.core.chatbot.models import ChatSessionDomain
+    from src.core.chatbot.specs import ChatMessageSpec
+    from src.core.common.utils import DateTimeUtils
+    from src.core.configuration.accessors.configuration_accessor import (
+        IConfigurationAccessor,
+    )
+    from src.core.configuration.constants import ConfigurationKey
+    from src.core.pantry.accessors.pantry_item_accessor import IPantryItemAccessor
+    from src.core.pantry.constants import Category, Unit
+    from src.core.pantry.models import PantryItemDomain
+    from src.core.pantry.specs import (
+        ListPantryItemsSpec,
+        PantryListCursor,
+        UpdatePantryItemSpec,
+    )
+    from src.core.receipt.accessors.receipt_item_classification_accessor import (
+        IReceiptItemClassificationAccessor,
+    )
+    from src.core.receipt.accessors.receipt_job_accessor import IReceiptJobAccessor
+    from src.core.receipt.accessors.receipt_result_accessor import (
+        IReceiptResultAccessor,
+    )
+    from src.core.receipt.accessors.receipt_upload_accessor import (
+        IReceiptUploadAccessor,
+    )
+    from src.core.receipt.models import (
+        ReceiptItemClassificationDomain,
+        ReceiptResultDomain,
+        ReceiptUploadDomain,
+    )
+    from src.pantrypal_api.modules import injector
+
+    now = DateTimeUtils.get_utc_now()
+
+    users = injector.get(IUserAccountAccessor)
+    user = await call(
+        users.create_user,
+        UserAccountDomain.create("advisor", "advisor@example.com", "x"),
+    )
+    await call(users.get_by_id, 1)
+    await call(users.get_by_email, "user1@example.com")
+    user.username = "advisor2"
+    await call(users.update_user, user)
+
+    tokens = injector.get(IAuthTokenAccessor)
+    token = AuthTokenDomain.create("advisor-token", 1, now, now + timedelta(hours=1))
+    await call(tokens.upsert, token)
+    await call(tokens.get_by_token, "advisor-token")
+    await call(tokens.delete_by_token, "advisor-token")
+    await call(tokens.delete_by_user_id, user.id)
+    await call(users.delete_by_id, user.id)
+
+    configurations = injector.get(IConfigurationAccessor)
+    await call(
+        configurations.get_by_key, ConfigurationKey.NOTIFICATION_EMAIL_SENDER_NAME
+    )
+
+    sessions = injector.get(IChatSessionAccessor)
+    session = await call(
+        sessions.create_session, ChatSessionDomain.create(user_id=1, title="Soup")
+    )
+    await call(sessions.list_sessions, 1)
+    await call(sessions.update_session_recipe, session.id, session)
+
+    history = injector.get(IChatbotHistoryAccessor)
+    await call(
+        history.save_message,
+        ChatMessageSpec(
+            user_id=1,
+            role=ChatbotMessageRole.USER,
+            content="What can I cook?",
+            timestamp=now,
+            session_id=1,
+        ),
+    )
+    await call(history.get_recent_messages, 1, 1)
+    await call(history.get_recent_messages, 1)
+    await call(history.get_prompt_window, 1, 1, 100)
+    await call(history.get_prompt_window, 1, None, 100, 1, 10**9)
+    await call(history.get_messages_by_session, 1)
+    await call(history.soft_delete_history_by_session, session.id)
+    await call(sessions.soft_delete_session, session.id)
+
+    pantry = injector.get(IPantryItemAccessor)
+    added = await call(
+        pantry.add_items,
+        [
+            PantryItemDomain.create(
+                user_id=1,
+                item_name=f"Advisor item {i}",
+                quantity=1,
+                unit=Unit.PIECES,
+                category=Category.OTHER,
+            )
+            for i in range(3)
+        ],
+    )
+    ids = [item.id for item in added]
+    item = await call(pantry.get_item_by_id, ids[0], 1)
+    item.quantity = 2
+    await call(pantry.update_item, item)
+    await call(
+        pantry.update_items, 1, [UpdatePantryItemSpec(id=i, quantity=3) for i in ids]
+    )
+    await call(pantry.get_items_by_user, 1)
+    await call(pantry.get_items_by_ids, ids, 1)
+    today = date.today()
+    await call(pantry.get_expiry_stats, 1, today, today + timedelta(days=7))
+    await call(pantry.get_items_expiring_before, 1, now + timedelta(days=7), 3)
+    await call(
+        pantry.get_items_page,
+        1,
+        ListPantryItemsSpec(
+            limit=20,
+            after=PantryListCursor(expiry_date=now, id=1),
+            categories=[Category.OTHER],
+        ),
+    )
+    await call(pantry.delete_items, ids[:1], 1, soft=True)
+    await call(pantry.delete_items, ids[1:], 1)
+
+    classifications = injector.get(IReceiptItemClassificationAccessor)
+    await call(
+        classifications.add_classifications,
+        [ReceiptItemClassificationDomain.create("milk 1l", "Milk 1L", "Milk", 1)],
+        now,
+    )
+    await call(classifications.get_by_names, ["milk 1l", "eggs"], now)
+
+    jobs = injector.get(IReceiptJobAccessor)
+    await call(jobs.enqueue, 1, "advisor-1.jpg", {})
+    await call(jobs.enqueue, 1, "advisor-2.jpg", {})
+    job = await call(jobs.claim_next, 60)
+    await call(jobs.retry_later, job, "timeout", now)
+    job = await call(jobs.claim_next, 60)
+    await call(jobs.complete, job)
+    job = await call(jobs.claim_next, 60)
+    await call(jobs.fail, job, "unreadable")
+    await call(jobs.get_job, 1, "advisor-1.jpg")
+    await call(jobs.get_statuses, ["advisor-1.jpg", "advisor-2.jpg"])
+
+    results = injector.get(IReceiptResultAccessor)
+    await call(results.add_result, ReceiptResultDomain.create(1, "advisor-1.jpg", {}))
+    await call(results.get_result, 1, "advisor-1.jpg")
+
+    uploads = injector.get(IReceiptUploadAccessor)
+    await call(
+        uploads.add_upload, ReceiptUploadDomain.create(1, "advisor-1.jpg", "abc123")
+    )
+    await call(uploads.get_latest_by_hash, 1, "abc123")
+
+
+def sqlite_flags(plan, tables):
+    """Flag table scans and sorts over table reads in EXPLAIN QUERY PLAN rows."""
+    flags = []
+    parents = {node: parent for node, parent, _, _ in plan}
+    details = {node: detail for node, _, _, detail in plan}
+    reads_table = set()
+    for node, parent, _, detail in plan:
+        match = re.match(r"(SCAN|SEARCH) (\w+)", detail)
+        if not match or match.group(2) not in tables:
+            continue
+        if match.group(1) == "SCAN":
+            flags.append(f"scan of {match.group(2)}")
+        # Rows feed every enclosing step up to the subquery that produces them
+        while True:
+            reads_table.add(parent)
+            if parent == 0 or details[parent].startswith(("CO-ROUTINE", "MATERIALIZE")):
+                break
+            parent = parents[parent]
+    for _, parent, _, detail in plan:
+        if detail.startswith("USE TEMP B-TREE") and parent in reads_table:
+            flags.append(detail.lower().replace("use temp b-tree for", "sort for"))
+    return flags
+
+
+def postgresql_flags(plan, tables):
+    """Flag Seq Scan and Sort nodes in EXPLAIN output lines."""
+    flags = []
+    for (line,) in plan:
+        match = re.search(r"Seq Scan on (\w+)", line)
+        if match and match.group(1) in tables:
+            flags.append(f"scan of {match.group(1)}")
+        elif re.match(r"\s*(->\s*)?(Incremental )?Sort\b", line):
+            flags.append("sort")
+    return flags
+
+
+async def run(args) -> bool:
+    from sqlalchemy import event
+
+    from src.core.storage.ports.relational_database_provider import (
+        IDatabaseProvider,
+    )
+    from src.pantrypal_api.base.models import PantryPalBaseModel
+    from src.pantrypal_api.modules import injector
+
+    if args.database_url:
+        await use_database(args.database_url)
+    else:
+        await prepare_database()
+    await seed(args)
+    engine = injector.get(IDatabaseProvider).engine
+    sqlite = engine.dialect.name == "sqlite"
+    if not sqlite:
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("ANALYZE")
+
+    current = [""]
+    queries = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(EXPLAINED_VERBS):
+            if executemany:
+                parameters = parameters[0]
+            queries.setdefault((current[0], statement), parameters)
+
+    async def call(method, *call_args, **call_kwargs):
+        current[0] = method.__qualname__
+        return await method(*call_args, **call_kwargs)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    await workload(call)
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    tables = set(PantryPalBaseModel.metadata.tables)
+    flagged = 0
+    print(f"\n{engine.dialect.name}, {len(queries)} accessor queries\n")
+    print("| accessor method | query | plan | flags |")
+    print("| --- | --- | --- | --- |")
+    async with engine.connect() as conn:
+        for (method, statement), parameters in queries.items():
+            prefix = "EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN "
+            plan = (await conn.exec_driver_sql(prefix + statement, parameters)).all()
+            flags = (sqlite_flags if sqlite else postgresql_flags)(plan, tables)
+            flagged += bool(flags)
+            query = " ".join(statement.split())
+            steps = "; ".join(row[-1].strip() for row in plan)
+            print(
+                f"| {method} | {query[:80]}{'...' if len(query) > 80 else ''} "
+                f"| {steps} | {', '.join(flags) or 'ok'} |"
+            )
+    print(f"\n{flagged} of {len(queries)} queries flagged")
+    return flagged == 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--items-per-user", type=int, default=50)
+    parser.add_argument("--messages-per-user", type=int, default=200)
+    parser.add_argument("--strict", action="store_true")
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    configure_environment()
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    clean = asyncio.run(run(args))
+    if args.strict and not clean:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
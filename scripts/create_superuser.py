@@ -39,7 +39,7 @@ async def create_superuser() -> None:
         print("Existing user promoted to admin.")
         return
 
-    password_hash = auth_provider.get_hashed_password(password)
+    password_hash = await auth_provider.get_hashed_password_async(password)
     admin = UserAccountDomain.create(
         username=username,
         email=email,
@@ -5,9 +5,16 @@ from fastapi.openapi.docs import get_swagger_ui_html
 
 from src.app.middleware import setup_middlewares
 from src.app.router_setup import setup_routers
+from src.core.account.ports.auth_provider import IAuthProvider
+from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+from src.core.chatbot.services.chat_history_writer import ChatHistoryWriter
 from src.core.common.constants import SecretKey
 from src.core.common.ports.secretkey_provider import ISecretProvider
 from src.core.logging.ports.logging_provider import ILoggingProvider
+from src.core.receipt.ports.receipt_gateway_provider import IReceiptGatewayProvider
+from src.core.receipt.ports.receipt_status_notifier import IReceiptStatusNotifier
+from src.core.receipt.services.receipt_gateway_service import ReceiptGatewayService
+from src.core.receipt.services.receipt_job_service import ReceiptJobService
 from src.core.storage.ports.relational_database_provider import IDatabaseProvider
 from src.pantrypal_api.admin.admin import setup_admin
 from src.pantrypal_api.modules import injector
@@ -20,7 +27,10 @@ def create_app() -> FastAPI:
     # Log application initialization
     logger.info("Initializing PantryPal API server...", tag="Startup")
 
-    # Lifespan event handler to ensure default admin user exists on app startup
+    # Lifespan event handler to ensure default admin user exists on app startup,
+    # to run the receipt job workers and the chat history writer, and to flush
+    # buffered chat messages and release pooled outbound connections, receipt
+    # status pollers and worker threads on shutdown
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         secret_provider = injector.get(ISecretProvider)
@@ -32,7 +42,18 @@ def create_app() -> FastAPI:
                 "Admin credentials are not fully configured; admin login will be disabled",
                 tag="Startup",
             )
+        receipt_jobs = injector.get(ReceiptJobService)
+        receipt_jobs.start()
+        chat_history_writer = injector.get(ChatHistoryWriter)
+        chat_history_writer.start()
         yield
+        await receipt_jobs.stop()
+        await chat_history_writer.stop()
+        await injector.get(ReceiptGatewayService).close()
+        await injector.get(IReceiptStatusNotifier).close()
+        await injector.get(IChatbotProvider).close()
+        await injector.get(IReceiptGatewayProvider).close()
+        await injector.get(IAuthProvider).close()
 
     # Initialize the FastAPI app
     app = FastAPI(
@@ -1,41 +1,59 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security.utils import get_authorization_scheme_param
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.requests import HTTPConnection
 from starlette.responses import RedirectResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from src.core.account.services.auth_service import AuthService
-from src.core.account.services.user_account_service import UserAccountService
-from src.pantrypal_api.modules import injector
+from src.pantrypal_api.account.dependencies import get_admin_user
+from src.pantrypal_api.pantry.schemas.pantry_schemas import NEXT_CURSOR_HEADER
 
 
-class AdminRedirectMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-        if path == "/docs" or (
+class AdminRedirectMiddleware:
+    """Redirects non-admin users away from /docs and the admin panel.
+
+    Implemented as plain ASGI so requests outside the protected paths are passed
+    straight through on a path check, without building a Request or wrapping the
+    response stream.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.__is_protected(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        if await self.__is_admin(HTTPConnection(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        response = RedirectResponse(url="/admin/login")
+        await response(scope, receive, send)
+
+    @staticmethod
+    async def __is_admin(connection: HTTPConnection) -> bool:
+        token = connection.headers.get("Authorization") or connection.cookies.get(
+            "Authorization"
+        )
+        if not token:
+            return False
+        scheme, param = get_authorization_scheme_param(str(token))
+        if scheme.lower() != "bearer":
+            param = str(token)
+        if not param:
+            return False
+        try:
+            return await get_admin_user(param) is not None
+        except Exception:
+            return False
+
+    @staticmethod
+    def __is_protected(path: str) -> bool:
+        return path == "/docs" or (
             path.startswith("/admin") and not path.startswith("/admin/login")
-        ):
-            token = request.headers.get("Authorization") or request.cookies.get(
-                "Authorization"
-            )
-            if token:
-                scheme, param = get_authorization_scheme_param(str(token))
-                if scheme.lower() != "bearer":
-                    param = str(token)
-                if param:
-                    auth_service = injector.get(AuthService)
-                    user_service = injector.get(UserAccountService)
-                    try:
-                        user_id = await auth_service.verify_auth_token(param)
-                        user = await user_service.get_user(user_id)
-                        if user and user.is_admin:
-                            return await call_next(request)
-                    except Exception:
-                        pass
-            return RedirectResponse(url="/admin/login")
-
-        return await call_next(request)
+        )
 
 
 def setup_middlewares(app: FastAPI):
@@ -46,5 +64,6 @@ def setup_middlewares(app: FastAPI):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
     app.add_middleware(AdminRedirectMiddleware)
@@ -7,6 +7,13 @@ class IAuthProvider(ABC):
         """Check if the raw password matches the hashed password."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def verify_password_async(
+        self, raw_password: str, hashed_password: str
+    ) -> bool:
+        """Check the password off the event loop (bcrypt is CPU-bound)."""
+        raise NotImplementedError
+
     @abstractmethod
     def generate_token(self, user_id: int) -> str:
         """Generate an access token for the given user ID."""
@@ -17,7 +24,21 @@ class IAuthProvider(ABC):
         """Hash the provided raw password securely."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_hashed_password_async(self, raw_password: str) -> str:
+        """Hash the password off the event loop (bcrypt is CPU-bound)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Return True if the hash was made with an outdated algorithm or cost."""
+        raise NotImplementedError
+
     @abstractmethod
     def decode_token(self, token: str) -> int:
         """Return the user ID encoded in the JWT token."""
         raise NotImplementedError
+
+    async def close(self) -> None:
+        """Releases worker threads held by the provider (no-op by default)."""
+        return None
@@ -0,0 +1,137 @@
+import hashlib
+import uuid
+from typing import Dict, Optional
+
+from injector import inject
+
+from src.core.account.models import UserAccountDomain
+from src.core.common.constants import SecretKey
+from src.core.common.ports.cache_provider import ICacheProvider
+from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.core.logging.ports.logging_provider import ILoggingProvider
+
+DEFAULT_AUTH_CACHE_TTL_SECONDS = 60
+
+
+class AuthCacheService:
+    """
+    Caches verified auth tokens and user lookups for authenticated requests.
+
+    Each user has at most one active token (see AuthTokenAccessor.upsert), so the
+    cache keeps a SHA-256 digest of that token per user rather than the raw token.
+    Users are cached without their password hash, so the cache can be a shared
+    backend; read users through the accessor before changing them.
+
+    Entries expire after AUTH_CACHE_TTL_SECONDS and are dropped explicitly whenever
+    a token is revoked or a user changes. Each invalidation also moves the user to
+    a new generation: callers take generation() before reading the database and
+    pass it to cache_token/cache_user, which drop their entry again if the user
+    was invalidated in between, so a slow lookup cannot bring back a stale one.
+    """
+
+    @inject
+    def __init__(
+        self,
+        cache_provider: ICacheProvider,
+        secret_provider: ISecretProvider,
+        logging_provider: ILoggingProvider,
+    ):
+        self.cache_provider = cache_provider
+        self.logging_provider = logging_provider
+        try:
+            self.ttl_seconds = int(
+                secret_provider.get_secret(
+                    SecretKey.AUTH_CACHE_TTL_SECONDS,
+                    str(DEFAULT_AUTH_CACHE_TTL_SECONDS),
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid AUTH_CACHE_TTL_SECONDS value in .env")
+
+        self.token_hits = 0
+        self.token_misses = 0
+        self.user_hits = 0
+        self.user_misses = 0
+
+    async def is_token_cached(self, user_id: int, token: str) -> bool:
+        """Return True if the token was verified recently and not revoked since."""
+        cached_digest = await self.cache_provider.get(self.__token_key(user_id))
+        if cached_digest is not None and cached_digest == self.__digest(token):
+            self.token_hits += 1
+            return True
+        self.token_misses += 1
+        return False
+
+    async def generation(self, user_id: int) -> Optional[str]:
+        """The user's current generation; take it before reading the database."""
+        return await self.cache_provider.get(self.__generation_key(user_id))
+
+    async def cache_token(
+        self, user_id: int, token: str, generation: Optional[str]
+    ) -> None:
+        key = self.__token_key(user_id)
+        await self.cache_provider.set(key, self.__digest(token), self.ttl_seconds)
+        await self.__drop_if_invalidated(user_id, generation, key)
+
+    async def invalidate_user_tokens(self, user_id: int) -> None:
+        await self.__next_generation(user_id)
+        await self.cache_provider.delete(self.__token_key(user_id))
+
+    async def get_user(self, user_id: int) -> Optional[UserAccountDomain]:
+        cached = await self.cache_provider.get(self.__user_key(user_id))
+        if cached is None:
+            self.user_misses += 1
+            return None
+        self.user_hits += 1
+        # The hash is never cached; callers checking passwords use the accessor
+        return UserAccountDomain.model_validate({**cached, "password_hash": ""})
+
+    async def cache_user(
+        self, user: UserAccountDomain, generation: Optional[str]
+    ) -> None:
+        key = self.__user_key(user.id)
+        await self.cache_provider.set(
+            key,
+            user.model_dump(mode="json", exclude={"password_hash"}),
+            self.ttl_seconds,
+        )
+        await self.__drop_if_invalidated(user.id, generation, key)
+
+    async def invalidate_user(self, user_id: int) -> None:
+        await self.__next_generation(user_id)
+        await self.cache_provider.delete(
+            self.__user_key(user_id), self.__token_key(user_id)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters since process start."""
+        return {
+            "token_hits": self.token_hits,
+            "token_misses": self.token_misses,
+            "user_hits": self.user_hits,
+            "user_misses": self.user_misses,
+        }
+
+    async def __next_generation(self, user_id: int) -> None:
+        await self.cache_provider.set(
+            self.__generation_key(user_id), uuid.uuid4().hex, self.ttl_seconds
+        )
+
+    async def __drop_if_invalidated(
+        self, user_id: int, generation: Optional[str], key: str
+    ) -> None:
+        """Remove a just-written entry if the user was invalidated since generation."""
+        if await self.generation(user_id) != generation:
+            await self.cache_provider.delete(key)
+
+    def __generation_key(self, user_id: int) -> str:
+        return f"auth:generation:{user_id}"
+
+    def __token_key(self, user_id: int) -> str:
+        return f"auth:token:{user_id}"
+
+    def __user_key(self, user_id: int) -> str:
+        return f"auth:user:{user_id}"
+
+    def __digest(self, token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
@@ -3,8 +3,9 @@ from injector import inject
 
 from src.core.account.accessors.auth_token_accessor import IAuthTokenAccessor
 from src.core.account.accessors.user_account_accessor import IUserAccountAccessor
-from src.core.account.models import AuthTokenDomain
+from src.core.account.models import AuthTokenDomain, UserAccountDomain
 from src.core.account.ports.auth_provider import IAuthProvider
+from src.core.account.services.auth_cache_service import AuthCacheService
 from src.core.account.specs import LoginSpec
 from src.core.common.utils import DateTimeUtils
 from src.core.logging.ports.logging_provider import ILoggingProvider
@@ -20,15 +21,17 @@ class AuthService:
         user_accessor: IUserAccountAccessor,
         token_accessor: IAuthTokenAccessor,
         logging_provider: ILoggingProvider,
+        auth_cache: AuthCacheService,
     ):
         self.auth_provider = auth_provider
         self.user_accessor = user_accessor
         self.token_accessor = token_accessor
         self.logging_provider = logging_provider
+        self.auth_cache = auth_cache
 
     async def login(self, spec: LoginSpec) -> AuthTokenDomain:
         user = await self.user_accessor.get_by_email(spec.email)
-        if not user or not self.auth_provider.verify_password(
+        if not user or not await self.auth_provider.verify_password_async(
             spec.password, user.password_hash
         ):
             self.logging_provider.warning(
@@ -37,8 +40,33 @@ class AuthService:
 
             raise ValueError("Invalid email or password")
 
+        if self.auth_provider.needs_rehash(user.password_hash):
+            await self.__rehash_password(user, spec.password)
+
         return await self.create_auth_token(user.id)
 
+    async def __rehash_password(
+        self, user: UserAccountDomain, raw_password: str
+    ) -> None:
+        """Upgrade a hash made at an outdated bcrypt cost; failures don't block login."""
+        try:
+            user.password_hash = await self.auth_provider.get_hashed_password_async(
+                raw_password
+            )
+            await self.user_accessor.update_user(user)
+            await self.auth_cache.invalidate_user(user.id)
+            self.logging_provider.info(
+                "Password hash upgraded on login",
+                extra_data={"user_id": user.id},
+                tag="AuthService",
+            )
+        except Exception as e:
+            self.logging_provider.warning(
+                "Failed to upgrade password hash",
+                extra_data={"user_id": user.id, "error": str(e)},
+                tag="AuthService",
+            )
+
     async def create_auth_token(self, user_id: int) -> AuthTokenDomain:
         try:
             token = self.auth_provider.generate_token(user_id)
@@ -51,7 +79,10 @@ class AuthService:
                 token_issued_at=now,
                 expires_at=expires,
             )
-            return await self.token_accessor.upsert(auth_token)
+            saved_token = await self.token_accessor.upsert(auth_token)
+            # The upsert replaces the user's previous token, so drop it from the cache
+            await self.auth_cache.invalidate_user_tokens(user_id)
+            return saved_token
         except Exception as e:
             self.logging_provider.error(
                 "Failed to create auth token",
@@ -73,12 +104,18 @@ class AuthService:
                 detail="Invalid or expired token",
             )
         await self.token_accessor.delete_by_token(token)
+        await self.auth_cache.invalidate_user_tokens(auth_token.user_id)
 
     async def invalidate_user_tokens(self, user_id: int) -> None:
         await self.token_accessor.delete_by_user_id(user_id)
+        await self.auth_cache.invalidate_user_tokens(user_id)
 
     async def verify_auth_token(self, token: str) -> int:
-        """Verify a JWT token and return the associated user id."""
+        """Verify a JWT token and return the associated user id.
+
+        The JWT signature and expiry are always checked; the token table lookup is
+        skipped while the token is in the auth cache.
+        """
         try:
             user_id = self.auth_provider.decode_token(token)
         except Exception:
@@ -87,10 +124,15 @@ class AuthService:
                 detail="Invalid or expired token",
             )
 
+        if await self.auth_cache.is_token_cached(user_id, token):
+            return user_id
+
+        generation = await self.auth_cache.generation(user_id)
         auth_token = await self.token_accessor.get_by_token(token)
         if not auth_token or auth_token.user_id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid or expired token",
             )
+        await self.auth_cache.cache_token(user_id, token, generation)
         return user_id
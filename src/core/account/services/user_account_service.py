@@ -4,6 +4,7 @@ from src.core.account.accessors.auth_token_accessor import IAuthTokenAccessor
 from src.core.account.accessors.user_account_accessor import IUserAccountAccessor
 from src.core.account.models import UserAccountDomain
 from src.core.account.ports.auth_provider import IAuthProvider
+from src.core.account.services.auth_cache_service import AuthCacheService
 from src.core.account.specs import RegisterUserSpec, UpdateUserSpec
 from src.core.logging.ports.logging_provider import ILoggingProvider
 
@@ -18,11 +19,13 @@ class UserAccountService:
         auth_provider: IAuthProvider,
         auth_token_accessor: IAuthTokenAccessor,
         logging_provider: ILoggingProvider,
+        auth_cache: AuthCacheService,
     ):
         self.user_account_accessor = user_account_accessor
         self.auth_provider = auth_provider
         self.auth_token_accessor = auth_token_accessor
         self.logging_provider = logging_provider
+        self.auth_cache = auth_cache
 
     async def register_user(self, spec: RegisterUserSpec) -> UserAccountDomain:
         if await self.user_account_accessor.get_by_email(spec.email):
@@ -33,7 +36,9 @@ class UserAccountService:
             )
             raise ValueError("A user with this email already exists")
 
-        hashed_password = self.auth_provider.get_hashed_password(spec.password)
+        hashed_password = await self.auth_provider.get_hashed_password_async(
+            spec.password
+        )
 
         user = UserAccountDomain.create(
             username=spec.username,
@@ -59,9 +64,13 @@ class UserAccountService:
         if spec.email:
             user.email = spec.email
         if spec.password:
-            user.password_hash = self.auth_provider.get_hashed_password(spec.password)
+            user.password_hash = await self.auth_provider.get_hashed_password_async(
+                spec.password
+            )
 
-        return await self.user_account_accessor.update_user(user)
+        updated_user = await self.user_account_accessor.update_user(user)
+        await self.auth_cache.invalidate_user(user_id)
+        return updated_user
 
     async def delete_user(self, user_id: int) -> None:
         user = await self.user_account_accessor.get_by_id(user_id)
@@ -74,6 +83,16 @@ class UserAccountService:
 
         await self.auth_token_accessor.delete_by_user_id(user_id)
         await self.user_account_accessor.delete_by_id(user_id)
+        await self.auth_cache.invalidate_user(user_id)
 
     async def get_user(self, user_id: int) -> UserAccountDomain | None:
-        return await self.user_account_accessor.get_by_id(user_id)
+        """Look up a user for authentication; cached copies have no password hash."""
+        cached_user = await self.auth_cache.get_user(user_id)
+        if cached_user:
+            return cached_user
+
+        generation = await self.auth_cache.generation(user_id)
+        user = await self.user_account_accessor.get_by_id(user_id)
+        if user:
+            await self.auth_cache.cache_user(user, generation)
+        return user
@@ -1,8 +1,11 @@
+import base64
 from datetime import datetime
-from typing import Optional
+from typing import ClassVar, Optional, Type, TypeVar
 
 from pydantic import BaseModel
 
+CursorT = TypeVar("CursorT", bound="KeysetCursor")
+
 
 class PantryPalBaseModelDomain(BaseModel):
     id: int
@@ -12,3 +15,27 @@ class PantryPalBaseModelDomain(BaseModel):
 
 class PantryPalMutableModelDomain(PantryPalBaseModelDomain):
     updated_at: Optional[datetime] = None
+
+
+class KeysetCursor(BaseModel):
+    """
+    Keyset position in a paged list, passed to clients as an opaque token.
+
+    Subclasses declare the sort key fields and the label used in the error
+    raised for a token that does not decode.
+    """
+
+    label: ClassVar[str] = "list"
+
+    def encode(self) -> str:
+        """Encode the position as an opaque, URL-safe token."""
+        raw = self.model_dump_json().encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls: Type[CursorT], token: str) -> CursorT:
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            return cls.model_validate_json(raw)
+        except Exception:
+            raise ValueError(f"Invalid {cls.label} cursor")
@@ -1,15 +1,31 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
-from src.core.chatbot.models import ChatSessionDomain
+from src.core.chatbot.models import ChatSessionDomain, ChatSessionSummaryDomain
+from src.core.chatbot.specs import ChatMessageSpec, ListChatSessionsSpec
 
 
 class IChatSessionAccessor(ABC):
     """Data access layer for chat sessions."""
 
     @abstractmethod
-    async def list_sessions(self, user_id: int) -> List[ChatSessionDomain]:
-        """Return all sessions for a user."""
+    async def list_sessions(
+        self, user_id: int, spec: ListChatSessionsSpec
+    ) -> List[ChatSessionSummaryDomain]:
+        """
+        Return summaries of a user's sessions, most recently updated first.
+
+        At most ``spec.limit`` of them, starting after ``spec.after``. With
+        ``spec.ingredient``, only sessions whose ingredients contain every word
+        of it (see ``ChatSessionDomain.ingredient_terms``).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_session(
+        self, user_id: int, session_id: int
+    ) -> Optional[ChatSessionDomain]:
+        """Return a session with its recipe, or None unless the user owns it."""
         raise NotImplementedError
 
     @abstractmethod
@@ -24,6 +40,21 @@ class IChatSessionAccessor(ABC):
         """Update stored recipe details for a session."""
         raise NotImplementedError
 
+    @abstractmethod
+    async def save_turn(
+        self,
+        session_id: Optional[int],
+        recipe: Optional[ChatSessionDomain],
+        messages: List[ChatMessageSpec],
+    ) -> Optional[int]:
+        """
+        Store one chat turn in a single transaction and return its session id.
+
+        A recipe creates a session when ``session_id`` is None and updates that
+        session otherwise; the messages are stored under the resulting session.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def soft_delete_session(self, session_id: int) -> None:
         """Soft delete a chat session."""
@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
-from src.core.chatbot.models import ChatHistoryDomain
-from src.core.chatbot.specs import ChatMessageSpec
+from src.core.chatbot.models import ChatHistoryDomain, ChatPromptWindowDomain
+from src.core.chatbot.specs import ChatHistoryCursor, ChatMessageSpec
 
 
 class IChatbotHistoryAccessor(ABC):
@@ -10,6 +10,11 @@ class IChatbotHistoryAccessor(ABC):
     async def save_message(self, message: ChatMessageSpec) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def save_messages(self, messages: List[ChatMessageSpec]) -> None:
+        """Insert several messages with one multi-row INSERT and commit."""
+        raise NotImplementedError
+
     @abstractmethod
     async def get_recent_messages(
         self, user_id: int, session_id: Optional[int] = None
@@ -17,7 +22,44 @@ class IChatbotHistoryAccessor(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def get_messages_by_session(self, session_id: int) -> List[ChatHistoryDomain]:
+    async def get_prompt_window(
+        self,
+        user_id: int,
+        session_id: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        since: Optional[ChatHistoryCursor] = None,
+        before: Optional[ChatHistoryCursor] = None,
+    ) -> ChatPromptWindowDomain:
+        """
+        Newest messages whose stored token counts sum to at most token_budget.
+
+        The window is also capped at CHATBOT_MAX_CHAT_HISTORY messages and can be
+        restricted to the messages from since (included) up to before (excluded)
+        in (created_at, id) order.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_messages_by_session(
+        self,
+        session_id: int,
+        user_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        before: Optional[ChatHistoryCursor] = None,
+    ) -> List[ChatHistoryDomain]:
+        """
+        A session's messages, oldest first.
+
+        With limit, only the newest limit messages older than the before cursor
+        are returned, still oldest first. user_id restricts them to its owner.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream_messages_by_session(
+        self, session_id: int, user_id: Optional[int] = None
+    ) -> AsyncIterator[ChatHistoryDomain]:
+        """Yield a session's messages, oldest first, without loading them all."""
         raise NotImplementedError
 
     @abstractmethod
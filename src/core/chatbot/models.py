@@ -1,11 +1,21 @@
+import re
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from src.core.base.models import PantryPalBaseModelDomain
+from pydantic import BaseModel
+
+from src.core.base.models import PantryPalBaseModelDomain, PantryPalMutableModelDomain
 from src.core.chatbot.constants import ChatbotMessageRole
-from src.pantrypal_api.chatbot.schemas.chat_session_schemas import ChatSessionResponse
+from src.core.chatbot.specs import ChatHistoryCursor, ChatSessionListCursor
+from src.pantrypal_api.chatbot.schemas.chat_session_schemas import (
+    ChatSessionResponse,
+    ChatSessionSummaryResponse,
+)
 from src.pantrypal_api.chatbot.schemas.chatbot_schemas import Message
 
+# Words of three or more letters; quantities, units like "g" and punctuation drop out
+INGREDIENT_TERM_PATTERN = re.compile(r"[^\W\d_]{3,}")
+
 
 class ChatHistoryDomain(PantryPalBaseModelDomain):
     user_id: int
@@ -43,7 +53,23 @@ class ChatHistoryDomain(PantryPalBaseModelDomain):
         )
 
 
-class ChatSessionDomain(PantryPalBaseModelDomain):
+class ChatHistoryPageDomain(BaseModel):
+    """A page of a session's messages, oldest first, read back from the newest."""
+
+    messages: List[ChatHistoryDomain]
+    next_cursor: Optional[ChatHistoryCursor] = None  # Set if older ones exist
+
+
+class ChatPromptWindowDomain(BaseModel):
+    """The newest messages of a conversation that fit a prompt token budget."""
+
+    messages: List[Dict[str, str]]  # Oldest first, as {"role", "content"} dicts
+    first: Optional[ChatHistoryCursor] = None  # Oldest message in the window
+    token_count: int = 0
+    truncated: bool = False  # Older messages were left out of the window
+
+
+class ChatSessionDomain(PantryPalMutableModelDomain):
     user_id: int
     title: str
     summary: Optional[str] = None
@@ -88,3 +114,28 @@ class ChatSessionDomain(PantryPalBaseModelDomain):
             available_ingredients=available_ingredients,
             total_ingredients=total_ingredients,
         )
+
+    @staticmethod
+    def ingredient_terms(text: str) -> List[str]:
+        """Distinct lower-cased words in text, the terms ingredients are indexed by."""
+        return list(dict.fromkeys(INGREDIENT_TERM_PATTERN.findall(text.casefold())))
+
+
+class ChatSessionSummaryDomain(BaseModel):
+    """The columns a session list shows; the recipe is fetched per session."""
+
+    id: int
+    title: str
+    updated_at: datetime
+
+    def to_schema(self) -> ChatSessionSummaryResponse:
+        return ChatSessionSummaryResponse(
+            id=self.id, title=self.title, updated_at=self.updated_at
+        )
+
+
+class ChatSessionPageDomain(BaseModel):
+    """One page of session summaries, most recently updated first."""
+
+    sessions: List[ChatSessionSummaryDomain]
+    next_cursor: Optional[ChatSessionListCursor] = None
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import AsyncIterator, Dict, List
 
 from src.core.chatbot.specs import ChatMessageSpec
 
@@ -11,6 +11,19 @@ class IChatbotProvider(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def handle_multi_turn(self, messages: List[ChatMessageSpec]) -> str:
-        """Multi-turn conversation with history"""
+    async def handle_multi_turn(self, messages: List[Dict[str, str]]) -> str:
+        """Multi-turn conversation with history, as ``{"role", "content"}`` dicts"""
         raise NotImplementedError
+
+    async def stream_multi_turn(
+        self, messages: List[Dict[str, str]]
+    ) -> AsyncIterator[str]:
+        """Multi-turn conversation yielding reply tokens as they are generated.
+
+        Providers without native streaming fall back to yielding the full reply.
+        """
+        yield await self.handle_multi_turn(messages)
+
+    async def close(self) -> None:
+        """Releases pooled connections held by the provider (no-op by default)"""
+        return None
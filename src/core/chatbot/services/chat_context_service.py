@@ -0,0 +1,178 @@
+from typing import Dict, List, Optional, Tuple
+
+from injector import inject
+
+from src.core.chatbot.accessors.chatbot_history_accessor import IChatbotHistoryAccessor
+from src.core.chatbot.constants import ChatbotMessageRole
+from src.core.chatbot.models import ChatPromptWindowDomain
+from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+from src.core.chatbot.specs import ChatHistoryCursor, ChatMessageSpec
+from src.core.common.constants import SecretKey
+from src.core.common.ports.cache_provider import ICacheProvider
+from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.core.common.utils import TokenUtil
+from src.core.logging.ports.logging_provider import ILoggingProvider
+
+DEFAULT_HISTORY_TOKEN_BUDGET = 3000
+DEFAULT_HISTORY_SUMMARY_TOKENS = 0  # Rolling summaries are off unless configured
+SUMMARY_TTL_SECONDS = 24 * 60 * 60
+SUMMARY_INSTRUCTION = (
+    "Summarise the conversation below between a user and a recipe assistant. "
+    "Keep ingredients, dietary preferences and the recipes discussed. "
+    "Respond with a short plain-text summary only."
+)
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+
+
+class ChatContextService:
+    """
+    Builds the history part of contextual chat prompts within a token budget.
+
+    The newest messages of the conversation are kept while their token counts
+    (estimated once, when each message is saved) fit CHATBOT_HISTORY_TOKEN_BUDGET
+    less the new message, up to CHATBOT_MAX_CHAT_HISTORY messages.
+
+    With CHATBOT_HISTORY_SUMMARY_TOKENS set, turns that fall out of a session's
+    window are folded into a rolling summary cached per session. When the window
+    overflows, the summary absorbs enough older turns to free half the budget, so
+    it is regenerated every few turns rather than on every request.
+    """
+
+    @inject
+    def __init__(
+        self,
+        chatbot_history_accessor: IChatbotHistoryAccessor,
+        chatbot_provider: IChatbotProvider,
+        cache_provider: ICacheProvider,
+        secret_provider: ISecretProvider,
+        logging_provider: ILoggingProvider,
+    ):
+        self.chatbot_history_accessor = chatbot_history_accessor
+        self.chatbot_provider = chatbot_provider
+        self.cache_provider = cache_provider
+        self.logging_provider = logging_provider
+        try:
+            self.token_budget = int(
+                secret_provider.get_secret(
+                    SecretKey.CHATBOT_HISTORY_TOKEN_BUDGET,
+                    str(DEFAULT_HISTORY_TOKEN_BUDGET),
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid CHATBOT_HISTORY_TOKEN_BUDGET value in .env")
+        try:
+            self.summary_tokens = int(
+                secret_provider.get_secret(
+                    SecretKey.CHATBOT_HISTORY_SUMMARY_TOKENS,
+                    str(DEFAULT_HISTORY_SUMMARY_TOKENS),
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid CHATBOT_HISTORY_SUMMARY_TOKENS value in .env")
+
+    async def build_messages(self, message: ChatMessageSpec) -> List[Dict[str, str]]:
+        """Return the budgeted history followed by the new message, oldest first."""
+        budget = max(self.token_budget - TokenUtil.estimate_tokens(message.content), 0)
+        if self.summary_tokens > 0 and message.session_id is not None:
+            history = await self.__summarised_history(message, budget)
+        else:
+            window = await self.chatbot_history_accessor.get_prompt_window(
+                message.user_id, session_id=message.session_id, token_budget=budget
+            )
+            history = window.messages
+        history.append(message.to_prompt_message())
+        return history
+
+    async def __summarised_history(
+        self, message: ChatMessageSpec, budget: int
+    ) -> List[Dict[str, str]]:
+        summary = await self.cache_provider.get(self.__summary_key(message.session_id))
+        summary_cost = self.summary_tokens + TokenUtil.estimate_tokens(SUMMARY_PREFIX)
+        window_budget = max(budget - summary_cost, 0)
+        window = await self.chatbot_history_accessor.get_prompt_window(
+            message.user_id,
+            session_id=message.session_id,
+            token_budget=window_budget,
+            since=self.__summary_end(summary),
+        )
+        if window.truncated:
+            rolled = await self.__roll_summary(message, summary, window_budget)
+            if rolled is not None:
+                summary, window = rolled
+
+        if not summary:
+            return window.messages
+        summary_message = {
+            "role": ChatbotMessageRole.SYSTEM.value,
+            "content": SUMMARY_PREFIX + summary["content"],
+        }
+        return [summary_message, *window.messages]
+
+    async def __roll_summary(
+        self, message: ChatMessageSpec, summary: Optional[Dict], window_budget: int
+    ) -> Optional[Tuple[Dict, ChatPromptWindowDomain]]:
+        """Fold the turns older than half the window budget into the summary."""
+        since = self.__summary_end(summary)
+        window = await self.chatbot_history_accessor.get_prompt_window(
+            message.user_id,
+            session_id=message.session_id,
+            token_budget=window_budget // 2,
+            since=since,
+        )
+        if window.first is None:
+            return None
+        folded = await self.chatbot_history_accessor.get_prompt_window(
+            message.user_id,
+            session_id=message.session_id,
+            token_budget=self.token_budget,
+            since=since,
+            before=window.first,
+        )
+        if not folded.messages:
+            return None
+
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in folded.messages)
+        if summary:
+            transcript = f"Earlier summary: {summary['content']}\n{transcript}"
+        try:
+            content = await self.chatbot_provider.handle_multi_turn(
+                [
+                    {
+                        "role": ChatbotMessageRole.SYSTEM.value,
+                        "content": SUMMARY_INSTRUCTION,
+                    },
+                    {"role": ChatbotMessageRole.USER.value, "content": transcript},
+                ]
+            )
+        except Exception as e:
+            self.logging_provider.warning(
+                "Failed to summarise chat history; using the plain window",
+                extra_data={"session_id": message.session_id, "error": str(e)},
+                tag="ChatContextService",
+            )
+            return None
+
+        summary = {
+            "content": content[: self.summary_tokens * TokenUtil.CHARS_PER_TOKEN],
+            # First message not folded in, in the (created_at, id) window order
+            "next": window.first.model_dump(mode="json"),
+        }
+        await self.cache_provider.set(
+            self.__summary_key(message.session_id), summary, SUMMARY_TTL_SECONDS
+        )
+        self.logging_provider.debug(
+            "Rolled chat history summary",
+            extra_data={
+                "session_id": message.session_id,
+                "folded_messages": len(folded.messages),
+            },
+        )
+        return summary, window
+
+    @staticmethod
+    def __summary_end(summary: Optional[Dict]) -> Optional[ChatHistoryCursor]:
+        """Position of the first message after the summary, if there is one."""
+        return ChatHistoryCursor.model_validate(summary["next"]) if summary else None
+
+    def __summary_key(self, session_id: int) -> str:
+        return f"chat:summary:v2:{session_id}"
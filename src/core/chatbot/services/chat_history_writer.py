@@ -0,0 +1,136 @@
+import asyncio
+from typing import List, Optional, Tuple
+
+from injector import inject
+
+from src.core.chatbot.accessors.chatbot_history_accessor import IChatbotHistoryAccessor
+from src.core.chatbot.specs import ChatMessageSpec
+from src.core.common.constants import SecretKey
+from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.core.logging.ports.logging_provider import ILoggingProvider
+
+DEFAULT_CHATBOT_HISTORY_FLUSH_MS = 0
+DEFAULT_CHATBOT_HISTORY_FLUSH_MAX_ROWS = 500
+
+
+class ChatHistoryWriter:
+    """
+    Coalesces chat message inserts from concurrent requests into batched writes.
+
+    With CHATBOT_HISTORY_FLUSH_MS above 0, ``write`` queues a turn's messages
+    and a task started with the app inserts everything queued every
+    CHATBOT_HISTORY_FLUSH_MS milliseconds, in multi-row INSERTs of at most
+    CHATBOT_HISTORY_FLUSH_MAX_ROWS rows sharing one commit each. Callers still
+    wait for the flush holding their messages, so a reply is only returned once
+    its history is stored and a failed insert is raised to them. ``stop``
+    flushes whatever is still queued.
+
+    At 0, the default, the writer is disabled and each chat turn is stored in
+    its own transaction instead.
+    """
+
+    @inject
+    def __init__(
+        self,
+        chatbot_history_accessor: IChatbotHistoryAccessor,
+        secret_provider: ISecretProvider,
+        logging_provider: ILoggingProvider,
+    ) -> None:
+        self.chatbot_history_accessor = chatbot_history_accessor
+        self.logging_provider = logging_provider
+        try:
+            self.flush_ms = int(
+                secret_provider.get_secret(
+                    SecretKey.CHATBOT_HISTORY_FLUSH_MS,
+                    str(DEFAULT_CHATBOT_HISTORY_FLUSH_MS),
+                )
+            )
+            if self.flush_ms < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ValueError("Invalid CHATBOT_HISTORY_FLUSH_MS value in .env")
+        try:
+            self.max_rows = int(
+                secret_provider.get_secret(
+                    SecretKey.CHATBOT_HISTORY_FLUSH_MAX_ROWS,
+                    str(DEFAULT_CHATBOT_HISTORY_FLUSH_MAX_ROWS),
+                )
+            )
+            if self.max_rows < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ValueError("Invalid CHATBOT_HISTORY_FLUSH_MAX_ROWS value in .env")
+
+        self._pending: List[Tuple[List[ChatMessageSpec], asyncio.Future]] = []
+        self._stopping: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.flush_ms > 0
+
+    async def write(self, messages: List[ChatMessageSpec]) -> None:
+        """Store messages with the next flush and wait until it has committed."""
+        if self._task is None:
+            # Not started (disabled, or outside the app): write straight through
+            await self.chatbot_history_accessor.save_messages(messages)
+            return
+        done = asyncio.get_running_loop().create_future()
+        self._pending.append((messages, done))
+        await done
+
+    def start(self) -> None:
+        """Start flushing on the running event loop, if enabled."""
+        if not self.enabled or self._task is not None:
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self.__run(), name="chat-history-writer")
+        self.logging_provider.info(
+            "Chat history writer started",
+            extra_data={"flush_ms": self.flush_ms, "max_rows": self.max_rows},
+            tag="ChatHistoryWriter",
+        )
+
+    async def stop(self) -> None:
+        """Stop the flush task once everything queued has been written."""
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+        await self.flush()  # Anything queued while the last flush ran
+
+    async def flush(self) -> None:
+        """Write every queued message now, resolving the waiting callers."""
+        while self._pending:
+            batch = [self._pending.pop(0)]
+            rows = len(batch[0][0])
+            while self._pending and rows + len(self._pending[0][0]) <= self.max_rows:
+                batch.append(self._pending.pop(0))
+                rows += len(batch[-1][0])
+
+            try:
+                await self.chatbot_history_accessor.save_messages(
+                    [message for messages, _ in batch for message in messages]
+                )
+            except Exception as exc:
+                self.logging_provider.error(
+                    "Failed to flush chat history",
+                    extra_data={"messages": rows, "error": str(exc)},
+                    tag="ChatHistoryWriter",
+                )
+                for _, done in batch:
+                    if not done.done():
+                        done.set_exception(exc)
+            else:
+                for _, done in batch:
+                    if not done.done():
+                        done.set_result(None)
+
+    async def __run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.flush_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
@@ -1,10 +1,22 @@
-from typing import List
+from typing import AsyncIterator, List, Optional
 
 from injector import inject
 
 from src.core.chatbot.accessors.chat_session_accessor import IChatSessionAccessor
 from src.core.chatbot.accessors.chatbot_history_accessor import IChatbotHistoryAccessor
-from src.core.chatbot.models import ChatHistoryDomain, ChatSessionDomain
+from src.core.chatbot.models import (
+    ChatHistoryDomain,
+    ChatHistoryPageDomain,
+    ChatSessionDomain,
+    ChatSessionPageDomain,
+)
+from src.core.chatbot.services.chat_history_writer import ChatHistoryWriter
+from src.core.chatbot.specs import (
+    ChatHistoryCursor,
+    ChatMessageSpec,
+    ChatSessionListCursor,
+    ListChatSessionsSpec,
+)
 from src.core.logging.ports.logging_provider import ILoggingProvider
 
 
@@ -16,23 +28,76 @@ class ChatSessionService:
         self,
         chat_session_accessor: IChatSessionAccessor,
         chatbot_history_accessor: IChatbotHistoryAccessor,
+        chat_history_writer: ChatHistoryWriter,
         logging_provider: ILoggingProvider,
     ):
         self.chat_session_accessor = chat_session_accessor
         self.chatbot_history_accessor = chatbot_history_accessor
+        self.chat_history_writer = chat_history_writer
         self.logging_provider = logging_provider
 
-    async def list_sessions(self, user_id: int) -> List[ChatSessionDomain]:
-        """Return all sessions owned by a user."""
-        return await self.chat_session_accessor.list_sessions(user_id)
+    async def list_sessions(
+        self, user_id: int, spec: ListChatSessionsSpec
+    ) -> ChatSessionPageDomain:
+        """List session summaries, newest activity first, one keyset page at a time."""
+        query = spec
+        if spec.limit is not None:
+            # One extra row tells us whether another page follows
+            query = spec.model_copy(update={"limit": spec.limit + 1})
+        sessions = await self.chat_session_accessor.list_sessions(user_id, query)
+
+        next_cursor = None
+        if spec.limit is not None and len(sessions) > spec.limit:
+            sessions = sessions[: spec.limit]
+            last = sessions[-1]
+            next_cursor = ChatSessionListCursor(updated_at=last.updated_at, id=last.id)
+        return ChatSessionPageDomain(sessions=sessions, next_cursor=next_cursor)
+
+    async def get_session(
+        self, user_id: int, session_id: int
+    ) -> Optional[ChatSessionDomain]:
+        """Fetch one of the user's sessions with its full recipe."""
+        return await self.chat_session_accessor.get_session(user_id, session_id)
 
     async def create_session(self, session: ChatSessionDomain) -> ChatSessionDomain:
         """Create and persist a new chat session."""
         return await self.chat_session_accessor.create_session(session)
 
-    async def get_session_history(self, session_id: int) -> List[ChatHistoryDomain]:
-        """Fetch full chat history for a session."""
-        return await self.chatbot_history_accessor.get_messages_by_session(session_id)
+    async def get_session_history(
+        self,
+        user_id: int,
+        session_id: int,
+        limit: Optional[int] = None,
+        before: Optional[ChatHistoryCursor] = None,
+    ) -> ChatHistoryPageDomain:
+        """
+        Fetch a session's chat history, oldest first.
+
+        Without limit the whole history is returned. With limit, the newest
+        limit messages older than the before cursor, and the cursor for the
+        page before them.
+        """
+        messages = await self.chatbot_history_accessor.get_messages_by_session(
+            session_id,
+            user_id=user_id,
+            # One extra row tells us whether older messages remain
+            limit=limit + 1 if limit is not None else None,
+            before=before,
+        )
+        next_cursor = None
+        if limit is not None and len(messages) > limit:
+            messages = messages[1:]
+            oldest = messages[0]
+            next_cursor = ChatHistoryCursor(created_at=oldest.created_at, id=oldest.id)
+        return ChatHistoryPageDomain(messages=messages, next_cursor=next_cursor)
+
+    def stream_session_history(
+        self, user_id: int, session_id: int
+    ) -> AsyncIterator[ChatHistoryDomain]:
+        """Yield a session's whole chat history, oldest first, as it is read."""
+        return self.chatbot_history_accessor.stream_messages_by_session(
+            session_id, user_id=user_id
+        )
 
     async def update_session_recipe(
         self, session_id: int, session: ChatSessionDomain
@@ -42,6 +107,32 @@ class ChatSessionService:
             session_id, session
         )
 
+    async def save_turn(
+        self,
+        session_id: Optional[int],
+        recipe: Optional[ChatSessionDomain],
+        messages: List[ChatMessageSpec],
+    ) -> Optional[int]:
+        """
+        Store a chat turn's recipe and messages, returning the session id.
+
+        A recipe creates a session when ``session_id`` is None and updates that
+        session otherwise. Everything is one transaction, unless the chat
+        history writer is enabled: then the messages wait for its next flush.
+        """
+        if not self.chat_history_writer.enabled:
+            return await self.chat_session_accessor.save_turn(
+                session_id, recipe, messages
+            )
+        if recipe is not None:
+            session_id = await self.chat_session_accessor.save_turn(
+                session_id, recipe, []
+            )
+        await self.chat_history_writer.write(
+            [m.model_copy(update={"session_id": session_id}) for m in messages]
+        )
+        return session_id
+
     async def delete_session(self, session_id: int) -> None:
         """Soft delete a chat session and its history."""
         await self.chat_session_accessor.soft_delete_session(session_id)
@@ -1,61 +1,69 @@
-import json
 import re
 from datetime import datetime
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 from injector import inject
 
-from src.core.chatbot.accessors.chatbot_history_accessor import IChatbotHistoryAccessor
 from src.core.chatbot.constants import ChatbotMessageRole
 from src.core.chatbot.models import ChatSessionDomain
 from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+from src.core.chatbot.services.chat_context_service import ChatContextService
 from src.core.chatbot.services.chat_session_service import ChatSessionService
-from src.core.chatbot.specs import ChatMessageSpec
-from src.core.common.utils import DateTimeUtils
+from src.core.chatbot.specs import ChatMessageSpec, ChatStreamEventSpec
+from src.core.common.utils import DateTimeUtils, JsonExtractUtil
 from src.core.logging.ports.logging_provider import ILoggingProvider
-from src.core.pantry.services.pantry_service import PantryService
+from src.core.pantry.services.pantry_context_service import PantryContextService
+
+RECIPE_JSON_INSTRUCTION = (
+    "You are an assistant that recommends a recipe based on user-provided content.\n\n"
+    "Respond strictly in JSON format with the following fields:\n"
+    '- "title": (string) the recipe title\n'
+    '- "summary": (string) a short description of the recipe\n'
+    '- "prep_time": (string) total preparation time (e.g., "15 mins")\n'
+    '- "ingredients": (list of strings) all required ingredients\n'
+    '- "instructions": (ordered list of strings) step-by-step instructions\n'
+    '- "available_ingredients": (list of strings) ingredients marked as available by the user\n'
+    '- "total_ingredients": (integer) total number of unique ingredients\n'
+    '- "assistant_comment": (string) your conversational response based on the message context. '
+    "You may use markdown or formatting to enhance readability.\n\n"
+    "Return only a valid JSON object, with no additional text before or after."
+)
+# Built once and shared by every recommendation; providers must not mutate it
+RECIPE_FORMAT_MESSAGE = {
+    "role": ChatbotMessageRole.SYSTEM.value,
+    "content": RECIPE_JSON_INSTRUCTION,
+}
+PREP_HOURS_PATTERN = re.compile(r"(\d+)\s*(?:h|hr|hrs|hour|hours)", re.I)
+PREP_MINUTES_PATTERN = re.compile(r"(\d+)\s*(?:m|min|mins|minute|minutes)", re.I)
 
 
 class ChatbotService:
     """
     Service layer for managing chatbot interactions.
 
-    Bridges the chatbot provider and message history accessor to handle:
+    Bridges the chatbot provider and the chat session service to handle:
     - One-shot recipe recommendations
     - Contextual conversations with history persistence
+    - Token-streamed variants of both, persisting once the stream ends
     """
 
     @inject
     def __init__(
         self,
-        pantry_service: PantryService,
+        pantry_context_service: PantryContextService,
         chat_session_service: ChatSessionService,
+        chat_context_service: ChatContextService,
         chatbot_provider: IChatbotProvider,
-        chatbot_history_accessor: IChatbotHistoryAccessor,
         logging_provider: ILoggingProvider,
     ):
         """
-        Initializes the chatbot service with the given provider and chat history accessor.
+        Initializes the chatbot service with the given provider and chat services.
         """
-        self.pantry_service = pantry_service
+        self.pantry_context_service = pantry_context_service
         self.chat_session_service = chat_session_service
+        self.chat_context_service = chat_context_service
         self.chatbot_provider = chatbot_provider
-        self.chatbot_history_accessor = chatbot_history_accessor
         self.logging_provider = logging_provider
-        self._json_instruction = (
-            "You are an assistant that recommends a recipe based on user-provided content.\n\n"
-            "Respond strictly in JSON format with the following fields:\n"
-            '- "title": (string) the recipe title\n'
-            '- "summary": (string) a short description of the recipe\n'
-            '- "prep_time": (string) total preparation time (e.g., "15 mins")\n'
-            '- "ingredients": (list of strings) all required ingredients\n'
-            '- "instructions": (ordered list of strings) step-by-step instructions\n'
-            '- "available_ingredients": (list of strings) ingredients marked as available by the user\n'
-            '- "total_ingredients": (integer) total number of unique ingredients\n'
-            '- "assistant_comment": (string) your conversational response based on the message context. '
-            "You may use markdown or formatting to enhance readability.\n\n"
-            "Return only a valid JSON object, with no additional text before or after."
-        )
 
     async def get_first_recommendation(
         self, message: ChatMessageSpec
@@ -70,52 +78,45 @@ class ChatbotService:
             f"Received one-shot message from user_id={message.user_id}"
         )
         try:
-            items = await self.pantry_service.get_items_sorted_by_expiry(
-                message.user_id
-            )
-            if items:
-                ingredient_list = ", ".join(
-                    f"{i.item_name} {i.quantity} {i.unit} exp {i.expiry_date.date() if i.expiry_date else 'N/A'}"
-                    for i in items
-                )
-                enriched = message.model_copy(
-                    update={
-                        "content": f"Prioritize ingredients nearing expiry: {ingredient_list}. "
-                        + message.content
-                    }
-                )
-            else:
-                enriched = message
-
-            messages = self.__prepend_format_instruction([enriched])
+            messages = await self.__build_recommendation_messages(message)
             reply = await self.chatbot_provider.handle_multi_turn(messages)
             self.logging_provider.debug("LLM reply generated for recipe recommendation")
-            session_data = self.__parse_recipe_reply(reply, message.user_id)
-            new_chat_session = await self.chat_session_service.create_session(
-                session_data
-            )
-
-            user_message = message.model_copy(
-                update={"session_id": new_chat_session.id}
-            )
+            session_id = await self.__save_first_recommendation(message, reply)
+            return reply, session_id
+        except Exception as e:
+            self.logging_provider.error(f"Error in get_first_recommendation: {str(e)}")
+            raise
 
-            await self.chatbot_history_accessor.save_message(user_message)
-            self.logging_provider.debug("User message saved to chat history")
+    async def stream_first_recommendation(
+        self, message: ChatMessageSpec
+    ) -> AsyncIterator[ChatStreamEventSpec]:
+        """
+        Stream the first recipe suggestion for a user token by token.
 
-            reply_timestamp = DateTimeUtils.get_utc_now()
-            assistant_message = self.__create_chat_message_spec(
-                user_id=message.user_id,
-                role=ChatbotMessageRole.ASSISTANT,
-                content=reply,
-                timestamp=reply_timestamp,
-                session_id=new_chat_session.id,
-            )
-            await self.chatbot_history_accessor.save_message(assistant_message)
-            self.logging_provider.debug("Assistant message saved to chat history")
+        The session and both chat messages are persisted once, after the provider
+        finishes the reply; the final event carries the full reply and session id.
 
-            return reply, new_chat_session.id
+        :param message: The user's input message
+        :return: Async iterator of token events followed by a single done event
+        """
+        self.logging_provider.info(
+            f"Received streaming one-shot message from user_id={message.user_id}"
+        )
+        try:
+            messages = await self.__build_recommendation_messages(message)
+            tokens: List[str] = []
+            async for token in self.chatbot_provider.stream_multi_turn(messages):
+                tokens.append(token)
+                yield ChatStreamEventSpec(token=token)
+
+            reply = "".join(tokens)
+            self.logging_provider.debug("LLM reply streamed for recipe recommendation")
+            session_id = await self.__save_first_recommendation(message, reply)
+            yield ChatStreamEventSpec(reply=reply, session_id=session_id, done=True)
         except Exception as e:
-            self.logging_provider.error(f"Error in get_first_recommendation: {str(e)}")
+            self.logging_provider.error(
+                f"Error in stream_first_recommendation: {str(e)}"
+            )
             raise
 
     async def chat_with_context(self, message: ChatMessageSpec) -> str:
@@ -130,44 +131,43 @@ class ChatbotService:
             f"Processing contextual message for user_id={message.user_id}"
         )
         try:
-            recent_messages = await self.chatbot_history_accessor.get_recent_messages(
-                message.user_id, session_id=message.session_id
-            )
-            self.logging_provider.debug(
-                f"Fetched {len(recent_messages)} recent messages"
-            )
-
-            history_specs = [
-                ChatMessageSpec.model_validate(m.model_dump()) for m in recent_messages
-            ]
-            history_specs.append(message)
-
-            reply = await self.chatbot_provider.handle_multi_turn(history_specs)
-
+            history = await self.__build_context_messages(message)
+            reply = await self.chatbot_provider.handle_multi_turn(history)
             self.logging_provider.debug("LLM reply generated for contextual chat")
+            await self.__save_contextual_reply(message, reply)
+            return reply
+        except Exception as e:
+            self.logging_provider.error(f"Error in chat_with_context: {str(e)}")
+            raise
 
-            session_id = await self.__update_chat_session(
-                reply, message.user_id, message.session_id
-            )
+    async def stream_chat_with_context(
+        self, message: ChatMessageSpec
+    ) -> AsyncIterator[ChatStreamEventSpec]:
+        """
+        Streams a contextual chat reply token by token.
 
-            user_message = message.model_copy(update={"session_id": session_id})
-            await self.chatbot_history_accessor.save_message(user_message)
-            self.logging_provider.debug("User message saved to chat history")
-
-            reply_timestamp = DateTimeUtils.get_utc_now()
-            assistant_message = self.__create_chat_message_spec(
-                user_id=message.user_id,
-                role=ChatbotMessageRole.ASSISTANT,
-                content=reply,
-                timestamp=reply_timestamp,
-                session_id=session_id,
-            )
-            await self.chatbot_history_accessor.save_message(assistant_message)
-            self.logging_provider.debug("Assistant message saved to chat history")
+        The recipe parse and history persistence run once, after the provider
+        finishes the reply; the final event carries the full reply.
 
-            return reply
+        :param message: The latest user message
+        :return: Async iterator of token events followed by a single done event
+        """
+        self.logging_provider.info(
+            f"Processing streaming contextual message for user_id={message.user_id}"
+        )
+        try:
+            history = await self.__build_context_messages(message)
+            tokens: List[str] = []
+            async for token in self.chatbot_provider.stream_multi_turn(history):
+                tokens.append(token)
+                yield ChatStreamEventSpec(token=token)
+
+            reply = "".join(tokens)
+            self.logging_provider.debug("LLM reply streamed for contextual chat")
+            session_id = await self.__save_contextual_reply(message, reply)
+            yield ChatStreamEventSpec(reply=reply, session_id=session_id, done=True)
         except Exception as e:
-            self.logging_provider.error(f"Error in chat_with_context: {str(e)}")
+            self.logging_provider.error(f"Error in stream_chat_with_context: {str(e)}")
             raise
 
     async def get_recipe_title_suggestions(self, user_id: int) -> list[str]:
@@ -185,9 +185,9 @@ class ChatbotService:
         )
         reply = await self.chatbot_provider.handle_single_turn(message)
         try:
-            data = json.loads(reply)
-            if not isinstance(data, list):
-                raise ValueError("Response not list")
+            data = JsonExtractUtil.extract(
+                reply, accept=lambda value: isinstance(value, list)
+            )
             return [str(t) for t in data]
         except Exception:
             self.logging_provider.error(
@@ -221,43 +221,75 @@ class ChatbotService:
             session_id=session_id,
         )
 
-    def __prepend_format_instruction(
-        self, messages: List[ChatMessageSpec]
-    ) -> List[ChatMessageSpec]:
-        system_msg = ChatMessageSpec(
-            user_id=messages[0].user_id,
-            role=ChatbotMessageRole.SYSTEM,
-            content=self._json_instruction,
-            timestamp=DateTimeUtils.get_utc_now(),
-            session_id=messages[0].session_id,
+    async def __build_recommendation_messages(
+        self, message: ChatMessageSpec
+    ) -> List[Dict[str, str]]:
+        """Prefix the user message with expiring pantry items, after the format prompt."""
+        ingredients = await self.pantry_context_service.get_ingredient_block(
+            message.user_id
         )
-        return [system_msg, *messages]
+        return [
+            RECIPE_FORMAT_MESSAGE,
+            {"role": message.role.value, "content": ingredients + message.content},
+        ]
 
-    async def __update_chat_session(
-        self, reply: str, user_id: int, session_id: Optional[int]
+    async def __save_first_recommendation(
+        self, message: ChatMessageSpec, reply: str
     ) -> Optional[int]:
-        session_data = self.__parse_recipe_reply(reply, user_id)
-        if session_data is None:
-            return session_id
-        await self.chat_session_service.update_session_recipe(session_id, session_data)
+        """Create the chat session for a recommendation and persist both messages."""
+        session_data = self.__parse_recipe_reply(reply, message.user_id)
+        session_id = await self.chat_session_service.save_turn(
+            None, session_data, [message, self.__assistant_message(message, reply)]
+        )
+        self.logging_provider.debug("Chat session and messages saved")
         return session_id
 
+    async def __build_context_messages(
+        self, message: ChatMessageSpec
+    ) -> List[Dict[str, str]]:
+        """Load the budgeted history for the message's session and append the message."""
+        history = await self.chat_context_service.build_messages(message)
+        self.logging_provider.debug(f"Built context of {len(history)} messages")
+        return history
+
+    async def __save_contextual_reply(
+        self, message: ChatMessageSpec, reply: str
+    ) -> Optional[int]:
+        """Update the session recipe from the reply and persist both messages."""
+        session_data = self.__parse_recipe_reply(reply, message.user_id)
+        session_id = await self.chat_session_service.save_turn(
+            message.session_id,
+            session_data,
+            [message, self.__assistant_message(message, reply)],
+        )
+        self.logging_provider.debug("Chat session and messages saved")
+        return session_id
+
+    def __assistant_message(
+        self, message: ChatMessageSpec, reply: str
+    ) -> ChatMessageSpec:
+        """The reply to message, to store in the same session."""
+        return self.__create_chat_message_spec(
+            user_id=message.user_id,
+            role=ChatbotMessageRole.ASSISTANT,
+            content=reply,
+            timestamp=DateTimeUtils.get_utc_now(),
+            session_id=message.session_id,
+        )
+
     def __parse_recipe_reply(
         self, reply: str, user_id: int
     ) -> Optional[ChatSessionDomain]:
         """Return a ChatSessionDomain if reply contains recipe JSON."""
         try:
-            data = json.loads(reply)
-        except Exception:
-            return None
-
-        if not isinstance(data, dict) or "title" not in data:
+            data = JsonExtractUtil.extract(reply, accept=self.__is_recipe)
+        except ValueError:
             return None
 
         prep = data.get("prep_time")
         if isinstance(prep, str):
-            hours_match = re.search(r"(\d+)\s*(?:h|hr|hrs|hour|hours)", prep, re.I)
-            mins_match = re.search(r"(\d+)\s*(?:m|min|mins|minute|minutes)", prep, re.I)
+            hours_match = PREP_HOURS_PATTERN.search(prep)
+            mins_match = PREP_MINUTES_PATTERN.search(prep)
             total = 0
             if hours_match:
                 total += int(hours_match.group(1)) * 60
@@ -284,3 +316,7 @@ class ChatbotService:
                 "total_ingredients", len(data.get("ingredients", []))
             ),
         )
+
+    @staticmethod
+    def __is_recipe(value) -> bool:
+        return isinstance(value, dict) and "title" in value
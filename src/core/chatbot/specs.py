@@ -1,8 +1,9 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import BaseModel
 
+from src.core.base.models import KeysetCursor
 from src.core.chatbot.constants import ChatbotMessageRole
 
 
@@ -12,3 +13,42 @@ class ChatMessageSpec(BaseModel):
     content: str
     timestamp: datetime
     session_id: Optional[int] = None
+
+    def to_prompt_message(self) -> Dict[str, str]:
+        """Return the ``{"role", "content"}`` dict chatbot providers send."""
+        return {"role": self.role.value, "content": self.content}
+
+
+class ChatStreamEventSpec(BaseModel):
+    """A streamed reply token, or the final event once the reply is persisted."""
+
+    token: Optional[str] = None
+    reply: Optional[str] = None
+    session_id: Optional[int] = None
+    done: bool = False
+
+
+class ChatSessionListCursor(KeysetCursor):
+    """Keyset position in the (updated_at desc, id desc) order of a session list."""
+
+    label = "chat session list"
+
+    updated_at: datetime
+    id: int
+
+
+class ChatHistoryCursor(KeysetCursor):
+    """Keyset position in the (created_at desc, id desc) order of a session's history."""
+
+    label = "chat history"
+
+    created_at: datetime
+    id: int
+
+
+class ListChatSessionsSpec(BaseModel):
+    """Page and filter options for listing a user's chat sessions."""
+
+    limit: Optional[int] = None  # None returns every matching session
+    after: Optional[ChatSessionListCursor] = None
+    ingredient: Optional[str] = None  # Words every listed session's ingredients use
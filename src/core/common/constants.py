@@ -9,15 +9,46 @@ class SecretKey(str, Enum):
     CHATBOT_MODEL = "CHATBOT_MODEL"
     CHATBOT_MAX_TOKENS = "CHATBOT_MAX_TOKENS"
     CHATBOT_MAX_CHAT_HISTORY = "CHATBOT_MAX_CHAT_HISTORY"
+    CHATBOT_HISTORY_TOKEN_BUDGET = "CHATBOT_HISTORY_TOKEN_BUDGET"
+    CHATBOT_HISTORY_SUMMARY_TOKENS = "CHATBOT_HISTORY_SUMMARY_TOKENS"
+    CHATBOT_HISTORY_FLUSH_MS = "CHATBOT_HISTORY_FLUSH_MS"
+    CHATBOT_HISTORY_FLUSH_MAX_ROWS = "CHATBOT_HISTORY_FLUSH_MAX_ROWS"
+    CHATBOT_MAX_CONNECTIONS = "CHATBOT_MAX_CONNECTIONS"
+    CHATBOT_MAX_CONCURRENT_REQUESTS = "CHATBOT_MAX_CONCURRENT_REQUESTS"
+    CHATBOT_REQUEST_TIMEOUT_SECONDS = "CHATBOT_REQUEST_TIMEOUT_SECONDS"
+    GROQ_BASE_URL = "GROQ_BASE_URL"
     AUTH_SECRET_KEY = "AUTH_SECRET_KEY"
     AUTH_ALGORITHM = "AUTH_ALGORITHM"
     AUTH_TOKEN_EXPIRY_MINUTES = "AUTH_TOKEN_EXPIRY_MINUTES"
+    AUTH_CACHE_TTL_SECONDS = "AUTH_CACHE_TTL_SECONDS"
+    AUTH_BCRYPT_ROUNDS = "AUTH_BCRYPT_ROUNDS"
+    AUTH_HASH_MAX_WORKERS = "AUTH_HASH_MAX_WORKERS"
+    AUTH_HASH_MAX_PENDING = "AUTH_HASH_MAX_PENDING"
+    CACHE_MAX_ENTRIES = "CACHE_MAX_ENTRIES"
     ADMIN_USERNAME = "ADMIN_USERNAME"
     ADMIN_EMAIL = "ADMIN_EMAIL"
     ADMIN_PASSWORD = "ADMIN_PASSWORD"
     RECEIPT_UPLOAD_BUCKET = "RECEIPT_UPLOAD_BUCKET"
     RECEIPT_UPLOAD_ENDPOINT = "RECEIPT_UPLOAD_ENDPOINT"
     RECEIPT_RETRIEVE_ENDPOINT = "RECEIPT_RETRIEVE_ENDPOINT"
+    RECEIPT_JOB_WORKERS = "RECEIPT_JOB_WORKERS"
+    RECEIPT_JOB_MAX_ATTEMPTS = "RECEIPT_JOB_MAX_ATTEMPTS"
+    RECEIPT_JOB_LEASE_SECONDS = "RECEIPT_JOB_LEASE_SECONDS"
+    RECEIPT_ITEM_CACHE_TTL_SECONDS = "RECEIPT_ITEM_CACHE_TTL_SECONDS"
+    RECEIPT_ITEM_CACHE_MAX_AGE_DAYS = "RECEIPT_ITEM_CACHE_MAX_AGE_DAYS"
+    RECEIPT_CLASSIFY_CHUNK_TOKENS = "RECEIPT_CLASSIFY_CHUNK_TOKENS"
+    RECEIPT_CLASSIFY_CONCURRENCY = "RECEIPT_CLASSIFY_CONCURRENCY"
+    RECEIPT_GATEWAY_CONNECTIONS = "RECEIPT_GATEWAY_CONNECTIONS"
+    RECEIPT_GATEWAY_TIMEOUT_SECONDS = "RECEIPT_GATEWAY_TIMEOUT_SECONDS"
+    RECEIPT_GATEWAY_RETRIES = "RECEIPT_GATEWAY_RETRIES"
+    RECEIPT_RESULT_WAIT_SECONDS = "RECEIPT_RESULT_WAIT_SECONDS"
+    RECEIPT_RESULT_POLL_SECONDS = "RECEIPT_RESULT_POLL_SECONDS"
+    RECEIPT_STATUS_BACKEND = "RECEIPT_STATUS_BACKEND"
+    RECEIPT_STATUS_POLL_SECONDS = "RECEIPT_STATUS_POLL_SECONDS"
+    EXPIRY_PROVIDER_MAX_CONCURRENCY = "EXPIRY_PROVIDER_MAX_CONCURRENCY"
+    PANTRY_CONTEXT_MAX_TOKENS = "PANTRY_CONTEXT_MAX_TOKENS"
+    PANTRY_CONTEXT_TTL_SECONDS = "PANTRY_CONTEXT_TTL_SECONDS"
+    PANTRY_SOFT_DELETE = "PANTRY_SOFT_DELETE"
 
 
 SINGLE_VALUE_JSON_FIELD_TYPES = Optional[Union[str, int, float, Decimal, bool]]
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+
+class ICacheProvider(ABC):
+    """Key-value cache with per-entry expiry.
+
+    Values must be JSON-serialisable (dicts, lists, strings, numbers) so that a
+    shared backend can be bound in place of the in-process one.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        """Store a value that expires after ttl_seconds"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Remove the given keys, ignoring any that are not cached"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove every cached entry"""
+        raise NotImplementedError
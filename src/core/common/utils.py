@@ -1,4 +1,11 @@
+import binascii
+import hashlib
+import json
+import re
+from ast import literal_eval
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
 
 from passlib.context import CryptContext
 
@@ -44,11 +51,235 @@ class HashUtil:
     _context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
     @staticmethod
-    def hash(raw_password: str) -> str:
-        """Hash a plain-text password using bcrypt."""
-        return HashUtil._context.hash(raw_password)
+    def hash(raw_password: str, rounds: Optional[int] = None) -> str:
+        """Hash a plain-text password using bcrypt, optionally at a given cost."""
+        if rounds is None:
+            return HashUtil._context.hash(raw_password)
+        return HashUtil._context_for(rounds).hash(raw_password)
 
     @staticmethod
     def verify(raw_password: str, hashed_password: str) -> bool:
         """Verify a plain-text password against a hashed one."""
         return HashUtil._context.verify(raw_password, hashed_password)
+
+    @staticmethod
+    def needs_rehash(hashed_password: str, rounds: int) -> bool:
+        """Return True if the hash was not made with bcrypt at least at the given cost."""
+        try:
+            return HashUtil._context_for(rounds).needs_update(hashed_password)
+        except ValueError:  # Not a recognisable bcrypt hash
+            return True
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _context_for(rounds: int) -> CryptContext:
+        return CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,  # No max: lowering the cost never downgrades
+        )
+
+
+class TokenUtil:
+    """Cheap token estimates for budgeting LLM prompts without a tokenizer."""
+
+    CHARS_PER_TOKEN = 4
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Estimate tokens as one per four characters, rounded up."""
+        return (len(text) + TokenUtil.CHARS_PER_TOKEN - 1) // TokenUtil.CHARS_PER_TOKEN
+
+
+class ContentHashUtil:
+    """Content hashes for deduplicating uploaded files."""
+
+    BASE64_CHUNK_CHARS = 64 * 1024  # Multiple of 4, so chunks decode on their own
+
+    @staticmethod
+    def sha256_of_base64(encoded: str) -> str:
+        """
+        Return the SHA-256 hex digest of the bytes encoded by a base64 string.
+
+        The string is decoded chunk by chunk into the hasher, so the decoded file
+        is never held in memory as a whole. Whitespace and a ``data:...;base64,``
+        prefix are ignored.
+
+        :raises ValueError: If the string is not valid base64.
+        """
+        if encoded.startswith("data:"):
+            encoded = encoded.partition(",")[2]
+        hasher = hashlib.sha256()
+        pending = ""
+        try:
+            for start in range(0, len(encoded), ContentHashUtil.BASE64_CHUNK_CHARS):
+                chunk = encoded[start : start + ContentHashUtil.BASE64_CHUNK_CHARS]
+                pending += "".join(chunk.split())
+                usable = len(pending) - len(pending) % 4
+                hasher.update(binascii.a2b_base64(pending[:usable], strict_mode=True))
+                pending = pending[usable:]
+        except binascii.Error as exc:
+            raise ValueError(f"Invalid base64 data: {exc}")
+        if pending:
+            raise ValueError("Invalid base64 data: incomplete final quantum")
+        return hasher.hexdigest()
+
+
+class JsonExtractUtil:
+    """
+    Pulls JSON out of LLM replies, which may wrap it in prose or code fences.
+
+    Values are found in one left-to-right pass: ``json.JSONDecoder.raw_decode``
+    is tried at each ``[`` or ``{``, and a value that is decoded but not
+    accepted is skipped as a whole rather than rescanned. Spans that are not
+    strict JSON (single quotes, ``True``/``None``) are matched by a bracket
+    scanner that understands strings and read with ``ast.literal_eval``.
+    """
+
+    _DECODER = json.JSONDecoder()
+    _OPENER = re.compile(r"[\[{]")
+    _TOKEN = re.compile(
+        r"""[\[\]{}]|"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|["']""", re.DOTALL
+    )
+    _LITERAL_START = re.compile(r"""[\[{]\s*(?:["'\d\-\[{\]}]|None|True|False)""")
+    _CLOSERS = {"[": "]", "{": "}"}
+
+    @staticmethod
+    def extract(text: str, accept: Callable[[Any], bool] = lambda value: True) -> Any:
+        """
+        Return the first JSON array or object in the text that ``accept`` allows.
+
+        Fenced code blocks are searched before the rest of the text.
+
+        :raises ValueError: If no accepted value is found.
+        """
+        for block in JsonExtractUtil._blocks(text):
+            for value in JsonExtractUtil._values(block):
+                if accept(value):
+                    return value
+        raise ValueError("No valid JSON found in response")
+
+    @staticmethod
+    def extract_objects(text: str) -> List[Dict[str, Any]]:
+        """
+        Return every complete top-level JSON object in the text, in order.
+
+        Recovers the finished entries of an array whose reply was cut off.
+        """
+        for block in JsonExtractUtil._blocks(text):
+            objects = [
+                value
+                for value in JsonExtractUtil._values(block, descend=True)
+                if isinstance(value, dict)
+            ]
+            if objects:
+                return objects
+        return []
+
+    @staticmethod
+    def _blocks(text: str) -> List[str]:
+        blocks = []
+        start = text.find("```")
+        while start != -1:
+            end = text.find("```", start + 3)
+            if end == -1:
+                break
+            body = text[start + 3 : end]
+            if body.startswith("json"):
+                body = body[4:]
+            body = body.strip()
+            if body:
+                blocks.append(body)
+            start = text.find("```", end + 3)
+        return blocks + [text] if blocks else [text]
+
+    @staticmethod
+    def _values(block: str, descend: bool = False):
+        """
+        Yield the values that start at successive brackets of the block.
+
+        After a value is yielded the scan resumes past its end. With
+        ``descend``, an array that cannot be read (e.g. truncated) is entered so
+        that its complete elements are still found.
+        """
+        brackets: Dict[int, Optional[int]] = {}
+        pos = 0
+        while True:
+            match = JsonExtractUtil._OPENER.search(block, pos)
+            if match is None:
+                return
+            start = match.start()
+            try:
+                value, end = JsonExtractUtil._DECODER.raw_decode(block, start)
+            except (ValueError, RecursionError):
+                value, end = JsonExtractUtil._literal_at(block, start, brackets)
+            if end is None or (descend and isinstance(value, list)):
+                pos = start + 1
+                if end is not None:
+                    yield value
+                continue
+            yield value
+            pos = end
+
+    @staticmethod
+    def _literal_at(block: str, start: int, brackets: Dict[int, Optional[int]]):
+        """
+        Read a Python-literal container starting at ``start``; (None, None) if not.
+
+        The span up to the last matching closer is tried first, as a reply is
+        usually one value; otherwise the brackets are matched.
+        """
+        if not JsonExtractUtil._LITERAL_START.match(block, start):
+            return None, None
+        end = block.rfind(JsonExtractUtil._CLOSERS[block[start]]) + 1
+        value = JsonExtractUtil._literal(block[start:end]) if end > start else None
+        if value is None:
+            if start not in brackets:
+                JsonExtractUtil._match_brackets(block, start, brackets)
+            end = brackets[start]
+            if end is None:
+                return None, None
+            value = JsonExtractUtil._literal(block[start:end])
+        return (value, end) if value is not None else (None, None)
+
+    @staticmethod
+    def _literal(candidate: str) -> Optional[Any]:
+        try:
+            value = literal_eval(candidate)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            return None
+        return value if isinstance(value, (list, dict)) else None
+
+    @staticmethod
+    def _match_brackets(
+        block: str, start: int, brackets: Dict[int, Optional[int]]
+    ) -> None:
+        """
+        Record in ``brackets`` the index just past the bracket closing the one at
+        ``start``, or None if it is never closed.
+
+        Brackets opened on the way are recorded too, so a failed scan is not
+        repeated from each of them. Quoted strings are skipped whole by one
+        regex; an unterminated one ends the scan.
+        """
+        opened = [start]
+        pos = start + 1
+        while True:
+            match = JsonExtractUtil._TOKEN.search(block, pos)
+            token = match.group() if match else None
+            if token is None or token in ('"', "'"):
+                break
+            pos = match.end()
+            if token in "[{":
+                opened.append(match.start())
+            elif token in "]}":
+                opener = opened.pop()
+                if JsonExtractUtil._CLOSERS[block[opener]] != token:
+                    opened.append(opener)
+                    break
+                brackets[opener] = pos
+                if not opened:
+                    return
+        for opener in opened:
+            brackets[opener] = None
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from datetime import date
+from typing import List, Tuple
 
 from src.core.pantry.constants import Category
 
@@ -13,3 +14,12 @@ class IExpiryPredictionProvider(ABC):
     ) -> date:
         """Predict expiry date given a category and purchase date."""
         raise NotImplementedError
+
+    async def predict_expiry_dates(
+        self, queries: List[Tuple[Category, date]]
+    ) -> List[date]:
+        """Predict expiry dates for many (category, purchase date) pairs, in order."""
+        return [
+            await self.predict_expiry_date(category, purchase_date)
+            for category, purchase_date in queries
+        ]
@@ -1,5 +1,7 @@
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import date
+from typing import Any, Dict, List, Union
 
 
 class ISupermarketExpiryProvider(ABC):
@@ -14,3 +16,24 @@ class ISupermarketExpiryProvider(ABC):
         depending on the specific supermarket integration.
         """
         raise NotImplementedError
+
+    async def fetch_expiry_dates(
+        self, queries: List[Dict[str, Any]], max_concurrency: int
+    ) -> List[Union[date, Exception]]:
+        """
+        Fetch expiry dates for many items, in order.
+
+        Each query holds the keyword arguments of one ``fetch_expiry_date`` call.
+        A failed lookup is returned in place of its date rather than raised. By
+        default the lookups run concurrently, at most ``max_concurrency`` at a
+        time; integrations with a bulk endpoint should override this.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(query: Dict[str, Any]) -> date:
+            async with semaphore:
+                return await self.fetch_expiry_date(**query)
+
+        return await asyncio.gather(
+            *(fetch(query) for query in queries), return_exceptions=True
+        )
@@ -1,13 +1,20 @@
+import asyncio
 from datetime import date
+from typing import Dict, Hashable, List, Tuple, Union
 
 from injector import inject
 
+from src.core.common.constants import SecretKey
+from src.core.common.ports.secretkey_provider import ISecretProvider
 from src.core.expiry.constants import SupermarketType
 from src.core.expiry.ports.expiry_prediction_provider import IExpiryPredictionProvider
 from src.core.expiry.ports.supermarket_expiry_provider import ISupermarketExpiryProvider
+from src.core.expiry.specs import ExpiryQuerySpec
 from src.core.logging.ports.logging_provider import ILoggingProvider
 from src.core.pantry.constants import Category
 
+DEFAULT_PROVIDER_MAX_CONCURRENCY = 10
+
 
 class ExpiryPredictionService:
     """
@@ -21,10 +28,22 @@ class ExpiryPredictionService:
         fallback_expiry_provider: IExpiryPredictionProvider,
         supermarket_expiry_provider: dict[SupermarketType, ISupermarketExpiryProvider],
         logging_provider: ILoggingProvider,
+        secret_provider: ISecretProvider,
     ):
         self.fallback_expiry_provider = fallback_expiry_provider
         self.supermarket_expiry_provider = supermarket_expiry_provider
         self.logging_provider = logging_provider
+        try:
+            self.provider_max_concurrency = int(
+                secret_provider.get_secret(
+                    SecretKey.EXPIRY_PROVIDER_MAX_CONCURRENCY,
+                    str(DEFAULT_PROVIDER_MAX_CONCURRENCY),
+                )
+            )
+            if self.provider_max_concurrency < 1:
+                raise ValueError  # A zero-permit semaphore would block every lookup
+        except (TypeError, ValueError):
+            raise ValueError("Invalid EXPIRY_PROVIDER_MAX_CONCURRENCY value in .env")
 
     async def get_expiry_date(
         self,
@@ -78,3 +97,109 @@ class ExpiryPredictionService:
             },
         )
         return fallback_date
+
+    async def get_expiry_dates(self, queries: List[ExpiryQuerySpec]) -> List[date]:
+        """
+        Resolve expiry dates for many items at once, in input order.
+
+        Identical queries are resolved once. Supermarket lookups are fanned out
+        concurrently (at most EXPIRY_PROVIDER_MAX_CONCURRENCY per provider) and
+        anything they cannot answer falls back to a single static prediction
+        per (category, purchase date).
+        """
+        unique_queries: Dict[Hashable, ExpiryQuerySpec] = {}
+        for query in queries:
+            unique_queries.setdefault(self.__query_key(query), query)
+
+        resolved: Dict[Hashable, date] = {}
+        provider_failures = await self.__fetch_from_supermarkets(
+            unique_queries, resolved
+        )
+
+        fallback_keys: Dict[Tuple[Category, date], None] = dict.fromkeys(
+            (query.category, query.purchase_date)
+            for key, query in unique_queries.items()
+            if key not in resolved
+        )
+        fallback_dates = await self.fallback_expiry_provider.predict_expiry_dates(
+            list(fallback_keys)
+        )
+        predicted = dict(zip(fallback_keys, fallback_dates))
+        for key, query in unique_queries.items():
+            if key not in resolved:
+                resolved[key] = predicted[(query.category, query.purchase_date)]
+
+        self.logging_provider.info(
+            "Resolved expiry dates",
+            tag="ExpiryService",
+            extra_data={
+                "items": len(queries),
+                "unique_queries": len(unique_queries),
+                "fallback_predictions": len(fallback_keys),
+                "provider_failures": provider_failures,
+            },
+        )
+        return [resolved[self.__query_key(query)] for query in queries]
+
+    async def __fetch_from_supermarkets(
+        self,
+        unique_queries: Dict[Hashable, ExpiryQuerySpec],
+        resolved: Dict[Hashable, date],
+    ) -> int:
+        """Fill ``resolved`` from supermarket providers; return the failure count."""
+        keys_by_provider: Dict[SupermarketType, List[Hashable]] = {}
+        for key, query in unique_queries.items():
+            if query.supermarket_type in self.supermarket_expiry_provider:
+                keys_by_provider.setdefault(query.supermarket_type, []).append(key)
+
+        if not keys_by_provider:
+            return 0
+
+        results: List[List[Union[date, Exception]]] = await asyncio.gather(
+            *(
+                self.supermarket_expiry_provider[supermarket_type].fetch_expiry_dates(
+                    [
+                        {
+                            "category": unique_queries[key].category,
+                            "purchase_date": unique_queries[key].purchase_date,
+                            **unique_queries[key].lookup,
+                        }
+                        for key in keys
+                    ],
+                    max_concurrency=self.provider_max_concurrency,
+                )
+                for supermarket_type, keys in keys_by_provider.items()
+            )
+        )
+
+        failures = 0
+        for (supermarket_type, keys), provider_results in zip(
+            keys_by_provider.items(), results
+        ):
+            errors = []
+            for key, result in zip(keys, provider_results):
+                if isinstance(result, date):
+                    resolved[key] = result
+                else:
+                    errors.append(str(result))
+            if errors:
+                failures += len(errors)
+                self.logging_provider.warning(
+                    "Supermarket provider failed for some items, falling back to static prediction",
+                    tag="ExpiryService",
+                    extra_data={
+                        "supermarket_type": supermarket_type.value,
+                        "failed": len(errors),
+                        "first_error": errors[0],
+                    },
+                )
+        return failures
+
+    @staticmethod
+    def __query_key(query: ExpiryQuerySpec) -> Hashable:
+        return (
+            query.category,
+            query.purchase_date,
+            query.supermarket_type,
+            tuple(sorted(query.lookup.items())),
+        )
@@ -0,0 +1,17 @@
+from datetime import date
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from src.core.expiry.constants import SupermarketType
+from src.core.pantry.constants import Category
+
+
+class ExpiryQuerySpec(BaseModel):
+    """One item to resolve an expiry date for in a bulk lookup."""
+
+    category: Category
+    purchase_date: date
+    supermarket_type: Optional[SupermarketType] = None
+    # Provider-specific lookup fields, e.g. {"barcode": "FPD1234"}
+    lookup: Dict[str, str] = Field(default_factory=dict)
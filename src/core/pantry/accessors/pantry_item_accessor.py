@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
 
-from src.core.pantry.models import PantryItemDomain
+from src.core.pantry.models import PantryItemDomain, PantryStatsDomain
+from src.core.pantry.specs import ListPantryItemsSpec, UpdatePantryItemSpec
 
 
 class IPantryItemAccessor(ABC):
@@ -14,7 +16,28 @@ class IPantryItemAccessor(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def delete_items(self, item_ids: List[int], user_id: int) -> None:
+    async def update_items(
+        self, user_id: int, specs: List[UpdatePantryItemSpec]
+    ) -> Optional[List[PantryItemDomain]]:
+        """
+        Apply partial updates to several of the user's items in one transaction.
+
+        Returns the updated items in ``specs`` order, or None without changing
+        anything if any of the items does not exist or belongs to someone else.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_items(
+        self, item_ids: List[int], user_id: int, soft: bool = False
+    ) -> List[int]:
+        """
+        Delete the user's items in one statement, or none of them.
+
+        Returns the ids that do not exist or belong to someone else; if there
+        are any, nothing is deleted. ``soft`` sets ``deleted_at`` instead of
+        removing the rows, which then no longer appear in any read.
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -32,3 +55,28 @@ class IPantryItemAccessor(ABC):
         self, item_ids: List[int], user_id: int
     ) -> List[PantryItemDomain]:
         raise NotImplementedError
+
+    @abstractmethod
+    async def get_expiry_stats(
+        self, user_id: int, today: date, soon_until: date
+    ) -> PantryStatsDomain:
+        """Count all, expired, expiring-today and expiring-by-soon_until items."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_items_expiring_before(
+        self, user_id: int, expires_before: datetime, limit: int
+    ) -> List[PantryItemDomain]:
+        """Return up to ``limit`` items expiring by the given time, soonest first."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_items_page(
+        self, user_id: int, spec: ListPantryItemsSpec
+    ) -> List[Dict[str, Any]]:
+        """
+        Return up to ``spec.limit`` rows after ``spec.after`` in
+        (expiry_date NULLS LAST, id) order, holding the requested fields plus
+        ``id`` and ``expiry_date``.
+        """
+        raise NotImplementedError
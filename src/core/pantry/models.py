@@ -1,12 +1,14 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
 from src.core.base.models import PantryPalMutableModelDomain
 from src.core.common.utils import DateTimeUtils
 from src.core.pantry.constants import Category, Unit
+from src.core.pantry.specs import AddPantryItemSpec, PantryListCursor
 from src.pantrypal_api.pantry.schemas.pantry_schemas import (
+    PantryItemPageResponse,
     PantryItemResponse,
     PantryStatsResponse,
 )
@@ -58,6 +60,18 @@ class PantryItemDomain(PantryPalMutableModelDomain):
             updated_at=now,
         )
 
+    @classmethod
+    def from_spec(cls, user_id: int, spec: AddPantryItemSpec) -> "PantryItemDomain":
+        return cls.create(
+            user_id=user_id,
+            item_name=spec.item_name,
+            quantity=spec.quantity,
+            unit=spec.unit,
+            category=spec.category,
+            purchase_date=spec.purchase_date,
+            expiry_date=spec.expiry_date,
+        )
+
 
 class PantryStatsDomain(BaseModel):
     total_items: int
@@ -72,3 +86,16 @@ class PantryStatsDomain(BaseModel):
             expiring_today=self.expiring_today,
             expired=self.expired,
         )
+
+
+class PantryItemPageDomain(BaseModel):
+    """One page of pantry rows holding only the selected columns."""
+
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[PantryListCursor] = None
+
+    def to_schema(self) -> PantryItemPageResponse:
+        return PantryItemPageResponse.model_construct(
+            items=self.items,
+            next_cursor=self.next_cursor.encode() if self.next_cursor else None,
+        )
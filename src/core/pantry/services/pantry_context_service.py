@@ -0,0 +1,122 @@
+import uuid
+from typing import Any, Dict, List
+
+from injector import inject
+
+from src.core.common.constants import SecretKey
+from src.core.common.ports.cache_provider import ICacheProvider
+from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.core.common.utils import TokenUtil
+from src.core.logging.ports.logging_provider import ILoggingProvider
+from src.core.pantry.accessors.pantry_item_accessor import IPantryItemAccessor
+from src.core.pantry.specs import ListPantryItemsSpec
+
+DEFAULT_PANTRY_CONTEXT_MAX_TOKENS = 1000
+DEFAULT_PANTRY_CONTEXT_TTL_SECONDS = 3600
+PANTRY_CONTEXT_FIELDS = ["item_name", "quantity", "unit", "expiry_date"]
+
+
+class PantryContextService:
+    """
+    Caches the pantry ingredient block that prefixes chatbot recommendation prompts.
+
+    Blocks are cached per user under a pantry version that PantryService bumps on
+    every add, update and delete, so a block never outlives the pantry it was built
+    from. Versions are random tokens rather than counters: if a version entry is
+    evicted, the next read starts a new version instead of reusing an old key.
+    """
+
+    @inject
+    def __init__(
+        self,
+        pantry_accessor: IPantryItemAccessor,
+        cache_provider: ICacheProvider,
+        secret_provider: ISecretProvider,
+        logging_provider: ILoggingProvider,
+    ):
+        self.pantry_accessor = pantry_accessor
+        self.cache_provider = cache_provider
+        self.logging_provider = logging_provider
+        try:
+            self.max_tokens = int(
+                secret_provider.get_secret(
+                    SecretKey.PANTRY_CONTEXT_MAX_TOKENS,
+                    str(DEFAULT_PANTRY_CONTEXT_MAX_TOKENS),
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid PANTRY_CONTEXT_MAX_TOKENS value in .env")
+        try:
+            self.ttl_seconds = int(
+                secret_provider.get_secret(
+                    SecretKey.PANTRY_CONTEXT_TTL_SECONDS,
+                    str(DEFAULT_PANTRY_CONTEXT_TTL_SECONDS),
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid PANTRY_CONTEXT_TTL_SECONDS value in .env")
+
+    async def get_ingredient_block(self, user_id: int) -> str:
+        """
+        Return the prompt prefix listing the user's items soonest-expiring first.
+
+        The list is cut off once it would exceed PANTRY_CONTEXT_MAX_TOKENS; an empty
+        pantry gives an empty string.
+        """
+        key = self.__block_key(user_id, await self.__get_version(user_id))
+        block = await self.cache_provider.get(key)
+        if block is None:
+            block = await self.__build_block(user_id)
+            await self.cache_provider.set(key, block, self.ttl_seconds)
+        return block
+
+    async def bump_version(self, user_id: int) -> None:
+        """Start a new pantry version so cached blocks for the user are not reused."""
+        await self.cache_provider.set(
+            self.__version_key(user_id), uuid.uuid4().hex, self.ttl_seconds
+        )
+
+    async def __get_version(self, user_id: int) -> str:
+        version = await self.cache_provider.get(self.__version_key(user_id))
+        if version is None:
+            version = uuid.uuid4().hex
+            await self.cache_provider.set(
+                self.__version_key(user_id), version, self.ttl_seconds
+            )
+        return version
+
+    async def __build_block(self, user_id: int) -> str:
+        # Every entry costs at least one token, so the budget also bounds the rows
+        rows = await self.pantry_accessor.get_items_page(
+            user_id,
+            ListPantryItemsSpec(limit=self.max_tokens, fields=PANTRY_CONTEXT_FIELDS),
+        )
+        entries: List[str] = []
+        budget = self.max_tokens
+        for row in rows:
+            entry = self.__format_entry(row)
+            cost = TokenUtil.estimate_tokens(entry) + 1  # Separator
+            if cost > budget:
+                self.logging_provider.debug(
+                    "Pantry context truncated to token budget",
+                    extra_data={"user_id": user_id, "items": len(entries)},
+                )
+                break
+            entries.append(entry)
+            budget -= cost
+
+        if not entries:
+            return ""
+        return f"Prioritize ingredients nearing expiry: {', '.join(entries)}. "
+
+    @staticmethod
+    def __format_entry(row: Dict[str, Any]) -> str:
+        expiry = row["expiry_date"].date() if row["expiry_date"] else "N/A"
+        unit = row["unit"].value
+        return f"{row['item_name']} {row['quantity']:g} {unit} exp {expiry}"
+
+    def __version_key(self, user_id: int) -> str:
+        return f"pantry:version:{user_id}"
+
+    def __block_key(self, user_id: int, version: str) -> str:
+        return f"pantry:context:{user_id}:{version}"
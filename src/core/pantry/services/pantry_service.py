@@ -1,18 +1,30 @@
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta, timezone
 from typing import List
 
 from injector import inject
 
+from src.core.common.constants import SecretKey
+from src.core.common.ports.secretkey_provider import ISecretProvider
 from src.core.common.utils import DateTimeUtils
 from src.core.logging.ports.logging_provider import ILoggingProvider
 from src.core.pantry.accessors.pantry_item_accessor import IPantryItemAccessor
-from src.core.pantry.models import PantryItemDomain, PantryStatsDomain
+from src.core.pantry.models import (
+    PantryItemDomain,
+    PantryItemPageDomain,
+    PantryStatsDomain,
+)
+from src.core.pantry.services.pantry_context_service import PantryContextService
 from src.core.pantry.specs import (
     AddPantryItemSpec,
     DeletePantryItemsSpec,
+    ListPantryItemsSpec,
+    PantryListCursor,
     UpdatePantryItemSpec,
 )
 
+EXPIRING_SOON_DAYS = 7
+EXPIRING_ITEMS_LIMIT = 3
+
 
 class PantryService:
     @inject
@@ -20,29 +32,51 @@ class PantryService:
         self,
         pantry_accessor: IPantryItemAccessor,
         logging_provider: ILoggingProvider,
+        pantry_context_service: PantryContextService,
+        secret_provider: ISecretProvider,
     ):
         self.pantry_accessor = pantry_accessor
         self.logging_provider = logging_provider
+        self.pantry_context_service = pantry_context_service
+        soft_delete = secret_provider.get_secret(SecretKey.PANTRY_SOFT_DELETE, "false")
+        if str(soft_delete).lower() not in ("true", "false"):
+            raise ValueError("Invalid PANTRY_SOFT_DELETE value in .env")
+        # Soft-deleted items keep their row with deleted_at set
+        self.soft_delete = str(soft_delete).lower() == "true"
 
     async def get_items(self, user_id: int) -> List[PantryItemDomain]:
         return await self.pantry_accessor.get_items_by_user(user_id)
 
+    async def get_items_page(
+        self, user_id: int, spec: ListPantryItemsSpec
+    ) -> PantryItemPageDomain:
+        """List pantry rows in (expiry_date, id) order, one keyset page at a time."""
+        query = spec
+        if spec.limit is not None:
+            # One extra row tells us whether another page follows
+            query = spec.model_copy(update={"limit": spec.limit + 1})
+        rows = await self.pantry_accessor.get_items_page(user_id, query)
+
+        next_cursor = None
+        if spec.limit is not None and len(rows) > spec.limit:
+            rows = rows[: spec.limit]
+            last = rows[-1]
+            next_cursor = PantryListCursor(
+                expiry_date=last["expiry_date"], id=last["id"]
+            )
+
+        if spec.fields is not None and "expiry_date" not in spec.fields:
+            for row in rows:
+                del row["expiry_date"]
+        return PantryItemPageDomain.model_construct(items=rows, next_cursor=next_cursor)
+
     async def add_items(
         self, user_id: int, specs: List[AddPantryItemSpec]
     ) -> List[PantryItemDomain]:
-        domains = [
-            PantryItemDomain.create(
-                user_id=user_id,
-                item_name=spec.item_name,
-                quantity=spec.quantity,
-                unit=spec.unit,
-                category=spec.category,
-                purchase_date=spec.purchase_date,
-                expiry_date=spec.expiry_date,
-            )
-            for spec in specs
-        ]
-        return await self.pantry_accessor.add_items(domains)
+        domains = [PantryItemDomain.from_spec(user_id, spec) for spec in specs]
+        added = await self.pantry_accessor.add_items(domains)
+        await self.pantry_context_service.bump_version(user_id)
+        return added
 
     async def update_item(
         self, user_id: int, spec: UpdatePantryItemSpec
@@ -72,94 +106,59 @@ class PantryService:
             created_at=existing.created_at,
             updated_at=DateTimeUtils.get_utc_now(),
         )
-        return await self.pantry_accessor.update_item(updated)
+        result = await self.pantry_accessor.update_item(updated)
+        await self.pantry_context_service.bump_version(user_id)
+        return result
+
+    async def update_items(
+        self, user_id: int, specs: List[UpdatePantryItemSpec]
+    ) -> List[PantryItemDomain]:
+        """Apply all updates in one transaction, or none if any item is invalid."""
+        item_ids = [spec.id for spec in specs]
+        if len(set(item_ids)) != len(item_ids):
+            raise ValueError("Each pantry item can only be updated once per batch")
+
+        updated = await self.pantry_accessor.update_items(user_id, specs)
+        if updated is None:
+            raise ValueError("Some items do not exist or do not belong to the user")
+        await self.pantry_context_service.bump_version(user_id)
+        return updated
 
     async def delete_items(self, user_id: int, spec: DeletePantryItemsSpec) -> None:
-        # validate if items exist and belong to user
-        existing_items = await self.pantry_accessor.get_items_by_ids(
-            spec.item_ids, user_id
+        # The accessor checks ownership in the delete itself and deletes
+        # nothing if any item is missing or belongs to someone else
+        missing_ids = await self.pantry_accessor.delete_items(
+            item_ids=spec.item_ids,
+            user_id=user_id,
+            soft=self.soft_delete,
         )
 
-        if len(existing_items) != len(spec.item_ids):
-            missing_ids = set(spec.item_ids) - {item.id for item in existing_items}
+        if missing_ids:
             self.logging_provider.warning(
                 "Attempted to delete non-existent or unauthorized items",
-                extra_data={"user_id": user_id, "missing_item_ids": list(missing_ids)},
+                extra_data={"user_id": user_id, "missing_item_ids": missing_ids},
                 tag="PantryService",
             )
             raise ValueError(
-                f"Some items do not exist or do not belong to the user: {missing_ids}"
-            )
-
-        return await self.pantry_accessor.delete_items(
-            item_ids=spec.item_ids,
-            user_id=user_id,
-        )
-
-    async def get_items_sorted_by_expiry(self, user_id: int) -> List[PantryItemDomain]:
-        items = await self.get_items(user_id)
-        max_dt = datetime.max.replace(tzinfo=timezone.utc)
-
-        def _key(item: PantryItemDomain) -> datetime:
-            if item.expiry_date is None:
-                return max_dt
-            return (
-                item.expiry_date
-                if item.expiry_date.tzinfo
-                else item.expiry_date.replace(tzinfo=timezone.utc)
+                "Some items do not exist or do not belong to the user: "
+                f"{set(missing_ids)}"
             )
 
-        return sorted(items, key=_key)
+        await self.pantry_context_service.bump_version(user_id)
 
     async def get_pantry_stats(self, user_id: int) -> PantryStatsDomain:
-        items = await self.get_items(user_id)
-        now = DateTimeUtils.get_utc_now()
-        today = now.date()
-        soon_threshold = today + timedelta(days=7)
-
-        total = len(items)
-        expired = 0
-        expiring_today = 0
-        expiring_soon = 0
-
-        for item in items:
-            if not item.expiry_date:
-                continue
-            expiry_date = item.expiry_date.date()
-            if expiry_date < today:
-                expired += 1
-            elif expiry_date == today:
-                expiring_today += 1
-            elif today < expiry_date <= soon_threshold:
-                expiring_soon += 1
-
-        return PantryStatsDomain(
-            total_items=total,
-            expiring_soon=expiring_soon,
-            expiring_today=expiring_today,
-            expired=expired,
+        today = DateTimeUtils.get_utc_now().date()
+        return await self.pantry_accessor.get_expiry_stats(
+            user_id, today=today, soon_until=today + timedelta(days=EXPIRING_SOON_DAYS)
         )
 
     async def get_expiring_items(self, user_id: int) -> List[PantryItemDomain]:
-        items = await self.get_items(user_id)
-        now = DateTimeUtils.get_utc_now()
-        threshold = now + timedelta(days=7)
-        expiring: List[PantryItemDomain] = []
+        threshold = DateTimeUtils.get_utc_now() + timedelta(days=EXPIRING_SOON_DAYS)
+        items = await self.pantry_accessor.get_items_expiring_before(
+            user_id, expires_before=threshold, limit=EXPIRING_ITEMS_LIMIT
+        )
         for item in items:
-            if not item.expiry_date:
-                continue
-            expiry = (
-                item.expiry_date
-                if item.expiry_date.tzinfo
-                else item.expiry_date.replace(tzinfo=timezone.utc)
-            )
-            if expiry <= threshold:
-                # store timezone-aware copy to avoid comparison issues later
-                item.expiry_date = expiry
-                expiring.append(item)
-        max_dt = datetime.max.replace(tzinfo=timezone.utc)
-
-        def _key(item: PantryItemDomain) -> datetime:
-            return item.expiry_date or max_dt
-
-        return sorted(expiring, key=_key)[:3]
+            # store timezone-aware copy to avoid comparison issues later
+            if item.expiry_date and not item.expiry_date.tzinfo:
+                item.expiry_date = item.expiry_date.replace(tzinfo=timezone.utc)
+        return items
@@ -3,7 +3,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel
 
-from src.core.pantry.models import Category, Unit
+from src.core.base.models import KeysetCursor
+from src.core.pantry.constants import Category, Unit
 
 
 class AddPantryItemSpec(BaseModel):
@@ -27,3 +28,23 @@ class UpdatePantryItemSpec(BaseModel):
 
 class DeletePantryItemsSpec(BaseModel):
     item_ids: List[int]
+
+
+class PantryListCursor(KeysetCursor):
+    """Keyset position in the (expiry_date NULLS LAST, id) order of a pantry list."""
+
+    label = "pantry list"
+
+    expiry_date: Optional[datetime] = None
+    id: int
+
+
+class ListPantryItemsSpec(BaseModel):
+    """Page, filter and projection options for listing a user's pantry."""
+
+    limit: Optional[int] = None  # None returns every matching item
+    after: Optional[PantryListCursor] = None
+    categories: List[Category] = []
+    expires_after: Optional[datetime] = None
+    expires_before: Optional[datetime] = None
+    fields: Optional[List[str]] = None  # None selects every column
@@ -0,0 +1,30 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List
+
+from src.core.receipt.models import ReceiptItemClassificationDomain
+
+
+class IReceiptItemClassificationAccessor(ABC):
+
+    @abstractmethod
+    async def get_by_names(
+        self, normalized_names: List[str], stored_after: datetime
+    ) -> Dict[str, ReceiptItemClassificationDomain]:
+        """
+        Return the classifications of the given names stored at or after
+        stored_after, keyed by name.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_classifications(
+        self,
+        classifications: List[ReceiptItemClassificationDomain],
+        stored_after: datetime,
+    ) -> None:
+        """
+        Store classifications. One already stored for the same name is kept
+        if it was stored at or after stored_after, and replaced otherwise.
+        """
+        raise NotImplementedError
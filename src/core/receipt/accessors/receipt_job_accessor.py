@@ -0,0 +1,81 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.core.pantry.models import PantryItemDomain
+from src.core.receipt.constants import ReceiptJobStatus
+from src.core.receipt.models import ReceiptJobDomain
+
+
+class IReceiptJobAccessor(ABC):
+
+    @abstractmethod
+    async def enqueue(
+        self, user_id: int, receipt_id: str, payload: Dict[str, Any]
+    ) -> ReceiptJobDomain:
+        """
+        Add a pending job for the receipt.
+
+        A receipt is queued at most once per user: if the user already has a
+        job for ``receipt_id`` it is returned unchanged.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def claim_next(self, lease_seconds: int) -> Optional[ReceiptJobDomain]:
+        """
+        Atomically lease the oldest due job and count the attempt.
+
+        Due jobs are pending jobs whose ``available_at`` has passed and running
+        jobs whose lease has expired (their worker died). Returns None when no
+        job is due.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def complete(
+        self, job: ReceiptJobDomain, items: Sequence[PantryItemDomain] = ()
+    ) -> bool:
+        """
+        Mark a claimed job as done and add the receipt's pantry items.
+
+        Both happen in one transaction. Returns False, adding nothing, if the
+        job was claimed again after ``job`` was read, so a receipt's items are
+        stored once however many workers processed it.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def extend_lease(self, job: ReceiptJobDomain, lease_seconds: int) -> bool:
+        """
+        Renew a claimed job's lease for another ``lease_seconds``.
+
+        Returns False if the job was claimed again after ``job`` was read.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def retry_later(
+        self, job: ReceiptJobDomain, error: str, available_at: datetime
+    ) -> bool:
+        """Release a claimed job so it is retried after ``available_at``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fail(self, job: ReceiptJobDomain, error: str) -> bool:
+        """Mark a claimed job as permanently failed."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_job(
+        self, user_id: int, receipt_id: str
+    ) -> Optional[ReceiptJobDomain]:
+        """Return the user's job for the receipt, if any."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_statuses(
+        self, receipt_ids: List[str]
+    ) -> Dict[Tuple[int, str], ReceiptJobStatus]:
+        """Return the job status of each queued receipt, keyed by (user, receipt)."""
+        raise NotImplementedError
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from src.core.receipt.models import ReceiptUploadDomain
+
+
+class IReceiptUploadAccessor(ABC):
+
+    @abstractmethod
+    async def get_latest_by_hash(
+        self, user_id: int, image_hash: str
+    ) -> Optional[ReceiptUploadDomain]:
+        """Return the user's most recent upload of the image, if any."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def add_upload(self, upload: ReceiptUploadDomain) -> ReceiptUploadDomain:
+        """Record an image uploaded to the receipt gateway."""
+        raise NotImplementedError
@@ -11,6 +11,16 @@ class ReceiptStatus(str, Enum):
 
     PROCESSED = "processed"
     PENDING = "pending"
+    FAILED = "failed"
+
+
+class ReceiptJobStatus(str, Enum):
+    """State of a queued receipt classification job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
 
 
 SUBCATEGORIES = [
@@ -1,7 +1,9 @@
-from typing import Any, Dict
+from datetime import datetime
+from typing import Any, Dict, Optional
 
-from src.core.base.models import PantryPalBaseModelDomain
+from src.core.base.models import PantryPalBaseModelDomain, PantryPalMutableModelDomain
 from src.core.common.utils import DateTimeUtils
+from src.core.receipt.constants import ReceiptJobStatus
 
 
 class ReceiptResultDomain(PantryPalBaseModelDomain):
@@ -24,3 +26,58 @@ class ReceiptResultDomain(PantryPalBaseModelDomain):
             created_at=DateTimeUtils.get_utc_now(),
             deleted_at=None,
         )
+
+
+class ReceiptJobDomain(PantryPalMutableModelDomain):
+    user_id: int
+    receipt_id: str
+    payload: Dict[str, Any]
+    status: ReceiptJobStatus
+    attempts: int
+    available_at: datetime
+    locked_until: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+
+class ReceiptUploadDomain(PantryPalBaseModelDomain):
+    user_id: int
+    receipt_id: str
+    image_hash: str
+
+    @classmethod
+    def create(
+        cls, user_id: int, receipt_id: str, image_hash: str
+    ) -> "ReceiptUploadDomain":
+        return cls(
+            id=0,
+            user_id=user_id,
+            receipt_id=receipt_id,
+            image_hash=image_hash,
+            created_at=DateTimeUtils.get_utc_now(),
+            deleted_at=None,
+        )
+
+
+class ReceiptItemClassificationDomain(PantryPalBaseModelDomain):
+    normalized_name: str
+    item_name: str
+    subcategory: Optional[str] = None
+    quantity: float
+
+    @classmethod
+    def create(
+        cls,
+        normalized_name: str,
+        item_name: str,
+        subcategory: Optional[str],
+        quantity: float,
+    ) -> "ReceiptItemClassificationDomain":
+        return cls(
+            id=0,
+            normalized_name=normalized_name,
+            item_name=item_name,
+            subcategory=subcategory,
+            quantity=quantity,
+            created_at=DateTimeUtils.get_utc_now(),
+            deleted_at=None,
+        )
@@ -16,3 +16,7 @@ class IReceiptGatewayProvider(ABC):
     ) -> Tuple[int, Optional[Dict[str, Any]]]:
         """Retrieve receipt result and return status code with JSON if available."""
         raise NotImplementedError
+
+    async def close(self) -> None:
+        """Releases pooled connections held by the provider (no-op by default)"""
+        return None
@@ -0,0 +1,43 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import AsyncContextManager, Optional
+
+from src.core.receipt.constants import ReceiptStatus
+
+
+class IReceiptStatusNotifier(ABC):
+    """Port for waking requests that wait on a receipt's processing status."""
+
+    @abstractmethod
+    def subscribe(
+        self, user_id: int, receipt_id: str
+    ) -> AsyncContextManager["asyncio.Future[Optional[ReceiptStatus]]"]:
+        """
+        Register interest in a receipt for the duration of the ``async with``.
+
+        The yielded future resolves with the first status published for the
+        receipt afterwards. Subscribe before reading the current status, so an
+        update landing in between is not missed.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def publish(
+        self, user_id: int, receipt_id: str, status: Optional[ReceiptStatus]
+    ) -> None:
+        """
+        Wake the requests waiting on the receipt.
+
+        ``status`` is None when it could not be determined, e.g. because the
+        receipt gateway failed.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def has_subscribers(self, user_id: int, receipt_id: str) -> bool:
+        """Return True if a request in this process is waiting on the receipt."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Stops background work held by the notifier (no-op by default)"""
+        return None
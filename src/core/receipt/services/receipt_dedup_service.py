@@ -0,0 +1,72 @@
+from typing import Dict, Optional
+
+from injector import inject
+
+from src.core.logging.ports.logging_provider import ILoggingProvider
+from src.core.receipt.accessors.receipt_upload_accessor import IReceiptUploadAccessor
+from src.core.receipt.constants import ReceiptStatus
+from src.core.receipt.models import ReceiptUploadDomain
+from src.core.receipt.services.receipt_job_service import ReceiptJobService
+
+
+class ReceiptDedupService:
+    """
+    Recognises receipt images a user has already uploaded, by content hash.
+
+    A duplicate resolves to the receipt of the earlier upload, so neither the
+    receipt gateway (OCR) nor the LLM classification runs again. Receipts whose
+    processing failed are not reused, which lets the user retry them.
+    """
+
+    @inject
+    def __init__(
+        self,
+        upload_accessor: IReceiptUploadAccessor,
+        job_service: ReceiptJobService,
+        logging_provider: ILoggingProvider,
+    ) -> None:
+        self.upload_accessor = upload_accessor
+        self.job_service = job_service
+        self.logging_provider = logging_provider
+
+        self.lookups = 0
+        self.hits = 0
+
+    async def find_duplicate(
+        self, user_id: int, image_hash: str
+    ) -> Optional[ReceiptUploadDomain]:
+        """Return the earlier upload of the same image, if it can be reused."""
+        self.lookups += 1
+        upload = await self.upload_accessor.get_latest_by_hash(user_id, image_hash)
+        if upload is None:
+            return None
+        status = await self.job_service.get_status(user_id, upload.receipt_id)
+        if status == ReceiptStatus.FAILED:
+            return None
+
+        self.hits += 1
+        self.logging_provider.info(
+            "Duplicate receipt upload",
+            extra_data={"user_id": user_id, "receipt_id": upload.receipt_id},
+            tag="ReceiptDedupService",
+        )
+        return upload
+
+    async def record_upload(
+        self, user_id: int, receipt_id: str, image_hash: str
+    ) -> ReceiptUploadDomain:
+        return await self.upload_accessor.add_upload(
+            ReceiptUploadDomain.create(
+                user_id=user_id, receipt_id=receipt_id, image_hash=image_hash
+            )
+        )
+
+    def stats(self) -> Dict[str, float]:
+        """Return dedup counters since process start."""
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            # Every hit skips one gateway upload and the OCR/LLM work behind it
+            "gateway_calls_saved": self.hits,
+        }
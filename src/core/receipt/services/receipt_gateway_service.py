@@ -1,40 +1,97 @@
-from typing import Any, Dict, Optional
+import asyncio
+from typing import Any, Dict, Optional, Tuple
 from uuid import uuid4
 
 from injector import inject
 
 from src.core.common.constants import SecretKey
 from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.core.common.utils import ContentHashUtil
 from src.core.logging.ports.logging_provider import ILoggingProvider
 from src.core.receipt.accessors.receipt_result_accessor import IReceiptResultAccessor
 from src.core.receipt.constants import ReceiptStatus
 from src.core.receipt.models import ReceiptResultDomain
 from src.core.receipt.ports.receipt_gateway_provider import IReceiptGatewayProvider
-from src.core.receipt.services.receipt_service import ReceiptService
+from src.core.receipt.ports.receipt_status_notifier import IReceiptStatusNotifier
+from src.core.receipt.services.receipt_dedup_service import ReceiptDedupService
+from src.core.receipt.services.receipt_job_service import ReceiptJobService
+
+DEFAULT_RECEIPT_RESULT_WAIT_SECONDS = 25.0
+DEFAULT_RECEIPT_RESULT_POLL_SECONDS = 2.0
 
 
 class ReceiptGatewayService:
-    """Interact with the AWS API Gateway for receipt processing."""
+    """
+    Interact with the AWS API Gateway for receipt processing.
+
+    Clients waiting on a receipt (``wait_for_result``) are parked on the status
+    notifier rather than polling. While the gateway is still reading a receipt
+    that someone waits on, one background task per receipt polls it every
+    RECEIPT_RESULT_POLL_SECONDS and queues the result once it is ready.
+    """
 
     @inject
     def __init__(
         self,
         secret_provider: ISecretProvider,
         logging_provider: ILoggingProvider,
-        receipt_service: ReceiptService,
+        job_service: ReceiptJobService,
         gateway_provider: IReceiptGatewayProvider,
         receipt_result_accessor: IReceiptResultAccessor,
+        dedup_service: ReceiptDedupService,
+        status_notifier: IReceiptStatusNotifier,
     ) -> None:
         self.secret_provider = secret_provider
         self.logging_provider = logging_provider
-        self.receipt_service = receipt_service
+        self.job_service = job_service
         self.gateway_provider = gateway_provider
         self.receipt_result_accessor = receipt_result_accessor
+        self.dedup_service = dedup_service
+        self.status_notifier = status_notifier
+        try:
+            self.max_wait_seconds = float(
+                secret_provider.get_secret(
+                    SecretKey.RECEIPT_RESULT_WAIT_SECONDS,
+                    str(DEFAULT_RECEIPT_RESULT_WAIT_SECONDS),
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid RECEIPT_RESULT_WAIT_SECONDS value in .env")
+        try:
+            self.gateway_poll_seconds = float(
+                secret_provider.get_secret(
+                    SecretKey.RECEIPT_RESULT_POLL_SECONDS,
+                    str(DEFAULT_RECEIPT_RESULT_POLL_SECONDS),
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid RECEIPT_RESULT_POLL_SECONDS value in .env")
+
+        self._pollers: Dict[Tuple[int, str], asyncio.Task] = {}
 
-    # TODO: Prevent same receipt upload (both image file and image's content)
     async def upload_receipt(
         self, user_id: int, image_base64: str
     ) -> Optional[Dict[str, Any]]:
+        """
+        Upload a receipt image, or return the receipt of an identical earlier upload.
+
+        Duplicates are answered with ``duplicate=True`` and the stored result, if
+        the receipt has been retrieved already.
+
+        :raises ValueError: If ``image_base64`` is not valid base64.
+        """
+        image_hash = ContentHashUtil.sha256_of_base64(image_base64)
+        duplicate = await self.dedup_service.find_duplicate(user_id, image_hash)
+        if duplicate is not None:
+            existing = await self.receipt_result_accessor.get_result(
+                user_id, duplicate.receipt_id
+            )
+            return {
+                "receipt_id": duplicate.receipt_id,
+                "duplicate": True,
+                "result": existing.result if existing else None,
+            }
+
         url = self.secret_provider.get_secret(SecretKey.RECEIPT_UPLOAD_ENDPOINT)
         if not url:
             self.logging_provider.error(
@@ -60,6 +117,7 @@ class ReceiptGatewayService:
             return None
 
         if 200 <= status < 300:
+            await self.dedup_service.record_upload(user_id, receipt_id, image_hash)
             return {"receipt_id": receipt_id}
 
         self.logging_provider.error(
@@ -72,9 +130,81 @@ class ReceiptGatewayService:
     async def poll_receipt_result(
         self, user_id: int, receipt_id: str
     ) -> Optional[ReceiptStatus]:
+        job_status = await self.job_service.get_status(user_id, receipt_id)
+        if job_status is not None:
+            return job_status
+        # Results stored before receipts were queued have no job
         existing = await self.receipt_result_accessor.get_result(user_id, receipt_id)
         if existing:
             return ReceiptStatus.PROCESSED
+        retrieved = await self.__retrieve_from_gateway(user_id, receipt_id)
+        return None if retrieved is None else ReceiptStatus.PENDING
+
+    async def wait_for_result(
+        self, user_id: int, receipt_id: str, timeout: Optional[float] = None
+    ) -> Optional[ReceiptStatus]:
+        """
+        Wait until the receipt is processed or has failed, for up to ``timeout``
+        seconds (at most RECEIPT_RESULT_WAIT_SECONDS).
+
+        Returns PENDING if it is still being processed when the time is up, and
+        None if its status cannot be determined.
+        """
+        timeout = min(timeout or self.max_wait_seconds, self.max_wait_seconds)
+        async with self.status_notifier.subscribe(user_id, receipt_id) as update:
+            status = await self.job_service.get_status(user_id, receipt_id)
+            if status is None:
+                existing = await self.receipt_result_accessor.get_result(
+                    user_id, receipt_id
+                )
+                if existing:
+                    return ReceiptStatus.PROCESSED
+                self.__ensure_gateway_poller(user_id, receipt_id)
+            elif status != ReceiptStatus.PENDING:
+                return status
+            try:
+                return await asyncio.wait_for(update, timeout)
+            except asyncio.TimeoutError:
+                return ReceiptStatus.PENDING
+
+    async def close(self) -> None:
+        """Stop the gateway pollers."""
+        pollers = list(self._pollers.values())
+        for task in pollers:
+            task.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
+
+    def __ensure_gateway_poller(self, user_id: int, receipt_id: str) -> None:
+        key = (user_id, receipt_id)
+        if key not in self._pollers:
+            self._pollers[key] = asyncio.create_task(
+                self.__poll_gateway(user_id, receipt_id),
+                name=f"receipt-gateway-poller-{receipt_id}",
+            )
+
+    async def __poll_gateway(self, user_id: int, receipt_id: str) -> None:
+        """Poll the gateway while anyone in this process waits on the receipt."""
+        try:
+            while self.status_notifier.has_subscribers(user_id, receipt_id):
+                retrieved = await self.__retrieve_from_gateway(user_id, receipt_id)
+                if retrieved is None:
+                    await self.status_notifier.publish(user_id, receipt_id, None)
+                    return
+                if retrieved:
+                    return  # The job worker publishes once it is classified
+                await asyncio.sleep(self.gateway_poll_seconds)
+        finally:
+            self._pollers.pop((user_id, receipt_id), None)
+
+    async def __retrieve_from_gateway(
+        self, user_id: int, receipt_id: str
+    ) -> Optional[bool]:
+        """
+        Fetch the receipt from the gateway and queue it if it is ready.
+
+        Returns True once queued, False while the gateway is still reading the
+        receipt and None if the gateway could not be asked.
+        """
         url = self.secret_provider.get_secret(SecretKey.RECEIPT_RETRIEVE_ENDPOINT)
         if not url:
             self.logging_provider.error(
@@ -100,10 +230,10 @@ class ReceiptGatewayService:
                 user_id=user_id, receipt_id=receipt_id, result=result
             )
             await self.receipt_result_accessor.add_result(domain)
-            await self.receipt_service.process_receipt_webhook(user_id, result)
-            return ReceiptStatus.PROCESSED
+            await self.job_service.enqueue(user_id, receipt_id, result)
+            return True
         if status == 202:
-            return ReceiptStatus.PENDING
+            return False
         self.logging_provider.error(
             "Unexpected status from receipt result",
             extra_data={"status": status},
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from injector import inject
+
+from src.core.common.constants import SecretKey
+from src.core.common.ports.cache_provider import ICacheProvider
+from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.core.common.utils import DateTimeUtils
+from src.core.logging.ports.logging_provider import ILoggingProvider
+from src.core.receipt.accessors.receipt_item_classification_accessor import (
+    IReceiptItemClassificationAccessor,
+)
+from src.core.receipt.constants import SUBCATEGORIES
+from src.core.receipt.models import ReceiptItemClassificationDomain
+
+DEFAULT_RECEIPT_ITEM_CACHE_TTL_SECONDS = 86400
+DEFAULT_RECEIPT_ITEM_CACHE_MAX_AGE_DAYS = 30
+
+
+class ReceiptItemCacheService:
+    """
+    Remembers how receipt lines were classified so repeated lines skip the LLM.
+
+    Classifications are keyed by the normalised line text and shared by all
+    users. They are stored in the receipt_item_classification table for
+    RECEIPT_ITEM_CACHE_MAX_AGE_DAYS, after which the line is sent to
+    the LLM again and its classification replaced, so a wrong one does not
+    stay forever. The in-process cache keeps recently seen lines for
+    RECEIPT_ITEM_CACHE_TTL_SECONDS in front of the table, evicting the least
+    recently used ones once CACHE_MAX_ENTRIES is reached.
+    """
+
+    @inject
+    def __init__(
+        self,
+        classification_accessor: IReceiptItemClassificationAccessor,
+        cache_provider: ICacheProvider,
+        secret_provider: ISecretProvider,
+        logging_provider: ILoggingProvider,
+    ) -> None:
+        self.classification_accessor = classification_accessor
+        self.cache_provider = cache_provider
+        self.logging_provider = logging_provider
+        try:
+            self.ttl_seconds = int(
+                secret_provider.get_secret(
+                    SecretKey.RECEIPT_ITEM_CACHE_TTL_SECONDS,
+                    str(DEFAULT_RECEIPT_ITEM_CACHE_TTL_SECONDS),
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid RECEIPT_ITEM_CACHE_TTL_SECONDS value in .env")
+        try:
+            self.max_age_days = int(
+                secret_provider.get_secret(
+                    SecretKey.RECEIPT_ITEM_CACHE_MAX_AGE_DAYS,
+                    str(DEFAULT_RECEIPT_ITEM_CACHE_MAX_AGE_DAYS),
+                )
+            )
+            if self.max_age_days < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ValueError("Invalid RECEIPT_ITEM_CACHE_MAX_AGE_DAYS value in .env")
+
+        self.lookups = 0
+        self.memory_hits = 0
+        self.db_hits = 0
+
+    @staticmethod
+    def normalize(item_name: str) -> str:
+        """Key a receipt line by its upper-cased text with whitespace collapsed."""
+        return " ".join(item_name.upper().split())
+
+    async def get_many(
+        self, normalized_names: List[str]
+    ) -> Dict[str, ReceiptItemClassificationDomain]:
+        """Return the known classifications of the given names, keyed by name."""
+        names = list(dict.fromkeys(normalized_names))
+        found: Dict[str, ReceiptItemClassificationDomain] = {}
+        missing = []
+        for name in names:
+            cached = await self.cache_provider.get(self.__key(name))
+            if cached is None:
+                missing.append(name)
+            else:
+                found[name] = ReceiptItemClassificationDomain.model_validate(cached)
+
+        stored = await self.classification_accessor.get_by_names(
+            missing, self.__stored_after()
+        )
+        for classification in stored.values():
+            await self.__remember(classification)
+
+        self.lookups += len(names)
+        self.memory_hits += len(found)
+        self.db_hits += len(stored)
+        return {**found, **stored}
+
+    async def add_many(
+        self, classifications: List[ReceiptItemClassificationDomain]
+    ) -> None:
+        """
+        Store fresh LLM classifications.
+
+        Lines without text or with a subcategory outside SUBCATEGORIES are not
+        stored, so one bad reply is not repeated for every later receipt.
+        """
+        valid = [
+            c
+            for c in classifications
+            if c.normalized_name
+            and (c.subcategory is None or c.subcategory in SUBCATEGORIES)
+        ]
+        if len(valid) < len(classifications):
+            self.logging_provider.debug(
+                "Skipped caching receipt item classifications",
+                extra_data={"skipped": len(classifications) - len(valid)},
+                tag="ReceiptItemCacheService",
+            )
+        await self.classification_accessor.add_classifications(
+            valid, self.__stored_after()
+        )
+        for classification in valid:
+            await self.__remember(classification)
+
+    def stats(self) -> Dict[str, float]:
+        """Return lookup counters since process start."""
+        hits = self.memory_hits + self.db_hits
+        return {
+            "lookups": self.lookups,
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.lookups - hits,
+            "hit_rate": hits / self.lookups if self.lookups else 0.0,
+        }
+
+    async def __remember(self, classification: ReceiptItemClassificationDomain) -> None:
+        await self.cache_provider.set(
+            self.__key(classification.normalized_name),
+            classification.model_dump(mode="json"),
+            self.ttl_seconds,
+        )
+
+    def __stored_after(self) -> datetime:
+        """Oldest storage time of a classification that is still used."""
+        return DateTimeUtils.get_utc_now() - timedelta(days=self.max_age_days)
+
+    def __key(self, normalized_name: str) -> str:
+        return f"receipt:item:{normalized_name}"
@@ -0,0 +1,254 @@
+import asyncio
+import hashlib
+import json
+import random
+from typing import Any, Dict, List, Optional
+
+from injector import inject
+
+from src.core.common.constants import SecretKey
+from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.core.common.utils import DateTimeUtils
+from src.core.logging.ports.logging_provider import ILoggingProvider
+from src.core.pantry.models import PantryItemDomain
+from src.core.pantry.services.pantry_context_service import PantryContextService
+from src.core.receipt.accessors.receipt_job_accessor import IReceiptJobAccessor
+from src.core.receipt.constants import ReceiptJobStatus, ReceiptStatus
+from src.core.receipt.models import ReceiptJobDomain
+from src.core.receipt.ports.receipt_status_notifier import IReceiptStatusNotifier
+from src.core.receipt.services.receipt_service import ReceiptService
+
+DEFAULT_RECEIPT_JOB_WORKERS = 2
+DEFAULT_RECEIPT_JOB_MAX_ATTEMPTS = 5
+DEFAULT_RECEIPT_JOB_LEASE_SECONDS = 300
+IDLE_POLL_SECONDS = 1.0
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 300.0
+
+
+class ReceiptJobService:
+    """
+    Classifies receipts on a database-backed job queue instead of in the request.
+
+    Webhooks and result polls enqueue one job per receipt; RECEIPT_JOB_WORKERS
+    workers, started with the app, claim due jobs and run
+    ``ReceiptService.process_receipt_webhook``, which bounds how many
+    classifications (and LLM calls) run at once.
+
+    Delivery is at least once: a claimed job is leased for
+    RECEIPT_JOB_LEASE_SECONDS, renewed while its worker is still running it,
+    and is claimed again if that worker dies before finishing. A receipt's
+    pantry items are added in the transaction that completes its job, which
+    only the worker holding the current lease can do, so a receipt processed
+    twice still adds its items once. Failed jobs are retried with exponential
+    backoff and full jitter until RECEIPT_JOB_MAX_ATTEMPTS attempts have been
+    made. Requests waiting on a receipt are woken through the status notifier
+    once its job is done or has failed for good.
+    """
+
+    @inject
+    def __init__(
+        self,
+        job_accessor: IReceiptJobAccessor,
+        receipt_service: ReceiptService,
+        secret_provider: ISecretProvider,
+        logging_provider: ILoggingProvider,
+        status_notifier: IReceiptStatusNotifier,
+        pantry_context_service: PantryContextService,
+    ) -> None:
+        self.job_accessor = job_accessor
+        self.receipt_service = receipt_service
+        self.pantry_context_service = pantry_context_service
+        self.logging_provider = logging_provider
+        self.status_notifier = status_notifier
+        try:
+            self.workers = int(
+                secret_provider.get_secret(
+                    SecretKey.RECEIPT_JOB_WORKERS, str(DEFAULT_RECEIPT_JOB_WORKERS)
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid RECEIPT_JOB_WORKERS value in .env")
+        try:
+            self.max_attempts = int(
+                secret_provider.get_secret(
+                    SecretKey.RECEIPT_JOB_MAX_ATTEMPTS,
+                    str(DEFAULT_RECEIPT_JOB_MAX_ATTEMPTS),
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid RECEIPT_JOB_MAX_ATTEMPTS value in .env")
+        try:
+            self.lease_seconds = int(
+                secret_provider.get_secret(
+                    SecretKey.RECEIPT_JOB_LEASE_SECONDS,
+                    str(DEFAULT_RECEIPT_JOB_LEASE_SECONDS),
+                )
+            )
+            if self.lease_seconds < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ValueError("Invalid RECEIPT_JOB_LEASE_SECONDS value in .env")
+
+        # One token per enqueue wakes one idle worker rather than all of them
+        self._wakeups: asyncio.Queue = asyncio.Queue(maxsize=max(self.workers, 1))
+        self._tasks: List[asyncio.Task] = []
+
+    async def enqueue(
+        self, user_id: int, receipt_id: Optional[str], payload: Dict[str, Any]
+    ) -> ReceiptJobDomain:
+        """
+        Queue a receipt for classification and return its job.
+
+        Without a ``receipt_id`` the job is keyed on a hash of the user and the
+        receipt content, so a redelivered webhook does not add the items twice.
+        """
+        receipt_id = receipt_id or self.__payload_key(user_id, payload)
+        job = await self.job_accessor.enqueue(user_id, receipt_id, payload)
+        try:
+            self._wakeups.put_nowait(None)
+        except asyncio.QueueFull:
+            pass  # Every worker already has a wake-up pending
+        return job
+
+    async def get_status(
+        self, user_id: int, receipt_id: str
+    ) -> Optional[ReceiptStatus]:
+        """Return the processing status of a queued receipt, or None if not queued."""
+        job = await self.job_accessor.get_job(user_id, receipt_id)
+        return self.to_receipt_status(job) if job else None
+
+    @staticmethod
+    def to_receipt_status(job: ReceiptJobDomain) -> ReceiptStatus:
+        if job.status == ReceiptJobStatus.DONE:
+            return ReceiptStatus.PROCESSED
+        if job.status == ReceiptJobStatus.FAILED:
+            return ReceiptStatus.FAILED
+        return ReceiptStatus.PENDING
+
+    def start(self) -> None:
+        """Start the worker pool on the running event loop."""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self.__work(), name=f"receipt-job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self.logging_provider.info(
+            "Receipt job workers started",
+            extra_data={"workers": self.workers},
+            tag="ReceiptJobService",
+        )
+
+    async def stop(self) -> None:
+        """
+        Stop the worker pool.
+
+        Jobs interrupted mid-way stay leased and are picked up again once their
+        lease expires.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_once(self) -> bool:
+        """Claim and process one due job; return False when no job is due."""
+        job = await self.job_accessor.claim_next(self.lease_seconds)
+        if job is None:
+            return False
+        if job.attempts > self.max_attempts:
+            # Only reachable when workers kept dying while holding the job
+            if await self.job_accessor.fail(job, "Lease expired too many times"):
+                await self.__notify(job, ReceiptStatus.FAILED)
+            return True
+
+        heartbeat = asyncio.create_task(self.__hold_lease(job))
+        try:
+            specs = await self.receipt_service.classify_receipt(
+                job.user_id, job.payload
+            )
+            completed = await self.job_accessor.complete(
+                job, [PantryItemDomain.from_spec(job.user_id, spec) for spec in specs]
+            )
+        except Exception as exc:
+            await self.__handle_failure(job, exc)
+            return True
+        finally:
+            heartbeat.cancel()
+        if completed:
+            await self.pantry_context_service.bump_version(job.user_id)
+            await self.__notify(job, ReceiptStatus.PROCESSED)
+        return True
+
+    async def __work(self) -> None:
+        while True:
+            try:
+                processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.logging_provider.error(
+                    "Receipt job worker error",
+                    extra_data={"error": str(exc)},
+                    tag="ReceiptJobService",
+                )
+                processed = False
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeups.get(), IDLE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def __hold_lease(self, job: ReceiptJobDomain) -> None:
+        """Renew the job's lease every third of it until cancelled or lost."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                extended = await self.job_accessor.extend_lease(job, self.lease_seconds)
+            except Exception as exc:
+                self.logging_provider.warning(
+                    "Failed to renew receipt job lease",
+                    extra_data={"receipt_id": job.receipt_id, "error": str(exc)},
+                    tag="ReceiptJobService",
+                )
+                continue
+            if not extended:
+                return  # Claimed again; the fenced complete() will be refused
+
+    async def __handle_failure(self, job: ReceiptJobDomain, exc: Exception) -> None:
+        extra_data = {
+            "receipt_id": job.receipt_id,
+            "attempts": job.attempts,
+            "error": str(exc),
+        }
+        if job.attempts >= self.max_attempts:
+            if await self.job_accessor.fail(job, str(exc)):
+                await self.__notify(job, ReceiptStatus.FAILED)
+            self.logging_provider.error(
+                "Receipt job failed permanently",
+                extra_data=extra_data,
+                tag="ReceiptJobService",
+            )
+            return
+
+        delay = random.uniform(
+            0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+        )
+        await self.job_accessor.retry_later(
+            job, str(exc), DateTimeUtils.add_seconds(DateTimeUtils.get_utc_now(), delay)
+        )
+        self.logging_provider.warning(
+            "Receipt job failed; retrying",
+            extra_data={**extra_data, "retry_in_seconds": round(delay, 2)},
+            tag="ReceiptJobService",
+        )
+
+    async def __notify(self, job: ReceiptJobDomain, status: ReceiptStatus) -> None:
+        await self.status_notifier.publish(job.user_id, job.receipt_id, status)
+
+    @staticmethod
+    def __payload_key(user_id: int, payload: Dict[str, Any]) -> str:
+        content = json.dumps([user_id, payload], sort_keys=True, default=str)
+        return f"webhook-{hashlib.sha256(content.encode()).hexdigest()}"
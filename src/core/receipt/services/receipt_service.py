@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import re
-from ast import literal_eval
 from datetime import datetime, timezone
 from typing import Any, Dict, List
 
@@ -11,13 +10,27 @@ from injector import inject
 from src.core.chatbot.constants import ChatbotMessageRole
 from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
 from src.core.chatbot.specs import ChatMessageSpec
-from src.core.common.utils import DateTimeUtils
+from src.core.common.constants import SecretKey
+from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.core.common.utils import DateTimeUtils, JsonExtractUtil, TokenUtil
 from src.core.expiry.services.expiry_prediction_service import ExpiryPredictionService
+from src.core.expiry.specs import ExpiryQuerySpec
 from src.core.logging.ports.logging_provider import ILoggingProvider
 from src.core.pantry.constants import Category, Unit
 from src.core.pantry.services.pantry_service import PantryService
 from src.core.pantry.specs import AddPantryItemSpec
 from src.core.receipt.constants import SUBCAT_TO_CATEGORY, SUBCATEGORIES
+from src.core.receipt.models import ReceiptItemClassificationDomain
+from src.core.receipt.services.receipt_item_cache_service import (
+    ReceiptItemCacheService,
+)
+
+DEFAULT_RECEIPT_CLASSIFY_CHUNK_TOKENS = 512
+DEFAULT_RECEIPT_CLASSIFY_CONCURRENCY = 4
+# Estimated reply tokens per line on top of its name: JSON keys and categories
+REPLY_TOKENS_PER_ITEM = 30
+CLASSIFY_CHUNK_RETRIES = 2
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
 
 
 class ReceiptService:
@@ -30,16 +43,48 @@ class ReceiptService:
         chatbot_provider: IChatbotProvider,
         logging_provider: ILoggingProvider,
         expiry_service: ExpiryPredictionService,
+        item_cache_service: ReceiptItemCacheService,
+        secret_provider: ISecretProvider,
     ) -> None:
         self.pantry_service = pantry_service
         self.chatbot_provider = chatbot_provider
         self.logging_provider = logging_provider
         self.expiry_service = expiry_service
+        self.item_cache_service = item_cache_service
+        try:
+            self.classify_chunk_tokens = int(
+                secret_provider.get_secret(
+                    SecretKey.RECEIPT_CLASSIFY_CHUNK_TOKENS,
+                    str(DEFAULT_RECEIPT_CLASSIFY_CHUNK_TOKENS),
+                )
+            )
+            if self.classify_chunk_tokens < 1:
+                raise ValueError  # A budget below one token would never fit a line
+        except (TypeError, ValueError):
+            raise ValueError("Invalid RECEIPT_CLASSIFY_CHUNK_TOKENS value in .env")
+        try:
+            self.classify_concurrency = int(
+                secret_provider.get_secret(
+                    SecretKey.RECEIPT_CLASSIFY_CONCURRENCY,
+                    str(DEFAULT_RECEIPT_CLASSIFY_CONCURRENCY),
+                )
+            )
+            if self.classify_concurrency < 1:
+                raise ValueError  # A zero-permit semaphore would block every chunk
+        except (TypeError, ValueError):
+            raise ValueError("Invalid RECEIPT_CLASSIFY_CONCURRENCY value in .env")
 
     async def process_receipt_webhook(
         self, user_id: int, receipt_json: Dict[str, Any]
     ) -> None:
         """Classify receipt items and store them in the pantry."""
+        specs = await self.classify_receipt(user_id, receipt_json)
+        await self.pantry_service.add_items(user_id, specs)
+
+    async def classify_receipt(
+        self, user_id: int, receipt_json: Dict[str, Any]
+    ) -> List[AddPantryItemSpec]:
+        """Classify receipt items into pantry items, without storing them."""
         try:
             classified = await self._classify_receipt_items(user_id, receipt_json)
         except Exception as exc:  # pragma: no cover - unlikely parsing error
@@ -50,107 +95,222 @@ class ReceiptService:
             )
             raise
 
-        specs: List[AddPantryItemSpec] = []
         purchase_date = self._parse_purchase_date(receipt_json.get("Date"))
+        categories = [
+            self._map_subcategory(item.get("SUBCATEGORY")) for item in classified
+        ]
+        expiry_dates = await self.expiry_service.get_expiry_dates(
+            [
+                ExpiryQuerySpec(category=category, purchase_date=purchase_date.date())
+                for category in categories
+            ]
+        )
 
-        for item in classified:
-            qty = self._parse_quantity(item.get("QUANTITY"))
-            category = self._map_subcategory(item.get("SUBCATEGORY"))
-            expiry = await self.expiry_service.get_expiry_date(
+        return [
+            AddPantryItemSpec(
+                item_name=item.get("ITEM", ""),
+                quantity=self._parse_quantity(item.get("QUANTITY")),
+                unit=Unit.PIECES,
                 category=category,
-                purchase_date=purchase_date.date(),
-            )
-            specs.append(
-                AddPantryItemSpec(
-                    item_name=item.get("ITEM", ""),
-                    quantity=qty,
-                    unit=Unit.PIECES,
-                    category=category,
-                    purchase_date=purchase_date,
-                    expiry_date=datetime.combine(expiry, datetime.min.time()),
-                )
+                purchase_date=purchase_date,
+                expiry_date=datetime.combine(expiry, datetime.min.time()),
             )
-        await self.pantry_service.add_items(user_id, specs)
+            for item, category, expiry in zip(classified, categories, expiry_dates)
+        ]
 
     async def _classify_receipt_items(
         self, user_id: int, receipt_json: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
+        """
+        Classify every receipt line, in receipt order.
+
+        Lines classified before come from the item cache; only the others are
+        sent to the LLM, and its answers are cached for later receipts. Lines the
+        LLM did not answer for are kept as unclassified items.
+        """
         cleaned = receipt_json.get("Items", [])
         items = [str(it.get("ITEM", "")).replace("\n", " ") for it in cleaned]
+        keys = [self.item_cache_service.normalize(name) for name in items]
+
+        known = await self.item_cache_service.get_many(keys)
+        unknown: Dict[str, str] = {}
+        for key, name in zip(keys, items):
+            if key not in known:
+                unknown.setdefault(key, name)
+        if unknown:
+            known.update(await self._classify_with_llm(user_id, unknown))
+
+        classified = []
+        for key, name in zip(keys, items):
+            entry = known.get(key)
+            if entry is None:
+                # The LLM skipped the line; keep it as an unclassified item
+                classified.append({"ITEM": name, "SUBCATEGORY": None, "QUANTITY": 1})
+                continue
+            classified.append(
+                {
+                    "ITEM": entry.item_name,
+                    "SUBCATEGORY": entry.subcategory,
+                    "QUANTITY": entry.quantity,
+                }
+            )
+        return classified
+
+    async def _classify_with_llm(
+        self, user_id: int, items: Dict[str, str]
+    ) -> Dict[str, ReceiptItemClassificationDomain]:
+        """
+        Classify receipt lines (normalised name -> text) with the LLM.
+
+        Lines are split into chunks whose answers should fit in
+        RECEIPT_CLASSIFY_CHUNK_TOKENS and classified concurrently, at most
+        RECEIPT_CLASSIFY_CONCURRENCY chunks at a time. When a reply cannot be
+        parsed or leaves lines out (usually because it was truncated), only the
+        missing lines are asked for again, in two smaller chunks, up to
+        CLASSIFY_CHUNK_RETRIES times; lines still missing stay unclassified.
+        Provider errors are raised so that the receipt job is retried.
+        """
+        gate = asyncio.Semaphore(self.classify_concurrency)
+        results = await asyncio.gather(
+            *(
+                self._classify_chunk(user_id, chunk, gate, CLASSIFY_CHUNK_RETRIES)
+                for chunk in self._chunk_items(items)
+            )
+        )
+        learned: Dict[str, ReceiptItemClassificationDomain] = {}
+        for result in results:
+            learned.update(result)
+        return learned
+
+    def _chunk_items(self, items: Dict[str, str]) -> List[Dict[str, str]]:
+        chunks: List[Dict[str, str]] = []
+        chunk: Dict[str, str] = {}
+        chunk_tokens = 0
+        for key, name in items.items():
+            tokens = TokenUtil.estimate_tokens(name) + REPLY_TOKENS_PER_ITEM
+            if chunk and chunk_tokens + tokens > self.classify_chunk_tokens:
+                chunks.append(chunk)
+                chunk, chunk_tokens = {}, 0
+            chunk[key] = name
+            chunk_tokens += tokens
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    async def _classify_chunk(
+        self,
+        user_id: int,
+        chunk: Dict[str, str],
+        gate: asyncio.Semaphore,
+        retries: int,
+    ) -> Dict[str, ReceiptItemClassificationDomain]:
+        async with gate:
+            reply = await self.chatbot_provider.handle_single_turn(
+                self._build_classification_message(user_id, chunk)
+            )
+        try:
+            learned = self._parse_classification(reply, chunk)
+        except ValueError as exc:
+            self.logging_provider.warning(
+                "Failed to parse receipt classification",
+                extra_data={"error": str(exc), "items": len(chunk)},
+                tag="ReceiptService",
+            )
+            learned = {}
+        # Cached per chunk, so a retried receipt job does not pay for it again
+        await self.item_cache_service.add_many(list(learned.values()))
+
+        missing = [key for key in chunk if key not in learned]
+        if not missing:
+            return learned
+        if retries == 0:
+            self.logging_provider.warning(
+                "Receipt items left unclassified",
+                extra_data={"user_id": user_id, "items": len(missing)},
+                tag="ReceiptService",
+            )
+            return learned
+
+        half = (len(missing) + 1) // 2
+        parts = [missing[:half], missing[half:]]
+        results = await asyncio.gather(
+            *(
+                self._classify_chunk(
+                    user_id, {key: chunk[key] for key in part}, gate, retries - 1
+                )
+                for part in parts
+                if part
+            )
+        )
+        for result in results:
+            learned.update(result)
+        return learned
+
+    def _build_classification_message(
+        self, user_id: int, items: Dict[str, str]
+    ) -> ChatMessageSpec:
         subcats = ", ".join(f'"{c}"' for c in SUBCATEGORIES)
         prompt = """You are a helpful assistant trained to classify receipt items from Singapore supermarkets.\n"""
         prompt += "Use this context to determine whether an item is a food or non-food item and assign a sub-category.\n"
         prompt += "For each item, return JSON with fields ITEM, CATEGORY, SUBCATEGORY, QUANTITY.\n"
+        prompt += "ITEM must repeat the item's text exactly as listed.\n"
         prompt += f"If food, SUBCATEGORY must be one of: {subcats}. For non-food, SUBCATEGORY is null.\n"
         prompt += "Items:\n" + "\n".join(
-            f"{i+1}. {name}" for i, name in enumerate(items)
+            f"{i+1}. {name}" for i, name in enumerate(items.values())
         )
 
-        message = ChatMessageSpec(
+        return ChatMessageSpec(
             user_id=user_id,
             role=ChatbotMessageRole.USER,
             content=prompt,
             timestamp=DateTimeUtils.get_utc_now(),
         )
-        reply = await self.chatbot_provider.handle_single_turn(message)
-        json_str = self._extract_json(reply)
-
-        obj = json.loads(json_str)
-        if isinstance(obj, dict) and "items" in obj:
-            obj = obj["items"]
-        if not isinstance(obj, list):
-            raise ValueError("Classification did not return a list")
-        return obj
-
-    def _safe_load_json(self, candidate: str) -> Any | None:
-        """Attempt to parse a JSON or Python literal string."""
-        for parser in (json.loads, literal_eval):
-            try:
-                return parser(candidate)
-            except Exception:  # pragma: no cover - best effort parsing
-                continue
-        return None
-
-    def _extract_json(self, text: str) -> str:
-        """Extract a JSON array or list of objects from an LLM response."""
-        # Prefer fenced blocks if present
-        blocks = re.findall(r"```(?:json)?\s*([\s\S]+?)\s*```", text)
-        if not blocks:
-            blocks = [text]
-
-        for block in blocks:
-            block = block.strip()
-            if not block:
-                continue
 
-            # Direct JSON array
-            match = re.search(r"\[\s*{.*?}\s*\]", block, re.DOTALL)
-            if match:
-                parsed = self._safe_load_json(match.group(0))
-                if isinstance(parsed, list):
-                    return json.dumps(parsed)
-
-            # Entire block might be valid JSON
-            parsed = self._safe_load_json(block)
-            if isinstance(parsed, list):
-                return json.dumps(parsed)
-            if isinstance(parsed, dict):
-                return json.dumps(parsed)
-
-            # Look for numbered objects like "1. {...}"
-            item_strs = re.findall(r"\{[^{}]*\}", block)
-            parsed_items = [self._safe_load_json(s) for s in item_strs]
-            parsed_items = [p for p in parsed_items if isinstance(p, dict)]
-            if parsed_items:
-                return json.dumps(parsed_items)
-
-        raise ValueError("No valid JSON list found in response")
+    def _parse_classification(
+        self, reply: str, items: Dict[str, str]
+    ) -> Dict[str, ReceiptItemClassificationDomain]:
+        """Match the answers in an LLM reply to the lines it was asked about."""
+        entries = self._extract_classification(reply)
+        # Matched by item name, never by position: the answers are cached for
+        # every user, so a reordered reply must not swap two lines' answers.
+        # Lines without an answer naming them are asked about again.
+        by_name = {
+            self.item_cache_service.normalize(str(entry.get("ITEM", ""))): entry
+            for entry in entries
+        }
+        pairs = [(key, by_name[key]) for key in items if key in by_name]
+
+        return {
+            key: ReceiptItemClassificationDomain.create(
+                normalized_name=key,
+                item_name=str(entry.get("ITEM") or items[key]),
+                subcategory=entry.get("SUBCATEGORY") or None,
+                quantity=self._parse_quantity(entry.get("QUANTITY")),
+            )
+            for key, entry in pairs
+        }
+
+    def _extract_classification(self, reply: str) -> List[Any]:
+        """Return the answers in an LLM reply, salvaging those of a cut-off reply."""
+        try:
+            obj = JsonExtractUtil.extract(reply, accept=self._is_classification)
+        except ValueError:
+            obj = JsonExtractUtil.extract_objects(reply)
+            if not obj:
+                raise ValueError("No valid JSON list found in response")
+        return obj["items"] if isinstance(obj, dict) else obj
+
+    @staticmethod
+    def _is_classification(value: Any) -> bool:
+        if isinstance(value, dict):
+            value = value.get("items")
+        return isinstance(value, list) and all(isinstance(e, dict) for e in value)
 
     def _parse_quantity(self, value: Any) -> float:
         try:
             return float(value)
         except (TypeError, ValueError):
-            nums = re.findall(r"\d+(?:\.\d+)?", str(value))
+            nums = NUMBER_PATTERN.findall(str(value))
             if nums:
                 try:
                     return float(nums[0])
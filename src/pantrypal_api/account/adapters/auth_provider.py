@@ -1,3 +1,8 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
 from injector import inject
 from jose import jwt
 
@@ -7,9 +12,21 @@ from src.core.common.ports.secretkey_provider import ISecretProvider
 from src.core.common.utils import DateTimeUtils, HashUtil
 from src.core.logging.ports.logging_provider import ILoggingProvider
 
+DEFAULT_BCRYPT_ROUNDS = 12
+DEFAULT_HASH_MAX_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_HASH_MAX_PENDING = 64
+
+T = TypeVar("T")
+
 
 class AuthProvider(IAuthProvider):
-    """Handles password hashing/verification and JWT token generation."""
+    """Handles password hashing/verification and JWT token generation.
+
+    The async hashing methods run bcrypt on a dedicated, fixed-size thread pool
+    (bcrypt releases the GIL while hashing) so logins never block the event
+    loop. A semaphore admits at most AUTH_HASH_MAX_PENDING jobs into the pool;
+    further callers wait on the event loop instead of growing the pool queue.
+    """
 
     @inject
     def __init__(
@@ -20,14 +37,47 @@ class AuthProvider(IAuthProvider):
         self.secret_provider = secret_provider
         self.logging_provider = logging_provider
 
+        self.bcrypt_rounds = self.__get_bcrypt_rounds()
+        self.__max_workers = self.__get_int_secret(
+            SecretKey.AUTH_HASH_MAX_WORKERS, DEFAULT_HASH_MAX_WORKERS
+        )
+        self.__hash_semaphore = asyncio.Semaphore(
+            self.__get_int_secret(
+                SecretKey.AUTH_HASH_MAX_PENDING, DEFAULT_HASH_MAX_PENDING
+            )
+        )
+        self.__executor: Optional[ThreadPoolExecutor] = None
+
     def get_hashed_password(self, raw_password: str) -> str:
         """Hash the provided raw password securely."""
-        return HashUtil.hash(raw_password)
+        return HashUtil.hash(raw_password, self.bcrypt_rounds)
+
+    async def get_hashed_password_async(self, raw_password: str) -> str:
+        """Hash the password on the bcrypt worker pool."""
+        return await self.__run_in_pool(self.get_hashed_password, raw_password)
 
     def verify_password(self, raw_password: str, hashed_password: str) -> bool:
         """Check if the raw password matches the hashed password."""
         return HashUtil.verify(raw_password, hashed_password)
 
+    async def verify_password_async(
+        self, raw_password: str, hashed_password: str
+    ) -> bool:
+        """Check the password on the bcrypt worker pool."""
+        return await self.__run_in_pool(
+            self.verify_password, raw_password, hashed_password
+        )
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Return True if the hash is weaker than the configured bcrypt cost."""
+        return HashUtil.needs_rehash(hashed_password, self.bcrypt_rounds)
+
+    async def close(self) -> None:
+        """Shuts down the bcrypt pool; the next hash or verify starts a new one."""
+        if self.__executor is not None:
+            executor, self.__executor = self.__executor, None
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def generate_token(self, user_id: int) -> str:
         """Generate a JWT access token for the given user ID."""
         secret_key = self.__get_secret_key()
@@ -57,6 +107,41 @@ class AuthProvider(IAuthProvider):
             )
             raise ValueError("Invalid token")
 
+    async def __run_in_pool(self, func: Callable[..., T], *args) -> T:
+        async with self.__hash_semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.__get_executor(), func, *args)
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        """Returns the bcrypt pool, creating it on first use or after close."""
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=self.__max_workers, thread_name_prefix="bcrypt"
+            )
+        return self.__executor
+
+    def __get_bcrypt_rounds(self) -> int:
+        try:
+            rounds = int(
+                self.secret_provider.get_secret(
+                    SecretKey.AUTH_BCRYPT_ROUNDS, str(DEFAULT_BCRYPT_ROUNDS)
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid AUTH_BCRYPT_ROUNDS value in .env")
+        if not 4 <= rounds <= 31:
+            raise ValueError("AUTH_BCRYPT_ROUNDS must be between 4 and 31")
+        return rounds
+
+    def __get_int_secret(self, key: SecretKey, default: int) -> int:
+        try:
+            value = int(self.secret_provider.get_secret(key, str(default)))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {key.value} value in .env")
+        if value < 1:
+            raise ValueError(f"{key.value} must be a positive integer")
+        return value
+
     def __get_secret_key(self) -> str:
         key = self.secret_provider.get_secret(SecretKey.AUTH_SECRET_KEY)
         if not key:
@@ -63,6 +63,21 @@ async def get_current_user_obj(
     return user
 
 
+async def get_admin_user(token: str) -> UserAccountDomain | None:
+    """Return the user behind a token if they are an administrator.
+
+    Shared by the admin middleware and the SQLAdmin backend; both the token and
+    user lookups go through the auth cache. Raises HTTPException for invalid tokens.
+    """
+    auth_service = injector.get(AuthService)
+    user_service = injector.get(UserAccountService)
+    user_id = await auth_service.verify_auth_token(token)
+    user = await user_service.get_user(user_id)
+    if not user or not user.is_admin:
+        return None
+    return user
+
+
 async def admin_required(user=Depends(get_current_user_obj)) -> int:
     if not user.is_admin:
         raise HTTPException(
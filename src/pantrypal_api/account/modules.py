@@ -3,6 +3,7 @@ from injector import Binder, Module, singleton
 from src.core.account.accessors.auth_token_accessor import IAuthTokenAccessor
 from src.core.account.accessors.user_account_accessor import IUserAccountAccessor
 from src.core.account.ports.auth_provider import IAuthProvider
+from src.core.account.services.auth_cache_service import AuthCacheService
 from src.pantrypal_api.account.accessors.auth_token_accessor import AuthTokenAccessor
 from src.pantrypal_api.account.accessors.user_account_accessor import (
     UserAccountAccessor,
@@ -15,3 +16,5 @@ class AccountModule(Module):
         binder.bind(IAuthProvider, to=AuthProvider, scope=singleton)
         binder.bind(IAuthTokenAccessor, to=AuthTokenAccessor, scope=singleton)
         binder.bind(IUserAccountAccessor, to=UserAccountAccessor, scope=singleton)
+        # Singleton so hit/miss counters cover every request in the process
+        binder.bind(AuthCacheService, scope=singleton)
@@ -7,6 +7,7 @@ from src.core.account.services.user_account_service import UserAccountService
 from src.core.account.specs import LoginSpec
 from src.core.common.constants import SecretKey
 from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.pantrypal_api.account.dependencies import get_admin_user
 from src.pantrypal_api.modules import injector
 
 
@@ -30,11 +31,7 @@ class AdminAuth(AuthenticationBackend):
         scheme, token = get_authorization_scheme_param(auth)
         if scheme.lower() != "bearer" or not token:
             return False
-        auth_service = injector.get(AuthService)
-        user_service = injector.get(UserAccountService)
-        user_id = await auth_service.verify_auth_token(token)
-        user = await user_service.get_user(user_id)
-        if not user or not user.is_admin:
+        if not await get_admin_user(token):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Administrator access required",
@@ -1,14 +1,24 @@
-from typing import List
+from typing import List, Optional
 
 from injector import inject
+from sqlalchemy import and_, delete, func, insert, or_
 from sqlalchemy.future import select
 
 from src.core.chatbot.accessors.chat_session_accessor import IChatSessionAccessor
-from src.core.chatbot.models import ChatSessionDomain
+from src.core.chatbot.models import ChatSessionDomain, ChatSessionSummaryDomain
+from src.core.chatbot.specs import (
+    ChatMessageSpec,
+    ChatSessionListCursor,
+    ListChatSessionsSpec,
+)
 from src.core.common.utils import DateTimeUtils
 from src.core.logging.ports.logging_provider import ILoggingProvider
 from src.core.storage.ports.relational_database_provider import IDatabaseProvider
-from src.pantrypal_api.chatbot.models import ChatSession
+from src.pantrypal_api.chatbot.models import (
+    ChatHistory,
+    ChatSession,
+    ChatSessionIngredient,
+)
 
 
 class ChatSessionAccessor(IChatSessionAccessor):
@@ -23,31 +33,54 @@ class ChatSessionAccessor(IChatSessionAccessor):
         self.db_provider = db_provider
         self.logging_provider = logging_provider
 
-    async def list_sessions(self, user_id: int) -> List[ChatSessionDomain]:
+    async def list_sessions(
+        self, user_id: int, spec: ListChatSessionsSpec
+    ) -> List[ChatSessionSummaryDomain]:
+        stmt = (
+            select(ChatSession.id, ChatSession.title, ChatSession.updated_at)
+            .where(ChatSession.user_id == user_id)
+            .where(ChatSession.deleted_at.is_(None))
+            .order_by(ChatSession.updated_at.desc(), ChatSession.id.desc())
+        )
+        if spec.ingredient is not None:
+            terms = ChatSessionDomain.ingredient_terms(spec.ingredient)
+            if not terms:
+                return []
+            stmt = stmt.where(
+                ChatSession.id.in_(
+                    select(ChatSessionIngredient.session_id)
+                    .where(ChatSessionIngredient.user_id == user_id)
+                    .where(ChatSessionIngredient.term.in_(terms))
+                    .group_by(ChatSessionIngredient.session_id)
+                    .having(func.count() == len(terms))
+                )
+            )
+        if spec.after is not None:
+            stmt = stmt.where(self.__after_cursor(spec.after))
+        if spec.limit is not None:
+            stmt = stmt.limit(spec.limit)
+        async with self.db_provider.get_db() as session:
+            result = await session.execute(stmt)
+            return [ChatSessionSummaryDomain(**row) for row in result.mappings()]
+
+    async def get_session(
+        self, user_id: int, session_id: int
+    ) -> Optional[ChatSessionDomain]:
         async with self.db_provider.get_db() as session:
             result = await session.execute(
                 select(ChatSession)
+                .where(ChatSession.id == session_id)
                 .where(ChatSession.user_id == user_id)
                 .where(ChatSession.deleted_at.is_(None))
             )
-            records = result.scalars().all()
-            return [r.to_domain() for r in records]
+            record = result.scalar_one_or_none()
+            return record.to_domain() if record else None
 
     async def create_session(
         self, session_domain: ChatSessionDomain
     ) -> ChatSessionDomain:
-        record = ChatSession(
-            user_id=session_domain.user_id,
-            title=session_domain.title,
-            summary=session_domain.summary,
-            prep_time=session_domain.prep_time,
-            instructions="|".join(session_domain.instructions),
-            ingredients="|".join(session_domain.ingredients),
-            available_count=session_domain.available_ingredients,
-            total_count=session_domain.total_ingredients,
-        )
         async with self.db_provider.get_db() as db:
-            db.add(record)
+            record = await self.__create_record(db, session_domain)
             await db.commit()
             await db.refresh(record)
             return record.to_domain()
@@ -56,24 +89,36 @@ class ChatSessionAccessor(IChatSessionAccessor):
         self, session_id: int, session_domain: ChatSessionDomain
     ) -> ChatSessionDomain:
         async with self.db_provider.get_db() as db:
-            record = await db.get(ChatSession, session_id)
-            if record is None:
-                raise ValueError("Session not found")
-            if record.deleted_at is not None:
-                raise ValueError("Session deleted")
-
-            record.title = session_domain.title
-            record.summary = session_domain.summary
-            record.prep_time = session_domain.prep_time
-            record.instructions = "|".join(session_domain.instructions)
-            record.ingredients = "|".join(session_domain.ingredients)
-            record.available_count = session_domain.available_ingredients
-            record.total_count = session_domain.total_ingredients
-
+            record = await self.__update_record(db, session_id, session_domain)
             await db.commit()
             await db.refresh(record)
             return record.to_domain()
 
+    async def save_turn(
+        self,
+        session_id: Optional[int],
+        recipe: Optional[ChatSessionDomain],
+        messages: List[ChatMessageSpec],
+    ) -> Optional[int]:
+        async with self.db_provider.get_db() as db:
+            if recipe is not None and session_id is None:
+                session_id = (await self.__create_record(db, recipe)).id
+            elif recipe is not None:
+                await self.__update_record(db, session_id, recipe)
+            if messages:
+                await db.execute(
+                    insert(ChatHistory).values(
+                        [
+                            ChatHistory.row_for(
+                                m.model_copy(update={"session_id": session_id})
+                            )
+                            for m in messages
+                        ]
+                    )
+                )
+            await db.commit()
+            return session_id
+
     async def soft_delete_session(self, session_id: int) -> None:
         async with self.db_provider.get_db() as db:
             record = await db.get(ChatSession, session_id)
@@ -82,3 +127,71 @@ class ChatSessionAccessor(IChatSessionAccessor):
             if record.deleted_at is None:
                 record.deleted_at = DateTimeUtils.get_utc_now()
             await db.commit()
+
+    async def __create_record(
+        self, db, session_domain: ChatSessionDomain
+    ) -> ChatSession:
+        record = ChatSession(
+            user_id=session_domain.user_id,
+            title=session_domain.title,
+            summary=session_domain.summary,
+            prep_time=session_domain.prep_time,
+            instructions=session_domain.instructions,
+            ingredients=session_domain.ingredients,
+            available_count=session_domain.available_ingredients,
+            total_count=session_domain.total_ingredients,
+        )
+        db.add(record)
+        await db.flush()
+        await self.__index_ingredients(db, record)
+        return record
+
+    async def __update_record(
+        self, db, session_id: int, session_domain: ChatSessionDomain
+    ) -> ChatSession:
+        record = await db.get(ChatSession, session_id)
+        if record is None:
+            raise ValueError("Session not found")
+        if record.deleted_at is not None:
+            raise ValueError("Session deleted")
+
+        record.title = session_domain.title
+        record.summary = session_domain.summary
+        record.prep_time = session_domain.prep_time
+        record.instructions = session_domain.instructions
+        record.ingredients = session_domain.ingredients
+        record.available_count = session_domain.available_ingredients
+        record.total_count = session_domain.total_ingredients
+        record.updated_at = DateTimeUtils.get_utc_now()
+
+        await db.execute(
+            delete(ChatSessionIngredient).where(
+                ChatSessionIngredient.session_id == session_id
+            )
+        )
+        await self.__index_ingredients(db, record)
+        return record
+
+    @staticmethod
+    def __after_cursor(cursor: ChatSessionListCursor):
+        """Sessions strictly after the cursor in (updated_at desc, id desc) order."""
+        return or_(
+            ChatSession.updated_at < cursor.updated_at,
+            and_(
+                ChatSession.updated_at == cursor.updated_at,
+                ChatSession.id < cursor.id,
+            ),
+        )
+
+    @staticmethod
+    async def __index_ingredients(db, record: ChatSession) -> None:
+        """Store the terms of the session's ingredients for list_sessions lookups."""
+        terms = ChatSessionDomain.ingredient_terms(" ".join(record.ingredients or []))
+        if terms:
+            await db.execute(
+                insert(ChatSessionIngredient),
+                [
+                    {"session_id": record.id, "user_id": record.user_id, "term": term}
+                    for term in terms
+                ],
+            )
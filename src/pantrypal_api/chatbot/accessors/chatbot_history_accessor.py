@@ -1,12 +1,12 @@
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 from injector import inject
-from sqlalchemy import update
+from sqlalchemy import Select, and_, func, insert, not_, or_, update
 from sqlalchemy.future import select
 
 from src.core.chatbot.accessors.chatbot_history_accessor import IChatbotHistoryAccessor
-from src.core.chatbot.models import ChatHistoryDomain
-from src.core.chatbot.specs import ChatMessageSpec
+from src.core.chatbot.models import ChatHistoryDomain, ChatPromptWindowDomain
+from src.core.chatbot.specs import ChatHistoryCursor, ChatMessageSpec
 from src.core.common.constants import SecretKey
 from src.core.common.ports.secretkey_provider import ISecretProvider
 from src.core.common.utils import DateTimeUtils
@@ -14,6 +14,9 @@ from src.core.logging.ports.logging_provider import ILoggingProvider
 from src.core.storage.ports.relational_database_provider import IDatabaseProvider
 from src.pantrypal_api.chatbot.models import ChatHistory
 
+# Messages fetched per round trip when streaming a session's history
+STREAM_BATCH_SIZE = 200
+
 
 class ChatbotHistoryAccessor(IChatbotHistoryAccessor):
     """Accesses and stores chatbot history using DB provider."""
@@ -32,7 +35,7 @@ class ChatbotHistoryAccessor(IChatbotHistoryAccessor):
     async def save_message(self, message: ChatMessageSpec) -> None:
         try:
             async with self.db_provider.get_db() as session:
-                chat_history_entry = self.__to_model(message)
+                chat_history_entry = ChatHistory(**ChatHistory.row_for(message))
                 session.add(chat_history_entry)
                 await session.commit()
         except Exception as e:
@@ -47,21 +50,35 @@ class ChatbotHistoryAccessor(IChatbotHistoryAccessor):
             )
             raise
 
+    async def save_messages(self, messages: List[ChatMessageSpec]) -> None:
+        if not messages:
+            return
+        try:
+            async with self.db_provider.get_db() as session:
+                await session.execute(
+                    insert(ChatHistory).values(
+                        [ChatHistory.row_for(m) for m in messages]
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            self.logging_provider.error(
+                "Failed to save chatbot messages",
+                extra_data={"messages": len(messages), "error": str(e)},
+                tag="ChatbotHistoryAccessor",
+            )
+            raise
+
     async def get_recent_messages(
         self, user_id: int, session_id: Optional[int] = None
     ) -> List[ChatHistoryDomain]:
         try:
-            limit = self.__get_max_chat_history()
             async with self.db_provider.get_db() as session:
                 stmt = (
-                    select(ChatHistory)
-                    .where(ChatHistory.user_id == user_id)
-                    .where(ChatHistory.deleted_at.is_(None))
-                    .order_by(ChatHistory.created_at.desc())
-                    .limit(limit)
+                    self.__live_messages(select(ChatHistory), user_id, session_id)
+                    .order_by(ChatHistory.created_at.desc(), ChatHistory.id.desc())
+                    .limit(self.__get_max_chat_history())
                 )
-                if session_id is not None:
-                    stmt = stmt.where(ChatHistory.session_id == session_id)
                 result = await session.execute(stmt)
                 messages = result.scalars().all()
             return [msg.to_domain() for msg in reversed(messages)]
@@ -73,16 +90,99 @@ class ChatbotHistoryAccessor(IChatbotHistoryAccessor):
             )
             raise
 
-    async def get_messages_by_session(self, session_id: int) -> List[ChatHistoryDomain]:
+    async def get_prompt_window(
+        self,
+        user_id: int,
+        session_id: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        since: Optional[ChatHistoryCursor] = None,
+        before: Optional[ChatHistoryCursor] = None,
+    ) -> ChatPromptWindowDomain:
         try:
-            async with self.db_provider.get_db() as session:
-                result = await session.execute(
-                    select(ChatHistory)
-                    .where(ChatHistory.session_id == session_id)
-                    .where(ChatHistory.deleted_at.is_(None))
-                    .order_by(ChatHistory.created_at.asc())
+            max_messages = self.__get_max_chat_history()
+            newest_first = (ChatHistory.created_at.desc(), ChatHistory.id.desc())
+            ranked = self.__live_messages(
+                select(
+                    ChatHistory.id,
+                    ChatHistory.created_at,
+                    ChatHistory.role,
+                    ChatHistory.content,
+                    ChatHistory.token_count,
+                    func.sum(ChatHistory.token_count)
+                    .over(order_by=newest_first)
+                    .label("running_tokens"),
+                    func.row_number().over(order_by=newest_first).label("position"),
+                ),
+                user_id,
+                session_id,
+            )
+            # Bounds follow the window's own order, which ids alone need not
+            if since is not None:
+                ranked = ranked.where(not_(self.__before_cursor(since)))
+            if before is not None:
+                ranked = ranked.where(self.__before_cursor(before))
+            # One row past the window is kept to tell whether it was truncated;
+            # limiting here lets the newest-first index walk stop after it
+            ranked = ranked.order_by(*newest_first).limit(max_messages + 1).subquery()
+
+            stmt = select(ranked).order_by(ranked.c.position)
+            if token_budget is not None:
+                stmt = stmt.where(
+                    ranked.c.running_tokens - ranked.c.token_count <= token_budget
                 )
+            async with self.db_provider.get_db() as session:
+                rows = (await session.execute(stmt)).all()
+        except Exception as e:
+            self.logging_provider.error(
+                "Failed to fetch chatbot prompt window",
+                extra_data={"user_id": user_id, "error": str(e)},
+                tag="ChatbotHistoryAccessor",
+            )
+            raise
+
+        window = [
+            row
+            for row in rows
+            if row.position <= max_messages
+            and (token_budget is None or row.running_tokens <= token_budget)
+        ]
+        return ChatPromptWindowDomain(
+            messages=[
+                {"role": row.role.value, "content": row.content}
+                for row in reversed(window)
+            ],
+            first=(
+                ChatHistoryCursor(created_at=window[-1].created_at, id=window[-1].id)
+                if window
+                else None
+            ),
+            token_count=window[-1].running_tokens if window else 0,
+            truncated=len(rows) > len(window),
+        )
+
+    async def get_messages_by_session(
+        self,
+        session_id: int,
+        user_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        before: Optional[ChatHistoryCursor] = None,
+    ) -> List[ChatHistoryDomain]:
+        try:
+            stmt = self.__session_messages(session_id, user_id)
+            if before is not None:
+                stmt = stmt.where(self.__before_cursor(before))
+            if limit is not None:
+                # Newest first so the page is read backwards along the index
+                stmt = stmt.order_by(
+                    ChatHistory.created_at.desc(), ChatHistory.id.desc()
+                ).limit(limit)
+            else:
+                stmt = stmt.order_by(ChatHistory.created_at.asc(), ChatHistory.id.asc())
+            async with self.db_provider.get_db() as session:
+                result = await session.execute(stmt)
                 messages = result.scalars().all()
+            if limit is not None:
+                messages = reversed(messages)
             return [msg.to_domain() for msg in messages]
         except Exception as e:
             self.logging_provider.error(
@@ -92,6 +192,27 @@ class ChatbotHistoryAccessor(IChatbotHistoryAccessor):
             )
             raise
 
+    async def stream_messages_by_session(
+        self, session_id: int, user_id: Optional[int] = None
+    ) -> AsyncIterator[ChatHistoryDomain]:
+        stmt = (
+            self.__session_messages(session_id, user_id)
+            .order_by(ChatHistory.created_at.asc(), ChatHistory.id.asc())
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        try:
+            async with self.db_provider.get_db() as session:
+                # Rows come from the cursor in batches; only one batch is held
+                async for msg in await session.stream_scalars(stmt):
+                    yield msg.to_domain()
+        except Exception as e:
+            self.logging_provider.error(
+                "Failed to stream chatbot history by session",
+                extra_data={"session_id": session_id, "error": str(e)},
+                tag="ChatbotHistoryAccessor",
+            )
+            raise
+
     async def soft_delete_history_by_session(self, session_id: int) -> None:
         async with self.db_provider.get_db() as session:
             await session.execute(
@@ -102,14 +223,38 @@ class ChatbotHistoryAccessor(IChatbotHistoryAccessor):
             )
             await session.commit()
 
-    def __get_max_chat_history(self) -> int:
-        return int(self.secret_provider.get_secret(SecretKey.CHATBOT_MAX_CHAT_HISTORY))
+    def __session_messages(self, session_id: int, user_id: Optional[int]) -> Select:
+        """A session's non-deleted messages, optionally only if user_id owns them."""
+        stmt = (
+            select(ChatHistory)
+            .where(ChatHistory.session_id == session_id)
+            .where(ChatHistory.deleted_at.is_(None))
+        )
+        if user_id is not None:
+            stmt = stmt.where(ChatHistory.user_id == user_id)
+        return stmt
+
+    @staticmethod
+    def __before_cursor(cursor: ChatHistoryCursor):
+        """Messages strictly after the cursor in (created_at desc, id desc) order."""
+        return or_(
+            ChatHistory.created_at < cursor.created_at,
+            and_(
+                ChatHistory.created_at == cursor.created_at,
+                ChatHistory.id < cursor.id,
+            ),
+        )
 
-    def __to_model(self, spec: ChatMessageSpec) -> ChatHistory:
-        return ChatHistory(
-            user_id=spec.user_id,
-            session_id=spec.session_id,
-            role=spec.role,
-            content=spec.content,
-            timestamp=spec.timestamp or DateTimeUtils.get_utc_now(),
+    def __live_messages(
+        self, stmt: Select, user_id: int, session_id: Optional[int]
+    ) -> Select:
+        """Restrict stmt to the user's (or session's) non-deleted messages."""
+        stmt = stmt.where(ChatHistory.user_id == user_id).where(
+            ChatHistory.deleted_at.is_(None)
         )
+        if session_id is not None:
+            stmt = stmt.where(ChatHistory.session_id == session_id)
+        return stmt
+
+    def __get_max_chat_history(self) -> int:
+        return int(self.secret_provider.get_secret(SecretKey.CHATBOT_MAX_CHAT_HISTORY))
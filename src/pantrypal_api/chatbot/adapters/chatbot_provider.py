@@ -1,7 +1,8 @@
 import asyncio
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List, Optional
 
-from groq import BadRequestError, Groq
+import httpx
+from groq import AsyncGroq, BadRequestError
 from injector import inject
 
 from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
@@ -10,9 +11,19 @@ from src.core.common.constants import SecretKey
 from src.core.common.ports.secretkey_provider import ISecretProvider
 from src.core.logging.ports.logging_provider import ILoggingProvider
 
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_CONCURRENT_REQUESTS = 100
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 60.0
+
 
 class GroqChatbotProvider(IChatbotProvider):
-    """Handles interaction with Groq LLM for both single-turn and multi-turn chat."""
+    """Handles interaction with Groq LLM for both single-turn and multi-turn chat.
+
+    A single ``AsyncGroq`` client backed by a pooled ``httpx.AsyncClient`` is
+    created lazily and reused for every completion, so connections (and their
+    TLS sessions) are kept alive across chat messages. A semaphore caps the
+    number of completions in flight at any one time.
+    """
 
     @inject
     def __init__(
@@ -23,31 +34,75 @@ class GroqChatbotProvider(IChatbotProvider):
         self.secret_provider = secret_provider
         self.logging_provider = logging_provider
 
+        self.__max_connections = self.__get_int_secret(
+            SecretKey.CHATBOT_MAX_CONNECTIONS, DEFAULT_MAX_CONNECTIONS
+        )
+        self.__max_concurrent_requests = self.__get_int_secret(
+            SecretKey.CHATBOT_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        )
+        self.__request_semaphore = asyncio.Semaphore(self.__max_concurrent_requests)
+        self.__client: Optional[AsyncGroq] = None
+
     async def handle_single_turn(self, message: ChatMessageSpec) -> str:
         """Processes a single-turn message."""
-        formatted_messages = [self.__format_message(message)]
-        return await self.__call_groq(formatted_messages)
+        return await self.__call_groq([message.to_prompt_message()])
 
-    async def handle_multi_turn(self, messages: List[ChatMessageSpec]) -> str:
+    async def handle_multi_turn(self, messages: List[Dict[str, str]]) -> str:
         """Processes multi-turn messages with history."""
-        formatted_history = [self.__format_message(m) for m in messages]
-        return await self.__call_groq(formatted_history)
+        return await self.__call_groq(messages)
 
-    async def __call_groq(self, formatted_messages: List[Dict[str, str]]) -> str:
-        """Executes the synchronous Groq API call in a separate thread to avoid blocking the event loop."""
-        return await asyncio.to_thread(self.__sync_call_groq, formatted_messages)
+    async def stream_multi_turn(
+        self, messages: List[Dict[str, str]]
+    ) -> AsyncIterator[str]:
+        """Processes multi-turn messages, yielding reply tokens as Groq streams them."""
+        client = self.__get_client()
 
-    def __sync_call_groq(self, formatted_messages: List[Dict[str, str]]) -> str:
-        """Executes the chat completion request to Groq."""
-        api_key = self.__get_api_key()
+        try:
+            async with self.__request_semaphore:
+                stream = await client.chat.completions.create(
+                    model=self.__get_model(),
+                    messages=messages,
+                    max_tokens=self.__get_max_tokens(),
+                    stream=True,
+                )
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    token = chunk.choices[0].delta.content
+                    if token:
+                        yield token
+        except BadRequestError as e:
+            self.logging_provider.error(
+                "Groq API BadRequestError",
+                extra_data={"error": str(e), "messages": messages},
+                tag="Groq",
+            )
+            raise RuntimeError(f"Groq API call failed: {e}")
+        except Exception as e:
+            self.logging_provider.error(
+                "Unexpected error streaming from Groq",
+                extra_data={"error": str(e), "messages": messages},
+                tag="Groq",
+            )
+            raise
+
+    async def close(self) -> None:
+        """Closes the pooled HTTP client, if one was created."""
+        if self.__client is not None:
+            client, self.__client = self.__client, None
+            await client.close()
+
+    async def __call_groq(self, formatted_messages: List[Dict[str, str]]) -> str:
+        """Executes the chat completion request to Groq on the shared client."""
+        client = self.__get_client()
         model = self.__get_model()
         max_tokens = self.__get_max_tokens()
-        client = Groq(api_key=api_key)
 
         try:
-            response = client.chat.completions.create(
-                model=model, messages=formatted_messages, max_tokens=max_tokens
-            )
+            async with self.__request_semaphore:
+                response = await client.chat.completions.create(
+                    model=model, messages=formatted_messages, max_tokens=max_tokens
+                )
             return response.choices[0].message.content
         except BadRequestError as e:
             self.logging_provider.error(
@@ -64,9 +119,23 @@ class GroqChatbotProvider(IChatbotProvider):
             )
             raise
 
-    def __format_message(self, message: ChatMessageSpec) -> Dict[str, str]:
-        """Formats internal message spec into Groq-compatible format."""
-        return {"role": message.role.value.lower(), "content": message.content}
+    def __get_client(self) -> AsyncGroq:
+        """Returns the shared Groq client, creating it on first use."""
+        if self.__client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.__max_connections,
+                    max_keepalive_connections=self.__max_connections,
+                ),
+                timeout=httpx.Timeout(self.__get_request_timeout()),
+            )
+            self.__client = AsyncGroq(
+                api_key=self.__get_api_key(),
+                base_url=self.secret_provider.get_secret(SecretKey.GROQ_BASE_URL)
+                or None,
+                http_client=http_client,
+            )
+        return self.__client
 
     def __get_api_key(self) -> str:
         return self.secret_provider.get_secret(SecretKey.GROQ_API_KEY)
@@ -79,3 +148,23 @@ class GroqChatbotProvider(IChatbotProvider):
             return int(self.secret_provider.get_secret(SecretKey.CHATBOT_MAX_TOKENS))
         except (TypeError, ValueError):
             raise ValueError("Invalid CHATBOT_MAX_TOKENS value in .env")
+
+    def __get_request_timeout(self) -> float:
+        try:
+            return float(
+                self.secret_provider.get_secret(
+                    SecretKey.CHATBOT_REQUEST_TIMEOUT_SECONDS,
+                    str(DEFAULT_REQUEST_TIMEOUT_SECONDS),
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid CHATBOT_REQUEST_TIMEOUT_SECONDS value in .env")
+
+    def __get_int_secret(self, key: SecretKey, default: int) -> int:
+        try:
+            value = int(self.secret_provider.get_secret(key, str(default)))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {key.value} value in .env")
+        if value < 1:
+            raise ValueError(f"{key.value} must be a positive integer")
+        return value
@@ -1,9 +1,14 @@
-from typing import List
+from typing import AsyncIterator, List, Optional, Tuple
 
 from injector import inject
 
 from src.core.chatbot.services.chat_session_service import ChatSessionService
-from src.pantrypal_api.chatbot.schemas.chat_session_schemas import ChatSessionResponse
+from src.core.chatbot.specs import ChatHistoryCursor
+from src.pantrypal_api.chatbot.schemas.chat_session_schemas import (
+    ChatSessionResponse,
+    ChatSessionSummaryResponse,
+    ListChatSessionsRequest,
+)
 from src.pantrypal_api.chatbot.schemas.chatbot_schemas import Message
 
 
@@ -12,15 +17,47 @@ class ChatSessionController:
     def __init__(self, chat_session_service: ChatSessionService):
         self.chat_session_service = chat_session_service
 
-    async def list_sessions(self, user_id: int) -> List[ChatSessionResponse]:
-        """Return session summaries for a user."""
-        sessions = await self.chat_session_service.list_sessions(user_id)
-        return [s.to_schema() for s in sessions]
+    async def list_sessions(
+        self, user_id: int, request: ListChatSessionsRequest
+    ) -> Tuple[List[ChatSessionSummaryResponse], Optional[str]]:
+        """Return a page of session summaries for a user and the next page's cursor."""
+        page = await self.chat_session_service.list_sessions(user_id, request.to_spec())
+        next_cursor = page.next_cursor.encode() if page.next_cursor else None
+        return [s.to_schema() for s in page.sessions], next_cursor
 
-    async def get_history(self, session_id: int) -> List[Message]:
-        """Retrieve the message log for a chat session."""
-        history = await self.chat_session_service.get_session_history(session_id)
-        return [h.to_schema() for h in history]
+    async def get_recipe(
+        self, user_id: int, session_id: int
+    ) -> Optional[ChatSessionResponse]:
+        """Return the recipe stored for one of the user's sessions."""
+        session = await self.chat_session_service.get_session(user_id, session_id)
+        return session.to_schema() if session else None
+
+    async def get_history(
+        self,
+        user_id: int,
+        session_id: int,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Message], Optional[str]]:
+        """
+        Retrieve the message log, or a page of it, for a user's chat session,
+        and the cursor of the page before it.
+        """
+        page = await self.chat_session_service.get_session_history(
+            user_id,
+            session_id,
+            limit=limit,
+            before=ChatHistoryCursor.decode(cursor) if cursor else None,
+        )
+        next_cursor = page.next_cursor.encode() if page.next_cursor else None
+        return [m.to_schema() for m in page.messages], next_cursor
+
+    async def stream_history(self, user_id: int, session_id: int) -> AsyncIterator[str]:
+        """Formats a session's message log as NDJSON, one message per line."""
+        async for message in self.chat_session_service.stream_session_history(
+            user_id, session_id
+        ):
+            yield message.to_schema().model_dump_json() + "\n"
 
     async def delete_session(self, session_id: int) -> None:
         """Soft delete a chat session and its history."""
@@ -1,8 +1,12 @@
+from typing import AsyncIterator
+
 from injector import inject
 
 from src.core.chatbot.services.chatbot_service import ChatbotService
+from src.core.chatbot.specs import ChatStreamEventSpec
 from src.pantrypal_api.chatbot.schemas.chatbot_schemas import (
     ChatReply,
+    ChatStreamToken,
     ContextualChatMessage,
     RecommendMessage,
     TitleSuggestions,
@@ -31,6 +35,41 @@ class ChatbotController:
         reply = await self.chatbot_service.chat_with_context(spec)
         return ChatReply(reply=reply)
 
+    async def stream_recipe_recommendation(
+        self, user_id: int, message: RecommendMessage
+    ) -> AsyncIterator[str]:
+        spec = message.to_spec(user_id)
+        events = self.chatbot_service.stream_first_recommendation(spec)
+        async for frame in self.__to_sse(events):
+            yield frame
+
+    async def stream_contextual_chat_reply(
+        self, user_id: int, message: ContextualChatMessage
+    ) -> AsyncIterator[str]:
+        spec = message.to_spec(user_id)
+        events = self.chatbot_service.stream_chat_with_context(spec)
+        async for frame in self.__to_sse(events):
+            yield frame
+
     async def get_recipe_title_suggestions(self, user_id: int) -> TitleSuggestions:
         suggestions = await self.chatbot_service.get_recipe_title_suggestions(user_id)
         return TitleSuggestions(suggestions=suggestions)
+
+    async def __to_sse(
+        self, events: AsyncIterator[ChatStreamEventSpec]
+    ) -> AsyncIterator[str]:
+        """Formats service stream events as Server-Sent Events frames.
+
+        Tokens are sent as unnamed `data:` events, followed by a `done` event with
+        the full ChatReply, or an `error` event if the reply could not be produced.
+        """
+        try:
+            async for event in events:
+                if event.done:
+                    reply = ChatReply(reply=event.reply, session_id=event.session_id)
+                    yield f"event: done\ndata: {reply.model_dump_json()}\n\n"
+                else:
+                    token = ChatStreamToken(token=event.token)
+                    yield f"data: {token.model_dump_json()}\n\n"
+        except Exception:
+            yield 'event: error\ndata: {"detail": "Failed to generate reply"}\n\n'
@@ -1,18 +1,61 @@
-from sqlalchemy import Column, DateTime
+from typing import Any, Dict
+
+from sqlalchemy import JSON, Column, DateTime
 from sqlalchemy import Enum as SQLAEnum
-from sqlalchemy import Integer, String, Text
+from sqlalchemy import Index, Integer, String, Text, UniqueConstraint, func, text
+from sqlalchemy.dialects.postgresql import JSONB
 
 from src.core.chatbot.constants import ChatbotMessageRole
 from src.core.chatbot.models import ChatHistoryDomain, ChatSessionDomain
-from src.core.common.utils import DateTimeUtils
+from src.core.chatbot.specs import ChatMessageSpec
+from src.core.common.utils import DateTimeUtils, TokenUtil
 from src.pantrypal_api.base.models import PantryPalBaseModel
 
 
 class ChatHistory(PantryPalBaseModel):
     __tablename__ = "chat_history"
+    __table_args__ = (
+        # One per filter the history accessor uses (user, user + session,
+        # session), ordered like its reads so that recent messages, prompt
+        # windows and transcripts walk the index instead of sorting matches;
+        # partial because every read skips soft-deleted messages
+        Index(
+            "ix_chat_history_user_id_created_at",
+            "user_id",
+            "created_at",
+            "id",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_chat_history_user_id_session_id_created_at",
+            "user_id",
+            "session_id",
+            "created_at",
+            "id",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_chat_history_session_id_created_at",
+            "session_id",
+            "created_at",
+            "id",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
 
-    user_id = Column(Integer, index=True)
-    session_id = Column(Integer, index=True, nullable=True)
+    # Set from Python too, so every row has the history sort key written in
+    # the same format as the cursors compared against it
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        default=lambda: DateTimeUtils.get_utc_now(),
+        nullable=False,
+    )
+    user_id = Column(Integer)
+    session_id = Column(Integer, nullable=True)
     role = Column(
         SQLAEnum(
             ChatbotMessageRole,
@@ -22,6 +65,8 @@ class ChatHistory(PantryPalBaseModel):
         nullable=False,
     )
     content = Column(Text)
+    # Estimated once at save time so prompt windows can be budgeted in SQL
+    token_count = Column(Integer, nullable=False, server_default="0")
     timestamp = Column(
         DateTime(timezone=True),
         nullable=False,
@@ -40,18 +85,52 @@ class ChatHistory(PantryPalBaseModel):
             session_id=self.session_id,
         )
 
+    @staticmethod
+    def row_for(spec: ChatMessageSpec) -> Dict[str, Any]:
+        """Column values storing a message, with its token count estimated."""
+        return {
+            "user_id": spec.user_id,
+            "session_id": spec.session_id,
+            "role": spec.role,
+            "content": spec.content,
+            "token_count": TokenUtil.estimate_tokens(spec.content),
+            "timestamp": spec.timestamp or DateTimeUtils.get_utc_now(),
+        }
+
+
+# Lists of strings, stored as JSON (JSONB on PostgreSQL)
+RecipeList = JSON().with_variant(JSONB(), "postgresql")
+
 
 class ChatSession(PantryPalBaseModel):
     __tablename__ = "chat_session"
+    __table_args__ = (
+        # Session lists show a user's live sessions, most recently updated first
+        Index(
+            "ix_chat_session_user_id_updated_at",
+            "user_id",
+            "updated_at",
+            "id",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
 
-    user_id = Column(Integer, index=True)
+    user_id = Column(Integer)
     title = Column(String, nullable=False)
     summary = Column(Text, nullable=True)
     prep_time = Column(Integer, nullable=True)
-    instructions = Column(Text, nullable=True)
-    ingredients = Column(Text, nullable=True)
+    instructions = Column(RecipeList, nullable=True)
+    ingredients = Column(RecipeList, nullable=True)
     available_count = Column(Integer, nullable=True)
     total_count = Column(Integer, nullable=True)
+    # Set on insert too, and from Python, so every row has the list sort key
+    # written in the same format as the cursors compared against it
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: DateTimeUtils.get_utc_now(),
+        onupdate=lambda: DateTimeUtils.get_utc_now(),
+    )
 
     def to_domain(self) -> ChatSessionDomain:
         return ChatSessionDomain(
@@ -62,9 +141,28 @@ class ChatSession(PantryPalBaseModel):
             title=self.title,
             summary=self.summary,
             prep_time=self.prep_time,
-            instructions=self.instructions.split("|") if self.instructions else [],
-            ingredients=self.ingredients.split("|") if self.ingredients else [],
+            instructions=self.instructions or [],
+            ingredients=self.ingredients or [],
             available_ingredients=self.available_count or 0,
             total_ingredients=self.total_count or 0,
             updated_at=self.updated_at,
         )
+
+
+class ChatSessionIngredient(PantryPalBaseModel):
+    """One row per word of a session's ingredients, to find sessions by ingredient."""
+
+    __tablename__ = "chat_session_ingredient"
+    __table_args__ = (
+        UniqueConstraint("session_id", "term"),
+        Index(
+            "ix_chat_session_ingredient_user_id_term",
+            "user_id",
+            "term",
+            "session_id",
+        ),
+    )
+
+    session_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    term = Column(String, nullable=False)
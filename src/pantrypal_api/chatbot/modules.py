@@ -3,6 +3,7 @@ from injector import Binder, Module, singleton
 from src.core.chatbot.accessors.chat_session_accessor import IChatSessionAccessor
 from src.core.chatbot.accessors.chatbot_history_accessor import IChatbotHistoryAccessor
 from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+from src.core.chatbot.services.chat_history_writer import ChatHistoryWriter
 from src.pantrypal_api.chatbot.accessors.chat_session_accessor import (
     ChatSessionAccessor,
 )
@@ -17,3 +18,5 @@ class ChatbotModule(Module):
         binder.bind(IChatbotProvider, to=GroqChatbotProvider, scope=singleton)
         binder.bind(IChatbotHistoryAccessor, to=ChatbotHistoryAccessor, scope=singleton)
         binder.bind(IChatSessionAccessor, to=ChatSessionAccessor, scope=singleton)
+        # Owns the message buffer flushed by a task started in the app lifespan
+        binder.bind(ChatHistoryWriter, scope=singleton)
@@ -1,6 +1,7 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 
 from src.core.chatbot.services.chat_session_service import ChatSessionService
 from src.core.chatbot.services.chatbot_service import ChatbotService
@@ -9,7 +10,13 @@ from src.pantrypal_api.chatbot.controllers.chat_session_controllers import (
     ChatSessionController,
 )
 from src.pantrypal_api.chatbot.controllers.chatbot_controllers import ChatbotController
-from src.pantrypal_api.chatbot.schemas.chat_session_schemas import ChatSessionResponse
+from src.pantrypal_api.chatbot.schemas.chat_session_schemas import (
+    CHAT_HISTORY_MAX_PAGE_SIZE,
+    CHAT_SESSION_LIST_MAX_PAGE_SIZE,
+    ChatSessionResponse,
+    ChatSessionSummaryResponse,
+    ListChatSessionsRequest,
+)
 from src.pantrypal_api.chatbot.schemas.chatbot_schemas import (
     ChatReply,
     ContextualChatMessage,
@@ -18,9 +25,14 @@ from src.pantrypal_api.chatbot.schemas.chatbot_schemas import (
     TitleSuggestions,
 )
 from src.pantrypal_api.modules import injector
+from src.pantrypal_api.pantry.schemas.pantry_schemas import NEXT_CURSOR_HEADER
 
 router = APIRouter(prefix="/chatbot", tags=["Chatbot"])
 
+# Headers keeping proxies from buffering Server-Sent Events
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 # Dependency factory function for controller with injected services
 def get_chatbot_controller() -> ChatbotController:
@@ -61,6 +73,50 @@ async def chat_with_history(
     return await controller.get_contextual_chat_reply(current_user_id, message)
 
 
+@router.post(
+    "/recommend/stream",
+    response_class=StreamingResponse,
+    summary="Stream a one-shot recipe recommendation",
+    description=(
+        'Streams the recommendation as Server-Sent Events: one `data: {"token": ...}` '
+        "event per generated chunk, then an `event: done` carrying the full reply "
+        "and session id once the chat history has been saved."
+    ),
+)
+async def stream_recommend_recipe(
+    message: RecommendMessage,
+    controller: ChatbotController = Depends(get_chatbot_controller),
+    current_user_id: int = Depends(get_current_user),
+):
+    return StreamingResponse(
+        controller.stream_recipe_recommendation(current_user_id, message),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.post(
+    "/chat/stream",
+    response_class=StreamingResponse,
+    summary="Stream a conversational reply from PantryPal Assistant",
+    description=(
+        'Streams the contextual reply as Server-Sent Events: one `data: {"token": ...}` '
+        "event per generated chunk, then an `event: done` carrying the full reply "
+        "once the chat history has been saved."
+    ),
+)
+async def stream_chat_with_history(
+    message: ContextualChatMessage,
+    controller: ChatbotController = Depends(get_chatbot_controller),
+    current_user_id: int = Depends(get_current_user),
+):
+    return StreamingResponse(
+        controller.stream_contextual_chat_reply(current_user_id, message),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 @router.get(
     "/title-suggestions",
     response_model=TitleSuggestions,
@@ -76,14 +132,73 @@ async def recipe_title_suggestions(
 
 @router.get(
     "/sessions",
-    response_model=List[ChatSessionResponse],
+    response_model=List[ChatSessionSummaryResponse],
     summary="List chat sessions for user",
 )
 async def list_sessions(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=CHAT_SESSION_LIST_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description=f"{NEXT_CURSOR_HEADER} value"),
+    ingredient: Optional[str] = Query(
+        None, description="Only sessions whose ingredients mention every word"
+    ),
+    controller: ChatSessionController = Depends(get_chat_session_controller),
+    current_user_id: int = Depends(get_current_user),
+):
+    """
+    List session ids, titles and update times, most recently updated first.
+
+    Without ``limit`` every session is returned. With ``limit``, the
+    ``X-Next-Cursor`` response header carries the cursor for the next page and
+    is omitted on the last page. ``/sessions/{session_id}/recipe`` returns a
+    session's recipe.
+    """
+    request = ListChatSessionsRequest(limit=limit, cursor=cursor, ingredient=ingredient)
+    try:
+        sessions, next_cursor = await controller.list_sessions(current_user_id, request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return sessions
+
+
+@router.get(
+    "/sessions/{session_id}/recipe",
+    response_model=ChatSessionResponse,
+    summary="Get the recipe stored for a chat session",
+)
+async def get_session_recipe(
+    session_id: int,
+    controller: ChatSessionController = Depends(get_chat_session_controller),
+    current_user_id: int = Depends(get_current_user),
+):
+    recipe = await controller.get_recipe(current_user_id, session_id)
+    if recipe is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Session not found"
+        )
+    return recipe
+
+
+@router.get(
+    "/sessions/{session_id}/stream",
+    response_class=StreamingResponse,
+    summary="Stream the chat history for a session",
+    description=(
+        "Streams every message in the session as NDJSON, oldest first: one "
+        "`Message` JSON object per line, read from the database in batches."
+    ),
+)
+async def stream_session_history(
+    session_id: int,
     controller: ChatSessionController = Depends(get_chat_session_controller),
     current_user_id: int = Depends(get_current_user),
 ):
-    return await controller.list_sessions(current_user_id)
+    return StreamingResponse(
+        controller.stream_history(current_user_id, session_id),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
 
 
 @router.get(
@@ -93,10 +208,30 @@ async def list_sessions(
 )
 async def get_session_history(
     session_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=CHAT_HISTORY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description=f"{NEXT_CURSOR_HEADER} value"),
     controller: ChatSessionController = Depends(get_chat_session_controller),
     current_user_id: int = Depends(get_current_user),
 ):
-    return await controller.get_history(session_id)
+    """
+    List the session's messages, oldest first.
+
+    Without ``limit`` every message is returned. With ``limit``, the newest
+    ``limit`` messages (older than ``cursor``) are returned and the
+    ``X-Next-Cursor`` response header carries the cursor for the page before
+    them; it is omitted once the first message has been reached.
+    ``/sessions/{session_id}/stream`` streams the whole history instead.
+    """
+    try:
+        messages, next_cursor = await controller.get_history(
+            current_user_id, session_id, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return messages
 
 
 @router.delete(
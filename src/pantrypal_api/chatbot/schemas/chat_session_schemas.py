@@ -1,7 +1,13 @@
+from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel
 
+from src.core.chatbot.specs import ChatSessionListCursor, ListChatSessionsSpec
+
+CHAT_SESSION_LIST_MAX_PAGE_SIZE = 200
+CHAT_HISTORY_MAX_PAGE_SIZE = 200
+
 
 class ChatSessionResponse(BaseModel):
     id: int
@@ -12,3 +18,22 @@ class ChatSessionResponse(BaseModel):
     ingredients: List[str]
     available_ingredients: int
     total_ingredients: int
+
+
+class ChatSessionSummaryResponse(BaseModel):
+    id: int
+    title: str
+    updated_at: datetime
+
+
+class ListChatSessionsRequest(BaseModel):
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+    ingredient: Optional[str] = None
+
+    def to_spec(self) -> ListChatSessionsSpec:
+        return ListChatSessionsSpec(
+            limit=self.limit,
+            after=ChatSessionListCursor.decode(self.cursor) if self.cursor else None,
+            ingredient=self.ingredient,
+        )
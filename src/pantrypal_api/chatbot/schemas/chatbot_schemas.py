@@ -99,6 +99,12 @@ class ChatReply(BaseModel):
     )
 
 
+class ChatStreamToken(BaseModel):
+    """Payload of each `data:` event sent while a reply is being streamed."""
+
+    token: str = Field(..., description="Next chunk of the generated reply")
+
+
 class TitleSuggestions(BaseModel):
     """List of short recipe title suggestions returned from the chatbot."""
 
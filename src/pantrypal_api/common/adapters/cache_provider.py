@@ -0,0 +1,52 @@
+import time
+from typing import Any, Optional, Tuple
+
+from cachetools import TLRUCache
+from injector import inject
+
+from src.core.common.constants import SecretKey
+from src.core.common.ports.cache_provider import ICacheProvider
+from src.core.common.ports.secretkey_provider import ISecretProvider
+
+DEFAULT_CACHE_MAX_ENTRIES = 10000
+
+
+class InMemoryCacheProvider(ICacheProvider):
+    """Bounded in-process cache evicting expired entries first, then least recently used.
+
+    Entries live only in the current process, so invalidations are not seen by
+    other workers; bind a shared ICacheProvider when running several processes.
+    """
+
+    @inject
+    def __init__(self, secret_provider: ISecretProvider):
+        try:
+            max_entries = int(
+                secret_provider.get_secret(
+                    SecretKey.CACHE_MAX_ENTRIES, str(DEFAULT_CACHE_MAX_ENTRIES)
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid CACHE_MAX_ENTRIES value in .env")
+
+        self.__entries: TLRUCache = TLRUCache(
+            maxsize=max_entries, ttu=self.__expires_at, timer=time.monotonic
+        )
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self.__entries.get(key)
+        return entry[0] if entry is not None else None
+
+    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        self.__entries[key] = (value, time.monotonic() + ttl_seconds)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.__entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self.__entries.clear()
+
+    @staticmethod
+    def __expires_at(key: str, entry: Tuple[Any, float], now: float) -> float:
+        return entry[1]
@@ -1,6 +1,8 @@
 from injector import Binder, Module, singleton
 
+from src.core.common.ports.cache_provider import ICacheProvider
 from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.pantrypal_api.common.adapters.cache_provider import InMemoryCacheProvider
 from src.pantrypal_api.common.adapters.secretkey_provider import (
     EnvVariableSecretProvider,
 )
@@ -9,3 +11,4 @@ from src.pantrypal_api.common.adapters.secretkey_provider import (
 class CommonModule(Module):
     def configure(self, binder: Binder):
         binder.bind(ISecretProvider, to=EnvVariableSecretProvider, scope=singleton)
+        binder.bind(ICacheProvider, to=InMemoryCacheProvider, scope=singleton)
@@ -1,5 +1,6 @@
 from typing import Optional
 
+from injector import inject
 from sqlalchemy import select
 
 from src.core.configuration.accessors.configuration_accessor import (
@@ -13,6 +14,7 @@ from src.pantrypal_api.configuration.models import Configuration
 
 
 class ConfigurationAccessor(IConfigurationAccessor):
+    @inject
     def __init__(
         self, db_provider: IDatabaseProvider, logging_provider: ILoggingProvider
     ):
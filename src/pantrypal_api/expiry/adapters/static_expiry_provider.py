@@ -1,4 +1,5 @@
-from datetime import date
+from datetime import date, timedelta
+from typing import List, Tuple
 
 from src.core.expiry.constants import CATEGORY_EXPIRY_DAYS
 from src.core.expiry.ports.expiry_prediction_provider import IExpiryPredictionProvider
@@ -11,7 +12,15 @@ class StaticExpiryPredictionProvider(IExpiryPredictionProvider):
     async def predict_expiry_date(
         self, category: Category, purchase_date: date
     ) -> date:
-        shelf_life = CATEGORY_EXPIRY_DAYS.get(
-            category, CATEGORY_EXPIRY_DAYS[Category.OTHER]
-        )
-        return purchase_date + shelf_life
+        return purchase_date + self.__shelf_life(category)
+
+    async def predict_expiry_dates(
+        self, queries: List[Tuple[Category, date]]
+    ) -> List[date]:
+        return [
+            purchase_date + self.__shelf_life(category)
+            for category, purchase_date in queries
+        ]
+
+    def __shelf_life(self, category: Category) -> timedelta:
+        return CATEGORY_EXPIRY_DAYS.get(category, CATEGORY_EXPIRY_DAYS[Category.OTHER])
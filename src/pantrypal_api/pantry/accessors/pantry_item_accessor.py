@@ -1,14 +1,27 @@
-from typing import List, Optional
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional
 
 from injector import inject
-from sqlalchemy import delete, select
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
 
+from src.core.common.utils import DateTimeUtils
 from src.core.logging.ports.logging_provider import ILoggingProvider
 from src.core.pantry.accessors.pantry_item_accessor import IPantryItemAccessor
-from src.core.pantry.models import PantryItemDomain
+from src.core.pantry.models import PantryItemDomain, PantryStatsDomain
+from src.core.pantry.specs import (
+    ListPantryItemsSpec,
+    PantryListCursor,
+    UpdatePantryItemSpec,
+)
 from src.core.storage.ports.relational_database_provider import IDatabaseProvider
 from src.pantrypal_api.pantry.models import PantryItem
+from src.pantrypal_api.pantry.schemas.pantry_schemas import PANTRY_ITEM_FIELDS
+
+# Rows sent per executemany of the bulk insert; SQLAlchemy further splits each
+# chunk into multi-row INSERT ... RETURNING statements
+ADD_ITEMS_CHUNK_SIZE = 5000
 
 
 class PantryItemAccessor(IPantryItemAccessor):
@@ -22,33 +35,72 @@ class PantryItemAccessor(IPantryItemAccessor):
         self.logging_provider = logging_provider
 
     async def add_items(self, items: List[PantryItemDomain]) -> List[PantryItemDomain]:
-        records = [self.__to_model(item) for item in items]
+        if not items:
+            return []
+        # A Core insert skips ORM unit-of-work bookkeeping, and RETURNING hands
+        # back ids and server defaults without a second query
+        table = PantryItem.__table__
 
+        added: List[PantryItemDomain] = []
         async with self.db_provider.get_db() as db:
-            db.add_all(records)
+            # Where the dialect can match RETURNING rows to their parameters
+            # with the autoincrement id, SQLAlchemy returns them in input order.
+            # SQLite cannot, and would fall back to one INSERT per row; it
+            # processes a multi-row VALUES in order, so ids follow the input.
+            sentinels = db.get_bind().dialect.insertmanyvalues_implicit_sentinel
+            in_order = bool(sentinels & InsertmanyvaluesSentinelOpts.ANY_AUTOINCREMENT)
+            stmt = insert(table).returning(*table.c, sort_by_parameter_order=in_order)
+            for start in range(0, len(items), ADD_ITEMS_CHUNK_SIZE):
+                chunk = items[start : start + ADD_ITEMS_CHUNK_SIZE]
+                result = await db.execute(stmt, [PantryItem.row_for(i) for i in chunk])
+                rows = list(result.mappings())
+                if not in_order:
+                    rows.sort(key=lambda row: row["id"])
+                added.extend(PantryItemDomain(**row) for row in rows)
             await db.commit()
-            return [record.to_domain() for record in records]
+        return added
 
-    async def delete_items(self, item_ids: List[int], user_id: int) -> None:
-        async with self.db_provider.get_db() as db:
-            stmt = delete(PantryItem).where(
-                PantryItem.id.in_(item_ids), PantryItem.user_id == user_id
+    async def delete_items(
+        self, item_ids: List[int], user_id: int, soft: bool = False
+    ) -> List[int]:
+        requested = set(item_ids)
+        owned = and_(PantryItem.id.in_(requested), self.__owned_by(user_id))
+        if soft:
+            stmt = (
+                update(PantryItem)
+                .where(owned)
+                .values(deleted_at=DateTimeUtils.get_utc_now())
             )
-            result = await db.execute(stmt)
-            await db.commit()
+        else:
+            stmt = delete(PantryItem).where(owned)
+        stmt = stmt.execution_options(synchronize_session=False)
 
-            if result.rowcount == 0:
-                self.logging_provider.warning(
-                    "No pantry items deleted",
-                    extra_data={"user_id": user_id, "item_ids": item_ids},
-                    tag="PantryItemAccessor",
-                )
+        async with self.db_provider.get_db() as db:
+            dialect = db.get_bind().dialect
+            returning = dialect.update_returning if soft else dialect.delete_returning
+            if returning:
+                result = await db.execute(stmt.returning(PantryItem.id))
+                missing_ids = requested - set(result.scalars())
+            else:
+                # Without RETURNING a short rowcount only says that ids are missing
+                result = await db.execute(stmt)
+                missing_ids = requested if result.rowcount != len(requested) else set()
+
+            if missing_ids:
+                # All or nothing: undo the rows that did match
+                await db.rollback()
+                if not returning:
+                    found = await db.scalars(select(PantryItem.id).where(owned))
+                    missing_ids = requested - set(found)
+                return sorted(missing_ids)
+            await db.commit()
+            return []
 
     async def update_item(self, item: PantryItemDomain) -> PantryItemDomain:
         async with self.db_provider.get_db() as db:
             result = await db.execute(
                 select(PantryItem).where(
-                    PantryItem.id == item.id, PantryItem.user_id == item.user_id
+                    PantryItem.id == item.id, self.__owned_by(item.user_id)
                 )
             )
             record = result.scalar_one_or_none()
@@ -67,15 +119,57 @@ class PantryItemAccessor(IPantryItemAccessor):
             record.category = item.category
             record.expiry_date = item.expiry_date
             record.purchase_date = item.purchase_date
+            record.updated_at = item.updated_at or DateTimeUtils.get_utc_now()
 
             domain = record.to_domain()  # Force load all fields while session is active
             await db.commit()
             return domain
 
+    async def update_items(
+        self, user_id: int, specs: List[UpdatePantryItemSpec]
+    ) -> Optional[List[PantryItemDomain]]:
+        item_ids = [spec.id for spec in specs]
+        async with self.db_provider.get_db() as db:
+            # One ownership check for the whole batch
+            result = await db.execute(
+                select(PantryItem).where(
+                    PantryItem.id.in_(item_ids), self.__owned_by(user_id)
+                )
+            )
+            records = {record.id: record for record in result.scalars()}
+            missing_ids = [item_id for item_id in item_ids if item_id not in records]
+            if missing_ids:
+                self.logging_provider.warning(
+                    "Attempted to update non-existent or unauthorized pantry items",
+                    extra_data={"user_id": user_id, "missing_item_ids": missing_ids},
+                    tag="PantryItemAccessor",
+                )
+                return None
+
+            now = DateTimeUtils.get_utc_now()
+            for spec in specs:
+                record = records[spec.id]
+                # As in PantryService.update_item, fields left as None keep their
+                # stored value, and so does an empty item name or unit
+                changes = spec.model_dump(exclude={"id"}, exclude_none=True)
+                for field in ("item_name", "unit"):
+                    if not changes.get(field):
+                        changes.pop(field, None)
+                for field, value in changes.items():
+                    setattr(record, field, value)
+                record.updated_at = now
+
+            # Force load all fields while session is active
+            domains = [records[item_id].to_domain() for item_id in item_ids]
+            # The flush groups rows that change the same columns into one
+            # executemany UPDATE
+            await db.commit()
+            return domains
+
     async def get_items_by_user(self, user_id: int) -> List[PantryItemDomain]:
         async with self.db_provider.get_db() as db:
             result = await db.execute(
-                select(PantryItem).where(PantryItem.user_id == user_id)
+                select(PantryItem).where(self.__owned_by(user_id))
             )
             records = result.scalars().all()
             return [record.to_domain() for record in records]
@@ -86,7 +180,7 @@ class PantryItemAccessor(IPantryItemAccessor):
         async with self.db_provider.get_db() as db:
             result = await db.execute(
                 select(PantryItem).where(
-                    PantryItem.id == item_id, PantryItem.user_id == user_id
+                    PantryItem.id == item_id, self.__owned_by(user_id)
                 )
             )
             record = result.scalar_one_or_none()
@@ -98,20 +192,121 @@ class PantryItemAccessor(IPantryItemAccessor):
         async with self.db_provider.get_db() as db:
             result = await db.execute(
                 select(PantryItem).where(
-                    PantryItem.id.in_(item_ids), PantryItem.user_id == user_id
+                    PantryItem.id.in_(item_ids), self.__owned_by(user_id)
                 )
             )
             records = result.scalars().all()
             return [record.to_domain() for record in records]
 
+    async def get_expiry_stats(
+        self, user_id: int, today: date, soon_until: date
+    ) -> PantryStatsDomain:
+        # Day buckets as half-open ranges on the raw column keep the
+        # (user_id, expiry_date) index usable and the query dialect-neutral
+        today_start = datetime.combine(today, time.min)
+        tomorrow_start = today_start + timedelta(days=1)
+        soon_end = datetime.combine(soon_until, time.min) + timedelta(days=1)
+        expiry_date = PantryItem.expiry_date
+
+        async with self.db_provider.get_db() as db:
+            result = await db.execute(
+                select(
+                    func.count(),
+                    func.count(case((expiry_date < today_start, 1))),
+                    func.count(
+                        case(
+                            (
+                                (expiry_date >= today_start)
+                                & (expiry_date < tomorrow_start),
+                                1,
+                            )
+                        )
+                    ),
+                    func.count(
+                        case(
+                            (
+                                (expiry_date >= tomorrow_start)
+                                & (expiry_date < soon_end),
+                                1,
+                            )
+                        )
+                    ),
+                ).where(self.__owned_by(user_id))
+            )
+            total, expired, expiring_today, expiring_soon = result.one()
+            return PantryStatsDomain(
+                total_items=total,
+                expiring_soon=expiring_soon,
+                expiring_today=expiring_today,
+                expired=expired,
+            )
+
+    async def get_items_expiring_before(
+        self, user_id: int, expires_before: datetime, limit: int
+    ) -> List[PantryItemDomain]:
+        async with self.db_provider.get_db() as db:
+            result = await db.execute(
+                select(PantryItem)
+                .where(
+                    self.__owned_by(user_id),
+                    PantryItem.expiry_date <= self.__to_naive_utc(expires_before),
+                )
+                .order_by(PantryItem.expiry_date, PantryItem.id)
+                .limit(limit)
+            )
+            records = result.scalars().all()
+            return [record.to_domain() for record in records]
+
+    async def get_items_page(
+        self, user_id: int, spec: ListPantryItemsSpec
+    ) -> List[Dict[str, Any]]:
+        names = spec.fields or PANTRY_ITEM_FIELDS
+        names = ["id", *(n for n in names if n not in ("id", "expiry_date"))]
+        columns = [getattr(PantryItem, name) for name in names]
+        expiry_date = PantryItem.expiry_date
+
+        conditions = [self.__owned_by(user_id)]
+        if spec.categories:
+            conditions.append(PantryItem.category.in_(spec.categories))
+        if spec.expires_after:
+            conditions.append(expiry_date >= self.__to_naive_utc(spec.expires_after))
+        if spec.expires_before:
+            conditions.append(expiry_date <= self.__to_naive_utc(spec.expires_before))
+        if spec.after:
+            conditions.append(self.__after_cursor(spec.after))
+
+        stmt = (
+            select(*columns, expiry_date)
+            .where(*conditions)
+            .order_by(expiry_date.asc().nulls_last(), PantryItem.id)
+        )
+        if spec.limit is not None:
+            stmt = stmt.limit(spec.limit)
+
+        async with self.db_provider.get_db() as db:
+            result = await db.execute(stmt)
+            return [dict(row) for row in result.mappings()]
+
     @staticmethod
-    def __to_model(domain: PantryItemDomain) -> PantryItem:
-        return PantryItem(
-            user_id=domain.user_id,
-            item_name=domain.item_name,
-            quantity=domain.quantity,
-            unit=domain.unit,
-            category=domain.category,
-            purchase_date=domain.purchase_date,
-            expiry_date=domain.expiry_date,
+    def __owned_by(user_id: int):
+        """The user's items, leaving out soft-deleted ones."""
+        return and_(PantryItem.user_id == user_id, PantryItem.deleted_at.is_(None))
+
+    def __after_cursor(self, cursor: PantryListCursor):
+        """Rows strictly after the cursor in (expiry_date NULLS LAST, id) order."""
+        expiry_date = PantryItem.expiry_date
+        if cursor.expiry_date is None:
+            return and_(expiry_date.is_(None), PantryItem.id > cursor.id)
+        cursor_expiry = self.__to_naive_utc(cursor.expiry_date)
+        return or_(
+            expiry_date > cursor_expiry,
+            and_(expiry_date == cursor_expiry, PantryItem.id > cursor.id),
+            expiry_date.is_(None),
         )
+
+    @staticmethod
+    def __to_naive_utc(value: datetime) -> datetime:
+        # expiry_date is stored as naive UTC
+        if value.tzinfo:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
@@ -6,6 +6,8 @@ from src.core.pantry.services.pantry_service import PantryService
 from src.pantrypal_api.pantry.schemas.pantry_schemas import (
     AddPantryItemRequest,
     DeletePantryItemsRequest,
+    ListPantryItemsRequest,
+    PantryItemPageResponse,
     PantryItemResponse,
     PantryStatsResponse,
     UpdatePantryItemRequest,
@@ -17,9 +19,11 @@ class PantryController:
     def __init__(self, pantry_service: PantryService):
         self.pantry_service = pantry_service
 
-    async def get_items(self, user_id: int) -> List[PantryItemResponse]:
-        result = await self.pantry_service.get_items(user_id)
-        return [item.to_schema() for item in result]
+    async def get_items_page(
+        self, user_id: int, data: ListPantryItemsRequest
+    ) -> PantryItemPageResponse:
+        page = await self.pantry_service.get_items_page(user_id, data.to_spec())
+        return page.to_schema()
 
     async def add_items(
         self, user_id: int, data: List[AddPantryItemRequest]
@@ -35,6 +39,13 @@ class PantryController:
         updated = await self.pantry_service.update_item(user_id, spec)
         return updated.to_schema()
 
+    async def update_items(
+        self, user_id: int, data: List[UpdatePantryItemRequest]
+    ) -> List[PantryItemResponse]:
+        specs = [req.to_spec() for req in data]
+        updated = await self.pantry_service.update_items(user_id, specs)
+        return [item.to_schema() for item in updated]
+
     async def delete_items(self, user_id: int, data: DeletePantryItemsRequest) -> None:
         spec = data.to_spec()
         await self.pantry_service.delete_items(user_id, spec)
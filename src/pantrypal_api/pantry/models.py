@@ -1,4 +1,6 @@
-from sqlalchemy import Column, DateTime, Enum, Float, Integer, String
+from typing import Any, Dict
+
+from sqlalchemy import Column, DateTime, Enum, Float, Index, Integer, String, text
 
 from src.core.pantry.constants import Category, Unit
 from src.core.pantry.models import PantryItemDomain
@@ -7,6 +9,17 @@ from src.pantrypal_api.base.models import PantryPalBaseModel
 
 class PantryItem(PantryPalBaseModel):
     __tablename__ = "pantry_item"
+    __table_args__ = (
+        # Serves the per-user expiry stats and "expiring soon" queries; partial
+        # so that it still covers them with the soft-delete filter
+        Index(
+            "ix_pantry_item_user_id_expiry_date",
+            "user_id",
+            "expiry_date",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, index=True)
@@ -30,3 +43,16 @@ class PantryItem(PantryPalBaseModel):
             created_at=self.created_at,
             updated_at=self.updated_at,
         )
+
+    @staticmethod
+    def row_for(domain: PantryItemDomain) -> Dict[str, Any]:
+        """Column values inserting a new item."""
+        return {
+            "user_id": domain.user_id,
+            "item_name": domain.item_name,
+            "quantity": domain.quantity,
+            "unit": domain.unit,
+            "category": domain.category,
+            "purchase_date": domain.purchase_date,
+            "expiry_date": domain.expiry_date,
+        }
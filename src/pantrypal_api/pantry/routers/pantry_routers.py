@@ -1,14 +1,21 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
 
+from src.core.pantry.constants import Category
 from src.core.pantry.services.pantry_service import PantryService
 from src.pantrypal_api.account.dependencies import get_current_user
 from src.pantrypal_api.modules import injector
 from src.pantrypal_api.pantry.controllers.pantry_controllers import PantryController
 from src.pantrypal_api.pantry.schemas.pantry_schemas import (
+    NEXT_CURSOR_HEADER,
+    PANTRY_LIST_MAX_PAGE_SIZE,
+    PANTRY_UPDATE_MAX_BATCH_SIZE,
     AddPantryItemRequest,
     DeletePantryItemsRequest,
+    ListPantryItemsRequest,
+    PantryItemListEntry,
     PantryItemResponse,
     PantryStatsResponse,
     UpdatePantryItemRequest,
@@ -22,12 +29,48 @@ def get_pantry_controller() -> PantryController:
     return PantryController(pantry_service=pantry_service)
 
 
-@router.get("/list", response_model=List[PantryItemResponse])
+@router.get(
+    "/list",
+    response_model=List[PantryItemListEntry],
+    response_model_exclude_unset=True,
+)
 async def list_pantry_items(
+    limit: Optional[int] = Query(None, ge=1, le=PANTRY_LIST_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description=f"{NEXT_CURSOR_HEADER} value"),
+    category: List[Category] = Query([]),
+    expires_after: Optional[datetime] = None,
+    expires_before: Optional[datetime] = None,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. item_name,quantity"
+    ),
     controller: PantryController = Depends(get_pantry_controller),
     current_user_id: int = Depends(get_current_user),
 ):
-    return await controller.get_items(current_user_id)
+    """
+    List pantry items ordered by expiry date (items without one last), then id.
+
+    Without ``limit`` every matching item is returned. With ``limit``, the
+    ``X-Next-Cursor`` response header carries the cursor for the next page and
+    is omitted on the last page.
+    """
+    request = ListPantryItemsRequest(
+        limit=limit,
+        cursor=cursor,
+        category=category,
+        expires_after=expires_after,
+        expires_before=expires_before,
+        fields=fields,
+    )
+    try:
+        page = await controller.get_items_page(current_user_id, request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Rows are already plain column dicts, so skip response_model re-validation
+    headers = {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else None
+    return Response(
+        content=page.items_json(), media_type="application/json", headers=headers
+    )
 
 
 @router.post("/add", response_model=List[PantryItemResponse])
@@ -48,6 +91,26 @@ async def update_pantry_item(
     return await controller.update_item(current_user_id, request)
 
 
+@router.patch("/update-batch", response_model=List[PantryItemResponse])
+async def update_pantry_items(
+    requests: List[UpdatePantryItemRequest] = Body(
+        ..., min_length=1, max_length=PANTRY_UPDATE_MAX_BATCH_SIZE
+    ),
+    controller: PantryController = Depends(get_pantry_controller),
+    current_user_id: int = Depends(get_current_user),
+):
+    """
+    Update several pantry items at once; fields left out keep their value.
+
+    Either every update is applied or, if any item is missing, belongs to
+    someone else or appears twice, none is.
+    """
+    try:
+        return await controller.update_items(current_user_id, requests)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.post("/delete", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_pantry_items(
     request: DeletePantryItemsRequest,
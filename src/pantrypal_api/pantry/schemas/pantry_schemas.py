@@ -1,15 +1,21 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, constr
+from pydantic import BaseModel, TypeAdapter, constr
 
 from src.core.pantry.constants import Category, Unit
 from src.core.pantry.specs import (
     AddPantryItemSpec,
     DeletePantryItemsSpec,
+    ListPantryItemsSpec,
+    PantryListCursor,
     UpdatePantryItemSpec,
 )
 
+PANTRY_LIST_MAX_PAGE_SIZE = 500
+PANTRY_UPDATE_MAX_BATCH_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 class AddPantryItemRequest(BaseModel):
     item_name: constr(min_length=1)
@@ -76,3 +82,56 @@ class PantryStatsResponse(BaseModel):
     expiring_soon: int
     expiring_today: int
     expired: int
+
+
+PANTRY_ITEM_FIELDS = tuple(PantryItemResponse.model_fields)
+
+
+class PantryItemListEntry(BaseModel):
+    """A /pantry/list row; with ``fields=`` only id and the chosen fields are set."""
+
+    id: int
+    user_id: Optional[int] = None
+    item_name: Optional[str] = None
+    quantity: Optional[float] = None
+    unit: Optional[Unit] = None
+    category: Optional[Category] = None
+    purchase_date: Optional[datetime] = None
+    expiry_date: Optional[datetime] = None
+
+
+class ListPantryItemsRequest(BaseModel):
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+    category: List[Category] = []
+    expires_after: Optional[datetime] = None
+    expires_before: Optional[datetime] = None
+    fields: Optional[str] = None  # Comma-separated PantryItemResponse fields
+
+    def to_spec(self) -> ListPantryItemsSpec:
+        fields = None
+        if self.fields:
+            fields = [f.strip() for f in self.fields.split(",") if f.strip()]
+            unknown = set(fields) - set(PANTRY_ITEM_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown pantry item fields: {sorted(unknown)}")
+        return ListPantryItemsSpec(
+            limit=self.limit,
+            after=PantryListCursor.decode(self.cursor) if self.cursor else None,
+            categories=self.category,
+            expires_after=self.expires_after,
+            expires_before=self.expires_before,
+            fields=fields,
+        )
+
+
+class PantryItemPageResponse(BaseModel):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+    def items_json(self) -> bytes:
+        """Serialise the rows without re-validating them against a model."""
+        return _PANTRY_ROWS_ADAPTER.dump_json(self.items)
+
+
+_PANTRY_ROWS_ADAPTER = TypeAdapter(List[Dict[str, Any]])
@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import Dict, List
+
+from injector import inject
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from src.core.logging.ports.logging_provider import ILoggingProvider
+from src.core.receipt.accessors.receipt_item_classification_accessor import (
+    IReceiptItemClassificationAccessor,
+)
+from src.core.receipt.models import ReceiptItemClassificationDomain
+from src.core.storage.ports.relational_database_provider import IDatabaseProvider
+from src.pantrypal_api.receipt.models import ReceiptItemClassification
+
+
+class ReceiptItemClassificationAccessor(IReceiptItemClassificationAccessor):
+    @inject
+    def __init__(
+        self, db_provider: IDatabaseProvider, logging_provider: ILoggingProvider
+    ) -> None:
+        self.db_provider = db_provider
+        self.logging_provider = logging_provider
+
+    async def get_by_names(
+        self, normalized_names: List[str], stored_after: datetime
+    ) -> Dict[str, ReceiptItemClassificationDomain]:
+        if not normalized_names:
+            return {}
+        async with self.db_provider.get_db() as db:
+            result = await db.execute(
+                select(ReceiptItemClassification).where(
+                    ReceiptItemClassification.normalized_name.in_(normalized_names),
+                    ReceiptItemClassification.created_at >= stored_after,
+                )
+            )
+            return {
+                record.normalized_name: record.to_domain()
+                for record in result.scalars()
+            }
+
+    async def add_classifications(
+        self,
+        classifications: List[ReceiptItemClassificationDomain],
+        stored_after: datetime,
+    ) -> None:
+        if not classifications:
+            return
+        names = [c.normalized_name for c in classifications]
+        existing = await self.get_by_names(names, stored_after)
+        records = [
+            ReceiptItemClassification(
+                normalized_name=c.normalized_name,
+                item_name=c.item_name,
+                subcategory=c.subcategory,
+                quantity=c.quantity,
+            )
+            for c in classifications
+            if c.normalized_name not in existing
+        ]
+        if not records:
+            return
+        async with self.db_provider.get_db() as db:
+            # Expired classifications are replaced, so a wrong one ages out
+            await db.execute(
+                delete(ReceiptItemClassification).where(
+                    ReceiptItemClassification.normalized_name.in_(
+                        [r.normalized_name for r in records]
+                    ),
+                    ReceiptItemClassification.created_at < stored_after,
+                )
+            )
+            db.add_all(records)
+            try:
+                await db.commit()
+            except IntegrityError:
+                # Another worker stored some of these names first; theirs is as
+                # good as ours, and the rest are stored on their next miss
+                await db.rollback()
+                self.logging_provider.debug(
+                    "Receipt item classifications already stored",
+                    extra_data={"names": len(records)},
+                    tag="ReceiptItemClassificationAccessor",
+                )
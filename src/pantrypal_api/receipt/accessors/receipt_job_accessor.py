@@ -0,0 +1,197 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from injector import inject
+from sqlalchemy import and_, exists, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.common.utils import DateTimeUtils
+from src.core.logging.ports.logging_provider import ILoggingProvider
+from src.core.pantry.models import PantryItemDomain
+from src.core.receipt.accessors.receipt_job_accessor import IReceiptJobAccessor
+from src.core.receipt.constants import ReceiptJobStatus
+from src.core.receipt.models import ReceiptJobDomain
+from src.core.storage.ports.relational_database_provider import IDatabaseProvider
+from src.pantrypal_api.pantry.models import PantryItem
+from src.pantrypal_api.receipt.models import ReceiptJob
+
+
+class ReceiptJobAccessor(IReceiptJobAccessor):
+    @inject
+    def __init__(
+        self, db_provider: IDatabaseProvider, logging_provider: ILoggingProvider
+    ) -> None:
+        self.db_provider = db_provider
+        self.logging_provider = logging_provider
+
+    async def enqueue(
+        self, user_id: int, receipt_id: str, payload: Dict[str, Any]
+    ) -> ReceiptJobDomain:
+        async with self.db_provider.get_db() as db:
+            record = ReceiptJob(
+                user_id=user_id,
+                receipt_id=receipt_id,
+                payload=payload,
+                status=ReceiptJobStatus.PENDING,
+                attempts=0,
+                available_at=DateTimeUtils.get_utc_now(),
+            )
+            db.add(record)
+            try:
+                await db.commit()
+                return record.to_domain()
+            except IntegrityError:
+                # The user already queued this receipt (unique per user)
+                await db.rollback()
+            result = await db.execute(
+                select(ReceiptJob).where(
+                    ReceiptJob.user_id == user_id,
+                    ReceiptJob.receipt_id == receipt_id,
+                )
+            )
+            return result.scalar_one().to_domain()
+
+    async def claim_next(self, lease_seconds: int) -> Optional[ReceiptJobDomain]:
+        now = DateTimeUtils.get_utc_now()
+        due = or_(
+            and_(
+                ReceiptJob.status == ReceiptJobStatus.PENDING,
+                ReceiptJob.available_at <= now,
+            ),
+            and_(
+                ReceiptJob.status == ReceiptJobStatus.RUNNING,
+                ReceiptJob.locked_until <= now,
+            ),
+        )
+        next_id = (
+            select(ReceiptJob.id)
+            .where(due)
+            .order_by(ReceiptJob.available_at, ReceiptJob.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        # The predicate is repeated on the UPDATE so that, of two workers that
+        # picked the same id, only the first one to write gets the row back
+        stmt = (
+            update(ReceiptJob)
+            .where(ReceiptJob.id == next_id, due)
+            .values(
+                status=ReceiptJobStatus.RUNNING,
+                attempts=ReceiptJob.attempts + 1,
+                locked_until=DateTimeUtils.add_seconds(now, lease_seconds),
+                updated_at=now,
+            )
+            .returning(ReceiptJob)
+        )
+        async with self.db_provider.get_db() as db:
+            # Idle workers poll; checking with a read first keeps them from
+            # taking the database write lock when nothing is due
+            if not await db.scalar(select(exists().where(due))):
+                return None
+            result = await db.execute(stmt)
+            record = result.scalar_one_or_none()
+            job = record.to_domain() if record else None
+            await db.commit()
+            return job
+
+    async def complete(
+        self, job: ReceiptJobDomain, items: Sequence[PantryItemDomain] = ()
+    ) -> bool:
+        async with self.db_provider.get_db() as db:
+            if not await self.__update_claimed(
+                db, job, status=ReceiptJobStatus.DONE, locked_until=None
+            ):
+                await db.rollback()
+                return False
+            if items:
+                await db.execute(
+                    insert(PantryItem), [PantryItem.row_for(i) for i in items]
+                )
+            await db.commit()
+        return True
+
+    async def extend_lease(self, job: ReceiptJobDomain, lease_seconds: int) -> bool:
+        locked_until = DateTimeUtils.add_seconds(
+            DateTimeUtils.get_utc_now(), lease_seconds
+        )
+        async with self.db_provider.get_db() as db:
+            extended = await self.__update_claimed(db, job, locked_until=locked_until)
+            await db.commit()
+        return extended
+
+    async def retry_later(
+        self, job: ReceiptJobDomain, error: str, available_at: datetime
+    ) -> bool:
+        return await self.__release(
+            job,
+            status=ReceiptJobStatus.PENDING,
+            available_at=available_at,
+            locked_until=None,
+            last_error=error,
+        )
+
+    async def fail(self, job: ReceiptJobDomain, error: str) -> bool:
+        return await self.__release(
+            job, status=ReceiptJobStatus.FAILED, locked_until=None, last_error=error
+        )
+
+    async def get_job(
+        self, user_id: int, receipt_id: str
+    ) -> Optional[ReceiptJobDomain]:
+        async with self.db_provider.get_db() as db:
+            result = await db.execute(
+                select(ReceiptJob).where(
+                    ReceiptJob.user_id == user_id,
+                    ReceiptJob.receipt_id == receipt_id,
+                )
+            )
+            record = result.scalar_one_or_none()
+            return record.to_domain() if record else None
+
+    async def get_statuses(
+        self, receipt_ids: List[str]
+    ) -> Dict[Tuple[int, str], ReceiptJobStatus]:
+        if not receipt_ids:
+            return {}
+        # Only the key columns, so the payloads are not read
+        stmt = select(
+            ReceiptJob.user_id, ReceiptJob.receipt_id, ReceiptJob.status
+        ).where(ReceiptJob.receipt_id.in_(receipt_ids))
+        async with self.db_provider.get_db() as db:
+            result = await db.execute(stmt)
+            return {
+                (user_id, receipt_id): job_status
+                for user_id, receipt_id, job_status in result.all()
+            }
+
+    async def __release(self, job: ReceiptJobDomain, **values: Any) -> bool:
+        async with self.db_provider.get_db() as db:
+            updated = await self.__update_claimed(db, job, **values)
+            await db.commit()
+        return updated
+
+    async def __update_claimed(
+        self, db: AsyncSession, job: ReceiptJobDomain, **values: Any
+    ) -> bool:
+        # The attempt count fences off workers whose lease expired and whose
+        # job was claimed again in the meantime
+        stmt = (
+            update(ReceiptJob)
+            .where(
+                ReceiptJob.id == job.id,
+                ReceiptJob.status == ReceiptJobStatus.RUNNING,
+                ReceiptJob.attempts == job.attempts,
+            )
+            .values(updated_at=DateTimeUtils.get_utc_now(), **values)
+        )
+        result = await db.execute(stmt)
+        if result.rowcount == 0:
+            self.logging_provider.warning(
+                "Receipt job was claimed by another worker",
+                extra_data={"job_id": job.id, "attempts": job.attempts},
+                tag="ReceiptJobAccessor",
+            )
+            return False
+        return True
@@ -0,0 +1,46 @@
+from typing import Optional
+
+from injector import inject
+from sqlalchemy import select
+
+from src.core.logging.ports.logging_provider import ILoggingProvider
+from src.core.receipt.accessors.receipt_upload_accessor import IReceiptUploadAccessor
+from src.core.receipt.models import ReceiptUploadDomain
+from src.core.storage.ports.relational_database_provider import IDatabaseProvider
+from src.pantrypal_api.receipt.models import ReceiptUpload
+
+
+class ReceiptUploadAccessor(IReceiptUploadAccessor):
+    @inject
+    def __init__(
+        self, db_provider: IDatabaseProvider, logging_provider: ILoggingProvider
+    ) -> None:
+        self.db_provider = db_provider
+        self.logging_provider = logging_provider
+
+    async def get_latest_by_hash(
+        self, user_id: int, image_hash: str
+    ) -> Optional[ReceiptUploadDomain]:
+        async with self.db_provider.get_db() as db:
+            result = await db.execute(
+                select(ReceiptUpload)
+                .where(
+                    ReceiptUpload.user_id == user_id,
+                    ReceiptUpload.image_hash == image_hash,
+                )
+                .order_by(ReceiptUpload.id.desc())
+                .limit(1)
+            )
+            record = result.scalar_one_or_none()
+            return record.to_domain() if record else None
+
+    async def add_upload(self, upload: ReceiptUploadDomain) -> ReceiptUploadDomain:
+        async with self.db_provider.get_db() as db:
+            record = ReceiptUpload(
+                user_id=upload.user_id,
+                receipt_id=upload.receipt_id,
+                image_hash=upload.image_hash,
+            )
+            db.add(record)
+            await db.commit()
+            return record.to_domain()
@@ -1,45 +1,109 @@
-from typing import Any, Dict, Optional, Tuple
+import asyncio
+import json
+import random
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Tuple,
+)
 
 import httpx
 from injector import inject
 
+from src.core.common.constants import SecretKey
+from src.core.common.ports.secretkey_provider import ISecretProvider
 from src.core.logging.ports.logging_provider import ILoggingProvider
 from src.core.receipt.ports.receipt_gateway_provider import IReceiptGatewayProvider
 
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_TIMEOUT_SECONDS = 30.0
+DEFAULT_MAX_RETRIES = 2
+RETRY_BASE_SECONDS = 0.2
+RETRY_MAX_SECONDS = 5.0
+UPLOAD_CHUNK_CHARS = 64 * 1024
+
 
 class HttpReceiptGatewayProvider(IReceiptGatewayProvider):
-    """HTTP implementation for the receipt gateway."""
+    """HTTP implementation for the receipt gateway.
+
+    One ``httpx.AsyncClient`` is created lazily and shared by every upload and
+    poll, so keep-alive connections (HTTP/2 where the gateway offers it) and
+    their TLS sessions are reused. It is closed with the app. Upload bodies are
+    streamed in slices rather than serialised whole, and 5xx responses and
+    transport errors are retried with exponential backoff and full jitter.
+    """
 
     @inject
-    def __init__(self, logging_provider: ILoggingProvider) -> None:
+    def __init__(
+        self, secret_provider: ISecretProvider, logging_provider: ILoggingProvider
+    ) -> None:
         self.logging_provider = logging_provider
+        self.__max_connections = self.__get_secret(
+            secret_provider,
+            SecretKey.RECEIPT_GATEWAY_CONNECTIONS,
+            DEFAULT_MAX_CONNECTIONS,
+            int,
+        )
+        self.__timeout_seconds = self.__get_secret(
+            secret_provider,
+            SecretKey.RECEIPT_GATEWAY_TIMEOUT_SECONDS,
+            DEFAULT_TIMEOUT_SECONDS,
+            float,
+        )
+        self.__max_retries = self.__get_secret(
+            secret_provider,
+            SecretKey.RECEIPT_GATEWAY_RETRIES,
+            DEFAULT_MAX_RETRIES,
+            int,
+            allow_zero=True,
+        )
+        self.__client: Optional[httpx.AsyncClient] = None
 
     async def upload_receipt(self, url: str, payload: Dict[str, Any]) -> int:
-        async with httpx.AsyncClient() as client:
-            try:
-                resp = await client.post(url, json=payload)
-                return resp.status_code
-            except Exception as exc:  # pragma: no cover - network
-                self.logging_provider.error(
-                    "Failed to upload receipt",
-                    extra_data={"error": str(exc)},
-                    tag="HttpReceiptGatewayProvider",
-                )
-                raise
+        client = self.__get_client()
+        content_length = sum(len(chunk) for chunk in self.__json_chunks(payload))
+        headers = {
+            "Content-Type": "application/json",
+            "Content-Length": str(content_length),
+        }
+
+        async def body() -> AsyncIterator[bytes]:
+            for chunk in self.__json_chunks(payload):
+                yield chunk
+
+        try:
+            resp = await self.__send_with_retries(
+                lambda: client.post(url, content=body(), headers=headers), "upload"
+            )
+            return resp.status_code
+        except Exception as exc:  # pragma: no cover - network
+            self.logging_provider.error(
+                "Failed to upload receipt",
+                extra_data={"error": str(exc)},
+                tag="HttpReceiptGatewayProvider",
+            )
+            raise
 
     async def fetch_receipt_result(
         self, url: str, params: Dict[str, Any]
     ) -> Tuple[int, Optional[Dict[str, Any]]]:
-        async with httpx.AsyncClient() as client:
-            try:
-                resp = await client.get(url, params=params)
-            except Exception as exc:  # pragma: no cover - network
-                self.logging_provider.error(
-                    "Failed to fetch receipt result",
-                    extra_data={"error": str(exc)},
-                    tag="HttpReceiptGatewayProvider",
-                )
-                raise
+        client = self.__get_client()
+        try:
+            resp = await self.__send_with_retries(
+                lambda: client.get(url, params=params), "result poll"
+            )
+        except Exception as exc:  # pragma: no cover - network
+            self.logging_provider.error(
+                "Failed to fetch receipt result",
+                extra_data={"error": str(exc)},
+                tag="HttpReceiptGatewayProvider",
+            )
+            raise
         data: Optional[Dict[str, Any]] = None
         if resp.status_code == 200:
             try:
@@ -52,3 +116,94 @@ class HttpReceiptGatewayProvider(IReceiptGatewayProvider):
                 )
                 raise
         return resp.status_code, data
+
+    async def close(self) -> None:
+        """Closes the pooled HTTP client, if one was created."""
+        if self.__client is not None:
+            client, self.__client = self.__client, None
+            await client.aclose()
+
+    async def __send_with_retries(
+        self, send: Callable[[], Awaitable[httpx.Response]], action: str
+    ) -> httpx.Response:
+        """
+        Send a request, retrying 5xx responses and transport errors.
+
+        Uploads carry their receipt ID, so sending one twice stores the same
+        object rather than a second receipt.
+        """
+        attempt = 0
+        while True:
+            try:
+                resp = await send()
+            except httpx.TransportError as exc:
+                if attempt >= self.__max_retries:
+                    raise
+                error = str(exc) or type(exc).__name__
+            else:
+                if resp.status_code < 500 or attempt >= self.__max_retries:
+                    return resp
+                error = f"HTTP {resp.status_code}"
+            attempt += 1
+            delay = random.uniform(
+                0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+            )
+            self.logging_provider.warning(
+                f"Receipt gateway {action} failed; retrying",
+                extra_data={
+                    "error": error,
+                    "attempt": attempt,
+                    "retry_in_seconds": round(delay, 2),
+                },
+                tag="HttpReceiptGatewayProvider",
+            )
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def __json_chunks(payload: Dict[str, Any]) -> Iterator[bytes]:
+        """
+        Yield the payload as JSON, with long strings (the base64 image) encoded
+        UPLOAD_CHUNK_CHARS characters at a time instead of copied whole.
+        """
+        separator = b"{"
+        for key, value in payload.items():
+            yield separator + json.dumps(key).encode() + b": "
+            separator = b", "
+            if isinstance(value, str) and len(value) > UPLOAD_CHUNK_CHARS:
+                yield b'"'
+                for start in range(0, len(value), UPLOAD_CHUNK_CHARS):
+                    piece = value[start : start + UPLOAD_CHUNK_CHARS]
+                    yield json.dumps(piece)[1:-1].encode()
+                yield b'"'
+            else:
+                yield json.dumps(value).encode()
+        yield b"}" if payload else b"{}"
+
+    def __get_client(self) -> httpx.AsyncClient:
+        """Returns the shared HTTP client, creating it on first use."""
+        if self.__client is None:
+            self.__client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=self.__max_connections,
+                    max_keepalive_connections=self.__max_connections,
+                ),
+                timeout=httpx.Timeout(self.__timeout_seconds),
+            )
+        return self.__client
+
+    @staticmethod
+    def __get_secret(
+        secret_provider: ISecretProvider,
+        key: SecretKey,
+        default: float,
+        cast: Callable[[Any], Any],
+        allow_zero: bool = False,
+    ) -> Any:
+        try:
+            value = cast(secret_provider.get_secret(key, str(default)))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {key.value} value in .env")
+        if value < 0 or (value == 0 and not allow_zero):
+            raise ValueError(f"{key.value} must be a positive number")
+        return value
@@ -0,0 +1,126 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set, Tuple
+
+from injector import inject
+
+from src.core.common.constants import SecretKey
+from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.core.logging.ports.logging_provider import ILoggingProvider
+from src.core.receipt.accessors.receipt_job_accessor import IReceiptJobAccessor
+from src.core.receipt.constants import ReceiptJobStatus, ReceiptStatus
+from src.core.receipt.ports.receipt_status_notifier import IReceiptStatusNotifier
+
+DEFAULT_RECEIPT_STATUS_POLL_SECONDS = 1.0
+
+ReceiptKey = Tuple[int, str]
+
+
+class InProcessReceiptStatusNotifier(IReceiptStatusNotifier):
+    """
+    Wakes waiting requests from a registry of futures held in this process.
+
+    Only sees statuses published by this process, so it fits a single API
+    process running its own job workers (and tests).
+    """
+
+    def __init__(self) -> None:
+        self._waiters: Dict[ReceiptKey, Set[asyncio.Future]] = {}
+
+    @asynccontextmanager
+    async def subscribe(
+        self, user_id: int, receipt_id: str
+    ) -> AsyncIterator["asyncio.Future[Optional[ReceiptStatus]]"]:
+        key = (user_id, receipt_id)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, set()).add(future)
+        self._on_subscribe()
+        try:
+            yield future
+        finally:
+            waiters = self._waiters.get(key)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    del self._waiters[key]
+
+    async def publish(
+        self, user_id: int, receipt_id: str, status: Optional[ReceiptStatus]
+    ) -> None:
+        for future in self._waiters.get((user_id, receipt_id), ()):
+            if not future.done():
+                future.set_result(status)
+
+    def has_subscribers(self, user_id: int, receipt_id: str) -> bool:
+        return bool(self._waiters.get((user_id, receipt_id)))
+
+    def _on_subscribe(self) -> None:
+        """Hook for subclasses that watch a shared backend."""
+        return None
+
+
+class DatabaseReceiptStatusNotifier(InProcessReceiptStatusNotifier):
+    """
+    Also wakes requests for receipts finished by other processes.
+
+    While any request is waiting, one task per process reads the job status of
+    every awaited receipt in a single query each RECEIPT_STATUS_POLL_SECONDS,
+    so the database is the shared channel between API processes and workers.
+    Statuses published in this process still wake requests immediately.
+    """
+
+    @inject
+    def __init__(
+        self,
+        job_accessor: IReceiptJobAccessor,
+        secret_provider: ISecretProvider,
+        logging_provider: ILoggingProvider,
+    ) -> None:
+        super().__init__()
+        self.job_accessor = job_accessor
+        self.logging_provider = logging_provider
+        try:
+            self.poll_seconds = float(
+                secret_provider.get_secret(
+                    SecretKey.RECEIPT_STATUS_POLL_SECONDS,
+                    str(DEFAULT_RECEIPT_STATUS_POLL_SECONDS),
+                )
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid RECEIPT_STATUS_POLL_SECONDS value in .env")
+        if self.poll_seconds <= 0:
+            raise ValueError("RECEIPT_STATUS_POLL_SECONDS must be a positive number")
+        self.__watcher: Optional[asyncio.Task] = None
+
+    async def close(self) -> None:
+        if self.__watcher is not None:
+            watcher, self.__watcher = self.__watcher, None
+            watcher.cancel()
+            await asyncio.gather(watcher, return_exceptions=True)
+
+    def _on_subscribe(self) -> None:
+        if self.__watcher is None or self.__watcher.done():
+            self.__watcher = asyncio.create_task(
+                self.__watch(), name="receipt-status-watcher"
+            )
+
+    async def __watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            if not self._waiters:
+                return
+            receipt_ids = list({receipt_id for _, receipt_id in self._waiters})
+            try:
+                statuses = await self.job_accessor.get_statuses(receipt_ids)
+            except Exception as exc:
+                self.logging_provider.error(
+                    "Failed to read receipt job statuses",
+                    extra_data={"error": str(exc)},
+                    tag="DatabaseReceiptStatusNotifier",
+                )
+                continue
+            for (user_id, receipt_id), job_status in statuses.items():
+                if job_status == ReceiptJobStatus.DONE:
+                    await self.publish(user_id, receipt_id, ReceiptStatus.PROCESSED)
+                elif job_status == ReceiptJobStatus.FAILED:
+                    await self.publish(user_id, receipt_id, ReceiptStatus.FAILED)
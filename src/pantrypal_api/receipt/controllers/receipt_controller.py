@@ -1,18 +1,26 @@
+from typing import Optional
+
 from injector import inject
 
 from src.core.receipt.constants import ReceiptStatus
 from src.core.receipt.services.receipt_gateway_service import ReceiptGatewayService
-from src.core.receipt.services.receipt_service import ReceiptService
+from src.core.receipt.services.receipt_job_service import ReceiptJobService
 from src.core.storage.services.object_storage_service import ObjectStorageService
 
 
 class ReceiptController:
     @inject
-    def __init__(self, receipt_service: ReceiptService) -> None:
-        self.receipt_service = receipt_service
+    def __init__(self, job_service: ReceiptJobService) -> None:
+        self.job_service = job_service
 
-    async def handle_receipt_webhook(self, user_id: int, receipt: dict) -> None:
-        await self.receipt_service.process_receipt_webhook(user_id, receipt)
+    async def handle_receipt_webhook(
+        self, user_id: int, receipt: dict, receipt_id: Optional[str] = None
+    ) -> dict:
+        job = await self.job_service.enqueue(user_id, receipt_id, receipt)
+        return {
+            "receipt_id": job.receipt_id,
+            "status": self.job_service.to_receipt_status(job),
+        }
 
 
 class ReceiptUploadController:
@@ -33,3 +41,8 @@ class ReceiptUploadController:
 
     async def poll_result(self, user_id: int, receipt_id: str) -> ReceiptStatus | None:
         return await self.gateway_service.poll_receipt_result(user_id, receipt_id)
+
+    async def wait_result(
+        self, user_id: int, receipt_id: str, timeout: Optional[float]
+    ) -> ReceiptStatus | None:
+        return await self.gateway_service.wait_for_result(user_id, receipt_id, timeout)
@@ -1,6 +1,14 @@
-from sqlalchemy import JSON, Column, Integer, String
+from sqlalchemy import JSON, Column, DateTime
+from sqlalchemy import Enum as SQLAEnum
+from sqlalchemy import Float, Index, Integer, String, Text, UniqueConstraint
 
-from src.core.receipt.models import ReceiptResultDomain
+from src.core.receipt.constants import ReceiptJobStatus
+from src.core.receipt.models import (
+    ReceiptItemClassificationDomain,
+    ReceiptJobDomain,
+    ReceiptResultDomain,
+    ReceiptUploadDomain,
+)
 from src.pantrypal_api.base.models import PantryPalBaseModel
 
 
@@ -20,3 +28,91 @@ class ReceiptResult(PantryPalBaseModel):
             receipt_id=self.receipt_id,
             result=self.result,
         )
+
+
+class ReceiptJob(PantryPalBaseModel):
+    __tablename__ = "receipt_job"
+    __table_args__ = (
+        # Workers look for the oldest due job of a given status
+        Index("ix_receipt_job_status_available_at", "status", "available_at"),
+        # One job per user and receipt, so redelivered webhooks and repeated
+        # polls are no-ops; receipt_id leads for the status lookups by receipt
+        UniqueConstraint(
+            "receipt_id", "user_id", name="uq_receipt_job_receipt_id_user_id"
+        ),
+    )
+
+    user_id = Column(Integer, nullable=False, index=True)
+    receipt_id = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(
+        SQLAEnum(
+            ReceiptJobStatus,
+            values_callable=lambda x: [e.value for e in x],
+            native_enum=False,
+        ),
+        nullable=False,
+    )
+    attempts = Column(Integer, nullable=False, server_default="0")
+    available_at = Column(DateTime(timezone=True), nullable=False)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    def to_domain(self) -> ReceiptJobDomain:
+        return ReceiptJobDomain(
+            id=self.id,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            deleted_at=self.deleted_at,
+            user_id=self.user_id,
+            receipt_id=self.receipt_id,
+            payload=self.payload,
+            status=self.status,
+            attempts=self.attempts,
+            available_at=self.available_at,
+            locked_until=self.locked_until,
+            last_error=self.last_error,
+        )
+
+
+class ReceiptUpload(PantryPalBaseModel):
+    __tablename__ = "receipt_upload"
+    # Duplicate uploads are looked up by content hash within a user's receipts
+    __table_args__ = (
+        Index("ix_receipt_upload_user_id_image_hash", "user_id", "image_hash"),
+    )
+
+    user_id = Column(Integer, nullable=False)
+    receipt_id = Column(String, nullable=False, unique=True)
+    image_hash = Column(String(64), nullable=False)
+
+    def to_domain(self) -> ReceiptUploadDomain:
+        return ReceiptUploadDomain(
+            id=self.id,
+            created_at=self.created_at,
+            deleted_at=self.deleted_at,
+            user_id=self.user_id,
+            receipt_id=self.receipt_id,
+            image_hash=self.image_hash,
+        )
+
+
+class ReceiptItemClassification(PantryPalBaseModel):
+    __tablename__ = "receipt_item_classification"
+
+    # Shared by every user: the same receipt line always means the same product
+    normalized_name = Column(String, nullable=False, unique=True)
+    item_name = Column(String, nullable=False)
+    subcategory = Column(String, nullable=True)
+    quantity = Column(Float, nullable=False)
+
+    def to_domain(self) -> ReceiptItemClassificationDomain:
+        return ReceiptItemClassificationDomain(
+            id=self.id,
+            created_at=self.created_at,
+            deleted_at=self.deleted_at,
+            normalized_name=self.normalized_name,
+            item_name=self.item_name,
+            subcategory=self.subcategory,
+            quantity=self.quantity,
+        )
@@ -1,13 +1,40 @@
-from injector import Binder, Module, singleton
+from injector import Binder, Injector, Module, inject, provider, singleton
 
+from src.core.common.constants import SecretKey
+from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.core.receipt.accessors.receipt_item_classification_accessor import (
+    IReceiptItemClassificationAccessor,
+)
+from src.core.receipt.accessors.receipt_job_accessor import IReceiptJobAccessor
 from src.core.receipt.accessors.receipt_result_accessor import IReceiptResultAccessor
+from src.core.receipt.accessors.receipt_upload_accessor import IReceiptUploadAccessor
 from src.core.receipt.ports.receipt_gateway_provider import IReceiptGatewayProvider
+from src.core.receipt.ports.receipt_status_notifier import IReceiptStatusNotifier
+from src.core.receipt.services.receipt_dedup_service import ReceiptDedupService
+from src.core.receipt.services.receipt_gateway_service import ReceiptGatewayService
+from src.core.receipt.services.receipt_item_cache_service import (
+    ReceiptItemCacheService,
+)
+from src.core.receipt.services.receipt_job_service import ReceiptJobService
+from src.pantrypal_api.receipt.accessors.receipt_item_classification_accessor import (
+    ReceiptItemClassificationAccessor,
+)
+from src.pantrypal_api.receipt.accessors.receipt_job_accessor import (
+    ReceiptJobAccessor,
+)
 from src.pantrypal_api.receipt.accessors.receipt_result_accessor import (
     ReceiptResultAccessor,
 )
+from src.pantrypal_api.receipt.accessors.receipt_upload_accessor import (
+    ReceiptUploadAccessor,
+)
 from src.pantrypal_api.receipt.adapters.receipt_gateway_provider import (
     HttpReceiptGatewayProvider,
 )
+from src.pantrypal_api.receipt.adapters.receipt_status_notifier import (
+    DatabaseReceiptStatusNotifier,
+    InProcessReceiptStatusNotifier,
+)
 
 
 class ReceiptModule(Module):
@@ -16,3 +43,35 @@ class ReceiptModule(Module):
             IReceiptGatewayProvider, to=HttpReceiptGatewayProvider, scope=singleton
         )
         binder.bind(IReceiptResultAccessor, to=ReceiptResultAccessor, scope=singleton)
+        binder.bind(IReceiptJobAccessor, to=ReceiptJobAccessor, scope=singleton)
+        binder.bind(IReceiptUploadAccessor, to=ReceiptUploadAccessor, scope=singleton)
+        binder.bind(
+            IReceiptItemClassificationAccessor,
+            to=ReceiptItemClassificationAccessor,
+            scope=singleton,
+        )
+        # Owns the worker pool started in the app lifespan
+        binder.bind(ReceiptJobService, scope=singleton)
+        # Singleton so dedup counters cover every upload in the process
+        binder.bind(ReceiptDedupService, scope=singleton)
+        # Singleton so item cache counters cover every receipt in the process
+        binder.bind(ReceiptItemCacheService, scope=singleton)
+        # Singleton so one gateway poller runs per awaited receipt
+        binder.bind(ReceiptGatewayService, scope=singleton)
+
+    @singleton
+    @provider
+    @inject
+    def provide_receipt_status_notifier(
+        self, secret_provider: ISecretProvider, injector: Injector
+    ) -> IReceiptStatusNotifier:
+        """
+        Wakes requests waiting on receipts: in-process by default, or through
+        the database when API processes and job workers run apart.
+        """
+        backend = secret_provider.get_secret(SecretKey.RECEIPT_STATUS_BACKEND, "local")
+        if backend == "local":
+            return InProcessReceiptStatusNotifier()
+        if backend == "database":
+            return injector.get(DatabaseReceiptStatusNotifier)
+        raise ValueError("Invalid RECEIPT_STATUS_BACKEND value in .env")
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse, Response
 
 from src.core.receipt.constants import ReceiptStatus
 from src.core.receipt.services.receipt_gateway_service import ReceiptGatewayService
-from src.core.receipt.services.receipt_service import ReceiptService
+from src.core.receipt.services.receipt_job_service import ReceiptJobService
 from src.core.storage.services.object_storage_service import ObjectStorageService
 from src.pantrypal_api.account.dependencies import get_current_user
 from src.pantrypal_api.modules import injector
@@ -20,8 +22,8 @@ router = APIRouter(prefix="/receipt", tags=["Receipt"])
 
 
 def get_receipt_controller() -> ReceiptController:
-    service = injector.get(ReceiptService)
-    return ReceiptController(service)
+    job_service = injector.get(ReceiptJobService)
+    return ReceiptController(job_service)
 
 
 def get_upload_controller() -> ReceiptUploadController:
@@ -30,12 +32,14 @@ def get_upload_controller() -> ReceiptUploadController:
     return ReceiptUploadController(storage_service, gateway_service)
 
 
-@router.post("/webhook", status_code=status.HTTP_204_NO_CONTENT)
+@router.post("/webhook", status_code=status.HTTP_202_ACCEPTED)
 async def receipt_webhook(
     request: ReceiptWebhookRequest,
     controller: ReceiptController = Depends(get_receipt_controller),
 ):
-    await controller.handle_receipt_webhook(request.user_id, request.receipt)
+    return await controller.handle_receipt_webhook(
+        request.user_id, request.receipt, request.receipt_id
+    )
 
 
 @router.post("/presigned-url")
@@ -52,9 +56,14 @@ async def upload_receipt(
     controller: ReceiptUploadController = Depends(get_upload_controller),
     current_user_id: int = Depends(get_current_user),
 ):
-    result = await controller.upload_image(current_user_id, request.image_base64)
+    try:
+        result = await controller.upload_image(current_user_id, request.image_base64)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     if result is None:
         raise HTTPException(status_code=500, detail="Failed to upload receipt")
+    if result.get("duplicate"):
+        return JSONResponse(result, status_code=status.HTTP_200_OK)
     return result
 
 
@@ -65,6 +74,21 @@ async def get_receipt_result(
     current_user_id: int = Depends(get_current_user),
 ):
     status_value = await controller.poll_result(current_user_id, receipt_id)
+    return receipt_status_response(status_value)
+
+
+@router.get("/result/{receipt_id}/wait")
+async def wait_for_receipt_result(
+    receipt_id: str,
+    timeout: Optional[float] = Query(None, gt=0, description="Seconds to wait"),
+    controller: ReceiptUploadController = Depends(get_upload_controller),
+    current_user_id: int = Depends(get_current_user),
+):
+    status_value = await controller.wait_result(current_user_id, receipt_id, timeout)
+    return receipt_status_response(status_value)
+
+
+def receipt_status_response(status_value: Optional[ReceiptStatus]) -> Response:
     if status_value is None:
         raise HTTPException(status_code=500, detail="Failed to poll receipt")
     if status_value == ReceiptStatus.PROCESSED:
@@ -73,4 +97,6 @@ async def get_receipt_result(
         return JSONResponse(
             {"status": ReceiptStatus.PENDING}, status_code=status.HTTP_202_ACCEPTED
         )
+    if status_value == ReceiptStatus.FAILED:
+        raise HTTPException(status_code=500, detail="Failed to process receipt")
     raise HTTPException(status_code=500, detail="Unexpected receipt status")
@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from pydantic import BaseModel
 
@@ -6,6 +6,8 @@ from pydantic import BaseModel
 class ReceiptWebhookRequest(BaseModel):
     user_id: int
     receipt: Dict[str, Any]
+    # Idempotency key; defaults to a hash of the user and receipt content
+    receipt_id: Optional[str] = None
 
 
 class ReceiptUploadRequest(BaseModel):
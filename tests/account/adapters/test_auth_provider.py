@@ -1,3 +1,7 @@
+import asyncio
+import threading
+import time
+
 import pytest
 from jose import jwt
 
@@ -15,12 +19,13 @@ def mock_secret_key_provider_with_auth_secrets():
     """
 
     class CustomSecretKeyProvider:
-        def get_secret(self, key):
+        def get_secret(self, key, default=None):
             return {
                 SecretKey.AUTH_SECRET_KEY: "test-secret-key",
                 SecretKey.AUTH_ALGORITHM: "HS256",
                 SecretKey.AUTH_TOKEN_EXPIRY_MINUTES: "60",
-            }.get(key)
+                SecretKey.AUTH_BCRYPT_ROUNDS: "4",
+            }.get(key, default)
 
     return CustomSecretKeyProvider()
 
@@ -42,6 +47,102 @@ def test_get_hashed_password_and_verify(
     assert provider.verify_password("wrong_password", hashed) is False
 
 
+# Test: Async Hashing Uses the Configured Cost and Flags Outdated Hashes
+@pytest.mark.asyncio
+async def test_async_hash_verify_and_needs_rehash(
+    mock_secret_key_provider_with_auth_secrets, mock_logging_provider
+):
+    provider = AuthProvider(
+        secret_provider=mock_secret_key_provider_with_auth_secrets,
+        logging_provider=mock_logging_provider,
+    )
+
+    hashed = await provider.get_hashed_password_async("my_password")
+
+    assert hashed.startswith("$2b$04$")
+    assert await provider.verify_password_async("my_password", hashed) is True
+    assert await provider.verify_password_async("wrong_password", hashed) is False
+    assert provider.needs_rehash(hashed) is False
+
+    provider.bcrypt_rounds = 5
+    assert provider.needs_rehash(hashed) is True
+
+    # Lowering the configured cost keeps the stronger hashes already stored
+    stronger = await provider.get_hashed_password_async("my_password")
+    assert stronger.startswith("$2b$05$")
+    provider.bcrypt_rounds = 4
+    assert provider.needs_rehash(stronger) is False
+    await provider.close()
+
+    # Closing only releases the pool; later calls start a new one
+    assert await provider.verify_password_async("my_password", hashed) is True
+    await provider.close()
+
+
+# Test: Pending Hash Jobs Are Capped and Run Off the Event Loop
+@pytest.mark.asyncio
+async def test_async_hashing_is_bounded(mock_logging_provider, monkeypatch):
+    class BoundedSecretKeyProvider:
+        def get_secret(self, key, default=None):
+            return {
+                SecretKey.AUTH_HASH_MAX_WORKERS: "4",
+                SecretKey.AUTH_HASH_MAX_PENDING: "2",
+            }.get(key, default)
+
+    in_flight, peak = 0, 0
+    lock = threading.Lock()
+
+    def slow_hash(raw_password, rounds=None):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return f"hashed-{raw_password}"
+
+    monkeypatch.setattr(
+        "src.pantrypal_api.account.adapters.auth_provider.HashUtil.hash", slow_hash
+    )
+    provider = AuthProvider(
+        secret_provider=BoundedSecretKeyProvider(),
+        logging_provider=mock_logging_provider,
+    )
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    results = await asyncio.gather(
+        *(provider.get_hashed_password_async(f"pw{i}") for i in range(6))
+    )
+    ticker_task.cancel()
+
+    assert results == [f"hashed-pw{i}" for i in range(6)]
+    assert peak == 2
+    assert ticks > 10  # The loop kept running while bcrypt was busy
+    await provider.close()
+
+
+# Test: Invalid bcrypt Cost Should Raise Error
+def test_invalid_bcrypt_rounds_raises(mock_logging_provider):
+    class InvalidRoundsProvider:
+        def get_secret(self, key, default=None):
+            return "3" if key == SecretKey.AUTH_BCRYPT_ROUNDS else default
+
+    with pytest.raises(ValueError, match="AUTH_BCRYPT_ROUNDS must be between"):
+        AuthProvider(
+            secret_provider=InvalidRoundsProvider(),
+            logging_provider=mock_logging_provider,
+        )
+
+
 # Test: Valid JWT Token Generation
 def test_generate_token_valid_jwt(
     mock_secret_key_provider_with_auth_secrets, mock_logging_provider
@@ -63,8 +164,8 @@ def test_generate_token_valid_jwt(
 # Test: Missing Secret Key Should Raise Error
 def test_invalid_secret_key_raises(mock_logging_provider):
     class IncompleteSecretKeyProvider:
-        def get_secret(self, key):
-            return None  # Simulate missing secrets
+        def get_secret(self, key, default=None):
+            return default  # Simulate missing secrets
 
     provider = AuthProvider(
         secret_provider=IncompleteSecretKeyProvider(),
@@ -78,12 +179,12 @@ def test_invalid_secret_key_raises(mock_logging_provider):
 # Test: Invalid Expiry Format Should Raise Error
 def test_invalid_expiry_minutes_raises(mock_logging_provider):
     class InvalidExpiryProvider:
-        def get_secret(self, key):
+        def get_secret(self, key, default=None):
             return {
                 SecretKey.AUTH_SECRET_KEY: "secret",
                 SecretKey.AUTH_ALGORITHM: "HS256",
                 SecretKey.AUTH_TOKEN_EXPIRY_MINUTES: "invalid",  # Not an integer
-            }.get(key)
+            }.get(key, default)
 
     provider = AuthProvider(
         secret_provider=InvalidExpiryProvider(), logging_provider=mock_logging_provider
@@ -2,6 +2,10 @@ from uuid import uuid4  # for generating unique emails
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
+
+from src.core.storage.ports.relational_database_provider import IDatabaseProvider
+from src.pantrypal_api.modules import injector
 
 
 @pytest.mark.asyncio
@@ -111,3 +115,51 @@ class TestUserAccountEndpoints:
         )
         assert response.status_code == 200
         assert response.json()["detail"] == "User deleted successfully"
+
+    async def test_warm_auth_cache_needs_no_queries(
+        self, async_client: AsyncClient, monkeypatch
+    ):
+        async def fake_single_turn(self, message):
+            return '["One", "Two", "Three", "Four"]'
+
+        monkeypatch.setattr(
+            "src.pantrypal_api.chatbot.adapters.chatbot_provider.GroqChatbotProvider.handle_single_turn",
+            fake_single_turn,
+        )
+        email = f"{uuid4()}@example.com"
+        await async_client.post(
+            "/account/register",
+            json={"username": "cacheuser", "email": email, "password": "password123"},
+        )
+        login_response = await async_client.post(
+            "/account/login", json={"email": email, "password": "password123"}
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['token']}"}
+
+        statements = []
+        engine = injector.get(IDatabaseProvider).engine.sync_engine
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            # Cold cache: token and user lookups go to the database
+            await async_client.get("/chatbot/title-suggestions", headers=headers)
+            cold_queries = len(statements)
+            statements.clear()
+
+            response = await async_client.get(
+                "/chatbot/title-suggestions", headers=headers
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert response.status_code == 200
+        assert cold_queries == 2
+        assert statements == []
+
+        # Logging out revokes the cached token immediately
+        await async_client.post("/account/logout", headers=headers)
+        response = await async_client.get("/chatbot/title-suggestions", headers=headers)
+        assert response.status_code == 401
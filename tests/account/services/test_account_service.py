@@ -7,10 +7,13 @@ from src.core.account.specs import RegisterUserSpec, UpdateUserSpec
 
 @pytest.mark.asyncio
 async def test_register_user_success(
-    mock_user_account_accessor, mock_auth_provider, mock_logging_provider
+    mock_user_account_accessor,
+    mock_auth_provider,
+    mock_logging_provider,
+    auth_cache_service,
 ):
     mock_user_account_accessor.get_by_email.return_value = None
-    mock_auth_provider.get_hashed_password.return_value = "securehash"
+    mock_auth_provider.get_hashed_password_async.return_value = "securehash"
 
     created_user = UserAccountDomain(
         id=1,
@@ -26,6 +29,7 @@ async def test_register_user_success(
         mock_auth_provider,
         None,
         mock_logging_provider,
+        auth_cache_service,
     )
 
     spec = RegisterUserSpec(username="newuser", email="a@x.com", password="securepw")
@@ -37,7 +41,10 @@ async def test_register_user_success(
 
 @pytest.mark.asyncio
 async def test_update_user(
-    mock_user_account_accessor, mock_auth_provider, mock_logging_provider
+    mock_user_account_accessor,
+    mock_auth_provider,
+    mock_logging_provider,
+    auth_cache_service,
 ):
     user_before = UserAccountDomain(
         id=1,
@@ -55,7 +62,7 @@ async def test_update_user(
     )
 
     mock_user_account_accessor.get_by_id.return_value = user_before
-    mock_auth_provider.get_hashed_password.return_value = "newhash"
+    mock_auth_provider.get_hashed_password_async.return_value = "newhash"
     mock_user_account_accessor.update_user.return_value = user_after
 
     service = UserAccountService(
@@ -63,6 +70,7 @@ async def test_update_user(
         mock_auth_provider,
         None,
         mock_logging_provider,
+        auth_cache_service,
     )
     spec = UpdateUserSpec(username="after", email="a@x.com", password="newpassword")
     user = await service.update_user(1, spec)
@@ -73,7 +81,10 @@ async def test_update_user(
 
 @pytest.mark.asyncio
 async def test_delete_user(
-    mock_user_account_accessor, mock_auth_token_accessor, mock_logging_provider
+    mock_user_account_accessor,
+    mock_auth_token_accessor,
+    mock_logging_provider,
+    auth_cache_service,
 ):
     user = UserAccountDomain(
         id=1,
@@ -89,8 +100,115 @@ async def test_delete_user(
         None,
         mock_auth_token_accessor,
         mock_logging_provider,
+        auth_cache_service,
     )
     await service.delete_user(1)
 
     mock_auth_token_accessor.delete_by_user_id.assert_called_once_with(1)
     mock_user_account_accessor.delete_by_id.assert_called_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_get_user_is_cached_until_update(
+    mock_user_account_accessor,
+    mock_auth_provider,
+    mock_logging_provider,
+    auth_cache_service,
+):
+    user = UserAccountDomain(
+        id=1,
+        username="cached",
+        email="c@x.com",
+        password_hash="x",
+        is_admin=False,
+    )
+    mock_user_account_accessor.get_by_id.return_value = user
+    mock_user_account_accessor.update_user.return_value = user.model_copy(
+        update={"username": "renamed"}
+    )
+
+    service = UserAccountService(
+        mock_user_account_accessor,
+        mock_auth_provider,
+        None,
+        mock_logging_provider,
+        auth_cache_service,
+    )
+
+    assert (await service.get_user(1)).username == "cached"
+    assert (await service.get_user(1)).username == "cached"
+    assert mock_user_account_accessor.get_by_id.await_count == 1
+
+    await service.update_user(1, UpdateUserSpec(username="renamed"))
+    mock_user_account_accessor.get_by_id.return_value = (
+        mock_user_account_accessor.update_user.return_value
+    )
+    assert (await service.get_user(1)).username == "renamed"
+
+
+@pytest.mark.asyncio
+async def test_get_user_caches_no_password_hash(
+    mock_user_account_accessor,
+    mock_auth_provider,
+    mock_logging_provider,
+    auth_cache_service,
+    fake_cache_provider,
+):
+    mock_user_account_accessor.get_by_id.return_value = UserAccountDomain(
+        id=1,
+        username="cached",
+        email="c@x.com",
+        password_hash="$2b$12$secret",
+        is_admin=True,
+    )
+    service = UserAccountService(
+        mock_user_account_accessor,
+        mock_auth_provider,
+        None,
+        mock_logging_provider,
+        auth_cache_service,
+    )
+
+    assert (await service.get_user(1)).password_hash == "$2b$12$secret"
+    assert not any("secret" in v for v in fake_cache_provider.entries.values())
+    cached = await service.get_user(1)
+    assert (cached.username, cached.is_admin, cached.password_hash) == (
+        "cached",
+        True,
+        "",
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_user_racing_an_update_does_not_cache_the_old_user(
+    mock_user_account_accessor,
+    mock_auth_provider,
+    mock_logging_provider,
+    auth_cache_service,
+):
+    old = UserAccountDomain(
+        id=1, username="old", email="c@x.com", password_hash="x", is_admin=True
+    )
+
+    async def read_then_update(user_id):
+        # The user is changed and invalidated while the old row is in flight
+        await auth_cache_service.invalidate_user(user_id)
+        mock_user_account_accessor.get_by_id.side_effect = None
+        mock_user_account_accessor.get_by_id.return_value = old.model_copy(
+            update={"username": "new", "is_admin": False}
+        )
+        return old
+
+    mock_user_account_accessor.get_by_id.side_effect = read_then_update
+    service = UserAccountService(
+        mock_user_account_accessor,
+        mock_auth_provider,
+        None,
+        mock_logging_provider,
+        auth_cache_service,
+    )
+
+    assert (await service.get_user(1)).username == "old"
+    assert (await service.get_user(1)).username == "new"
+    assert (await service.get_user(1)).username == "new"
+    assert mock_user_account_accessor.get_by_id.await_count == 2
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from fastapi import HTTPException
 
 from src.core.account.models import AuthTokenDomain, UserAccountDomain
 from src.core.account.services.auth_service import AuthService
@@ -13,6 +14,7 @@ async def test_login_success(
     mock_user_account_accessor,
     mock_auth_token_accessor,
     mock_logging_provider,
+    auth_cache_service,
 ):
     user = UserAccountDomain(
         id=1,
@@ -30,7 +32,7 @@ async def test_login_success(
     )
 
     mock_user_account_accessor.get_by_email.return_value = user
-    mock_auth_provider.verify_password.return_value = True
+    mock_auth_provider.verify_password_async.return_value = True
     mock_auth_provider.generate_token.return_value = "mock-token"
     mock_auth_token_accessor.upsert.return_value = token
 
@@ -39,6 +41,7 @@ async def test_login_success(
         mock_user_account_accessor,
         mock_auth_token_accessor,
         mock_logging_provider,
+        auth_cache_service,
     )
     result = await service.login(LoginSpec(email="test@example.com", password="pass"))
 
@@ -47,7 +50,79 @@ async def test_login_success(
 
 
 @pytest.mark.asyncio
-async def test_logout_success(mock_auth_token_accessor, mock_logging_provider):
+async def test_login_rehashes_outdated_password_hash(
+    mock_auth_provider,
+    mock_user_account_accessor,
+    mock_auth_token_accessor,
+    mock_logging_provider,
+    auth_cache_service,
+):
+    user = UserAccountDomain(
+        id=1,
+        username="test",
+        email="test@example.com",
+        password_hash="$2b$04$outdated",
+        is_admin=False,
+    )
+    mock_user_account_accessor.get_by_email.return_value = user
+    mock_auth_provider.needs_rehash.return_value = True
+    mock_auth_provider.get_hashed_password_async.return_value = "$2b$12$upgraded"
+    mock_auth_provider.generate_token.return_value = "mock-token"
+    mock_auth_token_accessor.upsert.side_effect = lambda token: token
+
+    service = AuthService(
+        mock_auth_provider,
+        mock_user_account_accessor,
+        mock_auth_token_accessor,
+        mock_logging_provider,
+        auth_cache_service,
+    )
+    result = await service.login(LoginSpec(email="test@example.com", password="pass"))
+
+    assert result.token == "mock-token"
+    mock_auth_provider.get_hashed_password_async.assert_awaited_once_with("pass")
+    updated_user = mock_user_account_accessor.update_user.await_args.args[0]
+    assert updated_user.password_hash == "$2b$12$upgraded"
+
+
+@pytest.mark.asyncio
+async def test_login_succeeds_when_rehash_fails(
+    mock_auth_provider,
+    mock_user_account_accessor,
+    mock_auth_token_accessor,
+    mock_logging_provider,
+    auth_cache_service,
+):
+    user = UserAccountDomain(
+        id=1,
+        username="test",
+        email="test@example.com",
+        password_hash="$2b$04$outdated",
+        is_admin=False,
+    )
+    mock_user_account_accessor.get_by_email.return_value = user
+    mock_user_account_accessor.update_user.side_effect = RuntimeError("db down")
+    mock_auth_provider.needs_rehash.return_value = True
+    mock_auth_provider.generate_token.return_value = "mock-token"
+    mock_auth_token_accessor.upsert.side_effect = lambda token: token
+
+    service = AuthService(
+        mock_auth_provider,
+        mock_user_account_accessor,
+        mock_auth_token_accessor,
+        mock_logging_provider,
+        auth_cache_service,
+    )
+    result = await service.login(LoginSpec(email="test@example.com", password="pass"))
+
+    assert result.token == "mock-token"
+    mock_logging_provider.warning.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_logout_success(
+    mock_auth_token_accessor, mock_logging_provider, auth_cache_service
+):
     token = AuthTokenDomain(
         id=1,
         token="abc",
@@ -57,7 +132,82 @@ async def test_logout_success(mock_auth_token_accessor, mock_logging_provider):
     )
     mock_auth_token_accessor.get_by_token.return_value = token
 
-    service = AuthService(None, None, mock_auth_token_accessor, mock_logging_provider)
+    service = AuthService(
+        None, None, mock_auth_token_accessor, mock_logging_provider, auth_cache_service
+    )
+    await auth_cache_service.cache_token(1, "abc", None)
     await service.logout("abc")
 
     mock_auth_token_accessor.delete_by_token.assert_called_once_with("abc")
+    assert not await auth_cache_service.is_token_cached(1, "abc")
+
+
+@pytest.mark.asyncio
+async def test_verify_auth_token_skips_db_on_cache_hit(
+    mock_auth_provider,
+    mock_auth_token_accessor,
+    mock_logging_provider,
+    auth_cache_service,
+):
+    mock_auth_provider.decode_token.return_value = 1
+    mock_auth_token_accessor.get_by_token.return_value = AuthTokenDomain(
+        id=1,
+        token="abc",
+        user_id=1,
+        token_issued_at=datetime.now(timezone.utc),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+    )
+
+    service = AuthService(
+        mock_auth_provider,
+        None,
+        mock_auth_token_accessor,
+        mock_logging_provider,
+        auth_cache_service,
+    )
+
+    assert await service.verify_auth_token("abc") == 1
+    assert await service.verify_auth_token("abc") == 1
+    mock_auth_token_accessor.get_by_token.assert_awaited_once_with("abc")
+    assert auth_cache_service.stats()["token_hits"] == 1
+    assert auth_cache_service.stats()["token_misses"] == 1
+
+    # Revoking the user's tokens forces the next call back to the database
+    mock_auth_token_accessor.get_by_token.return_value = None
+    await service.invalidate_user_tokens(1)
+    with pytest.raises(HTTPException):
+        await service.verify_auth_token("abc")
+
+
+@pytest.mark.asyncio
+async def test_verify_racing_a_revocation_does_not_cache_the_token(
+    mock_auth_provider,
+    mock_auth_token_accessor,
+    mock_logging_provider,
+    auth_cache_service,
+):
+    mock_auth_provider.decode_token.return_value = 1
+    token = AuthTokenDomain(
+        id=1,
+        token="abc",
+        user_id=1,
+        token_issued_at=datetime.now(timezone.utc),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+    )
+
+    async def read_then_revoke(raw_token):
+        # The token is revoked while its row is in flight
+        await auth_cache_service.invalidate_user_tokens(1)
+        return token
+
+    mock_auth_token_accessor.get_by_token.side_effect = read_then_revoke
+    service = AuthService(
+        mock_auth_provider,
+        None,
+        mock_auth_token_accessor,
+        mock_logging_provider,
+        auth_cache_service,
+    )
+
+    assert await service.verify_auth_token("abc") == 1
+    assert not await auth_cache_service.is_token_cached(1, "abc")
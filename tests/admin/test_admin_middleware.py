@@ -0,0 +1,49 @@
+import pytest
+from httpx import AsyncClient
+
+from src.core.account.accessors.user_account_accessor import IUserAccountAccessor
+from src.pantrypal_api.modules import injector
+
+
+async def register_and_login(async_client: AsyncClient, email: str) -> str:
+    await async_client.post(
+        "/account/register",
+        json={"username": "middleware", "email": email, "password": "pass123"},
+    )
+    login_resp = await async_client.post(
+        "/account/login", json={"email": email, "password": "pass123"}
+    )
+    return login_resp.json()["token"]
+
+
+@pytest.mark.asyncio
+class TestAdminRedirectMiddleware:
+    async def test_unprotected_paths_pass_through(self, async_client: AsyncClient):
+        response = await async_client.get("/")
+        assert response.status_code == 200
+        assert response.json() == {"message": "PantryPal API is running"}
+
+    async def test_docs_redirects_without_token(self, async_client: AsyncClient):
+        response = await async_client.get("/docs")
+        assert response.status_code == 307
+        assert response.headers["location"] == "/admin/login"
+
+    async def test_docs_redirects_non_admin(self, async_client: AsyncClient):
+        token = await register_and_login(async_client, "user@example.com")
+        response = await async_client.get(
+            "/docs", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 307
+
+    async def test_docs_allowed_for_admin_cookie(self, async_client: AsyncClient):
+        token = await register_and_login(async_client, "admin@example.com")
+        user_accessor = injector.get(IUserAccountAccessor)
+        user = await user_accessor.get_by_email("admin@example.com")
+        user.is_admin = True
+        await user_accessor.update_user(user)
+
+        async_client.cookies.set("Authorization", f"Bearer {token}")
+        response = await async_client.get("/docs")
+        async_client.cookies.clear()
+        assert response.status_code == 200
+        assert "swagger" in response.text.lower()
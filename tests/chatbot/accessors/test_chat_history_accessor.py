@@ -1,13 +1,17 @@
+import random
 from datetime import datetime, timezone
 from unittest.mock import MagicMock
 
 import pytest
+from sqlalchemy import update
 
 from src.core.chatbot.models import ChatHistoryDomain
+from src.core.chatbot.specs import ChatHistoryCursor
 from src.core.common.constants import SecretKey
 from src.pantrypal_api.chatbot.accessors.chatbot_history_accessor import (
     ChatbotHistoryAccessor,
 )
+from src.pantrypal_api.chatbot.models import ChatHistory
 
 
 # Custom mock secret provider that returns a valid integer for CHATBOT_MAX_CHAT_HISTORY
@@ -94,7 +98,210 @@ async def test_retrieve_multiple_messages_sorted_by_timestamp(
     for msg in messages:
         await accessor.save_message(msg)
 
-    # Retrieve and assert the messages are returned in correct order
+    # Retrieve and assert the messages are returned oldest first
     retrieved = await accessor.get_recent_messages(1, session_id=1)
     assert len(retrieved) == 3
-    assert [m.content for m in retrieved] == ["C", "B", "A"]
+    assert [m.content for m in retrieved] == ["A", "B", "C"]
+
+
+async def save_conversation(accessor, lengths, session_id=1):
+    """Save alternating user/assistant messages with the given content lengths."""
+    for i, length in enumerate(lengths):
+        await accessor.save_message(
+            ChatHistoryDomain.create(
+                user_id=1,
+                role="user" if i % 2 == 0 else "assistant",
+                content=(f"m{i} " + "x" * length)[:length],
+                timestamp=datetime(2023, 1, 1, tzinfo=timezone.utc),
+                session_id=session_id,
+            )
+        )
+
+
+# Test the prompt window of a long session is the newest suffix that fits the budget
+@pytest.mark.asyncio
+async def test_get_prompt_window_fits_token_budget_on_long_session(
+    mock_relational_database_provider,
+    mock_logging_provider,
+):
+    secret_provider = MagicMock()
+    secret_provider.get_secret.return_value = "50"
+    accessor = ChatbotHistoryAccessor(
+        db_provider=mock_relational_database_provider,
+        secret_provider=secret_provider,
+        logging_provider=mock_logging_provider,
+    )
+    rng = random.Random(3)
+    lengths = [rng.choice([12, 40, 400, 2400]) for _ in range(120)]
+    await save_conversation(accessor, lengths)
+    await save_conversation(accessor, [4000], session_id=2)
+    tokens = [(length + 3) // 4 for length in lengths]
+
+    for budget in [0, 5, 100, 700, 1500, 5000]:
+        window = await accessor.get_prompt_window(1, session_id=1, token_budget=budget)
+
+        # Brute force: walk back from the newest message until the budget is spent
+        expected, used = [], 0
+        for index in reversed(range(len(lengths))):
+            if len(expected) == 50 or used + tokens[index] > budget:
+                break
+            used += tokens[index]
+            expected.insert(0, index)
+
+        contents = [m["content"].split()[0] for m in window.messages]
+        assert contents == [f"m{i}" for i in expected]
+        assert window.token_count == used
+        assert window.truncated == (len(expected) < len(lengths))
+        assert [m["role"] for m in window.messages] == [
+            "user" if i % 2 == 0 else "assistant" for i in expected
+        ]
+
+
+# Test the window honours the message cap and the [since, before) bounds
+@pytest.mark.asyncio
+async def test_get_prompt_window_applies_cap_and_bounds(
+    mock_relational_database_provider,
+    mock_valid_secret_key_provider,
+    mock_logging_provider,
+):
+    accessor = ChatbotHistoryAccessor(
+        db_provider=mock_relational_database_provider,
+        secret_provider=mock_valid_secret_key_provider,
+        logging_provider=mock_logging_provider,
+    )
+    await save_conversation(accessor, [8] * 8)
+
+    # CHATBOT_MAX_CHAT_HISTORY is 5 in these tests
+    window = await accessor.get_prompt_window(1, session_id=1)
+    contents = [m["content"].split()[0] for m in window.messages]
+    assert contents == ["m3", "m4", "m5", "m6", "m7"]
+    assert window.truncated
+
+    stored = await accessor.get_messages_by_session(1, user_id=1, limit=8)
+    cursors = [ChatHistoryCursor(created_at=m.created_at, id=m.id) for m in stored]
+    bounded = await accessor.get_prompt_window(
+        1, session_id=1, since=cursors[1], before=cursors[5]
+    )
+    contents = [m["content"].split()[0] for m in bounded.messages]
+    assert contents == ["m1", "m2", "m3", "m4"]
+    assert not bounded.truncated
+
+    # Bounds follow (created_at, id) even where ids disagree with created_at,
+    # so the window and what lies before it neither overlap nor leave a gap
+    async with mock_relational_database_provider.get_db() as session:
+        await session.execute(
+            update(ChatHistory).values(created_at=datetime(2026, 1, 1, 12, 0))
+        )
+        await session.execute(
+            update(ChatHistory)
+            .where(ChatHistory.id == stored[0].id)
+            .values(created_at=datetime(2026, 1, 1, 12, 1))
+        )
+        await session.commit()
+    window = await accessor.get_prompt_window(1, session_id=1)
+    contents = [m["content"].split()[0] for m in window.messages]
+    assert contents == ["m4", "m5", "m6", "m7", "m0"]
+    assert window.first.id == stored[4].id
+    older = await accessor.get_prompt_window(1, session_id=1, before=window.first)
+    contents = [m["content"].split()[0] for m in older.messages]
+    assert contents == ["m1", "m2", "m3"]
+    since = await accessor.get_prompt_window(1, session_id=1, since=window.first)
+    assert since.messages == window.messages
+
+
+# Test storing several messages with one multi-row insert
+@pytest.mark.asyncio
+async def test_save_messages_in_one_insert(
+    mock_relational_database_provider,
+    mock_valid_secret_key_provider,
+    mock_logging_provider,
+):
+    accessor = ChatbotHistoryAccessor(
+        db_provider=mock_relational_database_provider,
+        secret_provider=mock_valid_secret_key_provider,
+        logging_provider=mock_logging_provider,
+    )
+
+    await accessor.save_messages(
+        [
+            ChatHistoryDomain.create(
+                user_id=1,
+                role=role,
+                content=content,
+                timestamp=datetime.now(timezone.utc),
+                session_id=9,
+            )
+            for role, content in (("user", "Any ideas?"), ("assistant", "Omelette"))
+        ]
+    )
+    await accessor.save_messages([])
+
+    retrieved = await accessor.get_messages_by_session(9)
+    assert [(m.role.value, m.content) for m in retrieved] == [
+        ("user", "Any ideas?"),
+        ("assistant", "Omelette"),
+    ]
+    assert retrieved[0].user_id == 1
+
+
+# Test reading a session backwards in pages and streaming it
+@pytest.mark.asyncio
+async def test_session_messages_pages_and_stream(
+    mock_relational_database_provider,
+    mock_valid_secret_key_provider,
+    mock_logging_provider,
+):
+    accessor = ChatbotHistoryAccessor(
+        db_provider=mock_relational_database_provider,
+        secret_provider=mock_valid_secret_key_provider,
+        logging_provider=mock_logging_provider,
+    )
+
+    await accessor.save_messages(
+        [
+            ChatHistoryDomain.create(
+                user_id=user_id,
+                role="user",
+                content=f"message {i}",
+                timestamp=datetime.now(timezone.utc),
+                session_id=12,
+            )
+            for i, user_id in enumerate((1, 1, 1, 1, 2))
+        ]
+    )
+
+    newest = await accessor.get_messages_by_session(12, user_id=1, limit=2)
+    assert [m.content for m in newest] == ["message 2", "message 3"]
+    older = await accessor.get_messages_by_session(
+        12,
+        user_id=1,
+        limit=2,
+        before=ChatHistoryCursor(created_at=newest[0].created_at, id=newest[0].id),
+    )
+    assert [m.content for m in older] == ["message 0", "message 1"]
+
+    streamed = [m async for m in accessor.stream_messages_by_session(12, user_id=1)]
+    assert [m.content for m in streamed] == [f"message {i}" for i in range(4)]
+
+    # Pages follow (created_at, id) even where ids disagree with created_at,
+    # and messages stored in the same instant are told apart by id
+    async with mock_relational_database_provider.get_db() as session:
+        await session.execute(
+            update(ChatHistory).values(created_at=datetime(2026, 1, 1, 12, 0))
+        )
+        await session.execute(
+            update(ChatHistory)
+            .where(ChatHistory.content == "message 0")
+            .values(created_at=datetime(2026, 1, 1, 12, 1))
+        )
+        await session.commit()
+    pages, before = [], None
+    while True:
+        page = await accessor.get_messages_by_session(
+            12, user_id=1, limit=1, before=before
+        )
+        if not page:
+            break
+        pages.append(page[0].content)
+        before = ChatHistoryCursor(created_at=page[0].created_at, id=page[0].id)
+    assert pages == [f"message {i}" for i in (0, 3, 2, 1)]
@@ -1,9 +1,20 @@
+from datetime import datetime, timezone
+
 import pytest
 
+from src.core.chatbot.constants import ChatbotMessageRole
 from src.core.chatbot.models import ChatSessionDomain
+from src.core.chatbot.specs import (
+    ChatMessageSpec,
+    ChatSessionListCursor,
+    ListChatSessionsSpec,
+)
 from src.pantrypal_api.chatbot.accessors.chat_session_accessor import (
     ChatSessionAccessor,
 )
+from src.pantrypal_api.chatbot.accessors.chatbot_history_accessor import (
+    ChatbotHistoryAccessor,
+)
 
 
 @pytest.mark.asyncio
@@ -29,7 +40,7 @@ async def test_create_and_list_sessions(
     created = await accessor.create_session(domain)
     assert created.title == "Soup"
 
-    sessions = await accessor.list_sessions(1)
+    sessions = await accessor.list_sessions(1, ListChatSessionsSpec())
     assert any(s.title == "Soup" for s in sessions)
 
 
@@ -62,3 +73,161 @@ async def test_update_session_recipe(
 
     assert updated.title == "Stew"
     assert updated.instructions == ["cook"]
+
+
+@pytest.mark.asyncio
+async def test_ingredients_keep_separators_and_can_be_looked_up(
+    mock_relational_database_provider, mock_logging_provider
+):
+    accessor = ChatSessionAccessor(
+        db_provider=mock_relational_database_provider,
+        logging_provider=mock_logging_provider,
+    )
+
+    curry = await accessor.create_session(
+        ChatSessionDomain.create(
+            user_id=1,
+            title="Curry",
+            instructions=["Mix | stir", "Serve"],
+            ingredients=["500g Chicken thighs", "salt | pepper"],
+        )
+    )
+    soup = await accessor.create_session(
+        ChatSessionDomain.create(
+            user_id=1, title="Soup", ingredients=["2 chicken stock cubes"]
+        )
+    )
+    await accessor.create_session(
+        ChatSessionDomain.create(user_id=2, title="Roast", ingredients=["chicken"])
+    )
+
+    stored = await accessor.get_session(1, curry.id)
+    assert stored.instructions == ["Mix | stir", "Serve"]
+    assert stored.ingredients == ["500g Chicken thighs", "salt | pepper"]
+
+    chicken = await accessor.list_sessions(
+        1, ListChatSessionsSpec(ingredient="Chicken")
+    )
+    assert sorted(s.title for s in chicken) == ["Curry", "Soup"]
+    thighs = await accessor.list_sessions(
+        1, ListChatSessionsSpec(ingredient="chicken thighs")
+    )
+    assert [s.title for s in thighs] == ["Curry"]
+    assert (
+        await accessor.list_sessions(1, ListChatSessionsSpec(ingredient="beef")) == []
+    )
+    assert await accessor.list_sessions(1, ListChatSessionsSpec(ingredient="2 g")) == []
+
+    # Updates replace the indexed terms and deleted sessions are not found
+    await accessor.update_session_recipe(
+        soup.id, soup.model_copy(update={"ingredients": ["beef stock"]})
+    )
+    await accessor.soft_delete_session(curry.id)
+    assert (
+        await accessor.list_sessions(1, ListChatSessionsSpec(ingredient="chicken"))
+        == []
+    )
+    [beef] = await accessor.list_sessions(1, ListChatSessionsSpec(ingredient="beef"))
+    assert beef.id == soup.id
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_pages_by_update_time(
+    mock_relational_database_provider, mock_logging_provider
+):
+    accessor = ChatSessionAccessor(
+        db_provider=mock_relational_database_provider,
+        logging_provider=mock_logging_provider,
+    )
+
+    created = [
+        await accessor.create_session(
+            ChatSessionDomain.create(user_id=1, title=title, ingredients=["rice"])
+        )
+        for title in ("Congee", "Pilaf", "Risotto")
+    ]
+    await accessor.create_session(ChatSessionDomain.create(user_id=2, title="Paella"))
+    # Updating a session moves it to the front of the list
+    await accessor.update_session_recipe(created[0].id, created[0])
+
+    first = await accessor.list_sessions(1, ListChatSessionsSpec(limit=2))
+    assert [s.title for s in first] == ["Congee", "Risotto"]
+    after = ChatSessionListCursor(updated_at=first[-1].updated_at, id=first[-1].id)
+    rest = await accessor.list_sessions(1, ListChatSessionsSpec(limit=2, after=after))
+    assert [s.title for s in rest] == ["Pilaf"]
+
+    # The recipe is only returned to its owner, and not once deleted
+    assert (await accessor.get_session(1, created[1].id)).ingredients == ["rice"]
+    assert await accessor.get_session(2, created[1].id) is None
+    await accessor.soft_delete_session(created[1].id)
+    assert await accessor.get_session(1, created[1].id) is None
+
+
+@pytest.mark.asyncio
+async def test_save_turn_stores_session_and_messages_together(
+    mock_relational_database_provider, mock_secret_key_provider, mock_logging_provider
+):
+    accessor = ChatSessionAccessor(
+        db_provider=mock_relational_database_provider,
+        logging_provider=mock_logging_provider,
+    )
+    history = ChatbotHistoryAccessor(
+        db_provider=mock_relational_database_provider,
+        secret_provider=mock_secret_key_provider,
+        logging_provider=mock_logging_provider,
+    )
+
+    def turn(content, reply):
+        now = datetime.now(timezone.utc)
+        return [
+            ChatMessageSpec(
+                user_id=1, role=ChatbotMessageRole.USER, content=content, timestamp=now
+            ),
+            ChatMessageSpec(
+                user_id=1,
+                role=ChatbotMessageRole.ASSISTANT,
+                content=reply,
+                timestamp=now,
+            ),
+        ]
+
+    # A recipe without a session id creates the session the messages go in
+    session_id = await accessor.save_turn(
+        None,
+        ChatSessionDomain.create(user_id=1, title="Soup", ingredients=["leek"]),
+        turn("Any soup?", "Leek soup"),
+    )
+    assert session_id is not None
+    [summary] = await accessor.list_sessions(1, ListChatSessionsSpec(ingredient="leek"))
+    assert summary.id == session_id
+
+    # A recipe with a session id updates it; without one it is left as is
+    await accessor.save_turn(
+        session_id,
+        ChatSessionDomain.create(user_id=1, title="Stew", ingredients=["beef"]),
+        turn("Heartier?", "Beef stew"),
+    )
+    assert await accessor.save_turn(session_id, None, turn("Thanks", "Enjoy")) == (
+        session_id
+    )
+    assert (await accessor.get_session(1, session_id)).title == "Stew"
+    messages = await history.get_messages_by_session(session_id)
+    assert [m.content for m in messages] == [
+        "Any soup?",
+        "Leek soup",
+        "Heartier?",
+        "Beef stew",
+        "Thanks",
+        "Enjoy",
+    ]
+
+    # Nothing is stored when the session cannot be updated
+    await accessor.soft_delete_session(session_id)
+    with pytest.raises(ValueError):
+        await accessor.save_turn(
+            session_id,
+            ChatSessionDomain.create(user_id=1, title="Salad"),
+            turn("Lighter?", "Salad"),
+        )
+    messages = await history.get_messages_by_session(session_id)
+    assert "Lighter?" not in [m.content for m in messages]
@@ -1,4 +1,6 @@
+import asyncio
 from datetime import datetime, timezone
+from types import SimpleNamespace
 
 import pytest
 
@@ -6,23 +8,64 @@ from src.core.chatbot.specs import ChatMessageSpec
 from src.pantrypal_api.chatbot.adapters.chatbot_provider import GroqChatbotProvider
 
 
+# Fake AsyncGroq client recording calls and tracking concurrent completions
+class FakeAsyncGroq:
+    def __init__(self, reply: str, delay: float = 0.0):
+        self.reply = reply
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        message = SimpleNamespace(content=self.reply)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def close(self):
+        self.closed = True
+
+
+def make_secret_provider(mock_secret_key_provider, **overrides):
+    values = {
+        "CHATBOT_MODEL": "test-model",
+        "CHATBOT_MAX_TOKENS": "128",
+        "GROQ_API_KEY": "dummy",
+        "GROQ_BASE_URL": None,
+        "CHATBOT_MAX_CONNECTIONS": "10",
+        "CHATBOT_MAX_CONCURRENT_REQUESTS": "10",
+        "CHATBOT_REQUEST_TIMEOUT_SECONDS": "5",
+    }
+    values.update(overrides)
+    mock_secret_key_provider.get_secret.side_effect = lambda key, default=None: (
+        values.get(key.value, default)
+    )
+    return mock_secret_key_provider
+
+
 # Real GroqChatbotProvider with mocked dependencies for unit testing adapter logic
 @pytest.fixture
 def groq_chatbot_provider(mock_secret_key_provider, mock_logging_provider):
     return GroqChatbotProvider(
-        secret_provider=mock_secret_key_provider,
+        secret_provider=make_secret_provider(mock_secret_key_provider),
         logging_provider=mock_logging_provider,
     )
 
 
+def use_fake_client(provider: GroqChatbotProvider, client: FakeAsyncGroq):
+    provider._GroqChatbotProvider__client = client
+
+
 @pytest.mark.asyncio
-async def test_handle_single_turn_calls_sync(monkeypatch, groq_chatbot_provider):
-    mock_response = "Mocked reply"
-    monkeypatch.setattr(
-        groq_chatbot_provider,
-        "_GroqChatbotProvider__sync_call_groq",
-        lambda formatted_messages: mock_response,
-    )
+async def test_handle_single_turn_uses_shared_client(groq_chatbot_provider):
+    client = FakeAsyncGroq("Mocked reply")
+    use_fake_client(groq_chatbot_provider, client)
 
     message = ChatMessageSpec(
         user_id=1,
@@ -32,27 +75,81 @@ async def test_handle_single_turn_calls_sync(monkeypatch, groq_chatbot_provider)
     )
 
     result = await groq_chatbot_provider.handle_single_turn(message)
-    assert result == mock_response
+    assert result == "Mocked reply"
+    assert client.calls[0]["messages"] == [
+        {"role": "user", "content": "What can I cook?"}
+    ]
+    assert client.calls[0]["model"] == "test-model"
 
 
 @pytest.mark.asyncio
-async def test_handle_multi_turn_calls_sync(monkeypatch, groq_chatbot_provider):
-    mock_response = "Mocked context reply"
-    monkeypatch.setattr(
-        groq_chatbot_provider,
-        "_GroqChatbotProvider__sync_call_groq",
-        lambda formatted_messages: mock_response,
-    )
+async def test_handle_multi_turn_uses_shared_client(groq_chatbot_provider):
+    client = FakeAsyncGroq("Mocked context reply")
+    use_fake_client(groq_chatbot_provider, client)
 
-    now = datetime.now(timezone.utc)
     messages = [
-        ChatMessageSpec(
-            user_id=1, role="user", content="What's in the fridge?", timestamp=now
-        ),
-        ChatMessageSpec(
-            user_id=1, role="assistant", content="Eggs and rice", timestamp=now
-        ),
+        {"role": "user", "content": "What's in the fridge?"},
+        {"role": "assistant", "content": "Eggs and rice"},
     ]
 
     result = await groq_chatbot_provider.handle_multi_turn(messages)
-    assert result == mock_response
+    assert result == "Mocked context reply"
+    assert client.calls[0]["messages"] == messages
+
+
+@pytest.mark.asyncio
+async def test_client_is_created_once_and_closed(groq_chatbot_provider):
+    first = groq_chatbot_provider._GroqChatbotProvider__get_client()
+    second = groq_chatbot_provider._GroqChatbotProvider__get_client()
+    assert first is second
+
+    await groq_chatbot_provider.close()
+    assert first.is_closed()
+    assert groq_chatbot_provider._GroqChatbotProvider__client is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_capped(
+    mock_secret_key_provider, mock_logging_provider
+):
+    provider = GroqChatbotProvider(
+        secret_provider=make_secret_provider(
+            mock_secret_key_provider, CHATBOT_MAX_CONCURRENT_REQUESTS="3"
+        ),
+        logging_provider=mock_logging_provider,
+    )
+    client = FakeAsyncGroq("ok", delay=0.01)
+    use_fake_client(provider, client)
+
+    message = ChatMessageSpec(
+        user_id=1, role="user", content="hi", timestamp=datetime.now(timezone.utc)
+    )
+    results = await asyncio.gather(
+        *(provider.handle_single_turn(message) for _ in range(12))
+    )
+
+    assert results == ["ok"] * 12
+    assert client.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_multi_turn_yields_tokens(groq_chatbot_provider):
+    class FakeStreamingGroq(FakeAsyncGroq):
+        async def create(self, **kwargs):
+            self.calls.append(kwargs)
+
+            async def chunks():
+                for content in ["Egg", " fried", None, " rice"]:
+                    delta = SimpleNamespace(content=content)
+                    yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+            return chunks()
+
+    client = FakeStreamingGroq("")
+    use_fake_client(groq_chatbot_provider, client)
+
+    message = {"role": "user", "content": "Rice?"}
+    tokens = [t async for t in groq_chatbot_provider.stream_multi_turn([message])]
+
+    assert tokens == ["Egg", " fried", " rice"]
+    assert client.calls[0]["stream"] is True
@@ -1,3 +1,4 @@
+import json
 from unittest.mock import MagicMock
 
 import pytest
@@ -47,6 +48,109 @@ class TestChatSessionEndpoints:
         assert response.status_code == 200
         assert isinstance(response.json(), list)
 
+    async def test_list_sessions_by_ingredient(
+        self,
+        async_client: AsyncClient,
+        mock_relational_database_provider,
+        mock_logging_provider,
+    ):
+        await async_client.post(
+            "/account/register",
+            json={
+                "username": "cook",
+                "email": "cook@example.com",
+                "password": "pass123",
+            },
+        )
+        login_resp = await async_client.post(
+            "/account/login",
+            json={"email": "cook@example.com", "password": "pass123"},
+        )
+        token = login_resp.json()["token"]
+        user_id = login_resp.json()["user_id"]
+
+        session_accessor = ChatSessionAccessor(
+            db_provider=mock_relational_database_provider,
+            logging_provider=mock_logging_provider,
+        )
+        for title, ingredients in (("Curry", ["chicken"]), ("Chili", ["beef"])):
+            await session_accessor.create_session(
+                ChatSessionDomain.create(
+                    user_id=user_id, title=title, ingredients=ingredients
+                )
+            )
+
+        response = await async_client.get(
+            "/chatbot/sessions",
+            params={"ingredient": "Chicken"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        [summary] = response.json()
+        assert summary["title"] == "Curry"
+        assert set(summary) == {"id", "title", "updated_at"}
+
+        recipe = await async_client.get(
+            f"/chatbot/sessions/{summary['id']}/recipe",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert recipe.status_code == 200
+        assert recipe.json()["ingredients"] == ["chicken"]
+
+    async def test_list_sessions_pages_and_recipe_ownership(
+        self,
+        async_client: AsyncClient,
+        mock_relational_database_provider,
+        mock_logging_provider,
+    ):
+        await async_client.post(
+            "/account/register",
+            json={
+                "username": "pager",
+                "email": "pager@example.com",
+                "password": "pass123",
+            },
+        )
+        login_resp = await async_client.post(
+            "/account/login",
+            json={"email": "pager@example.com", "password": "pass123"},
+        )
+        token = login_resp.json()["token"]
+        user_id = login_resp.json()["user_id"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        session_accessor = ChatSessionAccessor(
+            db_provider=mock_relational_database_provider,
+            logging_provider=mock_logging_provider,
+        )
+        for title in ("Soup", "Stew", "Salad"):
+            await session_accessor.create_session(
+                ChatSessionDomain.create(user_id=user_id, title=title)
+            )
+        other = await session_accessor.create_session(
+            ChatSessionDomain.create(user_id=user_id + 1, title="Not mine")
+        )
+
+        first = await async_client.get(
+            "/chatbot/sessions", params={"limit": 2}, headers=headers
+        )
+        assert [s["title"] for s in first.json()] == ["Salad", "Stew"]
+        cursor = first.headers["X-Next-Cursor"]
+        last = await async_client.get(
+            "/chatbot/sessions", params={"limit": 2, "cursor": cursor}, headers=headers
+        )
+        assert [s["title"] for s in last.json()] == ["Soup"]
+        assert "X-Next-Cursor" not in last.headers
+
+        bad_cursor = await async_client.get(
+            "/chatbot/sessions", params={"cursor": "nope"}, headers=headers
+        )
+        assert bad_cursor.status_code == 400
+        not_mine = await async_client.get(
+            f"/chatbot/sessions/{other.id}/recipe", headers=headers
+        )
+        assert not_mine.status_code == 404
+
     async def test_get_session_history(self, async_client: AsyncClient):
         await async_client.post(
             "/account/register",
@@ -69,6 +173,96 @@ class TestChatSessionEndpoints:
         assert response.status_code == 200
         assert isinstance(response.json(), list)
 
+    async def test_session_history_pages_backwards_and_streams(
+        self,
+        async_client: AsyncClient,
+        mock_relational_database_provider,
+        mock_valid_secret_key_provider,
+        mock_logging_provider,
+    ):
+        await async_client.post(
+            "/account/register",
+            json={
+                "username": "reader",
+                "email": "reader@example.com",
+                "password": "pass123",
+            },
+        )
+        login_resp = await async_client.post(
+            "/account/login",
+            json={"email": "reader@example.com", "password": "pass123"},
+        )
+        token = login_resp.json()["token"]
+        user_id = login_resp.json()["user_id"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        history_accessor = ChatbotHistoryAccessor(
+            db_provider=mock_relational_database_provider,
+            secret_provider=mock_valid_secret_key_provider,
+            logging_provider=mock_logging_provider,
+        )
+        await history_accessor.save_messages(
+            [
+                ChatHistoryDomain.create(
+                    user_id=user_id,
+                    role="user",
+                    content=f"message {i}",
+                    timestamp=DateTimeUtils.get_utc_now(),
+                    session_id=77,
+                )
+                for i in range(5)
+            ]
+        )
+
+        first = await async_client.get(
+            "/chatbot/sessions/77", params={"limit": 2}, headers=headers
+        )
+        assert [m["content"] for m in first.json()] == ["message 3", "message 4"]
+        cursor = first.headers["X-Next-Cursor"]
+        second = await async_client.get(
+            "/chatbot/sessions/77",
+            params={"limit": 3, "cursor": cursor},
+            headers=headers,
+        )
+        assert [m["content"] for m in second.json()] == [
+            "message 0",
+            "message 1",
+            "message 2",
+        ]
+        assert "X-Next-Cursor" not in second.headers
+
+        bad_cursor = await async_client.get(
+            "/chatbot/sessions/77",
+            params={"limit": 2, "cursor": "12"},
+            headers=headers,
+        )
+        assert bad_cursor.status_code == 400
+
+        streamed = await async_client.get(
+            "/chatbot/sessions/77/stream", headers=headers
+        )
+        assert streamed.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in streamed.text.splitlines()]
+        assert [m["content"] for m in lines] == [f"message {i}" for i in range(5)]
+
+        await async_client.post(
+            "/account/register",
+            json={
+                "username": "nosy",
+                "email": "nosy@example.com",
+                "password": "pass123",
+            },
+        )
+        login_resp = await async_client.post(
+            "/account/login", json={"email": "nosy@example.com", "password": "pass123"}
+        )
+        nosy = {"Authorization": f"Bearer {login_resp.json()['token']}"}
+        assert (
+            await async_client.get("/chatbot/sessions/77", headers=nosy)
+        ).json() == []
+        streamed = await async_client.get("/chatbot/sessions/77/stream", headers=nosy)
+        assert streamed.text == ""
+
     async def test_delete_session(
         self,
         async_client: AsyncClient,
@@ -1,3 +1,4 @@
+import json
 from unittest.mock import AsyncMock
 
 import pytest
@@ -114,3 +115,91 @@ class TestChatbotEndpoints:
         data = response.json()
         assert isinstance(data.get("suggestions"), list)
         assert len(data["suggestions"]) == 4
+
+    async def test_recommend_stream_endpoint(
+        self, async_client: AsyncClient, monkeypatch
+    ):
+        async def fake_stream(self, messages):
+            for token in [
+                '{"title": "Salmon Bowl", ',
+                '"ingredients": [], ',
+                '"instructions": []}',
+            ]:
+                yield token
+
+        monkeypatch.setattr(
+            "src.pantrypal_api.chatbot.adapters.chatbot_provider.GroqChatbotProvider.stream_multi_turn",
+            fake_stream,
+        )
+        await async_client.post(
+            "/account/register",
+            json={
+                "username": "stream",
+                "email": "stream@example.com",
+                "password": "pass123",
+            },
+        )
+        login_resp = await async_client.post(
+            "/account/login",
+            json={"email": "stream@example.com", "password": "pass123"},
+        )
+        token = login_resp.json()["token"]
+
+        response = await async_client.post(
+            "/chatbot/recommend/stream",
+            json={"role": "user", "content": "I have salmon and broccoli"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        frames = [f for f in response.text.split("\n\n") if f]
+        tokens = [json.loads(f[len("data: ") :])["token"] for f in frames[:-1]]
+        assert "".join(tokens) == (
+            '{"title": "Salmon Bowl", "ingredients": [], "instructions": []}'
+        )
+        event_line, data_line = frames[-1].split("\n")
+        assert event_line == "event: done"
+        done = json.loads(data_line[len("data: ") :])
+        assert done["reply"] == "".join(tokens)
+
+        history = await async_client.get(
+            f"/chatbot/sessions/{done['session_id']}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert [m["role"] for m in history.json()] == ["user", "assistant"]
+
+    async def test_chat_stream_endpoint_reports_errors(
+        self, async_client: AsyncClient, monkeypatch
+    ):
+        async def failing_stream(self, messages):
+            yield "Partial "
+            raise RuntimeError("Groq API call failed")
+
+        monkeypatch.setattr(
+            "src.pantrypal_api.chatbot.adapters.chatbot_provider.GroqChatbotProvider.stream_multi_turn",
+            failing_stream,
+        )
+        await async_client.post(
+            "/account/register",
+            json={
+                "username": "streamerr",
+                "email": "streamerr@example.com",
+                "password": "pass123",
+            },
+        )
+        login_resp = await async_client.post(
+            "/account/login",
+            json={"email": "streamerr@example.com", "password": "pass123"},
+        )
+        token = login_resp.json()["token"]
+
+        response = await async_client.post(
+            "/chatbot/chat/stream",
+            json={"role": "user", "content": "What can I cook today?"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        frames = [f for f in response.text.split("\n\n") if f]
+        assert frames[0] == 'data: {"token":"Partial "}'
+        assert frames[-1].startswith("event: error")
@@ -0,0 +1,173 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.chatbot.models import ChatPromptWindowDomain
+from src.core.chatbot.services.chat_context_service import ChatContextService
+from src.core.chatbot.specs import ChatMessageSpec
+from src.core.common.constants import SecretKey
+from src.pantrypal_api.chatbot.accessors.chatbot_history_accessor import (
+    ChatbotHistoryAccessor,
+)
+
+
+def make_secret_provider(**values):
+    provider = MagicMock()
+    provider.get_secret.side_effect = lambda key, default=None: values.get(
+        key.value, default
+    )
+    return provider
+
+
+def make_message(content, session_id=1):
+    return ChatMessageSpec(
+        user_id=1,
+        role="user",
+        content=content,
+        timestamp=datetime.now(timezone.utc),
+        session_id=session_id,
+    )
+
+
+async def save_turns(accessor, count, start=0):
+    """Save user/assistant messages of 400 characters (100 estimated tokens)."""
+    for i in range(start, start + count):
+        await accessor.save_message(
+            make_message(f"turn {i:03d} ".ljust(400, "x")).model_copy(
+                update={"role": "user" if i % 2 == 0 else "assistant"}
+            )
+        )
+
+
+@pytest.fixture
+def history_accessor(mock_relational_database_provider, mock_logging_provider):
+    return ChatbotHistoryAccessor(
+        db_provider=mock_relational_database_provider,
+        secret_provider=make_secret_provider(CHATBOT_MAX_CHAT_HISTORY="20"),
+        logging_provider=mock_logging_provider,
+    )
+
+
+@pytest.mark.asyncio
+async def test_build_messages_reserves_budget_for_new_message(
+    mock_chatbot_history_accessor,
+    mock_chatbot_provider,
+    fake_cache_provider,
+    mock_logging_provider,
+):
+    mock_chatbot_history_accessor.get_prompt_window.return_value = (
+        ChatPromptWindowDomain(messages=[{"role": "user", "content": "I have eggs"}])
+    )
+    service = ChatContextService(
+        mock_chatbot_history_accessor,
+        mock_chatbot_provider,
+        fake_cache_provider,
+        make_secret_provider(CHATBOT_HISTORY_TOKEN_BUDGET="100"),
+        mock_logging_provider,
+    )
+
+    messages = await service.build_messages(make_message("x" * 40))
+
+    mock_chatbot_history_accessor.get_prompt_window.assert_awaited_once_with(
+        1, session_id=1, token_budget=90
+    )
+    assert messages == [
+        {"role": "user", "content": "I have eggs"},
+        {"role": "user", "content": "x" * 40},
+    ]
+    mock_chatbot_provider.handle_multi_turn.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_rolling_summary_on_long_session(
+    history_accessor, mock_chatbot_provider, fake_cache_provider, mock_logging_provider
+):
+    mock_chatbot_provider.handle_multi_turn.return_value = "They cooked omelettes."
+    service = ChatContextService(
+        history_accessor,
+        mock_chatbot_provider,
+        fake_cache_provider,
+        make_secret_provider(
+            CHATBOT_HISTORY_TOKEN_BUDGET="1000", CHATBOT_HISTORY_SUMMARY_TOKENS="100"
+        ),
+        mock_logging_provider,
+    )
+    await save_turns(history_accessor, 40)
+
+    messages = await service.build_messages(make_message("next"))
+
+    # 1000 - 1 (new message) - 100 (summary) leaves 899; rolling keeps half of that
+    assert messages[0] == {
+        "role": "system",
+        "content": "Summary of the earlier conversation: They cooked omelettes.",
+    }
+    assert [m["content"][:8] for m in messages[1:-1]] == [
+        f"turn {i:03d}" for i in range(36, 40)
+    ]
+    assert messages[-1] == {"role": "user", "content": "next"}
+    assert mock_chatbot_provider.handle_multi_turn.await_count == 1
+    summary_prompt = mock_chatbot_provider.handle_multi_turn.await_args.args[0]
+    # The folded turns precede the window and fit the full history budget
+    transcript = summary_prompt[1]["content"]
+    assert transcript.count("turn ") == 10
+    assert transcript.startswith("user: turn 026") and "turn 035" in transcript
+
+    # The next turns reuse the cached summary until the window overflows again
+    for turn in range(40, 44):
+        await save_turns(history_accessor, 1, start=turn)
+        messages = await service.build_messages(make_message("next"))
+        assert messages[1]["content"].startswith("turn 036")
+    assert mock_chatbot_provider.handle_multi_turn.await_count == 1
+
+    await save_turns(history_accessor, 1, start=44)
+    messages = await service.build_messages(make_message("next"))
+    assert mock_chatbot_provider.handle_multi_turn.await_count == 2
+    assert "Earlier summary: They cooked omelettes." in (
+        mock_chatbot_provider.handle_multi_turn.await_args.args[0][1]["content"]
+    )
+    assert [m["content"][:8] for m in messages[1:-1]] == [
+        f"turn {i:03d}" for i in range(41, 45)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_summary_failure_falls_back_to_plain_window(
+    history_accessor, mock_chatbot_provider, fake_cache_provider, mock_logging_provider
+):
+    mock_chatbot_provider.handle_multi_turn = AsyncMock(
+        side_effect=RuntimeError("LLM down")
+    )
+    service = ChatContextService(
+        history_accessor,
+        mock_chatbot_provider,
+        fake_cache_provider,
+        make_secret_provider(
+            CHATBOT_HISTORY_TOKEN_BUDGET="1000", CHATBOT_HISTORY_SUMMARY_TOKENS="100"
+        ),
+        mock_logging_provider,
+    )
+    await save_turns(history_accessor, 20)
+
+    messages = await service.build_messages(make_message("next"))
+
+    assert [m["content"][:8] for m in messages[:-1]] == [
+        f"turn {i:03d}" for i in range(12, 20)
+    ]
+    mock_logging_provider.warning.assert_called_once()
+
+
+def test_invalid_token_budget_raises(
+    mock_chatbot_history_accessor,
+    mock_chatbot_provider,
+    fake_cache_provider,
+    mock_logging_provider,
+):
+    with pytest.raises(ValueError, match=SecretKey.CHATBOT_HISTORY_TOKEN_BUDGET.value):
+        ChatContextService(
+            mock_chatbot_history_accessor,
+            mock_chatbot_provider,
+            fake_cache_provider,
+            make_secret_provider(CHATBOT_HISTORY_TOKEN_BUDGET="lots"),
+            mock_logging_provider,
+        )
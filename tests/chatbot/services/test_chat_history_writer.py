@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.chatbot.constants import ChatbotMessageRole
+from src.core.chatbot.services.chat_history_writer import ChatHistoryWriter
+from src.core.chatbot.specs import ChatMessageSpec
+from src.core.common.constants import SecretKey
+
+
+def make_writer(history_accessor, logging_provider, flush_ms="5", max_rows="500"):
+    secret_provider = MagicMock()
+    secret_provider.get_secret.side_effect = lambda key, default=None: {
+        SecretKey.CHATBOT_HISTORY_FLUSH_MS: flush_ms,
+        SecretKey.CHATBOT_HISTORY_FLUSH_MAX_ROWS: max_rows,
+    }.get(key, default)
+    return ChatHistoryWriter(history_accessor, secret_provider, logging_provider)
+
+
+def turn(user_id):
+    now = datetime.now(timezone.utc)
+    return [
+        ChatMessageSpec(
+            user_id=user_id, role=ChatbotMessageRole.USER, content="Hi", timestamp=now
+        ),
+        ChatMessageSpec(
+            user_id=user_id,
+            role=ChatbotMessageRole.ASSISTANT,
+            content="Hello",
+            timestamp=now,
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_turns_share_one_insert(mock_logging_provider):
+    history_accessor = MagicMock()
+    history_accessor.save_messages = AsyncMock()
+    writer = make_writer(history_accessor, mock_logging_provider)
+    writer.start()
+
+    await asyncio.gather(*(writer.write(turn(user_id)) for user_id in range(10)))
+
+    history_accessor.save_messages.assert_awaited_once()
+    [messages] = history_accessor.save_messages.await_args.args
+    assert len(messages) == 20
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_flushes_are_capped_and_stop_writes_the_rest(mock_logging_provider):
+    history_accessor = MagicMock()
+    history_accessor.save_messages = AsyncMock()
+    writer = make_writer(
+        history_accessor, mock_logging_provider, flush_ms="60000", max_rows="4"
+    )
+    writer.start()
+
+    writes = asyncio.gather(*(writer.write(turn(user_id)) for user_id in range(5)))
+    await asyncio.sleep(0)
+    history_accessor.save_messages.assert_not_awaited()
+
+    # Stopping flushes what is queued, at most max_rows messages per insert
+    await writer.stop()
+    await writes
+    sizes = [len(c.args[0]) for c in history_accessor.save_messages.await_args_list]
+    assert sizes == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_disabled_writer_writes_through(mock_logging_provider):
+    history_accessor = MagicMock()
+    history_accessor.save_messages = AsyncMock()
+    writer = make_writer(history_accessor, mock_logging_provider, flush_ms="0")
+    writer.start()
+
+    assert not writer.enabled
+    await writer.write(turn(1))
+    history_accessor.save_messages.assert_awaited_once()
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_raised_to_every_writer(mock_logging_provider):
+    history_accessor = MagicMock()
+    history_accessor.save_messages = AsyncMock(side_effect=RuntimeError("db down"))
+    writer = make_writer(history_accessor, mock_logging_provider)
+    writer.start()
+
+    results = await asyncio.gather(
+        writer.write(turn(1)), writer.write(turn(2)), return_exceptions=True
+    )
+
+    assert [str(r) for r in results] == ["db down", "db down"]
+    await writer.stop()
+
+
+def test_rejects_invalid_flush_interval(mock_logging_provider):
+    with pytest.raises(ValueError, match="CHATBOT_HISTORY_FLUSH_MS"):
+        make_writer(MagicMock(), mock_logging_provider, flush_ms="-1")
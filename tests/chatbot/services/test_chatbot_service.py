@@ -2,17 +2,19 @@ from datetime import datetime, timezone
 
 import pytest
 
-from src.core.chatbot.models import ChatHistoryDomain, ChatSessionDomain
-from src.core.chatbot.services.chatbot_service import ChatbotService
+from src.core.chatbot.services.chatbot_service import (
+    RECIPE_FORMAT_MESSAGE,
+    ChatbotService,
+)
 from src.core.chatbot.specs import ChatMessageSpec
 
 
 @pytest.mark.asyncio
 async def test_get_first_recommendation(
     mock_chatbot_provider,
-    mock_chatbot_history_accessor,
-    mock_pantry_service,
+    mock_pantry_context_service,
     mock_chat_session_service,
+    mock_chat_context_service,
     mock_logging_provider,
 ):
     mock_chatbot_provider.handle_multi_turn.return_value = (
@@ -21,15 +23,13 @@ async def test_get_first_recommendation(
 
     service = ChatbotService(
         chatbot_provider=mock_chatbot_provider,
-        chatbot_history_accessor=mock_chatbot_history_accessor,
-        pantry_service=mock_pantry_service,
+        pantry_context_service=mock_pantry_context_service,
         chat_session_service=mock_chat_session_service,
+        chat_context_service=mock_chat_context_service,
         logging_provider=mock_logging_provider,
     )
 
-    created_session = ChatSessionDomain.create(user_id=1, title="Soup")
-    created_session.id = 1
-    mock_chat_session_service.create_session.return_value = created_session
+    mock_chat_session_service.save_turn.return_value = 1
 
     msg = ChatMessageSpec(
         id=1,
@@ -43,15 +43,15 @@ async def test_get_first_recommendation(
 
     assert reply == '{"title": "Soup", "ingredients": [], "instructions": []}'
     assert session_id == 1
-    assert mock_chatbot_history_accessor.save_message.await_count == 2
+    mock_chat_session_service.save_turn.assert_awaited_once()
 
 
 @pytest.mark.asyncio
 async def test_get_first_recommendation_creates_session(
     mock_chatbot_provider,
-    mock_chatbot_history_accessor,
-    mock_pantry_service,
+    mock_pantry_context_service,
     mock_chat_session_service,
+    mock_chat_context_service,
     mock_logging_provider,
 ):
     mock_chatbot_provider.handle_multi_turn.return_value = (
@@ -60,9 +60,9 @@ async def test_get_first_recommendation_creates_session(
 
     service = ChatbotService(
         chatbot_provider=mock_chatbot_provider,
-        chatbot_history_accessor=mock_chatbot_history_accessor,
-        pantry_service=mock_pantry_service,
+        pantry_context_service=mock_pantry_context_service,
         chat_session_service=mock_chat_session_service,
+        chat_context_service=mock_chat_context_service,
         logging_provider=mock_logging_provider,
     )
 
@@ -75,31 +75,70 @@ async def test_get_first_recommendation_creates_session(
     )
     reply, session_id = await service.get_first_recommendation(msg)
 
-    mock_chat_session_service.create_session.assert_awaited()
+    new_session_id, recipe, _ = mock_chat_session_service.save_turn.await_args.args
+    assert new_session_id is None
+    assert recipe.title == "Soup"
     assert reply == '{"title": "Soup", "ingredients": [], "instructions": []}'
-    assert session_id == mock_chat_session_service.create_session.return_value.id
+    assert session_id == mock_chat_session_service.save_turn.return_value
+
+
+@pytest.mark.asyncio
+async def test_first_recommendation_prompt_uses_cached_pantry_context(
+    mock_chatbot_provider,
+    mock_pantry_context_service,
+    mock_chat_session_service,
+    mock_chat_context_service,
+    mock_logging_provider,
+):
+    mock_pantry_context_service.get_ingredient_block.return_value = (
+        "Prioritize ingredients nearing expiry: Milk 1 l exp 2025-06-02. "
+    )
+    mock_chatbot_provider.handle_multi_turn.return_value = "Plain reply"
+
+    service = ChatbotService(
+        chatbot_provider=mock_chatbot_provider,
+        pantry_context_service=mock_pantry_context_service,
+        chat_session_service=mock_chat_session_service,
+        chat_context_service=mock_chat_context_service,
+        logging_provider=mock_logging_provider,
+    )
+
+    msg = ChatMessageSpec(
+        role="user",
+        content="Something quick",
+        user_id=1,
+        timestamp=datetime.now(timezone.utc),
+    )
+    await service.get_first_recommendation(msg)
+
+    mock_pantry_context_service.get_ingredient_block.assert_awaited_once_with(1)
+    messages = mock_chatbot_provider.handle_multi_turn.await_args.args[0]
+    assert messages[0] is RECIPE_FORMAT_MESSAGE
+    assert messages[1] == {
+        "role": "user",
+        "content": "Prioritize ingredients nearing expiry: Milk 1 l exp 2025-06-02. "
+        "Something quick",
+    }
 
 
 @pytest.mark.asyncio
 async def test_first_recommendation_saves_user_message_with_session(
     mock_chatbot_provider,
-    mock_chatbot_history_accessor,
-    mock_pantry_service,
+    mock_pantry_context_service,
     mock_chat_session_service,
+    mock_chat_context_service,
     mock_logging_provider,
 ):
     mock_chatbot_provider.handle_multi_turn.return_value = (
         '{"title": "Soup", "ingredients": [], "instructions": []}'
     )
-    created_session = ChatSessionDomain.create(user_id=1, title="Soup")
-    created_session.id = 123
-    mock_chat_session_service.create_session.return_value = created_session
+    mock_chat_session_service.save_turn.return_value = 123
 
     service = ChatbotService(
         chatbot_provider=mock_chatbot_provider,
-        chatbot_history_accessor=mock_chatbot_history_accessor,
-        pantry_service=mock_pantry_service,
+        pantry_context_service=mock_pantry_context_service,
         chat_session_service=mock_chat_session_service,
+        chat_context_service=mock_chat_context_service,
         logging_provider=mock_logging_provider,
     )
 
@@ -111,36 +150,28 @@ async def test_first_recommendation_saves_user_message_with_session(
     )
     reply, session_id = await service.get_first_recommendation(msg)
 
-    saved_user_message = mock_chatbot_history_accessor.save_message.await_args_list[
-        0
-    ].args[0]
-    assert saved_user_message.session_id == 123
+    # The session and both messages are handed over as one turn
+    _, recipe, messages = mock_chat_session_service.save_turn.await_args.args
+    assert recipe.title == "Soup"
+    assert [(m.role.value, m.content) for m in messages] == [
+        ("user", "I have tomatoes and pasta"),
+        ("assistant", '{"title": "Soup", "ingredients": [], "instructions": []}'),
+    ]
     assert session_id == 123
 
 
 @pytest.mark.asyncio
 async def test_chat_with_context(
     mock_chatbot_provider,
-    mock_chatbot_history_accessor,
-    mock_pantry_service,
+    mock_pantry_context_service,
     mock_chat_session_service,
+    mock_chat_context_service,
     mock_logging_provider,
 ):
-    mock_chatbot_history_accessor.get_recent_messages.return_value = [
-        ChatHistoryDomain.create(
-            user_id=1,
-            role="user",
-            content="I have eggs",
-            timestamp=datetime.now(timezone.utc),
-            session_id=1,
-        ),
-        ChatHistoryDomain.create(
-            user_id=1,
-            role="assistant",
-            content="Make an omelette",
-            timestamp=datetime.now(timezone.utc),
-            session_id=1,
-        ),
+    mock_chat_context_service.build_messages.return_value = [
+        {"role": "user", "content": "I have eggs"},
+        {"role": "assistant", "content": "Make an omelette"},
+        {"role": "user", "content": "Now I have rice"},
     ]
 
     mock_chatbot_provider.handle_multi_turn.return_value = (
@@ -149,9 +180,9 @@ async def test_chat_with_context(
 
     service = ChatbotService(
         chatbot_provider=mock_chatbot_provider,
-        chatbot_history_accessor=mock_chatbot_history_accessor,
-        pantry_service=mock_pantry_service,
+        pantry_context_service=mock_pantry_context_service,
         chat_session_service=mock_chat_session_service,
+        chat_context_service=mock_chat_context_service,
         logging_provider=mock_logging_provider,
     )
 
@@ -165,27 +196,74 @@ async def test_chat_with_context(
     result = await service.chat_with_context(new_msg)
 
     assert result == '{"title": "Rice", "ingredients": [], "instructions": []}'
-    mock_chatbot_provider.handle_multi_turn.assert_awaited()
-    mock_chatbot_history_accessor.get_recent_messages.assert_awaited_once()
-    mock_chatbot_history_accessor.save_message.assert_awaited()
-    mock_chat_session_service.update_session_recipe.assert_awaited()
+    mock_chatbot_provider.handle_multi_turn.assert_awaited_once_with(
+        [
+            {"role": "user", "content": "I have eggs"},
+            {"role": "assistant", "content": "Make an omelette"},
+            {"role": "user", "content": "Now I have rice"},
+        ]
+    )
+    mock_chat_context_service.build_messages.assert_awaited_once_with(new_msg)
+    session_id, recipe, messages = mock_chat_session_service.save_turn.await_args.args
+    assert session_id == 1
+    assert recipe.title == "Rice"
+    assert len(messages) == 2
+
+
+@pytest.mark.asyncio
+async def test_chat_with_context_reads_recipe_wrapped_in_prose(
+    mock_chatbot_provider,
+    mock_pantry_context_service,
+    mock_chat_session_service,
+    mock_chat_context_service,
+    mock_logging_provider,
+):
+    mock_chatbot_provider.handle_multi_turn.return_value = (
+        "Sure! Here is a recipe:\n```json\n"
+        '{"title": "Fried Rice", "prep_time": "1 hr 20 mins", "ingredients": '
+        '["rice", "egg"], "instructions": ["Fry {everything}"]}\n```'
+    )
+
+    service = ChatbotService(
+        chatbot_provider=mock_chatbot_provider,
+        pantry_context_service=mock_pantry_context_service,
+        chat_session_service=mock_chat_session_service,
+        chat_context_service=mock_chat_context_service,
+        logging_provider=mock_logging_provider,
+    )
+
+    await service.chat_with_context(
+        ChatMessageSpec(
+            role="user",
+            content="Now I have rice",
+            user_id=1,
+            timestamp=datetime.now(timezone.utc),
+            session_id=1,
+        )
+    )
+
+    session_id, recipe, _ = mock_chat_session_service.save_turn.await_args.args
+    assert session_id == 1
+    assert recipe.title == "Fried Rice"
+    assert recipe.prep_time == 80
+    assert recipe.total_ingredients == 2
 
 
 @pytest.mark.asyncio
 async def test_get_recipe_title_suggestions(
     mock_chatbot_provider,
-    mock_chatbot_history_accessor,
-    mock_pantry_service,
+    mock_pantry_context_service,
     mock_chat_session_service,
+    mock_chat_context_service,
     mock_logging_provider,
 ):
     mock_chatbot_provider.handle_single_turn.return_value = '["A", "B", "C", "D"]'
 
     service = ChatbotService(
         chatbot_provider=mock_chatbot_provider,
-        chatbot_history_accessor=mock_chatbot_history_accessor,
-        pantry_service=mock_pantry_service,
+        pantry_context_service=mock_pantry_context_service,
         chat_session_service=mock_chat_session_service,
+        chat_context_service=mock_chat_context_service,
         logging_provider=mock_logging_provider,
     )
 
@@ -193,3 +271,99 @@ async def test_get_recipe_title_suggestions(
 
     assert result == ["A", "B", "C", "D"]
     mock_chatbot_provider.handle_single_turn.assert_awaited_once()
+
+
+def make_token_stream(tokens):
+    async def stream(messages):
+        for token in tokens:
+            yield token
+
+    return stream
+
+
+@pytest.mark.asyncio
+async def test_stream_first_recommendation_persists_once_at_end(
+    mock_chatbot_provider,
+    mock_pantry_context_service,
+    mock_chat_session_service,
+    mock_chat_context_service,
+    mock_logging_provider,
+):
+    mock_chatbot_provider.stream_multi_turn = make_token_stream(
+        ['{"title": ', '"Soup", ', '"ingredients": [], "instructions": []}']
+    )
+    mock_chat_session_service.save_turn.return_value = 7
+
+    service = ChatbotService(
+        chatbot_provider=mock_chatbot_provider,
+        pantry_context_service=mock_pantry_context_service,
+        chat_session_service=mock_chat_session_service,
+        chat_context_service=mock_chat_context_service,
+        logging_provider=mock_logging_provider,
+    )
+
+    msg = ChatMessageSpec(
+        role="user",
+        content="I have tomatoes and pasta",
+        user_id=1,
+        timestamp=datetime.now(timezone.utc),
+    )
+
+    events = []
+    async for event in service.stream_first_recommendation(msg):
+        if not event.done:
+            # Nothing is persisted while tokens are still streaming
+            mock_chat_session_service.save_turn.assert_not_awaited()
+        events.append(event)
+
+    assert [e.token for e in events[:-1]] == [
+        '{"title": ',
+        '"Soup", ',
+        '"ingredients": [], "instructions": []}',
+    ]
+    assert events[-1].done
+    assert events[-1].session_id == 7
+    assert (
+        events[-1].reply == '{"title": "Soup", "ingredients": [], "instructions": []}'
+    )
+    _, created, messages = mock_chat_session_service.save_turn.await_args.args
+    assert created.title == "Soup"
+    assert len(messages) == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_chat_with_context(
+    mock_chatbot_provider,
+    mock_pantry_context_service,
+    mock_chat_session_service,
+    mock_chat_context_service,
+    mock_logging_provider,
+):
+    mock_chatbot_provider.stream_multi_turn = make_token_stream(["Try ", "fried rice"])
+
+    service = ChatbotService(
+        chatbot_provider=mock_chatbot_provider,
+        pantry_context_service=mock_pantry_context_service,
+        chat_session_service=mock_chat_session_service,
+        chat_context_service=mock_chat_context_service,
+        logging_provider=mock_logging_provider,
+    )
+
+    new_msg = ChatMessageSpec(
+        role="user",
+        content="Now I have rice",
+        user_id=1,
+        timestamp=datetime.now(timezone.utc),
+        session_id=1,
+    )
+    events = [e async for e in service.stream_chat_with_context(new_msg)]
+
+    assert [e.token for e in events if not e.done] == ["Try ", "fried rice"]
+    assert events[-1].reply == "Try fried rice"
+    assert events[-1].session_id == 1
+    mock_chat_context_service.build_messages.assert_awaited_once_with(new_msg)
+    session_id, recipe, messages = mock_chat_session_service.save_turn.await_args.args
+    assert session_id == 1
+    assert messages[1].content == "Try fried rice"
+    # Plain-text replies carry no recipe to update
+    assert recipe is None
@@ -0,0 +1,56 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.pantrypal_api.common.adapters.cache_provider import InMemoryCacheProvider
+
+
+def make_cache(max_entries: str = "100") -> InMemoryCacheProvider:
+    secret_provider = MagicMock(spec=ISecretProvider)
+    secret_provider.get_secret.return_value = max_entries
+    return InMemoryCacheProvider(secret_provider)
+
+
+@pytest.mark.asyncio
+async def test_set_get_and_delete():
+    cache = make_cache()
+    await cache.set("a", {"id": 1}, ttl_seconds=60)
+    await cache.set("b", "two", ttl_seconds=60)
+
+    assert await cache.get("a") == {"id": 1}
+    await cache.delete("a", "missing")
+    assert await cache.get("a") is None
+    assert await cache.get("b") == "two"
+
+    await cache.clear()
+    assert await cache.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        "src.pantrypal_api.common.adapters.cache_provider.time.monotonic",
+        lambda: now[0],
+    )
+    cache = make_cache()
+    await cache.set("short", 1, ttl_seconds=5)
+    await cache.set("long", 2, ttl_seconds=50)
+
+    now[0] += 10
+    assert await cache.get("short") is None
+    assert await cache.get("long") == 2
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted():
+    cache = make_cache(max_entries="2")
+    await cache.set("a", 1, ttl_seconds=60)
+    await cache.set("b", 2, ttl_seconds=60)
+    await cache.get("a")
+    await cache.set("c", 3, ttl_seconds=60)
+
+    assert await cache.get("a") == 1
+    assert await cache.get("b") is None
+    assert await cache.get("c") == 3
@@ -1,6 +1,16 @@
+import base64
+import hashlib
+import os
 from datetime import datetime, timedelta, timezone
 
-from src.core.common.utils import DateTimeUtils, HashUtil
+import pytest
+
+from src.core.common.utils import (
+    ContentHashUtil,
+    DateTimeUtils,
+    HashUtil,
+    JsonExtractUtil,
+)
 
 
 def test_get_utc_now_returns_utc_datetime():
@@ -32,3 +42,84 @@ def test_hash_and_verify_password():
     assert hashed != raw_password
     assert HashUtil.verify(raw_password, hashed) is True
     assert HashUtil.verify("wrongpassword", hashed) is False
+
+
+def test_needs_rehash_detects_weaker_cost():
+    """Should flag hashes made at a lower bcrypt cost or with another scheme."""
+    hashed = HashUtil.hash("securepassword123", rounds=4)
+
+    assert hashed.startswith("$2b$04$")
+    assert HashUtil.needs_rehash(hashed, 4) is False
+    assert HashUtil.needs_rehash(hashed, 5) is True
+    assert HashUtil.needs_rehash(HashUtil.hash("securepassword123", rounds=5), 4) is (
+        False
+    )
+    assert HashUtil.needs_rehash("not-a-bcrypt-hash", 4) is True
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 49151, 49152, 49153, 200000])
+def test_sha256_of_base64_matches_decoded_bytes(size):
+    """Should hash the decoded bytes across chunk boundaries and line breaks."""
+    data = os.urandom(size)
+    expected = hashlib.sha256(data).hexdigest()
+    encoded = base64.b64encode(data).decode()
+
+    assert ContentHashUtil.sha256_of_base64(encoded) == expected
+    assert ContentHashUtil.sha256_of_base64(base64.encodebytes(data).decode()) == (
+        expected
+    )
+    assert ContentHashUtil.sha256_of_base64(f"data:image/jpeg;base64,{encoded}") == (
+        expected
+    )
+
+
+@pytest.mark.parametrize("encoded", ["abc", "ab=c", "!!!!"])
+def test_sha256_of_base64_rejects_invalid_data(encoded):
+    """Should raise ValueError for malformed base64."""
+    with pytest.raises(ValueError):
+        ContentHashUtil.sha256_of_base64(encoded)
+
+
+def is_list_of_objects(value):
+    return isinstance(value, list) and all(isinstance(e, dict) for e in value)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('[{"ITEM": "Apple"}]', [{"ITEM": "Apple"}]),
+        ('Sure:\n```json\n[{"ITEM": "Apple"}]\n```\nDone', [{"ITEM": "Apple"}]),
+        ('Notes [1] and [2]: [{"ITEM": "Apple"}] ok', [{"ITEM": "Apple"}]),
+        (
+            "[{'ITEM': 'Kopi', 'SUBCATEGORY': None}]",
+            [{"ITEM": "Kopi", "SUBCATEGORY": None}],
+        ),
+        ('[{"ITEM": "Apple"},]', [{"ITEM": "Apple"}]),
+        ('[{"ITEM": "Nasi [lemak] {set}"}]', [{"ITEM": "Nasi [lemak] {set}"}]),
+        ("[]", []),
+    ],
+)
+def test_extract_json_returns_first_accepted_value(text, expected):
+    assert JsonExtractUtil.extract(text, accept=is_list_of_objects) == expected
+
+
+@pytest.mark.parametrize("text", ["", "no json here", '[{"ITEM": "Apple"', "[1, 2]"])
+def test_extract_json_raises_without_accepted_value(text):
+    with pytest.raises(ValueError):
+        JsonExtractUtil.extract(text, accept=is_list_of_objects)
+
+
+def test_extract_objects_salvages_truncated_array():
+    text = '[{"ITEM": "A", "TAGS": {"x": 1}},\n {"ITEM": "B"}, {"ITEM": "C", "QUA'
+
+    assert JsonExtractUtil.extract_objects(text) == [
+        {"ITEM": "A", "TAGS": {"x": 1}},
+        {"ITEM": "B"},
+    ]
+    assert JsonExtractUtil.extract_objects(
+        "1. {'ITEM': 'A'}\n2. {\"ITEM\": \"B\"}"
+    ) == [
+        {"ITEM": "A"},
+        {"ITEM": "B"},
+    ]
+    assert JsonExtractUtil.extract_objects("nothing") == []
@@ -1,3 +1,4 @@
+import json
 import os
 from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock
@@ -9,7 +10,9 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from src.app.main import app
+from src.core.account.services.auth_cache_service import AuthCacheService
 from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+from src.core.common.ports.cache_provider import ICacheProvider
 from src.core.common.ports.secretkey_provider import ISecretProvider
 from src.core.expiry.ports.expiry_prediction_provider import IExpiryPredictionProvider
 from src.core.expiry.ports.supermarket_expiry_provider import ISupermarketExpiryProvider
@@ -69,12 +72,15 @@ async def mock_relational_database_provider(db_session, mock_logging_provider):
     return provider
 
 
-# Mock IAuthProvider using MagicMock since all methods are synchronous
+# Mock IAuthProvider: hashing has async variants, token helpers are synchronous
 @pytest.fixture
 def mock_auth_provider():
     provider = MagicMock()
     provider.get_hashed_password.return_value = "securehash"
+    provider.get_hashed_password_async = AsyncMock(return_value="securehash")
     provider.verify_password.return_value = True
+    provider.verify_password_async = AsyncMock(return_value=True)
+    provider.needs_rehash.return_value = False
     provider.generate_jwt.return_value = "mock.jwt.token"
     provider.decode_jwt.return_value = {"sub": "1"}
     return provider
@@ -89,6 +95,39 @@ def mock_chatbot_provider():
     return provider
 
 
+# Fake shared cache backend: JSON round-trips values like a networked store would
+class FakeSharedCacheProvider(ICacheProvider):
+    def __init__(self):
+        self.entries = {}
+
+    async def get(self, key):
+        value = self.entries.get(key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key, value, ttl_seconds):
+        self.entries[key] = json.dumps(value)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.entries.pop(key, None)
+
+    async def clear(self):
+        self.entries.clear()
+
+
+@pytest.fixture
+def fake_cache_provider():
+    return FakeSharedCacheProvider()
+
+
+# Real AuthCacheService backed by the fake shared cache
+@pytest.fixture
+def auth_cache_service(fake_cache_provider, mock_logging_provider):
+    secret_provider = MagicMock(spec=ISecretProvider)
+    secret_provider.get_secret.return_value = "60"
+    return AuthCacheService(fake_cache_provider, secret_provider, mock_logging_provider)
+
+
 # Mock ISecretKeyProvider for JWT and config access
 @pytest.fixture
 def mock_secret_key_provider(mock_logging_provider):
@@ -154,7 +193,9 @@ def mock_auth_token_accessor():
 
 @pytest.fixture
 def mock_chatbot_history_accessor():
-    return make_async_accessor(["get_recent_messages", "save_message"])
+    return make_async_accessor(
+        ["get_recent_messages", "get_prompt_window", "save_message"]
+    )
 
 
 @pytest.fixture
@@ -165,16 +206,28 @@ def mock_pantry_item_accessor():
             "add_items",
             "get_item_by_id",
             "update_item",
+            "update_items",
             "delete_items",
             "get_items_by_ids",
+            "get_expiry_stats",
+            "get_items_expiring_before",
+            "get_items_page",
         ]
     )
 
 
 @pytest.fixture
-def mock_pantry_service():
+def mock_chat_context_service():
+    service = MagicMock()
+    service.build_messages = AsyncMock(return_value=[])
+    return service
+
+
+@pytest.fixture
+def mock_pantry_context_service():
     service = MagicMock()
-    service.get_items_sorted_by_expiry = AsyncMock(return_value=[])
+    service.get_ingredient_block = AsyncMock(return_value="")
+    service.bump_version = AsyncMock()
     return service
 
 
@@ -183,6 +236,7 @@ def mock_chat_session_service():
     service = MagicMock()
     service.create_session = AsyncMock()
     service.update_session_recipe = AsyncMock()
+    service.save_turn = AsyncMock()
     return service
 
 
@@ -227,6 +281,8 @@ async def clean_all_tables(db_session):
     for table in reversed(PantryPalBaseModel.metadata.sorted_tables):
         await db_session.execute(table.delete())
     await db_session.commit()
+    # Cached auth entries would otherwise outlive the rows they were read from
+    await injector.get(ICacheProvider).clear()
 
 
 # ===============================
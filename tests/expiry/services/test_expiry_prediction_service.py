@@ -1,10 +1,46 @@
+import asyncio
 from datetime import date, timedelta
+from unittest.mock import MagicMock
 
 import pytest
 
+from src.core.common.ports.secretkey_provider import ISecretProvider
 from src.core.expiry.constants import SupermarketType
+from src.core.expiry.ports.supermarket_expiry_provider import ISupermarketExpiryProvider
 from src.core.expiry.services.expiry_prediction_service import ExpiryPredictionService
+from src.core.expiry.specs import ExpiryQuerySpec
 from src.core.pantry.constants import Category
+from src.pantrypal_api.expiry.adapters.static_expiry_provider import (
+    StaticExpiryPredictionProvider,
+)
+
+
+@pytest.fixture
+def expiry_secret_provider():
+    provider = MagicMock(spec=ISecretProvider)
+    provider.get_secret.return_value = "2"
+    return provider
+
+
+class CountingSupermarketProvider(ISupermarketExpiryProvider):
+    """Answers barcodes starting with "OK" and tracks concurrent lookups."""
+
+    def __init__(self):
+        self.calls = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def fetch_expiry_date(self, **kwargs) -> date:
+        self.calls.append(kwargs)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if not kwargs.get("barcode", "").startswith("OK"):
+                raise LookupError("Unknown barcode")
+            return kwargs["purchase_date"] + timedelta(days=1)
+        finally:
+            self.in_flight -= 1
 
 
 @pytest.mark.asyncio
@@ -14,6 +50,7 @@ class TestExpiryPredictionService:
         mock_expiry_prediction_provider,
         mock_supermarket_expiry_provider,
         mock_logging_provider,
+        expiry_secret_provider,
     ):
         # Arrange
         mock_supermarket_expiry_provider.fetch_expiry_date.return_value = (
@@ -26,6 +63,7 @@ class TestExpiryPredictionService:
                 SupermarketType.FAIRPRICE: mock_supermarket_expiry_provider
             },
             logging_provider=mock_logging_provider,
+            secret_provider=expiry_secret_provider,
         )
 
         # Act
@@ -44,6 +82,7 @@ class TestExpiryPredictionService:
         self,
         mock_expiry_prediction_provider,
         mock_logging_provider,
+        expiry_secret_provider,
     ):
         # Arrange
         mock_expiry_prediction_provider.predict_expiry_date.return_value = (
@@ -54,6 +93,7 @@ class TestExpiryPredictionService:
             fallback_expiry_provider=mock_expiry_prediction_provider,
             supermarket_expiry_provider={},  # empty provider registry
             logging_provider=mock_logging_provider,
+            secret_provider=expiry_secret_provider,
         )
 
         # Act
@@ -72,6 +112,7 @@ class TestExpiryPredictionService:
         mock_expiry_prediction_provider,
         mock_supermarket_expiry_provider,
         mock_logging_provider,
+        expiry_secret_provider,
     ):
         # Arrange
         mock_supermarket_expiry_provider.fetch_expiry_date.side_effect = Exception(
@@ -87,6 +128,7 @@ class TestExpiryPredictionService:
                 SupermarketType.FAIRPRICE: mock_supermarket_expiry_provider
             },
             logging_provider=mock_logging_provider,
+            secret_provider=expiry_secret_provider,
         )
 
         # Act
@@ -100,3 +142,102 @@ class TestExpiryPredictionService:
         assert isinstance(result, date)
         mock_expiry_prediction_provider.predict_expiry_date.assert_awaited_once()
         mock_supermarket_expiry_provider.fetch_expiry_date.assert_awaited_once()
+
+    async def test_bulk_resolves_each_unique_query_once(
+        self, mock_logging_provider, expiry_secret_provider
+    ):
+        # Arrange
+        fallback = StaticExpiryPredictionProvider()
+        supermarket = CountingSupermarketProvider()
+        service = ExpiryPredictionService(
+            fallback_expiry_provider=fallback,
+            supermarket_expiry_provider={SupermarketType.GIANT: supermarket},
+            logging_provider=mock_logging_provider,
+            secret_provider=expiry_secret_provider,
+        )
+        today = date.today()
+        queries = [
+            ExpiryQuerySpec(category=Category.FRUITS, purchase_date=today),
+            ExpiryQuerySpec(category=Category.FRUITS, purchase_date=today),
+            ExpiryQuerySpec(
+                category=Category.MEAT,
+                purchase_date=today,
+                supermarket_type=SupermarketType.GIANT,
+                lookup={"barcode": "OK1"},
+            ),
+            ExpiryQuerySpec(
+                category=Category.MEAT,
+                purchase_date=today,
+                supermarket_type=SupermarketType.GIANT,
+                lookup={"barcode": "OK1"},
+            ),
+            ExpiryQuerySpec(
+                category=Category.DAIRY,
+                purchase_date=today,
+                supermarket_type=SupermarketType.GIANT,
+                lookup={"barcode": "BAD"},
+            ),
+            ExpiryQuerySpec(
+                category=Category.DAIRY,
+                purchase_date=today,
+                supermarket_type=SupermarketType.FAIRPRICE,  # No provider bound
+            ),
+        ]
+
+        # Act
+        result = await service.get_expiry_dates(queries)
+
+        # Assert
+        assert result == [
+            today + timedelta(days=7),
+            today + timedelta(days=7),
+            today + timedelta(days=1),
+            today + timedelta(days=1),
+            today + timedelta(days=10),
+            today + timedelta(days=10),
+        ]
+        assert sorted(call["barcode"] for call in supermarket.calls) == ["BAD", "OK1"]
+        mock_logging_provider.info.assert_called_once()
+        mock_logging_provider.warning.assert_called_once()
+
+    async def test_bulk_limits_concurrency_per_provider(
+        self, mock_logging_provider, expiry_secret_provider
+    ):
+        # Arrange
+        supermarket = CountingSupermarketProvider()
+        service = ExpiryPredictionService(
+            fallback_expiry_provider=StaticExpiryPredictionProvider(),
+            supermarket_expiry_provider={SupermarketType.GIANT: supermarket},
+            logging_provider=mock_logging_provider,
+            secret_provider=expiry_secret_provider,
+        )
+        queries = [
+            ExpiryQuerySpec(
+                category=Category.MEAT,
+                purchase_date=date.today(),
+                supermarket_type=SupermarketType.GIANT,
+                lookup={"barcode": f"OK{i}"},
+            )
+            for i in range(10)
+        ]
+
+        # Act
+        result = await service.get_expiry_dates(queries)
+
+        # Assert
+        assert len(result) == 10
+        assert len(supermarket.calls) == 10
+        assert supermarket.peak_in_flight == 2
+
+
+def test_rejects_non_positive_provider_concurrency(mock_logging_provider):
+    secret_provider = MagicMock(spec=ISecretProvider)
+    secret_provider.get_secret.return_value = "0"
+
+    with pytest.raises(ValueError, match="EXPIRY_PROVIDER_MAX_CONCURRENCY"):
+        ExpiryPredictionService(
+            fallback_expiry_provider=StaticExpiryPredictionProvider(),
+            supermarket_expiry_provider={},
+            logging_provider=mock_logging_provider,
+            secret_provider=secret_provider,
+        )
@@ -1,9 +1,15 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 
 import pytest
 
 from src.core.pantry.constants import Category, Unit
 from src.core.pantry.models import PantryItemDomain
+from src.core.pantry.specs import (
+    ListPantryItemsSpec,
+    PantryListCursor,
+    UpdatePantryItemSpec,
+)
+from src.pantrypal_api.pantry.accessors import pantry_item_accessor
 from src.pantrypal_api.pantry.accessors.pantry_item_accessor import PantryItemAccessor
 
 
@@ -34,6 +40,38 @@ async def test_add_and_get_items(
     assert any(i.item_name == "Milk" for i in fetched)
 
 
+@pytest.mark.asyncio
+async def test_add_items_inserts_in_chunks_and_keeps_order(
+    mock_relational_database_provider, mock_logging_provider, monkeypatch
+):
+    monkeypatch.setattr(pantry_item_accessor, "ADD_ITEMS_CHUNK_SIZE", 4)
+    accessor = PantryItemAccessor(
+        db_provider=mock_relational_database_provider,
+        logging_provider=mock_logging_provider,
+    )
+    items = [
+        PantryItemDomain.create(
+            user_id=7,
+            item_name=f"Item {i}",
+            quantity=i + 1,
+            unit=Unit.PIECES,
+            category=Category.SNACKS,
+            expiry_date=datetime(2023, 5, 1) + timedelta(days=i),
+        )
+        for i in range(10)
+    ]
+
+    added = await accessor.add_items(items)
+
+    assert [a.item_name for a in added] == [f"Item {i}" for i in range(10)]
+    assert [a.expiry_date for a in added] == [i.expiry_date for i in items]
+    assert len({a.id for a in added}) == 10 and all(a.id > 0 for a in added)
+    assert all(a.created_at is not None for a in added)
+    fetched = await accessor.get_items_by_ids([a.id for a in added], user_id=7)
+    assert {f.id: f.quantity for f in fetched} == {a.id: a.quantity for a in added}
+    assert await accessor.add_items([]) == []
+
+
 @pytest.mark.asyncio
 async def test_update_item_success(
     mock_relational_database_provider, mock_logging_provider
@@ -57,6 +95,101 @@ async def test_update_item_success(
     updated_domain = added.model_copy(update={"quantity": 3.5})
     updated = await accessor.update_item(updated_domain)
     assert updated.quantity == 3.5
+    assert updated.updated_at is not None
+
+
+@pytest.mark.asyncio
+async def test_update_items_applies_partial_updates_atomically(
+    mock_relational_database_provider, mock_logging_provider
+):
+    accessor = PantryItemAccessor(
+        db_provider=mock_relational_database_provider,
+        logging_provider=mock_logging_provider,
+    )
+    rice, beans = await accessor.add_items(
+        [
+            PantryItemDomain.create(
+                user_id=3,
+                item_name=name,
+                quantity=2.0,
+                unit=Unit.KILOGRAMS,
+                category=Category.STAPLES,
+            )
+            for name in ("Rice", "Beans")
+        ]
+    )
+    [other] = await accessor.add_items(
+        [
+            PantryItemDomain.create(
+                user_id=4,
+                item_name="Oats",
+                quantity=1.0,
+                unit=Unit.KILOGRAMS,
+                category=Category.STAPLES,
+            )
+        ]
+    )
+
+    # One item of someone else's rejects the whole batch
+    rejected = await accessor.update_items(
+        3,
+        [
+            UpdatePantryItemSpec(id=rice.id, quantity=0.5),
+            UpdatePantryItemSpec(id=other.id, quantity=0.0),
+        ],
+    )
+    assert rejected is None
+    unchanged = await accessor.get_items_by_ids([rice.id], user_id=3)
+    assert unchanged[0].quantity == 2.0
+
+    updated = await accessor.update_items(
+        3,
+        [
+            UpdatePantryItemSpec(id=beans.id, item_name="Black Beans"),
+            UpdatePantryItemSpec(id=rice.id, quantity=0.5),
+        ],
+    )
+    assert [(u.id, u.item_name, u.quantity) for u in updated] == [
+        (beans.id, "Black Beans", 2.0),
+        (rice.id, "Rice", 0.5),
+    ]
+    stored = {i.id: i for i in await accessor.get_items_by_user(user_id=3)}
+    assert stored[beans.id].item_name == "Black Beans"
+    assert stored[rice.id].quantity == 0.5
+    assert stored[rice.id].category == Category.STAPLES
+    assert stored[rice.id].updated_at is not None
+
+
+@pytest.mark.asyncio
+async def test_update_items_keeps_empty_name_like_update_item(
+    mock_relational_database_provider, mock_logging_provider
+):
+    accessor = PantryItemAccessor(
+        db_provider=mock_relational_database_provider,
+        logging_provider=mock_logging_provider,
+    )
+    [tea] = await accessor.add_items(
+        [
+            PantryItemDomain.create(
+                user_id=5,
+                item_name="Tea",
+                quantity=1.0,
+                unit=Unit.GRAMS,
+                category=Category.BEVERAGES,
+            )
+        ]
+    )
+    assert tea.updated_at is None
+
+    [updated] = await accessor.update_items(
+        5, [UpdatePantryItemSpec(id=tea.id, item_name="", quantity=2.0)]
+    )
+
+    assert (updated.item_name, updated.quantity) == ("Tea", 2.0)
+    assert updated.updated_at is not None
+    [stored] = await accessor.get_items_by_ids([tea.id], user_id=5)
+    assert stored.item_name == "Tea"
+    assert stored.updated_at is not None
 
 
 @pytest.mark.asyncio
@@ -90,6 +223,88 @@ async def test_get_item_by_id_and_delete(
     assert deleted is None
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("returning", [True, False])
+async def test_delete_items_is_all_or_nothing(
+    mock_relational_database_provider, mock_logging_provider, monkeypatch, returning
+):
+    accessor = PantryItemAccessor(
+        db_provider=mock_relational_database_provider,
+        logging_provider=mock_logging_provider,
+    )
+    if not returning:
+        async with mock_relational_database_provider.get_db() as db:
+            dialect = db.get_bind().dialect
+        monkeypatch.setattr(dialect, "delete_returning", False)
+    mine = await accessor.add_items(
+        [
+            PantryItemDomain.create(
+                user_id=5,
+                item_name=name,
+                quantity=1,
+                unit=Unit.PIECES,
+                category=Category.FRUITS,
+            )
+            for name in ("Kiwi", "Lime")
+        ]
+    )
+    [theirs] = await accessor.add_items(
+        [
+            PantryItemDomain.create(
+                user_id=6,
+                item_name="Plum",
+                quantity=1,
+                unit=Unit.PIECES,
+                category=Category.FRUITS,
+            )
+        ]
+    )
+
+    missing = await accessor.delete_items([mine[0].id, theirs.id, 999], user_id=5)
+    assert missing == [theirs.id, 999]
+    assert len(await accessor.get_items_by_user(user_id=5)) == 2
+
+    assert await accessor.delete_items([item.id for item in mine], user_id=5) == []
+    assert await accessor.get_items_by_user(user_id=5) == []
+    assert await accessor.get_item_by_id(theirs.id, user_id=6) is not None
+
+
+@pytest.mark.asyncio
+async def test_soft_deleted_items_are_hidden_and_cannot_be_deleted_again(
+    mock_relational_database_provider, mock_logging_provider
+):
+    accessor = PantryItemAccessor(
+        db_provider=mock_relational_database_provider,
+        logging_provider=mock_logging_provider,
+    )
+    today = datetime(2023, 6, 1)
+    gone, kept = await accessor.add_items(
+        [
+            PantryItemDomain.create(
+                user_id=8,
+                item_name=name,
+                quantity=1,
+                unit=Unit.PIECES,
+                category=Category.FRUITS,
+                expiry_date=today,
+            )
+            for name in ("Fig", "Date")
+        ]
+    )
+
+    assert await accessor.delete_items([gone.id], user_id=8, soft=True) == []
+
+    assert [i.id for i in await accessor.get_items_by_user(user_id=8)] == [kept.id]
+    assert await accessor.get_item_by_id(gone.id, user_id=8) is None
+    assert await accessor.get_items_by_ids([gone.id], user_id=8) == []
+    stats = await accessor.get_expiry_stats(8, today.date(), today.date())
+    assert stats.total_items == 1 and stats.expiring_today == 1
+    page = await accessor.get_items_page(8, ListPantryItemsSpec())
+    assert [row["id"] for row in page] == [kept.id]
+    assert await accessor.update_items(8, [UpdatePantryItemSpec(id=gone.id)]) is None
+    assert await accessor.delete_items([gone.id], user_id=8, soft=True) == [gone.id]
+
+
 @pytest.mark.asyncio
 async def test_get_items_by_ids(
     mock_relational_database_provider, mock_logging_provider
@@ -116,3 +331,144 @@ async def test_get_items_by_ids(
     fetched = await accessor.get_items_by_ids(item_ids=ids, user_id=2)
     assert len(fetched) == 3
     assert {i.item_name for i in fetched} == {"Item 1", "Item 2", "Item 3"}
+
+
+@pytest.mark.asyncio
+async def test_get_expiry_stats_buckets_items_in_sql(
+    mock_relational_database_provider, mock_logging_provider
+):
+    accessor = PantryItemAccessor(
+        db_provider=mock_relational_database_provider,
+        logging_provider=mock_logging_provider,
+    )
+    today = date(2025, 6, 10)
+    expiry_dates = [
+        datetime(2025, 6, 9, 23, 59, tzinfo=timezone.utc),  # expired
+        datetime(2025, 6, 10, 0, 0, tzinfo=timezone.utc),  # today
+        datetime(2025, 6, 10, 23, 0),  # today, stored naive
+        datetime(2025, 6, 11, 0, 0, tzinfo=timezone.utc),  # soon
+        datetime(2025, 6, 17, 22, 0, tzinfo=timezone.utc),  # soon (last day)
+        datetime(2025, 6, 18, 0, 0, tzinfo=timezone.utc),  # later
+        None,  # no expiry date
+    ]
+    await accessor.add_items(
+        [
+            PantryItemDomain.create(
+                user_id=7,
+                item_name=f"Item {i}",
+                quantity=1,
+                unit=Unit.PIECES,
+                category=Category.FRUITS,
+                expiry_date=expiry_date,
+            )
+            for i, expiry_date in enumerate(expiry_dates)
+        ]
+    )
+
+    stats = await accessor.get_expiry_stats(
+        user_id=7, today=today, soon_until=today + timedelta(days=7)
+    )
+    empty = await accessor.get_expiry_stats(
+        user_id=8, today=today, soon_until=today + timedelta(days=7)
+    )
+
+    assert stats.total_items == 7
+    assert stats.expired == 1
+    assert stats.expiring_today == 2
+    assert stats.expiring_soon == 2
+    assert empty.total_items == empty.expired == 0
+
+
+@pytest.mark.asyncio
+async def test_get_items_expiring_before_orders_and_limits(
+    mock_relational_database_provider, mock_logging_provider
+):
+    accessor = PantryItemAccessor(
+        db_provider=mock_relational_database_provider,
+        logging_provider=mock_logging_provider,
+    )
+    now = datetime(2025, 6, 10, 12, 0, tzinfo=timezone.utc)
+    offsets = {"Soon3": 3, "Expired": -1, "Later": 10, "Soon1": 1, "Soon2": 2}
+    await accessor.add_items(
+        [
+            PantryItemDomain.create(
+                user_id=9,
+                item_name=name,
+                quantity=1,
+                unit=Unit.PIECES,
+                category=Category.FRUITS,
+                expiry_date=now + timedelta(days=days),
+            )
+            for name, days in offsets.items()
+        ]
+        + [
+            PantryItemDomain.create(
+                user_id=9,
+                item_name="No expiry",
+                quantity=1,
+                unit=Unit.PIECES,
+                category=Category.FRUITS,
+            ),
+            PantryItemDomain.create(
+                user_id=10,
+                item_name="Other user",
+                quantity=1,
+                unit=Unit.PIECES,
+                category=Category.FRUITS,
+                expiry_date=now - timedelta(days=5),
+            ),
+        ]
+    )
+
+    top_three = await accessor.get_items_expiring_before(
+        user_id=9, expires_before=now + timedelta(days=7), limit=3
+    )
+    all_expiring = await accessor.get_items_expiring_before(
+        user_id=9, expires_before=now + timedelta(days=7), limit=10
+    )
+
+    assert [i.item_name for i in top_three] == ["Expired", "Soon1", "Soon2"]
+    assert [i.item_name for i in all_expiring] == [
+        "Expired",
+        "Soon1",
+        "Soon2",
+        "Soon3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_items_page_keyset_crosses_null_expiry_dates(
+    mock_relational_database_provider, mock_logging_provider
+):
+    accessor = PantryItemAccessor(
+        db_provider=mock_relational_database_provider,
+        logging_provider=mock_logging_provider,
+    )
+    same_day = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    expiry_dates = [None, same_day, None, same_day, same_day + timedelta(days=1)]
+    await accessor.add_items(
+        [
+            PantryItemDomain.create(
+                user_id=11,
+                item_name=f"Item {i}",
+                quantity=1,
+                unit=Unit.PIECES,
+                category=Category.OTHER,
+                expiry_date=expiry_date,
+            )
+            for i, expiry_date in enumerate(expiry_dates)
+        ]
+    )
+
+    seen, after = [], None
+    while True:
+        rows = await accessor.get_items_page(
+            11, ListPantryItemsSpec(limit=2, after=after, fields=["item_name"])
+        )
+        if not rows:
+            break
+        assert all(set(row) == {"id", "item_name", "expiry_date"} for row in rows)
+        seen += [row["item_name"] for row in rows]
+        after = PantryListCursor(expiry_date=rows[-1]["expiry_date"], id=rows[-1]["id"])
+
+    assert seen == ["Item 1", "Item 3", "Item 4", "Item 0", "Item 2"]
@@ -117,6 +117,71 @@ class TestPantryEndpoints:
         assert update_response.status_code == 200
         assert update_response.json()["item_name"] == "Milk (Skimmed)"
 
+    async def test_update_items_batch(self, async_client: AsyncClient):
+        tokens = []
+        for name in ("pantry", "other"):
+            await async_client.post(
+                "/account/register",
+                json={
+                    "username": name,
+                    "email": f"{name}@example.com",
+                    "password": "pass123",
+                },
+            )
+            login_resp = await async_client.post(
+                "/account/login",
+                json={"email": f"{name}@example.com", "password": "pass123"},
+            )
+            tokens.append(login_resp.json()["token"])
+        headers, other_headers = (
+            {"Authorization": f"Bearer {token}"} for token in tokens
+        )
+
+        add_payload = [
+            {"item_name": name, "quantity": 3, "unit": "pieces", "category": "Fruits"}
+            for name in ("Apple", "Pear")
+        ]
+        response = await async_client.post(
+            "/pantry/add", json=add_payload, headers=headers
+        )
+        apple_id, pear_id = (item["id"] for item in response.json())
+        response = await async_client.post(
+            "/pantry/add", json=add_payload[:1], headers=other_headers
+        )
+        other_id = response.json()[0]["id"]
+
+        update_response = await async_client.patch(
+            "/pantry/update-batch",
+            json=[
+                {"item_id": apple_id, "quantity": 1},
+                {"item_id": pear_id, "quantity": 0, "unit": "grams"},
+            ],
+            headers=headers,
+        )
+        assert update_response.status_code == 200
+        assert [
+            (item["id"], item["item_name"], item["quantity"], item["unit"])
+            for item in update_response.json()
+        ] == [(apple_id, "Apple", 1, "pieces"), (pear_id, "Pear", 0, "grams")]
+
+        foreign_response = await async_client.patch(
+            "/pantry/update-batch",
+            json=[
+                {"item_id": apple_id, "quantity": 2},
+                {"item_id": other_id, "quantity": 2},
+            ],
+            headers=headers,
+        )
+        assert foreign_response.status_code == 400
+        list_response = await async_client.get("/pantry/list", headers=headers)
+        quantities = {item["id"]: item["quantity"] for item in list_response.json()}
+        assert quantities == {apple_id: 1, pear_id: 0}
+
+        empty_response = await async_client.patch(
+            "/pantry/update-batch", json=[], headers=headers
+        )
+        assert empty_response.status_code == 422
+
     async def test_delete_item(self, async_client: AsyncClient):
         # add the item
         await async_client.post(
@@ -168,3 +233,91 @@ class TestPantryEndpoints:
         assert list_response.status_code == 200
         items = list_response.json()
         assert all(item["id"] != item_id for item in items)
+
+    async def test_list_items_pages_filters_and_projects(
+        self, async_client: AsyncClient
+    ):
+        await async_client.post(
+            "/account/register",
+            json={
+                "username": "pantry",
+                "email": "pantry@example.com",
+                "password": "pass123",
+            },
+        )
+        login_resp = await async_client.post(
+            "/account/login",
+            json={"email": "pantry@example.com", "password": "pass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_resp.json()['token']}"}
+
+        payload = [
+            {
+                "item_name": f"Item {day}",
+                "quantity": 1,
+                "unit": "pieces",
+                "category": "Dairy" if day % 2 else "Fruits",
+                "expiry_date": f"2025-06-{day:02d}T10:00:00Z",
+            }
+            for day in (5, 1, 4, 2, 3)
+        ]
+        payload.append(
+            {"item_name": "Salt", "quantity": 1, "unit": "pack", "category": "Staples"}
+        )
+        await async_client.post("/pantry/add", json=payload, headers=headers)
+
+        # Walk every page of two and check the keyset order (no expiry last)
+        names, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = await async_client.get(
+                "/pantry/list", params=params, headers=headers
+            )
+            assert response.status_code == 200
+            names += [item["item_name"] for item in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert names == ["Item 1", "Item 2", "Item 3", "Item 4", "Item 5", "Salt"]
+
+        response = await async_client.get(
+            "/pantry/list",
+            params={
+                "category": "Dairy",
+                "expires_before": "2025-06-04T00:00:00Z",
+                "fields": "item_name,quantity",
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert "X-Next-Cursor" not in response.headers
+        data = response.json()
+        assert [set(item) for item in data] == [{"id", "item_name", "quantity"}] * 2
+        assert [item["item_name"] for item in data] == ["Item 1", "Item 3"]
+
+    async def test_list_items_rejects_bad_cursor_and_fields(
+        self, async_client: AsyncClient
+    ):
+        await async_client.post(
+            "/account/register",
+            json={
+                "username": "pantry",
+                "email": "pantry@example.com",
+                "password": "pass123",
+            },
+        )
+        login_resp = await async_client.post(
+            "/account/login",
+            json={"email": "pantry@example.com", "password": "pass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_resp.json()['token']}"}
+
+        bad_cursor = await async_client.get(
+            "/pantry/list", params={"cursor": "not-a-cursor"}, headers=headers
+        )
+        bad_fields = await async_client.get(
+            "/pantry/list", params={"fields": "item_name,secret"}, headers=headers
+        )
+
+        assert bad_cursor.status_code == 400
+        assert bad_fields.status_code == 400
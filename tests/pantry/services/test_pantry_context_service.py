@@ -0,0 +1,91 @@
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.common.constants import SecretKey
+from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.core.pantry.constants import Unit
+from src.core.pantry.services.pantry_context_service import PantryContextService
+
+
+def make_service(accessor, cache_provider, logging_provider, max_tokens="1000"):
+    secret_provider = MagicMock(spec=ISecretProvider)
+    secret_provider.get_secret.side_effect = lambda key, default=None: (
+        max_tokens if key == SecretKey.PANTRY_CONTEXT_MAX_TOKENS else default
+    )
+    return PantryContextService(
+        accessor, cache_provider, secret_provider, logging_provider
+    )
+
+
+def make_rows(count):
+    return [
+        {
+            "id": i + 1,
+            "item_name": f"Item {i}",
+            "quantity": 2.0,
+            "unit": Unit.PIECES,
+            "expiry_date": datetime(2025, 6, i + 1) if i < count - 1 else None,
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ingredient_block_is_cached_until_version_bump(
+    mock_pantry_item_accessor, fake_cache_provider, mock_logging_provider
+):
+    mock_pantry_item_accessor.get_items_page.return_value = make_rows(2)
+    service = make_service(
+        mock_pantry_item_accessor, fake_cache_provider, mock_logging_provider
+    )
+
+    first = await service.get_ingredient_block(user_id=1)
+    second = await service.get_ingredient_block(user_id=1)
+
+    assert first == (
+        "Prioritize ingredients nearing expiry: "
+        "Item 0 2 pieces exp 2025-06-01, Item 1 2 pieces exp N/A. "
+    )
+    assert second == first
+    assert mock_pantry_item_accessor.get_items_page.await_count == 1
+    spec = mock_pantry_item_accessor.get_items_page.await_args.args[1]
+    assert spec.fields == ["item_name", "quantity", "unit", "expiry_date"]
+
+    mock_pantry_item_accessor.get_items_page.return_value = []
+    await service.bump_version(user_id=1)
+
+    assert await service.get_ingredient_block(user_id=1) == ""
+    assert mock_pantry_item_accessor.get_items_page.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_ingredient_block_is_truncated_to_token_budget(
+    mock_pantry_item_accessor, fake_cache_provider, mock_logging_provider
+):
+    mock_pantry_item_accessor.get_items_page.return_value = make_rows(10)
+    service = make_service(
+        mock_pantry_item_accessor,
+        fake_cache_provider,
+        mock_logging_provider,
+        max_tokens="30",
+    )
+
+    block = await service.get_ingredient_block(user_id=1)
+
+    # Each "Item N 2 pieces exp YYYY-MM-DD" entry is ~8 tokens plus a separator
+    assert block.count("Item ") == 3
+    assert "Item 0 " in block and "Item 3 " not in block
+
+
+def test_invalid_max_tokens_raises(
+    mock_pantry_item_accessor, fake_cache_provider, mock_logging_provider
+):
+    with pytest.raises(ValueError, match="PANTRY_CONTEXT_MAX_TOKENS"):
+        make_service(
+            mock_pantry_item_accessor,
+            fake_cache_provider,
+            mock_logging_provider,
+            max_tokens="lots",
+        )
@@ -1,21 +1,33 @@
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 
 import pytest
 
+from src.core.common.constants import SecretKey
 from src.core.common.utils import DateTimeUtils
 from src.core.pantry.constants import Category, Unit
-from src.core.pantry.models import PantryItemDomain
+from src.core.pantry.models import PantryItemDomain, PantryStatsDomain
 from src.core.pantry.services.pantry_service import PantryService
 from src.core.pantry.specs import (
     AddPantryItemSpec,
     DeletePantryItemsSpec,
+    ListPantryItemsSpec,
+    PantryListCursor,
     UpdatePantryItemSpec,
 )
 
 
+@pytest.fixture
+def secret_provider(mock_secret_key_provider):
+    mock_secret_key_provider.get_secret.side_effect = lambda key, default=None: default
+    return mock_secret_key_provider
+
+
 @pytest.mark.asyncio
 async def test_get_items_returns_user_items(
-    mock_pantry_item_accessor, mock_logging_provider
+    mock_pantry_item_accessor,
+    mock_logging_provider,
+    mock_pantry_context_service,
+    secret_provider,
 ):
     now = datetime.now(timezone.utc)
     mock_pantry_item_accessor.get_items_by_user.return_value = [
@@ -33,7 +45,12 @@ async def test_get_items_returns_user_items(
         )
     ]
 
-    service = PantryService(mock_pantry_item_accessor, mock_logging_provider)
+    service = PantryService(
+        mock_pantry_item_accessor,
+        mock_logging_provider,
+        mock_pantry_context_service,
+        secret_provider,
+    )
     items = await service.get_items(user_id=1)
 
     assert len(items) == 1
@@ -42,7 +59,10 @@ async def test_get_items_returns_user_items(
 
 @pytest.mark.asyncio
 async def test_add_items_creates_items(
-    mock_pantry_item_accessor, mock_logging_provider
+    mock_pantry_item_accessor,
+    mock_logging_provider,
+    mock_pantry_context_service,
+    secret_provider,
 ):
     spec = AddPantryItemSpec(
         item_name="Apple",
@@ -69,15 +89,26 @@ async def test_add_items_creates_items(
 
     mock_pantry_item_accessor.add_items.return_value = [pantry_item]
 
-    service = PantryService(mock_pantry_item_accessor, mock_logging_provider)
+    service = PantryService(
+        mock_pantry_item_accessor,
+        mock_logging_provider,
+        mock_pantry_context_service,
+        secret_provider,
+    )
     result = await service.add_items(user_id=1, specs=[spec])
 
     assert len(result) == 1
     assert result[0].item_name == "Apple"
+    mock_pantry_context_service.bump_version.assert_awaited_once_with(1)
 
 
 @pytest.mark.asyncio
-async def test_update_item_success(mock_pantry_item_accessor, mock_logging_provider):
+async def test_update_item_success(
+    mock_pantry_item_accessor,
+    mock_logging_provider,
+    mock_pantry_context_service,
+    secret_provider,
+):
     now = datetime.now(timezone.utc)
     existing_item = PantryItemDomain(
         id=1,
@@ -109,212 +140,174 @@ async def test_update_item_success(mock_pantry_item_accessor, mock_logging_provi
         expiry_date=now,
     )
 
-    service = PantryService(mock_pantry_item_accessor, mock_logging_provider)
+    service = PantryService(
+        mock_pantry_item_accessor,
+        mock_logging_provider,
+        mock_pantry_context_service,
+        secret_provider,
+    )
     result = await service.update_item(user_id=1, spec=spec)
 
     assert result.item_name == "New"
     assert result.quantity == 2.0
+    mock_pantry_context_service.bump_version.assert_awaited_once_with(1)
 
 
 @pytest.mark.asyncio
-async def test_delete_items_success(mock_pantry_item_accessor, mock_logging_provider):
+async def test_update_items_applies_batch_in_one_call(
+    mock_pantry_item_accessor,
+    mock_logging_provider,
+    mock_pantry_context_service,
+    secret_provider,
+):
     now = datetime.now(timezone.utc)
-    pantry_item = PantryItemDomain(
-        id=1,
-        user_id=1,
-        item_name="Apple",
-        quantity=1.0,
-        unit=Unit.GRAMS,
-        category=Category.FRUITS,
-        purchase_date=None,
-        expiry_date=None,
-        created_at=now,
-        updated_at=now,
+    updated = [
+        PantryItemDomain(
+            id=item_id,
+            user_id=1,
+            item_name=f"Item {item_id}",
+            quantity=0.5,
+            unit=Unit.KILOGRAMS,
+            created_at=now,
+        )
+        for item_id in (3, 1)
+    ]
+    mock_pantry_item_accessor.update_items.return_value = updated
+    specs = [UpdatePantryItemSpec(id=3, quantity=0.5), UpdatePantryItemSpec(id=1)]
+
+    service = PantryService(
+        mock_pantry_item_accessor,
+        mock_logging_provider,
+        mock_pantry_context_service,
+        secret_provider,
     )
+    result = await service.update_items(user_id=1, specs=specs)
 
-    mock_pantry_item_accessor.get_items_by_ids.return_value = [pantry_item]
+    assert result == updated
+    mock_pantry_item_accessor.update_items.assert_awaited_once_with(1, specs)
+    mock_pantry_context_service.bump_version.assert_awaited_once_with(1)
 
-    service = PantryService(mock_pantry_item_accessor, mock_logging_provider)
-    spec = DeletePantryItemsSpec(item_ids=[1])
 
-    await service.delete_items(user_id=1, spec=spec)
-    mock_pantry_item_accessor.delete_items.assert_awaited_once_with(
-        item_ids=[1], user_id=1
+@pytest.mark.asyncio
+async def test_update_items_rejects_duplicate_and_unknown_items(
+    mock_pantry_item_accessor,
+    mock_logging_provider,
+    mock_pantry_context_service,
+    secret_provider,
+):
+    service = PantryService(
+        mock_pantry_item_accessor,
+        mock_logging_provider,
+        mock_pantry_context_service,
+        secret_provider,
     )
 
+    with pytest.raises(ValueError, match="once per batch"):
+        await service.update_items(
+            user_id=1,
+            specs=[UpdatePantryItemSpec(id=1), UpdatePantryItemSpec(id=1)],
+        )
+    mock_pantry_item_accessor.update_items.assert_not_awaited()
+
+    mock_pantry_item_accessor.update_items.return_value = None
+    with pytest.raises(ValueError, match="do not belong to the user"):
+        await service.update_items(user_id=1, specs=[UpdatePantryItemSpec(id=9)])
+    mock_pantry_context_service.bump_version.assert_not_awaited()
+
 
 @pytest.mark.asyncio
-async def test_get_items_sorted_by_expiry(
-    mock_pantry_item_accessor, mock_logging_provider
+async def test_delete_items_success(
+    mock_pantry_item_accessor,
+    mock_logging_provider,
+    mock_pantry_context_service,
+    secret_provider,
 ):
-    now = datetime.now(timezone.utc)
-    items = [
-        PantryItemDomain(
-            id=1,
-            user_id=1,
-            item_name="A",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now + timedelta(days=2),
-            created_at=now,
-            updated_at=now,
-        ),
-        PantryItemDomain(
-            id=2,
-            user_id=1,
-            item_name="B",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now + timedelta(days=1),
-            created_at=now,
-            updated_at=now,
-        ),
-        PantryItemDomain(
-            id=3,
-            user_id=1,
-            item_name="C",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=None,
-            created_at=now,
-            updated_at=now,
-        ),
-    ]
+    mock_pantry_item_accessor.delete_items.return_value = []
 
-    mock_pantry_item_accessor.get_items_by_user.return_value = items
-
-    service = PantryService(mock_pantry_item_accessor, mock_logging_provider)
-    result = await service.get_items_sorted_by_expiry(user_id=1)
+    service = PantryService(
+        mock_pantry_item_accessor,
+        mock_logging_provider,
+        mock_pantry_context_service,
+        secret_provider,
+    )
+    spec = DeletePantryItemsSpec(item_ids=[1])
 
-    assert [i.id for i in result] == [2, 1, 3]
+    await service.delete_items(user_id=1, spec=spec)
+    mock_pantry_item_accessor.delete_items.assert_awaited_once_with(
+        item_ids=[1], user_id=1, soft=False
+    )
+    mock_pantry_item_accessor.get_items_by_ids.assert_not_awaited()
+    mock_pantry_context_service.bump_version.assert_awaited_once_with(1)
 
 
 @pytest.mark.asyncio
-async def test_get_pantry_stats(mock_pantry_item_accessor, mock_logging_provider):
-    now = DateTimeUtils.get_utc_now()
-    items = [
-        PantryItemDomain(
-            id=1,
-            user_id=1,
-            item_name="Expired",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now - timedelta(days=1),
-            created_at=now,
-            updated_at=now,
-        ),
-        PantryItemDomain(
-            id=2,
-            user_id=1,
-            item_name="Today",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now,
-            created_at=now,
-            updated_at=now,
-        ),
-        PantryItemDomain(
-            id=3,
-            user_id=1,
-            item_name="Soon",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now + timedelta(days=3),
-            created_at=now,
-            updated_at=now,
-        ),
-        PantryItemDomain(
-            id=4,
-            user_id=1,
-            item_name="Later",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now + timedelta(days=20),
-            created_at=now,
-            updated_at=now,
-        ),
-    ]
-
-    mock_pantry_item_accessor.get_items_by_user.return_value = items
+async def test_delete_items_reports_missing_ids_and_soft_deletes_when_enabled(
+    mock_pantry_item_accessor,
+    mock_logging_provider,
+    mock_pantry_context_service,
+    mock_secret_key_provider,
+):
+    mock_secret_key_provider.get_secret.side_effect = lambda key, default=None: (
+        "True" if key == SecretKey.PANTRY_SOFT_DELETE else default
+    )
+    mock_pantry_item_accessor.delete_items.return_value = [2]
 
-    service = PantryService(mock_pantry_item_accessor, mock_logging_provider)
-    stats = await service.get_pantry_stats(user_id=1)
+    service = PantryService(
+        mock_pantry_item_accessor,
+        mock_logging_provider,
+        mock_pantry_context_service,
+        mock_secret_key_provider,
+    )
+    with pytest.raises(ValueError, match=r"do not belong to the user: \{2\}"):
+        await service.delete_items(
+            user_id=1, spec=DeletePantryItemsSpec(item_ids=[1, 2])
+        )
 
-    assert stats.total_items == 4
-    assert stats.expired == 1
-    assert stats.expiring_today == 1
-    assert stats.expiring_soon == 1
+    mock_pantry_item_accessor.delete_items.assert_awaited_once_with(
+        item_ids=[1, 2], user_id=1, soft=True
+    )
+    mock_pantry_context_service.bump_version.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_get_expiring_items(mock_pantry_item_accessor, mock_logging_provider):
-    now = DateTimeUtils.get_utc_now()
-    items = [
-        PantryItemDomain(
-            id=1,
-            user_id=1,
-            item_name="Expired",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now - timedelta(days=1),
-            created_at=now,
-            updated_at=now,
-        ),
-        PantryItemDomain(
-            id=2,
-            user_id=1,
-            item_name="Soon",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now + timedelta(days=3),
-            created_at=now,
-            updated_at=now,
-        ),
-        PantryItemDomain(
-            id=3,
-            user_id=1,
-            item_name="Later",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now + timedelta(days=10),
-            created_at=now,
-            updated_at=now,
-        ),
-    ]
-
-    mock_pantry_item_accessor.get_items_by_user.return_value = items
+async def test_get_pantry_stats(
+    mock_pantry_item_accessor,
+    mock_logging_provider,
+    mock_pantry_context_service,
+    secret_provider,
+    monkeypatch,
+):
+    now = datetime(2025, 6, 10, 15, 30, tzinfo=timezone.utc)
+    monkeypatch.setattr(DateTimeUtils, "get_utc_now", lambda: now)
+    expected = PantryStatsDomain(
+        total_items=4, expiring_soon=1, expiring_today=1, expired=1
+    )
+    mock_pantry_item_accessor.get_expiry_stats.return_value = expected
 
-    service = PantryService(mock_pantry_item_accessor, mock_logging_provider)
-    result = await service.get_expiring_items(user_id=1)
+    service = PantryService(
+        mock_pantry_item_accessor,
+        mock_logging_provider,
+        mock_pantry_context_service,
+        secret_provider,
+    )
+    stats = await service.get_pantry_stats(user_id=1)
 
-    assert [i.id for i in result] == [1, 2]
+    assert stats == expected
+    mock_pantry_item_accessor.get_expiry_stats.assert_awaited_once_with(
+        1, today=date(2025, 6, 10), soon_until=date(2025, 6, 17)
+    )
+    mock_pantry_item_accessor.get_items_by_user.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_get_expiring_items_handles_naive_datetimes(
-    mock_pantry_item_accessor, mock_logging_provider, monkeypatch
+async def test_get_expiring_items(
+    mock_pantry_item_accessor,
+    mock_logging_provider,
+    mock_pantry_context_service,
+    secret_provider,
+    monkeypatch,
 ):
-    """Ensure naive expiry dates do not cause comparison errors."""
+    """The accessor returns the top three; naive expiry dates come back as UTC."""
     now = DateTimeUtils.get_utc_now()
     monkeypatch.setattr(DateTimeUtils, "get_utc_now", lambda: now)
     items = [
@@ -338,93 +331,54 @@ async def test_get_expiring_items_handles_naive_datetimes(
             unit=Unit.GRAMS,
             category=Category.FRUITS,
             purchase_date=None,
-            expiry_date=(now + timedelta(days=3)).replace(tzinfo=None),
+            expiry_date=now + timedelta(days=3),
             created_at=now,
             updated_at=now,
         ),
     ]
+    mock_pantry_item_accessor.get_items_expiring_before.return_value = items
 
-    mock_pantry_item_accessor.get_items_by_user.return_value = items
-
-    service = PantryService(mock_pantry_item_accessor, mock_logging_provider)
+    service = PantryService(
+        mock_pantry_item_accessor,
+        mock_logging_provider,
+        mock_pantry_context_service,
+        secret_provider,
+    )
     result = await service.get_expiring_items(user_id=1)
 
     assert [i.id for i in result] == [1, 2]
+    assert all(i.expiry_date.tzinfo is not None for i in result)
+    mock_pantry_item_accessor.get_items_expiring_before.assert_awaited_once_with(
+        1, expires_before=now + timedelta(days=7), limit=3
+    )
 
 
 @pytest.mark.asyncio
-async def test_get_expiring_items_returns_top_three(
-    mock_pantry_item_accessor, mock_logging_provider, monkeypatch
+async def test_get_items_page_sets_cursor_and_drops_unrequested_expiry(
+    mock_pantry_item_accessor,
+    mock_logging_provider,
+    mock_pantry_context_service,
+    secret_provider,
 ):
-    """Only the three soonest expiring items are returned."""
-    now = DateTimeUtils.get_utc_now()
-    monkeypatch.setattr(DateTimeUtils, "get_utc_now", lambda: now)
-    items = [
-        PantryItemDomain(
-            id=1,
-            user_id=1,
-            item_name="Expired",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now - timedelta(days=1),
-            created_at=now,
-            updated_at=now,
-        ),
-        PantryItemDomain(
-            id=2,
-            user_id=1,
-            item_name="Soon1",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now + timedelta(days=1),
-            created_at=now,
-            updated_at=now,
-        ),
-        PantryItemDomain(
-            id=3,
-            user_id=1,
-            item_name="Soon2",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now + timedelta(days=2),
-            created_at=now,
-            updated_at=now,
-        ),
-        PantryItemDomain(
-            id=4,
-            user_id=1,
-            item_name="Soon3",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now + timedelta(days=3),
-            created_at=now,
-            updated_at=now,
-        ),
-        PantryItemDomain(
-            id=5,
-            user_id=1,
-            item_name="Soon4",
-            quantity=1,
-            unit=Unit.GRAMS,
-            category=Category.FRUITS,
-            purchase_date=None,
-            expiry_date=now + timedelta(days=4),
-            created_at=now,
-            updated_at=now,
-        ),
+    expiry = datetime(2025, 6, 2, 10, 0)
+    mock_pantry_item_accessor.get_items_page.return_value = [
+        {"id": 1, "item_name": "A", "expiry_date": datetime(2025, 6, 1, 10, 0)},
+        {"id": 2, "item_name": "B", "expiry_date": expiry},
+        {"id": 3, "item_name": "C", "expiry_date": None},
     ]
 
-    mock_pantry_item_accessor.get_items_by_user.return_value = items
-
-    service = PantryService(mock_pantry_item_accessor, mock_logging_provider)
-    result = await service.get_expiring_items(user_id=1)
+    service = PantryService(
+        mock_pantry_item_accessor,
+        mock_logging_provider,
+        mock_pantry_context_service,
+        secret_provider,
+    )
+    page = await service.get_items_page(
+        user_id=1, spec=ListPantryItemsSpec(limit=2, fields=["item_name"])
+    )
 
-    assert [i.id for i in result] == [1, 2, 3]
+    query = mock_pantry_item_accessor.get_items_page.await_args.args[1]
+    assert query.limit == 3  # One extra row to detect the next page
+    assert page.items == [{"id": 1, "item_name": "A"}, {"id": 2, "item_name": "B"}]
+    assert page.next_cursor == PantryListCursor(expiry_date=expiry, id=2)
+    assert PantryListCursor.decode(page.next_cursor.encode()) == page.next_cursor
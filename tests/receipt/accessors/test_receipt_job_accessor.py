@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+from src.core.common.utils import DateTimeUtils
+from src.core.pantry.constants import Category, Unit
+from src.core.pantry.models import PantryItemDomain
+from src.core.receipt.constants import ReceiptJobStatus
+from src.pantrypal_api.pantry.models import PantryItem
+from src.pantrypal_api.receipt.accessors.receipt_job_accessor import (
+    ReceiptJobAccessor,
+)
+
+
+@pytest.fixture
+def accessor(mock_relational_database_provider, mock_logging_provider):
+    return ReceiptJobAccessor(
+        db_provider=mock_relational_database_provider,
+        logging_provider=mock_logging_provider,
+    )
+
+
+@pytest.mark.asyncio
+async def test_enqueue_is_idempotent_per_receipt(accessor):
+    first = await accessor.enqueue(1, "r-1", {"Items": [{"ITEM": "Apple"}]})
+    again = await accessor.enqueue(1, "r-1", {"Items": []})
+
+    assert again.id == first.id
+    assert again.payload == {"Items": [{"ITEM": "Apple"}]}
+    assert again.status == ReceiptJobStatus.PENDING
+    assert (await accessor.get_job(1, "r-1")).id == first.id
+    assert await accessor.get_job(2, "r-1") is None
+
+    # Receipt ids come from the webhook body; another user's job is never shared
+    other_user = await accessor.enqueue(2, "r-1", {"Items": []})
+    assert other_user.id != first.id
+    assert other_user.user_id == 2
+    assert (await accessor.get_job(2, "r-1")).payload == {"Items": []}
+
+
+@pytest.mark.asyncio
+async def test_claim_next_leases_oldest_due_job(accessor):
+    first = await accessor.enqueue(1, "r-1", {})
+    second = await accessor.enqueue(1, "r-2", {})
+
+    claimed = [await accessor.claim_next(lease_seconds=60) for _ in range(3)]
+
+    assert [job.id if job else None for job in claimed] == [first.id, second.id, None]
+    assert claimed[0].status == ReceiptJobStatus.RUNNING
+    assert claimed[0].attempts == 1
+
+    later = DateTimeUtils.get_utc_now() + timedelta(minutes=5)
+    assert await accessor.retry_later(claimed[0], "boom", later)
+    assert await accessor.claim_next(lease_seconds=60) is None
+    job = await accessor.get_job(1, "r-1")
+    assert job.status == ReceiptJobStatus.PENDING
+    assert job.last_error == "boom"
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed_and_fences_stale_worker(
+    accessor, mock_relational_database_provider
+):
+    await accessor.enqueue(1, "r-1", {})
+    stale = await accessor.claim_next(lease_seconds=0)
+
+    reclaimed = await accessor.claim_next(lease_seconds=60)
+
+    assert reclaimed.id == stale.id
+    assert reclaimed.attempts == 2
+    # The first worker's lease is gone, so its result and items are discarded
+    apple = PantryItemDomain.create(
+        user_id=1,
+        item_name="Apple",
+        quantity=1,
+        unit=Unit.PIECES,
+        category=Category.FRUITS,
+    )
+    assert await accessor.complete(stale, [apple]) is False
+    assert await accessor.complete(reclaimed, [apple]) is True
+    assert (await accessor.get_job(1, "r-1")).status == ReceiptJobStatus.DONE
+    async with mock_relational_database_provider.get_db() as db:
+        result = await db.execute(select(PantryItem.item_name))
+        assert result.scalars().all() == ["Apple"]
+    assert await accessor.claim_next(lease_seconds=60) is None
+
+
+@pytest.mark.asyncio
+async def test_get_statuses_returns_queued_receipts(accessor):
+    await accessor.enqueue(1, "r-1", {})
+    second = await accessor.enqueue(2, "r-2", {})
+    await accessor.complete(await accessor.claim_next(lease_seconds=60))
+
+    statuses = await accessor.get_statuses(["r-1", "r-2", "r-unknown"])
+
+    assert statuses == {
+        (1, "r-1"): ReceiptJobStatus.DONE,
+        (second.user_id, "r-2"): ReceiptJobStatus.PENDING,
+    }
+    assert await accessor.get_statuses([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_extend_lease_is_fenced(accessor):
+    await accessor.enqueue(1, "r-1", {})
+    stale = await accessor.claim_next(lease_seconds=0)
+    reclaimed = await accessor.claim_next(lease_seconds=0)
+
+    assert await accessor.extend_lease(stale, 60) is False
+    assert await accessor.extend_lease(reclaimed, 60) is True
+    assert await accessor.claim_next(lease_seconds=60) is None
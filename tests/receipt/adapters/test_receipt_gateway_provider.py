@@ -0,0 +1,167 @@
+import json
+
+import httpx
+import pytest
+
+from src.pantrypal_api.receipt.adapters import receipt_gateway_provider
+from src.pantrypal_api.receipt.adapters.receipt_gateway_provider import (
+    HttpReceiptGatewayProvider,
+)
+
+
+def make_secret_provider(mock_secret_key_provider, **overrides):
+    values = {
+        "RECEIPT_GATEWAY_CONNECTIONS": "5",
+        "RECEIPT_GATEWAY_TIMEOUT_SECONDS": "5",
+        "RECEIPT_GATEWAY_RETRIES": "2",
+    }
+    values.update(overrides)
+    mock_secret_key_provider.get_secret.side_effect = lambda key, default=None: (
+        values.get(key.value, default)
+    )
+    return mock_secret_key_provider
+
+
+# Real provider whose shared client sends requests to an in-memory handler
+def make_provider(mock_secret_key_provider, mock_logging_provider, handler, **secrets):
+    provider = HttpReceiptGatewayProvider(
+        secret_provider=make_secret_provider(mock_secret_key_provider, **secrets),
+        logging_provider=mock_logging_provider,
+    )
+    provider._HttpReceiptGatewayProvider__client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+    return provider
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(receipt_gateway_provider, "RETRY_BASE_SECONDS", 0)
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_payload_as_json(
+    mock_secret_key_provider, mock_logging_provider
+):
+    requests = []
+
+    async def handler(request: httpx.Request):
+        requests.append((request, await request.aread()))
+        return httpx.Response(200)
+
+    provider = make_provider(mock_secret_key_provider, mock_logging_provider, handler)
+    payload = {
+        "user_id": "1",
+        "receipt_id": "r.jpg",
+        "image_base64": "QUJD" * 50_000,
+    }
+
+    status = await provider.upload_receipt("https://gateway.test/upload", payload)
+    await provider.upload_receipt("https://gateway.test/upload", payload)
+
+    assert status == 200
+    assert len(requests) == 2
+    request, body = requests[0]
+    assert json.loads(body) == payload
+    assert request.headers["Content-Length"] == str(len(body))
+    assert "Transfer-Encoding" not in request.headers
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_retried(
+    mock_secret_key_provider, mock_logging_provider
+):
+    statuses = iter([503, 502, 200])
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request)
+        return httpx.Response(next(statuses), json={"Items": []})
+
+    provider = make_provider(mock_secret_key_provider, mock_logging_provider, handler)
+
+    status, data = await provider.fetch_receipt_result(
+        "https://gateway.test/result", {"receipt_id": "r.jpg"}
+    )
+
+    assert (status, data) == (200, {"Items": []})
+    assert len(calls) == 3
+    assert mock_logging_provider.warning.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_at_limit_and_skip_client_errors(
+    mock_secret_key_provider, mock_logging_provider
+):
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request)
+        return httpx.Response(404 if "missing" in str(request.url) else 500)
+
+    provider = make_provider(
+        mock_secret_key_provider,
+        mock_logging_provider,
+        handler,
+        RECEIPT_GATEWAY_RETRIES="1",
+    )
+
+    assert await provider.upload_receipt("https://gateway.test/upload", {}) == 500
+    assert len(calls) == 2
+    status, data = await provider.fetch_receipt_result(
+        "https://gateway.test/missing", {}
+    )
+    assert (status, data) == (404, None)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_transport_errors_are_retried(
+    mock_secret_key_provider, mock_logging_provider
+):
+    failures = [httpx.ConnectError("connection refused")]
+
+    def handler(request: httpx.Request):
+        if failures:
+            raise failures.pop()
+        return httpx.Response(202)
+
+    provider = make_provider(mock_secret_key_provider, mock_logging_provider, handler)
+
+    status, _ = await provider.fetch_receipt_result("https://gateway.test/result", {})
+    assert status == 202
+
+
+@pytest.mark.asyncio
+async def test_client_is_created_once_and_closed(
+    mock_secret_key_provider, mock_logging_provider
+):
+    provider = HttpReceiptGatewayProvider(
+        secret_provider=make_secret_provider(mock_secret_key_provider),
+        logging_provider=mock_logging_provider,
+    )
+
+    client = provider._HttpReceiptGatewayProvider__get_client()
+    assert provider._HttpReceiptGatewayProvider__get_client() is client
+
+    await provider.close()
+    assert client.is_closed
+    await provider.close()
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"RECEIPT_GATEWAY_CONNECTIONS": "0"},
+        {"RECEIPT_GATEWAY_TIMEOUT_SECONDS": "soon"},
+        {"RECEIPT_GATEWAY_RETRIES": "-1"},
+    ],
+)
+def test_invalid_config_raises(
+    mock_secret_key_provider, mock_logging_provider, overrides
+):
+    with pytest.raises(ValueError):
+        HttpReceiptGatewayProvider(
+            secret_provider=make_secret_provider(mock_secret_key_provider, **overrides),
+            logging_provider=mock_logging_provider,
+        )
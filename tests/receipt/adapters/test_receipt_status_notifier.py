@@ -0,0 +1,72 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.receipt.constants import ReceiptJobStatus, ReceiptStatus
+from src.pantrypal_api.receipt.adapters.receipt_status_notifier import (
+    DatabaseReceiptStatusNotifier,
+    InProcessReceiptStatusNotifier,
+)
+
+
+def make_secret_provider(**values):
+    provider = MagicMock()
+    provider.get_secret.side_effect = lambda key, default=None: values.get(
+        key.value, default
+    )
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_publish_wakes_only_waiters_on_that_receipt():
+    notifier = InProcessReceiptStatusNotifier()
+
+    async with notifier.subscribe(1, "r-1") as first:
+        async with notifier.subscribe(1, "r-1") as second:
+            async with notifier.subscribe(2, "r-1") as other_user:
+                await notifier.publish(1, "r-1", ReceiptStatus.PROCESSED)
+
+                assert await first == ReceiptStatus.PROCESSED
+                assert await second == ReceiptStatus.PROCESSED
+                assert not other_user.done()
+        assert notifier.has_subscribers(1, "r-1")
+
+    assert not notifier.has_subscribers(1, "r-1")
+    await notifier.publish(1, "r-1", ReceiptStatus.FAILED)
+
+
+@pytest.mark.asyncio
+async def test_database_notifier_sees_jobs_finished_elsewhere(mock_logging_provider):
+    job_accessor = MagicMock()
+    job_accessor.get_statuses = AsyncMock(
+        side_effect=[
+            {(1, "r-1"): ReceiptJobStatus.RUNNING},
+            {(1, "r-1"): ReceiptJobStatus.DONE, (1, "r-2"): ReceiptJobStatus.FAILED},
+        ]
+    )
+    notifier = DatabaseReceiptStatusNotifier(
+        job_accessor=job_accessor,
+        secret_provider=make_secret_provider(RECEIPT_STATUS_POLL_SECONDS="0.01"),
+        logging_provider=mock_logging_provider,
+    )
+
+    async with notifier.subscribe(1, "r-1") as done:
+        async with notifier.subscribe(1, "r-2") as failed:
+            assert await asyncio.wait_for(done, 1) == ReceiptStatus.PROCESSED
+            assert await asyncio.wait_for(failed, 1) == ReceiptStatus.FAILED
+
+    # One query per poll covers every awaited receipt
+    assert sorted(job_accessor.get_statuses.await_args.args[0]) == ["r-1", "r-2"]
+    await asyncio.sleep(0.05)
+    assert job_accessor.get_statuses.await_count == 2
+    await notifier.close()
+
+
+def test_invalid_poll_interval_raises(mock_logging_provider):
+    with pytest.raises(ValueError, match="RECEIPT_STATUS_POLL_SECONDS"):
+        DatabaseReceiptStatusNotifier(
+            job_accessor=MagicMock(),
+            secret_provider=make_secret_provider(RECEIPT_STATUS_POLL_SECONDS="0"),
+            logging_provider=mock_logging_provider,
+        )
@@ -0,0 +1,82 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from src.core.receipt.accessors.receipt_job_accessor import IReceiptJobAccessor
+from src.core.receipt.constants import ReceiptJobStatus, ReceiptStatus
+from src.core.receipt.ports.receipt_status_notifier import IReceiptStatusNotifier
+from src.pantrypal_api.modules import injector
+
+
+@pytest.mark.asyncio
+class TestReceiptWebhook:
+    async def test_webhook_queues_receipt_once(self, async_client: AsyncClient):
+        payload = {
+            "user_id": 1,
+            "receipt_id": "r-1.jpg",
+            "receipt": {"Items": [{"ITEM": "Apple"}]},
+        }
+
+        first = await async_client.post("/receipt/webhook", json=payload)
+        again = await async_client.post("/receipt/webhook", json=payload)
+
+        assert first.status_code == 202
+        assert first.json() == {"receipt_id": "r-1.jpg", "status": "pending"}
+        assert again.status_code == 202
+        job = await injector.get(IReceiptJobAccessor).get_job(1, "r-1.jpg")
+        assert job.status == ReceiptJobStatus.PENDING
+        assert job.payload == payload["receipt"]
+
+    async def test_webhook_without_receipt_id_uses_content_key(
+        self, async_client: AsyncClient
+    ):
+        payload = {"user_id": 1, "receipt": {"Items": [{"ITEM": "Apple"}]}}
+
+        first = await async_client.post("/receipt/webhook", json=payload)
+        again = await async_client.post("/receipt/webhook", json=payload)
+
+        assert first.status_code == 202
+        assert first.json()["receipt_id"].startswith("webhook-")
+        assert again.json()["receipt_id"] == first.json()["receipt_id"]
+
+
+async def login(async_client: AsyncClient):
+    email = f"{uuid4()}@example.com"
+    await async_client.post(
+        "/account/register",
+        json={"username": "receiptuser", "email": email, "password": "password123"},
+    )
+    response = await async_client.post(
+        "/account/login", json={"email": email, "password": "password123"}
+    )
+    data = response.json()
+    return data["user_id"], {"Authorization": f"Bearer {data['token']}"}
+
+
+@pytest.mark.asyncio
+class TestReceiptResultWait:
+    async def test_wait_returns_once_receipt_is_processed(
+        self, async_client: AsyncClient
+    ):
+        user_id, headers = await login(async_client)
+        await async_client.post(
+            "/receipt/webhook",
+            json={"user_id": user_id, "receipt_id": "r-1.jpg", "receipt": {}},
+        )
+        notifier = injector.get(IReceiptStatusNotifier)
+
+        pending = await async_client.get(
+            "/receipt/result/r-1.jpg/wait", params={"timeout": 0.05}, headers=headers
+        )
+        waiting = asyncio.create_task(
+            async_client.get("/receipt/result/r-1.jpg/wait", headers=headers)
+        )
+        while not notifier.has_subscribers(user_id, "r-1.jpg"):
+            await asyncio.sleep(0.01)
+        await notifier.publish(user_id, "r-1.jpg", ReceiptStatus.PROCESSED)
+
+        assert pending.status_code == 202
+        assert pending.json() == {"status": "pending"}
+        assert (await asyncio.wait_for(waiting, 5)).status_code == 204
@@ -0,0 +1,233 @@
+import asyncio
+import base64
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.common.constants import SecretKey
+from src.core.receipt.constants import ReceiptStatus
+from src.core.receipt.models import ReceiptResultDomain
+from src.core.receipt.services.receipt_dedup_service import ReceiptDedupService
+from src.core.receipt.services.receipt_gateway_service import ReceiptGatewayService
+from src.pantrypal_api.receipt.accessors.receipt_result_accessor import (
+    ReceiptResultAccessor,
+)
+from src.pantrypal_api.receipt.accessors.receipt_upload_accessor import (
+    ReceiptUploadAccessor,
+)
+from src.pantrypal_api.receipt.adapters.receipt_status_notifier import (
+    InProcessReceiptStatusNotifier,
+)
+
+IMAGE = base64.b64encode(b"\xff\xd8 receipt photo \xff\xd9").decode()
+
+
+@pytest.fixture
+def job_service():
+    service = MagicMock()
+    service.get_status = AsyncMock(return_value=None)
+    service.enqueue = AsyncMock()
+    return service
+
+
+@pytest.fixture
+def gateway_provider():
+    provider = MagicMock()
+    provider.upload_receipt = AsyncMock(return_value=200)
+    return provider
+
+
+@pytest.fixture
+def dedup_service(mock_relational_database_provider, job_service):
+    return ReceiptDedupService(
+        upload_accessor=ReceiptUploadAccessor(
+            mock_relational_database_provider, MagicMock()
+        ),
+        job_service=job_service,
+        logging_provider=MagicMock(),
+    )
+
+
+@pytest.fixture
+def result_accessor(mock_relational_database_provider):
+    return ReceiptResultAccessor(mock_relational_database_provider, MagicMock())
+
+
+@pytest.fixture
+def status_notifier():
+    return InProcessReceiptStatusNotifier()
+
+
+def make_service(
+    job_service, gateway_provider, result_accessor, dedup_service, notifier
+):
+    secrets = {
+        SecretKey.RECEIPT_UPLOAD_ENDPOINT: "https://gateway/upload",
+        SecretKey.RECEIPT_RETRIEVE_ENDPOINT: "https://gateway/result",
+        SecretKey.RECEIPT_RESULT_POLL_SECONDS: "0.01",
+    }
+    secret_provider = MagicMock()
+    secret_provider.get_secret.side_effect = lambda key, default=None: secrets.get(
+        key, default
+    )
+    return ReceiptGatewayService(
+        secret_provider=secret_provider,
+        logging_provider=MagicMock(),
+        job_service=job_service,
+        gateway_provider=gateway_provider,
+        receipt_result_accessor=result_accessor,
+        dedup_service=dedup_service,
+        status_notifier=notifier,
+    )
+
+
+@pytest.fixture
+def service(
+    job_service, gateway_provider, result_accessor, dedup_service, status_notifier
+):
+    return make_service(
+        job_service, gateway_provider, result_accessor, dedup_service, status_notifier
+    )
+
+
+# Waiting requests run concurrently, so results live in a mock rather than in the
+# shared in-memory test session
+@pytest.fixture
+def waiting_service(job_service, gateway_provider, status_notifier):
+    result_accessor = MagicMock()
+    result_accessor.get_result = AsyncMock(return_value=None)
+    result_accessor.add_result = AsyncMock()
+    return make_service(
+        job_service, gateway_provider, result_accessor, MagicMock(), status_notifier
+    )
+
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_reuses_receipt_without_gateway_call(
+    service, gateway_provider, result_accessor, dedup_service
+):
+    first = await service.upload_receipt(1, IMAGE)
+    await result_accessor.add_result(
+        ReceiptResultDomain.create(
+            user_id=1, receipt_id=first["receipt_id"], result={"Items": []}
+        )
+    )
+
+    # Same bytes, wrapped like a data URL with line breaks
+    again = await service.upload_receipt(
+        1,
+        "data:image/jpeg;base64,"
+        + base64.encodebytes(base64.b64decode(IMAGE)).decode(),
+    )
+
+    assert again == {
+        "receipt_id": first["receipt_id"],
+        "duplicate": True,
+        "result": {"Items": []},
+    }
+    assert gateway_provider.upload_receipt.await_count == 1
+    assert dedup_service.stats() == {
+        "lookups": 2,
+        "hits": 1,
+        "hit_rate": 0.5,
+        "gateway_calls_saved": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_same_image_from_another_user_is_uploaded(service, gateway_provider):
+    first = await service.upload_receipt(1, IMAGE)
+    other = await service.upload_receipt(2, IMAGE)
+
+    assert other["receipt_id"] != first["receipt_id"]
+    assert "duplicate" not in other
+    assert gateway_provider.upload_receipt.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_receipt_is_uploaded_again(service, gateway_provider, job_service):
+    first = await service.upload_receipt(1, IMAGE)
+    job_service.get_status.return_value = ReceiptStatus.FAILED
+
+    retry = await service.upload_receipt(1, IMAGE)
+
+    assert retry["receipt_id"] != first["receipt_id"]
+    assert gateway_provider.upload_receipt.await_count == 2
+    job_service.get_status.return_value = None
+    assert (await service.upload_receipt(1, IMAGE))["receipt_id"] == (
+        retry["receipt_id"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_failed_gateway_upload_is_not_recorded(service, gateway_provider):
+    gateway_provider.upload_receipt.return_value = 500
+    assert await service.upload_receipt(1, IMAGE) is None
+
+    gateway_provider.upload_receipt.return_value = 200
+    assert "duplicate" not in await service.upload_receipt(1, IMAGE)
+
+
+@pytest.mark.asyncio
+async def test_invalid_base64_raises(service, gateway_provider):
+    with pytest.raises(ValueError):
+        await service.upload_receipt(1, "not base64!")
+    gateway_provider.upload_receipt.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_waiting_requests_share_one_gateway_poller(
+    waiting_service, gateway_provider, job_service, status_notifier
+):
+    gateway_provider.fetch_receipt_result = AsyncMock(
+        side_effect=[(202, None), (202, None), (200, {"Items": []})]
+    )
+
+    async def worker_finishes(user_id, receipt_id, result):
+        await status_notifier.publish(user_id, receipt_id, ReceiptStatus.PROCESSED)
+
+    job_service.enqueue.side_effect = worker_finishes
+
+    statuses = await asyncio.gather(
+        waiting_service.wait_for_result(1, "r-1.jpg", timeout=2),
+        waiting_service.wait_for_result(1, "r-1.jpg", timeout=2),
+    )
+
+    assert statuses == [ReceiptStatus.PROCESSED, ReceiptStatus.PROCESSED]
+    assert gateway_provider.fetch_receipt_result.await_count == 3
+    job_service.enqueue.assert_awaited_once_with(1, "r-1.jpg", {"Items": []})
+    assert not waiting_service._pollers
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_as_pending_and_stops_polling(
+    waiting_service, gateway_provider
+):
+    gateway_provider.fetch_receipt_result = AsyncMock(return_value=(202, None))
+
+    status = await waiting_service.wait_for_result(1, "r-1.jpg", timeout=0.05)
+    await asyncio.sleep(0.05)
+
+    assert status == ReceiptStatus.PENDING
+    assert not waiting_service._pollers
+    polls = gateway_provider.fetch_receipt_result.await_count
+    await asyncio.sleep(0.05)
+    assert gateway_provider.fetch_receipt_result.await_count == polls
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_known_status_without_gateway_call(
+    waiting_service, gateway_provider, job_service
+):
+    gateway_provider.fetch_receipt_result = AsyncMock()
+    job_service.get_status.return_value = ReceiptStatus.FAILED
+
+    assert await waiting_service.wait_for_result(1, "r-1.jpg") == (ReceiptStatus.FAILED)
+    gateway_provider.fetch_receipt_result.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_gateway_error_wakes_waiting_request(waiting_service, gateway_provider):
+    gateway_provider.fetch_receipt_result = AsyncMock(return_value=(500, None))
+
+    assert await waiting_service.wait_for_result(1, "r-1.jpg", timeout=2) is None
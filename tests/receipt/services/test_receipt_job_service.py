@@ -0,0 +1,341 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.core.chatbot.ports.chatbot_provider import IChatbotProvider
+from src.core.common.utils import DateTimeUtils
+from src.core.receipt.constants import ReceiptJobStatus, ReceiptStatus
+from src.core.receipt.services import receipt_job_service
+from src.core.receipt.services.receipt_job_service import ReceiptJobService
+from src.core.receipt.services.receipt_service import ReceiptService
+from src.core.storage.ports.relational_database_provider import IDatabaseProvider
+from src.pantrypal_api.pantry.models import PantryItem
+from src.pantrypal_api.receipt.accessors.receipt_job_accessor import (
+    ReceiptJobAccessor,
+)
+from src.pantrypal_api.receipt.adapters.receipt_status_notifier import (
+    InProcessReceiptStatusNotifier,
+)
+from src.pantrypal_api.receipt.models import ReceiptJob
+
+
+class FakeChatbotProvider(IChatbotProvider):
+    """Classifies every receipt as one apple after ``latency`` seconds."""
+
+    def __init__(self, latency: float = 0.0, failures: int = 0, on_call=None):
+        self.latency = latency
+        self.failures = failures
+        self.on_call = on_call
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle_single_turn(self, message):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.on_call:
+                await self.on_call(self.calls)
+            await asyncio.sleep(self.latency)
+            if self.calls <= self.failures:
+                raise RuntimeError("LLM unavailable")
+            return '[{"ITEM": "Apple", "QUANTITY": 1}]'
+        finally:
+            self.in_flight -= 1
+
+    async def handle_multi_turn(self, messages):
+        raise NotImplementedError
+
+    async def stream_multi_turn(self, messages):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+def make_secret_provider(**values):
+    provider = MagicMock()
+    provider.get_secret.side_effect = lambda key, default=None: values.get(
+        key.value, default
+    )
+    return provider
+
+
+# Workers run concurrently, so each database call needs its own connection; the
+# shared in-memory test database would let one session roll back another's work
+@pytest_asyncio.fixture
+async def job_db_provider(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(ReceiptJob.__table__.create)
+        await conn.run_sync(PantryItem.__table__.create)
+    session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    @asynccontextmanager
+    async def get_db():
+        async with session_factory() as session:
+            yield session
+
+    provider = MagicMock(spec=IDatabaseProvider)
+    provider.get_db.side_effect = get_db
+    yield provider
+    await engine.dispose()
+
+
+async def stored_items(db_provider) -> int:
+    async with db_provider.get_db() as db:
+        return await db.scalar(select(func.count()).select_from(PantryItem))
+
+
+def make_service(chatbot_provider, db_provider, logging_provider, **config):
+    pantry_service = MagicMock()
+    pantry_service.add_items = AsyncMock()
+    pantry_context_service = MagicMock()
+    pantry_context_service.bump_version = AsyncMock()
+    expiry_service = MagicMock()
+    expiry_service.get_expiry_dates = AsyncMock(
+        side_effect=lambda queries: [date.today()] * len(queries)
+    )
+    # Every receipt here has the same line; keep it from being cached
+    item_cache_service = MagicMock()
+    item_cache_service.normalize.side_effect = str.upper
+    item_cache_service.get_many = AsyncMock(side_effect=lambda names: {})
+    item_cache_service.add_many = AsyncMock()
+    receipt_service = ReceiptService(
+        pantry_service=pantry_service,
+        chatbot_provider=chatbot_provider,
+        logging_provider=logging_provider,
+        expiry_service=expiry_service,
+        item_cache_service=item_cache_service,
+        secret_provider=make_secret_provider(),
+    )
+    accessor = ReceiptJobAccessor(db_provider, logging_provider)
+    service = ReceiptJobService(
+        accessor,
+        receipt_service,
+        make_secret_provider(**config),
+        logging_provider,
+        InProcessReceiptStatusNotifier(),
+        pantry_context_service,
+    )
+    return service, pantry_context_service
+
+
+@pytest.mark.asyncio
+async def test_workers_drain_queue_concurrently_within_limit(
+    job_db_provider, mock_logging_provider
+):
+    chatbot_provider = FakeChatbotProvider(latency=0.05)
+    service, pantry_context_service = make_service(
+        chatbot_provider,
+        job_db_provider,
+        mock_logging_provider,
+        RECEIPT_JOB_WORKERS="4",
+    )
+    receipt = {"Items": [{"ITEM": "Apple"}]}
+
+    start = time.perf_counter()
+    for i in range(20):
+        await service.enqueue(1, f"r-{i}", receipt)
+    enqueue_seconds = time.perf_counter() - start
+
+    service.start()
+    try:
+        while True:
+            statuses = [await service.get_status(1, f"r-{i}") for i in range(20)]
+            if all(s == ReceiptStatus.PROCESSED for s in statuses):
+                break
+            assert time.perf_counter() - start < 5, statuses
+            await asyncio.sleep(0.01)
+    finally:
+        await service.stop()
+    drain_seconds = time.perf_counter() - start
+
+    # Enqueueing does no classification work
+    assert enqueue_seconds < 20 * chatbot_provider.latency / 2
+    assert chatbot_provider.calls == 20
+    assert chatbot_provider.max_in_flight == 4
+    # Serially, 20 classifications take at least 1s
+    assert drain_seconds < 20 * chatbot_provider.latency * 0.75
+    assert await stored_items(job_db_provider) == 20
+    assert pantry_context_service.bump_version.await_count == 20
+
+
+@pytest.mark.asyncio
+async def test_enqueue_is_idempotent_without_receipt_id(
+    job_db_provider, mock_logging_provider
+):
+    service, _ = make_service(
+        FakeChatbotProvider(), job_db_provider, mock_logging_provider
+    )
+    receipt = {"Date": "01/06/2025", "Items": [{"ITEM": "Apple"}]}
+
+    first = await service.enqueue(1, None, receipt)
+    again = await service.enqueue(1, None, dict(receipt))
+    other_user = await service.enqueue(2, None, receipt)
+
+    assert again.id == first.id
+    assert other_user.id != first.id
+    assert await service.run_once()
+    assert await service.run_once()
+    assert not await service.run_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_with_backoff(
+    job_db_provider, mock_logging_provider, monkeypatch
+):
+    delays = []
+
+    def no_jitter(low, high):
+        delays.append(high)
+        return 0
+
+    monkeypatch.setattr(receipt_job_service.random, "uniform", no_jitter)
+    chatbot_provider = FakeChatbotProvider(failures=2)
+    service, _ = make_service(chatbot_provider, job_db_provider, mock_logging_provider)
+    await service.enqueue(1, "r-1", {"Items": [{"ITEM": "Apple"}]})
+
+    for _ in range(3):
+        assert await service.run_once()
+
+    assert delays == [2.0, 4.0]
+    job = await service.job_accessor.get_job(1, "r-1")
+    assert job.status == ReceiptJobStatus.DONE
+    assert job.attempts == 3
+    assert await stored_items(job_db_provider) == 1
+    assert mock_logging_provider.warning.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_job_fails_after_max_attempts(
+    job_db_provider, mock_logging_provider, monkeypatch
+):
+    monkeypatch.setattr(receipt_job_service.random, "uniform", lambda low, high: 0)
+    service, pantry_context_service = make_service(
+        FakeChatbotProvider(failures=10),
+        job_db_provider,
+        mock_logging_provider,
+        RECEIPT_JOB_MAX_ATTEMPTS="2",
+    )
+    await service.enqueue(1, "r-1", {"Items": [{"ITEM": "Apple"}]})
+
+    assert await service.run_once()
+    assert await service.run_once()
+    assert not await service.run_once()
+
+    assert await service.get_status(1, "r-1") == ReceiptStatus.FAILED
+    job = await service.job_accessor.get_job(1, "r-1")
+    assert job.last_error == "LLM unavailable"
+    assert await stored_items(job_db_provider) == 0
+    pantry_context_service.bump_version.assert_not_awaited()
+    mock_logging_provider.error.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_waiting_requests_are_woken_when_job_finishes(
+    job_db_provider, mock_logging_provider, monkeypatch
+):
+    monkeypatch.setattr(receipt_job_service.random, "uniform", lambda low, high: 0)
+    service, _ = make_service(
+        FakeChatbotProvider(failures=1),
+        job_db_provider,
+        mock_logging_provider,
+        RECEIPT_JOB_MAX_ATTEMPTS="1",
+    )
+    notifier = service.status_notifier
+    # The first job claimed meets the LLM failure
+    await service.enqueue(1, "r-bad", {"Items": [{"ITEM": "Apple"}]})
+    await service.enqueue(1, "r-ok", {"Items": [{"ITEM": "Apple"}]})
+
+    async with notifier.subscribe(1, "r-bad") as failed:
+        async with notifier.subscribe(1, "r-ok") as processed:
+            assert await service.run_once()
+            assert await service.run_once()
+            assert await asyncio.wait_for(failed, 1) == ReceiptStatus.FAILED
+            assert await asyncio.wait_for(processed, 1) == ReceiptStatus.PROCESSED
+
+
+@pytest.mark.asyncio
+async def test_lease_lost_mid_run_adds_items_once(
+    job_db_provider, mock_logging_provider
+):
+    async def expire_and_reprocess(call):
+        if call > 1:
+            return
+        # The first worker stalls past its lease; a second one takes the job over
+        async with job_db_provider.get_db() as db:
+            await db.execute(
+                update(ReceiptJob).values(locked_until=DateTimeUtils.get_utc_now())
+            )
+            await db.commit()
+        assert await other.run_once()
+
+    service, pantry_context_service = make_service(
+        FakeChatbotProvider(on_call=expire_and_reprocess),
+        job_db_provider,
+        mock_logging_provider,
+    )
+    other, other_context_service = make_service(
+        FakeChatbotProvider(), job_db_provider, mock_logging_provider
+    )
+    await service.enqueue(1, "r-1", {"Items": [{"ITEM": "Apple"}]})
+
+    assert await service.run_once()
+
+    job = await service.job_accessor.get_job(1, "r-1")
+    assert job.status == ReceiptJobStatus.DONE
+    assert job.attempts == 2
+    # Only the worker holding the lease could complete the job and add items
+    assert await stored_items(job_db_provider) == 1
+    other_context_service.bump_version.assert_awaited_once_with(1)
+    pantry_context_service.bump_version.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_lease_is_renewed_while_job_runs(job_db_provider, mock_logging_provider):
+    service, _ = make_service(
+        FakeChatbotProvider(latency=1.5),
+        job_db_provider,
+        mock_logging_provider,
+        RECEIPT_JOB_LEASE_SECONDS="1",
+    )
+    other, _ = make_service(
+        FakeChatbotProvider(), job_db_provider, mock_logging_provider
+    )
+    await service.enqueue(1, "r-1", {"Items": [{"ITEM": "Apple"}]})
+
+    running = asyncio.create_task(service.run_once())
+    while (
+        await service.job_accessor.get_job(1, "r-1")
+    ).status != ReceiptJobStatus.RUNNING:
+        await asyncio.sleep(0.01)
+    polls = []
+    while not running.done():
+        polls.append(await other.run_once())
+        await asyncio.sleep(0.1)
+
+    assert await running
+    assert not any(polls)  # Never reclaimed, though the run outlasted its lease
+    assert await stored_items(job_db_provider) == 1
+
+
+def test_invalid_worker_count_raises(mock_logging_provider):
+    with pytest.raises(ValueError, match="RECEIPT_JOB_WORKERS"):
+        make_service(
+            FakeChatbotProvider(),
+            MagicMock(spec=IDatabaseProvider),
+            mock_logging_provider,
+            RECEIPT_JOB_WORKERS="many",
+        )
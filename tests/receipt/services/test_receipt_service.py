@@ -1,13 +1,108 @@
-from datetime import date
+import asyncio
+import json
+import re
+from datetime import date, timedelta
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy import select, update
 
+from src.core.common.ports.secretkey_provider import ISecretProvider
+from src.core.common.utils import DateTimeUtils
+from src.core.pantry.constants import Category
+from src.core.receipt.services.receipt_item_cache_service import (
+    ReceiptItemCacheService,
+)
 from src.core.receipt.services.receipt_service import ReceiptService
+from src.pantrypal_api.receipt.accessors.receipt_item_classification_accessor import (
+    ReceiptItemClassificationAccessor,
+)
+from src.pantrypal_api.receipt.models import ReceiptItemClassification
+
+
+class FakeClassifier:
+    """Answers for the numbered lines of a prompt, at most ``max_answers`` of them."""
+
+    def __init__(self, max_answers: int = 1000, latency: float = 0.0):
+        self.max_answers = max_answers
+        self.latency = latency
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle_single_turn(self, message):
+        self.prompts.append(message.content)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        names = re.findall(r"^\d+\. (.*)$", message.content, re.MULTILINE)
+        answers = [
+            {"ITEM": name, "SUBCATEGORY": "Snacks", "QUANTITY": 1}
+            for name in names[: self.max_answers]
+        ]
+        # A truncated reply: the closing bracket of the list is cut off too
+        reply = json.dumps(answers)
+        return reply if len(answers) == len(names) else reply[:-1]
+
+
+def make_receipt_service(chatbot_provider, item_cache_service, **config):
+    pantry_service = MagicMock()
+    pantry_service.add_items = AsyncMock()
+    expiry_service = MagicMock()
+    expiry_service.get_expiry_dates = AsyncMock(
+        side_effect=lambda queries: [date.today()] * len(queries)
+    )
+    service = ReceiptService(
+        pantry_service=pantry_service,
+        chatbot_provider=chatbot_provider,
+        logging_provider=MagicMock(),
+        expiry_service=expiry_service,
+        item_cache_service=item_cache_service,
+        secret_provider=make_secret_provider(**config),
+    )
+    return service, pantry_service
+
+
+def make_secret_provider(**values):
+    provider = MagicMock(spec=ISecretProvider)
+    provider.get_secret.side_effect = lambda key, default=None: values.get(
+        key.value, default
+    )
+    return provider
+
+
+# Real item cache backed by the test database and the fake shared cache
+@pytest.fixture
+def item_cache_service(
+    mock_relational_database_provider, fake_cache_provider, mock_logging_provider
+):
+    return ReceiptItemCacheService(
+        ReceiptItemClassificationAccessor(
+            mock_relational_database_provider, mock_logging_provider
+        ),
+        fake_cache_provider,
+        make_secret_provider(),
+        mock_logging_provider,
+    )
+
+
+# Item cache without a table: chunks run concurrently, and concurrent writes on
+# the shared test database session would interfere with each other
+@pytest.fixture
+def memory_item_cache_service(fake_cache_provider, mock_logging_provider):
+    accessor = MagicMock()
+    accessor.get_by_names = AsyncMock(side_effect=lambda names, stored_after: {})
+    accessor.add_classifications = AsyncMock()
+    return ReceiptItemCacheService(
+        accessor, fake_cache_provider, make_secret_provider(), mock_logging_provider
+    )
 
 
 @pytest.mark.asyncio
-async def test_process_receipt_webhook_adds_items():
+async def test_process_receipt_webhook_adds_items(item_cache_service):
     pantry_service = MagicMock()
     pantry_service.add_items = AsyncMock()
 
@@ -17,13 +112,17 @@ async def test_process_receipt_webhook_adds_items():
     )
 
     expiry_service = MagicMock()
-    expiry_service.get_expiry_date = AsyncMock(return_value=date.today())
+    expiry_service.get_expiry_dates = AsyncMock(
+        side_effect=lambda queries: [date.today()] * len(queries)
+    )
 
     service = ReceiptService(
         pantry_service=pantry_service,
         chatbot_provider=chatbot_provider,
         logging_provider=MagicMock(),
         expiry_service=expiry_service,
+        item_cache_service=item_cache_service,
+        secret_provider=make_secret_provider(),
     )
 
     receipt_json = {"Items": [{"ITEM": "Apple"}]}
@@ -31,4 +130,348 @@ async def test_process_receipt_webhook_adds_items():
 
     assert pantry_service.add_items.await_count == 1
     chatbot_provider.handle_single_turn.assert_awaited()
-    expiry_service.get_expiry_date.assert_awaited()
+    expiry_service.get_expiry_dates.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_process_receipt_webhook_resolves_expiry_in_one_bulk_call(
+    item_cache_service,
+):
+    pantry_service = MagicMock()
+    pantry_service.add_items = AsyncMock()
+
+    chatbot_provider = MagicMock()
+    chatbot_provider.handle_single_turn = AsyncMock(
+        return_value='[{"ITEM": "Cheddar", "SUBCATEGORY": "Cheese", "QUANTITY": 2},'
+        ' {"ITEM": "Soap", "SUBCATEGORY": null, "QUANTITY": 1}]'
+    )
+
+    expiry_service = MagicMock()
+    expiry_service.get_expiry_dates = AsyncMock(
+        return_value=[date(2025, 6, 11), date(2025, 7, 1)]
+    )
+
+    service = ReceiptService(
+        pantry_service=pantry_service,
+        chatbot_provider=chatbot_provider,
+        logging_provider=MagicMock(),
+        expiry_service=expiry_service,
+        item_cache_service=item_cache_service,
+        secret_provider=make_secret_provider(),
+    )
+
+    receipt_json = {
+        "Date": "01/06/2025",
+        "Items": [{"ITEM": "Cheddar"}, {"ITEM": "Soap"}],
+    }
+    await service.process_receipt_webhook(user_id=1, receipt_json=receipt_json)
+
+    queries = expiry_service.get_expiry_dates.await_args.args[0]
+    assert [q.purchase_date for q in queries] == [date(2025, 6, 1)] * 2
+    specs = pantry_service.add_items.await_args.args[1]
+    assert [s.item_name for s in specs] == ["Cheddar", "Soap"]
+    assert [s.expiry_date.date() for s in specs] == [
+        date(2025, 6, 11),
+        date(2025, 7, 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_known_lines_skip_the_llm_and_keep_receipt_order(
+    item_cache_service, fake_cache_provider
+):
+    pantry_service = MagicMock()
+    pantry_service.add_items = AsyncMock()
+    chatbot_provider = MagicMock()
+    chatbot_provider.handle_single_turn = AsyncMock(
+        side_effect=[
+            '[{"ITEM": "Marigold HL Milk 1L", "SUBCATEGORY": "Fresh Milk",'
+            ' "QUANTITY": 1}, {"ITEM": "Soap", "SUBCATEGORY": null, "QUANTITY": 2}]',
+            '[{"ITEM": "Cheddar", "SUBCATEGORY": "Cheese", "QUANTITY": "3 pcs"}]',
+        ]
+    )
+    expiry_service = MagicMock()
+    expiry_service.get_expiry_dates = AsyncMock(
+        side_effect=lambda queries: [date.today()] * len(queries)
+    )
+    service = ReceiptService(
+        pantry_service=pantry_service,
+        chatbot_provider=chatbot_provider,
+        logging_provider=MagicMock(),
+        expiry_service=expiry_service,
+        item_cache_service=item_cache_service,
+        secret_provider=make_secret_provider(),
+    )
+
+    await service.process_receipt_webhook(
+        1, {"Items": [{"ITEM": "MARIGOLD HL MILK 1L"}, {"ITEM": "SOAP"}]}
+    )
+    await service.process_receipt_webhook(
+        2,
+        {
+            "Items": [
+                {"ITEM": "soap"},
+                {"ITEM": "CHEDDAR"},
+                {"ITEM": "Marigold  HL\nMilk 1L"},
+                {"ITEM": "CHEDDAR"},
+            ]
+        },
+    )
+
+    prompt = chatbot_provider.handle_single_turn.await_args_list[1].args[0].content
+    assert "1. CHEDDAR" in prompt
+    assert "MARIGOLD" not in prompt and "SOAP" not in prompt
+    specs = pantry_service.add_items.await_args_list[1].args[1]
+    assert [s.item_name for s in specs] == [
+        "Soap",
+        "Cheddar",
+        "Marigold HL Milk 1L",
+        "Cheddar",
+    ]
+    assert [s.quantity for s in specs] == [2.0, 3.0, 1.0, 3.0]
+    assert item_cache_service.stats()["memory_hits"] == 2
+
+    # Entries evicted from the in-process cache are read back from the table
+    await fake_cache_provider.clear()
+    await service.process_receipt_webhook(3, {"Items": [{"ITEM": "Cheddar"}]})
+    assert chatbot_provider.handle_single_turn.await_count == 2
+    assert item_cache_service.stats()["db_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unmatched_and_invalid_classifications_are_not_cached(
+    item_cache_service,
+):
+    pantry_service = MagicMock()
+    pantry_service.add_items = AsyncMock()
+    chatbot_provider = MagicMock()
+    # Only ever answers for the durian, including when asked about the rest again
+    chatbot_provider.handle_single_turn = AsyncMock(
+        side_effect=lambda message: (
+            '[{"ITEM": "Durian", "SUBCATEGORY": "Exotic", "QUANTITY": 1}]'
+            if "Durian" in message.content
+            else "[]"
+        )
+    )
+    expiry_service = MagicMock()
+    expiry_service.get_expiry_dates = AsyncMock(
+        side_effect=lambda queries: [date.today()] * len(queries)
+    )
+    service = ReceiptService(
+        pantry_service=pantry_service,
+        chatbot_provider=chatbot_provider,
+        logging_provider=MagicMock(),
+        expiry_service=expiry_service,
+        item_cache_service=item_cache_service,
+        secret_provider=make_secret_provider(),
+    )
+
+    receipt_json = {"Items": [{"ITEM": "Mystery"}, {"ITEM": "Durian"}]}
+    await service.process_receipt_webhook(1, receipt_json)
+
+    specs = pantry_service.add_items.await_args.args[1]
+    assert [s.item_name for s in specs] == ["Mystery", "Durian"]
+    assert await item_cache_service.get_many(["MYSTERY", "DURIAN"]) == {}
+    # The unanswered line is asked about again, up to the retry limit
+    assert chatbot_provider.handle_single_turn.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_expired_classifications_are_asked_again_and_replaced(
+    item_cache_service, fake_cache_provider, mock_relational_database_provider
+):
+    pantry_service = MagicMock()
+    pantry_service.add_items = AsyncMock()
+    chatbot_provider = MagicMock()
+    chatbot_provider.handle_single_turn = AsyncMock(
+        side_effect=[
+            '[{"ITEM": "Cheddar", "SUBCATEGORY": "Fresh Milk", "QUANTITY": 1}]',
+            '[{"ITEM": "Cheddar", "SUBCATEGORY": "Cheese", "QUANTITY": 1}]',
+        ]
+    )
+    expiry_service = MagicMock()
+    expiry_service.get_expiry_dates = AsyncMock(
+        side_effect=lambda queries: [date.today()] * len(queries)
+    )
+    service = ReceiptService(
+        pantry_service=pantry_service,
+        chatbot_provider=chatbot_provider,
+        logging_provider=MagicMock(),
+        expiry_service=expiry_service,
+        item_cache_service=item_cache_service,
+        secret_provider=make_secret_provider(),
+    )
+    receipt_json = {"Items": [{"ITEM": "CHEDDAR"}]}
+    await service.process_receipt_webhook(1, receipt_json)
+
+    # The stored classification outlives RECEIPT_ITEM_CACHE_MAX_AGE_DAYS
+    async with mock_relational_database_provider.get_db() as db:
+        await db.execute(
+            update(ReceiptItemClassification).values(
+                created_at=DateTimeUtils.get_utc_now() - timedelta(days=31)
+            )
+        )
+        await db.commit()
+    await fake_cache_provider.clear()
+    await service.process_receipt_webhook(2, receipt_json)
+
+    assert chatbot_provider.handle_single_turn.await_count == 2
+    specs = pantry_service.add_items.await_args.args[1]
+    assert [s.item_name for s in specs] == ["Cheddar"]
+    async with mock_relational_database_provider.get_db() as db:
+        result = await db.execute(select(ReceiptItemClassification.subcategory))
+        assert result.scalars().all() == ["Cheese"]
+
+
+@pytest.mark.asyncio
+async def test_reordered_reply_is_matched_by_item_name(item_cache_service):
+    pantry_service = MagicMock()
+    pantry_service.add_items = AsyncMock()
+    chatbot_provider = MagicMock()
+    chatbot_provider.handle_single_turn = AsyncMock(
+        side_effect=[
+            # Same number of answers as lines, in another order, one misnamed
+            '[{"ITEM": "Soap", "SUBCATEGORY": null, "QUANTITY": 2},'
+            ' {"ITEM": "Milk", "SUBCATEGORY": "Fresh Milk", "QUANTITY": 1},'
+            ' {"ITEM": "Cheddar", "SUBCATEGORY": "Cheese", "QUANTITY": 3}]',
+            '[{"ITEM": "Marigold Milk 1L", "SUBCATEGORY": "Fresh Milk",'
+            ' "QUANTITY": 1}]',
+        ]
+    )
+    expiry_service = MagicMock()
+    expiry_service.get_expiry_dates = AsyncMock(
+        side_effect=lambda queries: [date.today()] * len(queries)
+    )
+    service = ReceiptService(
+        pantry_service=pantry_service,
+        chatbot_provider=chatbot_provider,
+        logging_provider=MagicMock(),
+        expiry_service=expiry_service,
+        item_cache_service=item_cache_service,
+        secret_provider=make_secret_provider(),
+    )
+
+    await service.process_receipt_webhook(
+        1,
+        {
+            "Items": [
+                {"ITEM": "CHEDDAR"},
+                {"ITEM": "MARIGOLD MILK 1L"},
+                {"ITEM": "SOAP"},
+            ]
+        },
+    )
+
+    specs = pantry_service.add_items.await_args.args[1]
+    assert [(s.item_name, s.quantity) for s in specs] == [
+        ("Cheddar", 3.0),
+        ("Marigold Milk 1L", 1.0),
+        ("Soap", 2.0),
+    ]
+    # The line no answer named was asked about again on its own
+    retry = chatbot_provider.handle_single_turn.await_args_list[1].args[0].content
+    assert "1. MARIGOLD MILK 1L" in retry and "CHEDDAR" not in retry
+    cached = await item_cache_service.get_many(["CHEDDAR", "SOAP", "MILK"])
+    assert {k: (c.subcategory, c.quantity) for k, c in cached.items()} == {
+        "CHEDDAR": ("Cheese", 3.0),
+        "SOAP": (None, 2.0),
+    }
+
+
+def test_invalid_item_cache_max_age_raises(fake_cache_provider, mock_logging_provider):
+    with pytest.raises(ValueError, match="RECEIPT_ITEM_CACHE_MAX_AGE_DAYS"):
+        ReceiptItemCacheService(
+            MagicMock(),
+            fake_cache_provider,
+            make_secret_provider(RECEIPT_ITEM_CACHE_MAX_AGE_DAYS="0"),
+            mock_logging_provider,
+        )
+
+
+def test_invalid_item_cache_ttl_raises(fake_cache_provider, mock_logging_provider):
+    secret_provider = MagicMock(spec=ISecretProvider)
+    secret_provider.get_secret.return_value = "a day"
+    with pytest.raises(ValueError, match="RECEIPT_ITEM_CACHE_TTL_SECONDS"):
+        ReceiptItemCacheService(
+            MagicMock(), fake_cache_provider, secret_provider, mock_logging_provider
+        )
+
+
+@pytest.mark.asyncio
+async def test_long_receipt_is_classified_in_concurrent_chunks(
+    memory_item_cache_service,
+):
+    chatbot_provider = FakeClassifier(latency=0.01)
+    service, pantry_service = make_receipt_service(
+        chatbot_provider,
+        memory_item_cache_service,
+        RECEIPT_CLASSIFY_CHUNK_TOKENS="200",
+        RECEIPT_CLASSIFY_CONCURRENCY="3",
+    )
+    names = [f"Item {i:03d}" for i in range(100)]
+
+    await service.process_receipt_webhook(1, {"Items": [{"ITEM": n} for n in names]})
+
+    # Each line is estimated at 33 reply tokens, so six fit in a chunk
+    assert len(chatbot_provider.prompts) == 17
+    assert chatbot_provider.max_in_flight == 3
+    specs = pantry_service.add_items.await_args.args[1]
+    assert [s.item_name for s in specs] == names
+
+
+@pytest.mark.asyncio
+async def test_truncated_replies_retry_only_the_missing_lines(
+    memory_item_cache_service,
+):
+    chatbot_provider = FakeClassifier(max_answers=4)
+    service, pantry_service = make_receipt_service(
+        chatbot_provider,
+        memory_item_cache_service,
+        RECEIPT_CLASSIFY_CHUNK_TOKENS="1000",
+    )
+    names = [f"Item {i:02d}" for i in range(12)]
+
+    await service.process_receipt_webhook(1, {"Items": [{"ITEM": n} for n in names]})
+
+    # 12 lines -> 4 answered; 8 missing -> 2 chunks of 4, answered in full
+    assert [len(re.findall(r"^\d+\. ", p, re.M)) for p in chatbot_provider.prompts] == [
+        12,
+        4,
+        4,
+    ]
+    specs = pantry_service.add_items.await_args.args[1]
+    assert [s.item_name for s in specs] == names
+    assert {s.category for s in specs} == {Category.SNACKS}
+
+
+@pytest.mark.asyncio
+async def test_provider_errors_fail_the_receipt(memory_item_cache_service):
+    chatbot_provider = MagicMock()
+    chatbot_provider.handle_single_turn = AsyncMock(
+        side_effect=RuntimeError("Groq API call failed")
+    )
+    service, pantry_service = make_receipt_service(
+        chatbot_provider, memory_item_cache_service
+    )
+
+    with pytest.raises(RuntimeError):
+        await service.process_receipt_webhook(1, {"Items": [{"ITEM": "Apple"}]})
+
+    assert chatbot_provider.handle_single_turn.await_count == 1
+    pantry_service.add_items.assert_not_awaited()
+
+
+def test_invalid_classify_chunk_tokens_raises(memory_item_cache_service):
+    with pytest.raises(ValueError, match="RECEIPT_CLASSIFY_CHUNK_TOKENS"):
+        make_receipt_service(
+            MagicMock(), memory_item_cache_service, RECEIPT_CLASSIFY_CHUNK_TOKENS="lots"
+        )
+
+
+@pytest.mark.parametrize(
+    "key", ["RECEIPT_CLASSIFY_CHUNK_TOKENS", "RECEIPT_CLASSIFY_CONCURRENCY"]
+)
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_non_positive_classify_settings_raise(memory_item_cache_service, key, value):
+    with pytest.raises(ValueError, match=f"Invalid {key} value in .env"):
+        make_receipt_service(MagicMock(), memory_item_cache_service, **{key: value})